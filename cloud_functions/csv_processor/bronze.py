@@ -0,0 +1,247 @@
+"""
+Case Fictício - Teste -- Bronze Load Helpers
+==================================
+
+Shared helpers that turn validated pedido/item_pedido DataFrames into Bronze
+rows (lowercase column names, metadata columns, NUMERIC-compatible values)
+and load them into BigQuery.
+
+Used by the Cloud Function (main.py) and by the replay/backfill scripts, so
+every path writes exactly the same Bronze schema.
+
+Two load paths exist:
+    to_bronze_arrow + load_bronze_arrow      (default) builds a pyarrow.Table
+        with the exact Bronze schema straight from the validated columns and
+        uploads it as Parquet with load_table_from_file
+    prepare_bronze_frame + load_bronze_frame (legacy) converts money columns
+        to Decimal objects row by row and lets load_table_from_dataframe
+        re-serialize the frame; kept as the baseline for
+        scripts/benchmark_bronze_load.py
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+
+
+# Source CSV column -> Bronze column (lowercase with underscores)
+BRONZE_COLUMN_NAMES = {
+    "Id_Unidade": "id_unidade",
+    "Id_Pedido": "id_pedido",
+    "Tipo_Pedido": "tipo_pedido",
+    "Data_Pedido": "data_pedido",
+    "Vlr_Pedido": "vlr_pedido",
+    "Endereco_Entrega": "endereco_entrega",
+    "Taxa_Entrega": "taxa_entrega",
+    "Status": "status",
+    "Id_Item_Pedido": "id_item_pedido",
+    "Id_Produto": "id_produto",
+    "Qtd": "qtd",
+    "Vlr_Item": "vlr_item",
+    "Observacao": "observacao",
+}
+
+# Bronze table -> ordered column list (must match sql/bronze/create_tables.sql)
+BRONZE_COLUMNS = {
+    "orders": [
+        "id_unidade", "id_pedido", "tipo_pedido", "data_pedido", "vlr_pedido",
+        "endereco_entrega", "taxa_entrega", "status",
+        "_source_file", "_ingest_timestamp", "_ingest_date",
+    ],
+    "order_items": [
+        "id_pedido", "id_item_pedido", "id_produto", "qtd", "vlr_item", "observacao",
+        "_source_file", "_ingest_timestamp", "_ingest_date",
+    ],
+}
+
+# NUMERIC(10,2) columns in Bronze
+NUMERIC_COLUMNS = {"vlr_pedido", "taxa_entrega", "vlr_item"}
+
+# Bronze table -> Arrow schema (types and NOT NULL modes of create_tables.sql)
+BRONZE_NUMERIC = pa.decimal128(10, 2)
+BRONZE_ARROW_SCHEMAS = {
+    "orders": pa.schema([
+        pa.field("id_unidade", pa.int64(), nullable=False),
+        pa.field("id_pedido", pa.string(), nullable=False),
+        pa.field("tipo_pedido", pa.string()),
+        pa.field("data_pedido", pa.date32()),
+        pa.field("vlr_pedido", BRONZE_NUMERIC),
+        pa.field("endereco_entrega", pa.string()),
+        pa.field("taxa_entrega", BRONZE_NUMERIC),
+        pa.field("status", pa.string()),
+        pa.field("_source_file", pa.string()),
+        pa.field("_ingest_timestamp", pa.timestamp("us", tz="UTC")),
+        pa.field("_ingest_date", pa.date32()),
+    ]),
+    "order_items": pa.schema([
+        pa.field("id_pedido", pa.string(), nullable=False),
+        pa.field("id_item_pedido", pa.string(), nullable=False),
+        pa.field("id_produto", pa.int64()),
+        pa.field("qtd", pa.int64()),
+        pa.field("vlr_item", BRONZE_NUMERIC),
+        pa.field("observacao", pa.string()),
+        pa.field("_source_file", pa.string()),
+        pa.field("_ingest_timestamp", pa.timestamp("us", tz="UTC")),
+        pa.field("_ingest_date", pa.date32()),
+    ]),
+}
+
+# Bronze column -> source CSV column
+SOURCE_COLUMN_NAMES = {bronze: source for source, bronze in BRONZE_COLUMN_NAMES.items()}
+
+
+def prepare_bronze_frame(
+    df: pd.DataFrame,
+    table_name: str,
+    source_file: str | None = None,
+    ingest_timestamp: datetime | None = None,
+) -> pd.DataFrame:
+    """
+    Rename, add metadata columns and select the Bronze schema for table_name.
+
+    Args:
+        df: Validated DataFrame with source CSV column names
+        table_name: Bronze table ("orders" or "order_items")
+        source_file: GCS object name; when None, df must already carry a
+                     per-row _source_file column (bulk replay/backfill)
+        ingest_timestamp: Defaults to now (UTC)
+    """
+    ingest_timestamp = ingest_timestamp or datetime.utcnow()
+
+    df = df.rename(columns=BRONZE_COLUMN_NAMES)
+    if source_file is not None:
+        df["_source_file"] = source_file
+    df["_ingest_timestamp"] = ingest_timestamp
+    df["_ingest_date"] = ingest_timestamp.date()
+
+    # Convert float columns to Decimal for NUMERIC compatibility
+    # This prevents pyarrow serialization errors with BigQuery NUMERIC type
+    for col in NUMERIC_COLUMNS.intersection(df.columns):
+        df[col] = df[col].apply(lambda x: Decimal(str(round(x, 2))) if pd.notna(x) else None)
+
+    return df[BRONZE_COLUMNS[table_name]]
+
+
+def load_bronze_frame(client: bigquery.Client, df: pd.DataFrame, table_id: str) -> int:
+    """Append a prepared Bronze frame to table_id with one load job."""
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
+
+    job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
+    job.result()
+    return len(df)
+
+
+# ============================================================================
+# ARROW-NATIVE PATH
+# ============================================================================
+
+def _validity_buffer(valid: np.ndarray) -> pa.Buffer | None:
+    """Arrow validity bitmap for a boolean mask (None when nothing is null)."""
+    if valid.all():
+        return None
+    return pa.array(valid, type=pa.bool_()).buffers()[1]
+
+
+def decimal_array(values: pd.Series, arrow_type: pa.Decimal128Type = BRONZE_NUMERIC) -> pa.Array:
+    """
+    Build a decimal128 array from float values without Decimal objects.
+
+    Values are scaled to integers (cents for NUMERIC(10,2)) in one vectorized
+    step and written directly as 128-bit two's complement little-endian words,
+    the Arrow decimal128 memory layout.
+    """
+    data = values.to_numpy(dtype="float64", na_value=np.nan)
+    valid = ~np.isnan(data)
+
+    words = np.zeros((len(data), 2), dtype=np.int64)
+    words[:, 0] = np.round(np.where(valid, data, 0.0) * 10 ** arrow_type.scale)
+    words[:, 1] = words[:, 0] >> 63  # sign extension of the high word
+
+    return pa.Array.from_buffers(
+        arrow_type,
+        len(data),
+        [_validity_buffer(valid), pa.py_buffer(words)],
+        null_count=int((~valid).sum()),
+    )
+
+
+def _column_array(values: pd.Series, arrow_type: pa.DataType) -> pa.Array:
+    """Convert one validated source column to its Bronze Arrow type."""
+    if pa.types.is_decimal(arrow_type):
+        return decimal_array(values, arrow_type)
+    if pa.types.is_int64(arrow_type):
+        data = values.to_numpy(dtype="float64", na_value=np.nan)
+        return pa.array(data, from_pandas=True).cast(arrow_type)
+    return pa.array(values, type=arrow_type, from_pandas=True)
+
+
+def to_bronze_arrow(
+    df: pd.DataFrame,
+    table_name: str,
+    source_file: str | None = None,
+    ingest_timestamp: datetime | None = None,
+) -> pa.Table:
+    """
+    Build a pyarrow.Table with the exact Bronze schema of table_name.
+
+    Same arguments as prepare_bronze_frame; df is not modified.
+    """
+    ingest_timestamp = ingest_timestamp or datetime.utcnow()
+    schema = BRONZE_ARROW_SCHEMAS[table_name]
+    num_rows = len(df)
+
+    if source_file is not None:
+        source_files = pa.array([source_file] * num_rows, type=pa.string())
+    else:
+        source_files = pa.array(df["_source_file"], type=pa.string(), from_pandas=True)
+
+    metadata = {
+        "_source_file": source_files,
+        "_ingest_timestamp": pa.array(
+            np.full(num_rows, np.datetime64(ingest_timestamp.replace(tzinfo=None), "us"))
+        ).cast(schema.field("_ingest_timestamp").type),
+        "_ingest_date": pa.array(
+            np.full(num_rows, np.datetime64(ingest_timestamp.date(), "D"))
+        ),
+    }
+
+    arrays = []
+    for field in schema:
+        if field.name in metadata:
+            arrays.append(metadata[field.name])
+        else:
+            arrays.append(_column_array(df[SOURCE_COLUMN_NAMES[field.name]], field.type))
+
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def to_parquet_buffer(table: pa.Table) -> pa.Buffer:
+    """Serialize an Arrow table to an in-memory Parquet buffer."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="snappy")
+    return sink.getvalue()
+
+
+def load_bronze_arrow(client: bigquery.Client, table: pa.Table, table_id: str) -> int:
+    """Append an Arrow Bronze table to table_id with one Parquet load job."""
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
+
+    buffer = to_parquet_buffer(table)
+    job = client.load_table_from_file(
+        pa.BufferReader(buffer), table_id, size=buffer.size, job_config=job_config
+    )
+    job.result()
+    return table.num_rows
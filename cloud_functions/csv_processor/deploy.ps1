@@ -54,7 +54,7 @@ gcloud functions deploy csv-processor `
   --trigger-event-filters="bucket=$BUCKET" `
   --memory=256MB `
   --timeout=300s `
-  --set-env-vars="PROJECT_ID=$PROJECT_ID,BUCKET_NAME=$BUCKET" `
+  --set-env-vars="PROJECT_ID=$PROJECT_ID,BUCKET_NAME=$BUCKET,INGESTION_MODE=paired" `
   --allow-unauthenticated
 
 if ($LASTEXITCODE -eq 0) {
@@ -4,12 +4,16 @@ Case Fictício - Teste -- CSV Processor Cloud Function (2nd Gen)
 
 Triggered by GCS file upload events on raw/csv_sales/ prefix.
 Processes pedido.csv and item_pedido.csv files into BigQuery Bronze layer.
+By default both files of a unit_NNN directory are reconciled and loaded
+together (INGESTION_MODE=paired); INGESTION_MODE=single keeps the legacy
+one-file-per-invocation behaviour.
 
 Event-driven architecture:
 - GCS upload event -> Eventarc trigger -> This function
-- Validates CSV schema and data quality
+- Validates CSV schema and data quality (declarative rules in validation.py)
 - Loads valid data to BigQuery Bronze (orders, order_items)
-- Quarantines invalid files with error reports
+- Quarantines rejected rows in bulk (quarantine/rows/*.parquet) and
+  unreadable files with error reports
 
 Author: Arthur Graf -- Case Fictício - Teste Project
 Date: January 2026
@@ -21,39 +25,69 @@ import io
 import json
 import os
 from datetime import datetime
-from google.cloud import storage, bigquery
+from google.cloud import storage, bigquery, bigquery_storage_v1
+from google.api_core import exceptions
+
+from bronze import to_bronze_arrow, load_bronze_arrow
+from quarantine import (
+    QUARANTINE_PREFIX,
+    quarantine_rows_path,
+    build_quarantine_frame,
+    to_parquet_bytes,
+)
+from write_api import table_path, write_bronze_arrow
+from validation import (
+    validate_pedido,
+    validate_item_pedido,
+    reconcile_pair,
+    has_missing_columns,
+)
 
 
 # Environment configuration (must be set via environment variables or .env)
 PROJECT = os.environ["PROJECT_ID"]
 BUCKET = os.environ["BUCKET_NAME"]
 BQ_DATASET = os.environ.get("BQ_DATASET", "case_ficticio_bronze")
-QUARANTINE_PREFIX = "quarantine"
 
-# Expected schemas for validation
-PEDIDO_COLUMNS = [
-    "Id_Unidade", "Id_Pedido", "Tipo_Pedido", "Data_Pedido",
-    "Vlr_Pedido", "Endereco_Entrega", "Taxa_Entrega", "Status"
-]
-ITEM_PEDIDO_COLUMNS = [
-    "Id_Pedido", "Id_Item_Pedido", "Id_Produto", "Qtd", "Vlr_Item", "Observacao"
-]
+# "paired": wait for both files of a unit_NNN directory and reconcile them together
+# "single": legacy mode, each file is validated and loaded on its own
+INGESTION_MODE = os.environ.get("INGESTION_MODE", "paired")
+PAIR_FILES = {"pedido.csv": "orders", "item_pedido.csv": "order_items"}
+STATE_PREFIX = "_state"
 
-VALID_STATUSES = {"Finalizado", "Pendente", "Cancelado"}
-VALID_ORDER_TYPES = {"Loja Online", "Loja Fisica"}
+# "load": one Parquet load job per file
+# "write_api": Storage Write API pending stream per file (sub-second visibility)
+BRONZE_SINK = os.environ.get("BRONZE_SINK", "load")
+
+# Reused across warm invocations (gRPC channel setup dominates small writes)
+_write_client = None
+
+
+def get_write_client() -> bigquery_storage_v1.BigQueryWriteClient:
+    """Return the shared Storage Write API client."""
+    global _write_client
+    if _write_client is None:
+        _write_client = bigquery_storage_v1.BigQueryWriteClient()
+    return _write_client
 
 
 def read_csv_from_gcs(bucket_name: str, blob_name: str) -> pd.DataFrame:
-    """Read a CSV file from GCS into a pandas DataFrame."""
+    """Read a CSV file from GCS into a pandas DataFrame (all columns as strings)."""
     client = storage.Client(project=PROJECT)
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
     content = blob.download_as_text(encoding="utf-8")
-    return pd.read_csv(io.StringIO(content), sep=";")
+    return pd.read_csv(io.StringIO(content), sep=";", dtype=str)
 
 
 def quarantine_file(bucket_name: str, source_blob: str, error_msg: str) -> None:
-    """Move invalid file to quarantine with error report."""
+    """
+    Move an unreadable/structurally invalid file to quarantine with error report.
+
+    Only used when the file as a whole cannot be processed (parse errors,
+    missing columns, load failures). Individual bad rows go through
+    quarantine_rows instead.
+    """
     client = storage.Client(project=PROJECT)
     bucket = client.bucket(bucket_name)
 
@@ -73,135 +107,127 @@ def quarantine_file(bucket_name: str, source_blob: str, error_msg: str) -> None:
     print(f"  [QUARANTINE] {source_blob}: {error_msg}")
 
 
-def validate_pedido(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
-    """Validate pedido.csv data. Returns (valid_df, errors)."""
-    errors = []
+def quarantine_rows(bucket_name: str, source_file: str, rejected: pd.DataFrame) -> None:
+    """Write all rejected rows of one source file as a single Parquet object."""
+    if len(rejected) == 0:
+        return
 
-    # Check required columns
-    missing = set(PEDIDO_COLUMNS) - set(df.columns)
-    if missing:
-        return pd.DataFrame(), [f"Missing columns: {missing}"]
+    client = storage.Client(project=PROJECT)
+    bucket = client.bucket(bucket_name)
 
-    # Type casting
-    df["Id_Unidade"] = pd.to_numeric(df["Id_Unidade"], errors="coerce")
-    df["Vlr_Pedido"] = pd.to_numeric(df["Vlr_Pedido"], errors="coerce")
-    df["Taxa_Entrega"] = pd.to_numeric(df["Taxa_Entrega"], errors="coerce")
-    df["Data_Pedido"] = pd.to_datetime(df["Data_Pedido"], errors="coerce").dt.date
+    quarantine_path = quarantine_rows_path(source_file)
+    frame = build_quarantine_frame(rejected, source_file)
+    bucket.blob(quarantine_path).upload_from_string(
+        to_parquet_bytes(frame), content_type="application/vnd.apache.parquet"
+    )
+    print(f"  [QUARANTINE] {len(frame)} rows from {source_file} -> {quarantine_path}")
 
-    # Remove nulls in required fields
-    null_mask = df[["Id_Unidade", "Id_Pedido", "Data_Pedido", "Vlr_Pedido", "Status"]].isnull().any(axis=1)
-    if null_mask.sum() > 0:
-        errors.append(f"Dropped {null_mask.sum()} rows with null required fields")
-    df = df[~null_mask]
 
-    # Validate Status
-    invalid_status = ~df["Status"].isin(VALID_STATUSES)
-    if invalid_status.sum() > 0:
-        errors.append(f"Dropped {invalid_status.sum()} rows with invalid Status")
-    df = df[~invalid_status]
+def load_to_bigquery(df: pd.DataFrame, table_name: str, source_file: str) -> int:
+    """Load a DataFrame into BigQuery Bronze table through the configured sink."""
+    table = to_bronze_arrow(df, table_name, source_file)
 
-    # Deduplicate
-    before = len(df)
-    df = df.drop_duplicates(subset=["Id_Pedido"])
-    if len(df) < before:
-        errors.append(f"Removed {before - len(df)} duplicate orders")
+    if BRONZE_SINK == "write_api":
+        parent = table_path(PROJECT, BQ_DATASET, table_name)
+        return write_bronze_arrow(get_write_client(), table, parent)
 
-    return df, errors
+    client = bigquery.Client(project=PROJECT)
+    table_id = f"{PROJECT}.{BQ_DATASET}.{table_name}"
+    return load_bronze_arrow(client, table, table_id)
 
 
-def validate_item_pedido(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
-    """Validate item_pedido.csv data. Returns (valid_df, errors)."""
-    errors = []
+def claim_unit_pair(bucket_name: str, unit_prefix: str) -> str | None:
+    """
+    Atomically claim the pedido/item_pedido pair of a unit-day directory.
 
-    missing = set(ITEM_PEDIDO_COLUMNS) - set(df.columns)
-    if missing:
-        return pd.DataFrame(), [f"Missing columns: {missing}"]
+    Both files trigger their own invocation; whichever runs once BOTH objects
+    exist creates a marker keyed on the two object generations with
+    if_generation_match=0 (create-only), so exactly one invocation wins.
+    Re-sending either file produces a new generation and therefore a new claim.
 
-    # Type casting
-    df["Id_Produto"] = pd.to_numeric(df["Id_Produto"], errors="coerce")
-    df["Qtd"] = pd.to_numeric(df["Qtd"], errors="coerce")
-    df["Vlr_Item"] = pd.to_numeric(df["Vlr_Item"], errors="coerce")
+    Returns the marker path when claimed, None if a file is missing or another
+    invocation already claimed this pair.
+    """
+    client = storage.Client(project=PROJECT)
+    bucket = client.bucket(bucket_name)
 
-    # Remove nulls in required fields
-    null_mask = df[["Id_Pedido", "Id_Item_Pedido", "Id_Produto", "Qtd", "Vlr_Item"]].isnull().any(axis=1)
-    if null_mask.sum() > 0:
-        errors.append(f"Dropped {null_mask.sum()} rows with null required fields")
-    df = df[~null_mask]
+    generations = []
+    for base_name in PAIR_FILES:
+        blob = bucket.get_blob(f"{unit_prefix}/{base_name}")
+        if blob is None:
+            print(f"  [WAIT] {unit_prefix}/{base_name} not uploaded yet")
+            return None
+        generations.append(str(blob.generation))
 
-    # Deduplicate
-    before = len(df)
-    df = df.drop_duplicates(subset=["Id_Item_Pedido"])
-    if len(df) < before:
-        errors.append(f"Removed {before - len(df)} duplicate items")
+    marker_path = f"{STATE_PREFIX}/paired/{unit_prefix}/{'-'.join(generations)}"
+    try:
+        bucket.blob(marker_path).upload_from_string(
+            datetime.utcnow().isoformat(), if_generation_match=0
+        )
+    except exceptions.PreconditionFailed:
+        print(f"  [SKIP] Pair already claimed: {marker_path}")
+        return None
+    return marker_path
 
-    return df, errors
 
+def release_unit_pair(bucket_name: str, marker_path: str) -> None:
+    """Delete a pair claim so a retried upload can reprocess the unit-day."""
+    client = storage.Client(project=PROJECT)
+    try:
+        client.bucket(bucket_name).blob(marker_path).delete()
+    except exceptions.NotFound:
+        pass
 
-def load_to_bigquery(df: pd.DataFrame, table_name: str, source_file: str) -> int:
-    """Load a DataFrame into BigQuery Bronze table."""
-    from decimal import Decimal
 
-    client = bigquery.Client(project=PROJECT)
-    table_id = f"{PROJECT}.{BQ_DATASET}.{table_name}"
+def process_unit_pair(bucket_name: str, unit_prefix: str) -> None:
+    """Reconcile pedido.csv with item_pedido.csv in memory and load both."""
+    marker_path = claim_unit_pair(bucket_name, unit_prefix)
+    if marker_path is None:
+        return
 
-    # Add metadata columns
-    df["_source_file"] = source_file
-    df["_ingest_timestamp"] = datetime.utcnow()
-    df["_ingest_date"] = datetime.utcnow().date()
-
-    # Normalize column names to match BigQuery schema (lowercase with underscores)
-    df = df.rename(columns={
-        "Id_Unidade": "id_unidade",
-        "Id_Pedido": "id_pedido",
-        "Tipo_Pedido": "tipo_pedido",
-        "Data_Pedido": "data_pedido",
-        "Vlr_Pedido": "vlr_pedido",
-        "Endereco_Entrega": "endereco_entrega",
-        "Taxa_Entrega": "taxa_entrega",
-        "Status": "status",
-        "Id_Item_Pedido": "id_item_pedido",
-        "Id_Produto": "id_produto",
-        "Qtd": "qtd",
-        "Vlr_Item": "vlr_item",
-        "Observacao": "observacao",
-    })
-
-    # Convert float columns to Decimal for NUMERIC compatibility
-    # This prevents pyarrow serialization errors with BigQuery NUMERIC type
-    numeric_columns = []
-    if "vlr_pedido" in df.columns:
-        numeric_columns.extend(["vlr_pedido", "taxa_entrega"])
-    if "vlr_item" in df.columns:
-        numeric_columns.append("vlr_item")
-
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: Decimal(str(round(x, 2))) if pd.notna(x) else None)
-
-    job_config = bigquery.LoadJobConfig(
-        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-    )
+    orders_file = f"{unit_prefix}/pedido.csv"
+    items_file = f"{unit_prefix}/item_pedido.csv"
 
-    job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
-    job.result()
-    return len(df)
+    try:
+        df_orders = read_csv_from_gcs(bucket_name, orders_file)
+        df_items = read_csv_from_gcs(bucket_name, items_file)
+        print(f"  Read {len(df_orders)} orders and {len(df_items)} items from {unit_prefix}")
+
+        valid_orders, valid_items, rejected_orders, rejected_items, errors = reconcile_pair(
+            df_orders, df_items
+        )
+        for e in errors:
+            print(f"  [WARN] {e}")
+
+        if has_missing_columns(errors):
+            release_unit_pair(bucket_name, marker_path)
+            quarantine_file(bucket_name, orders_file, errors[0])
+            quarantine_file(bucket_name, items_file, errors[0])
+            return
 
+        quarantine_rows(bucket_name, orders_file, rejected_orders)
+        quarantine_rows(bucket_name, items_file, rejected_items)
 
-@functions_framework.cloud_event
-def process_csv(cloud_event):
-    """Main Cloud Function entry point -- triggered by GCS file upload."""
-    data = cloud_event.data
-    bucket_name = data["bucket"]
-    file_name = data["name"]
+        if len(valid_orders) == 0:
+            print(f"  [WARN] No valid rows after validation in {unit_prefix}")
+            return
 
-    print(f"Processing: gs://{bucket_name}/{file_name}")
+        rows_loaded = load_to_bigquery(valid_orders, "orders", orders_file)
+        print(f"  [OK] Loaded {rows_loaded} rows into {BQ_DATASET}.orders")
+        if len(valid_items) > 0:
+            rows_loaded = load_to_bigquery(valid_items, "order_items", items_file)
+            print(f"  [OK] Loaded {rows_loaded} rows into {BQ_DATASET}.order_items")
 
-    # Only process CSV files in raw/csv_sales/
-    if not file_name.startswith("raw/csv_sales/") or not file_name.endswith(".csv"):
-        print(f"  [SKIP] Not a sales CSV: {file_name}")
-        return
+    except Exception as e:
+        error_msg = f"Processing failed: {str(e)}"
+        print(f"  [ERROR] {error_msg}")
+        release_unit_pair(bucket_name, marker_path)
+        quarantine_file(bucket_name, orders_file, error_msg)
+        quarantine_file(bucket_name, items_file, error_msg)
 
-    # Determine file type
+
+def process_single_file(bucket_name: str, file_name: str) -> None:
+    """Validate and load one CSV on its own (legacy single-file mode)."""
     base_name = file_name.split("/")[-1]
 
     try:
@@ -209,21 +235,23 @@ def process_csv(cloud_event):
         print(f"  Read {len(df)} rows from {base_name}")
 
         if base_name == "pedido.csv":
-            df_valid, errors = validate_pedido(df)
-            table = "orders"
-        elif base_name == "item_pedido.csv":
-            df_valid, errors = validate_item_pedido(df)
-            table = "order_items"
+            df_valid, rejected, errors = validate_pedido(df)
         else:
-            print(f"  [SKIP] Unknown file type: {base_name}")
-            return
+            df_valid, rejected, errors = validate_item_pedido(df)
+        table = PAIR_FILES[base_name]
 
         if errors:
             for e in errors:
                 print(f"  [WARN] {e}")
 
+        if has_missing_columns(errors):
+            quarantine_file(bucket_name, file_name, errors[0])
+            return
+
+        quarantine_rows(bucket_name, file_name, rejected)
+
         if len(df_valid) == 0:
-            quarantine_file(bucket_name, file_name, "No valid rows after validation")
+            print(f"  [WARN] No valid rows after validation in {base_name}")
             return
 
         rows_loaded = load_to_bigquery(df_valid, table, file_name)
@@ -233,3 +261,29 @@ def process_csv(cloud_event):
         error_msg = f"Processing failed: {str(e)}"
         print(f"  [ERROR] {error_msg}")
         quarantine_file(bucket_name, file_name, error_msg)
+
+
+@functions_framework.cloud_event
+def process_csv(cloud_event):
+    """Main Cloud Function entry point -- triggered by GCS file upload."""
+    data = cloud_event.data
+    bucket_name = data["bucket"]
+    file_name = data["name"]
+
+    print(f"Processing: gs://{bucket_name}/{file_name}")
+
+    # Only process CSV files in raw/csv_sales/
+    if not file_name.startswith("raw/csv_sales/") or not file_name.endswith(".csv"):
+        print(f"  [SKIP] Not a sales CSV: {file_name}")
+        return
+
+    # Determine file type
+    unit_prefix, _, base_name = file_name.rpartition("/")
+    if base_name not in PAIR_FILES:
+        print(f"  [SKIP] Unknown file type: {base_name}")
+        return
+
+    if INGESTION_MODE == "paired":
+        process_unit_pair(bucket_name, unit_prefix)
+    else:
+        process_single_file(bucket_name, file_name)
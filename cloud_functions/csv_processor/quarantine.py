@@ -0,0 +1,83 @@
+"""
+Case Fictício - Teste -- Row-Level Quarantine
+===================================
+
+Rejected rows are written in bulk, one compact Parquet object per source
+file, under quarantine/rows/ (mirroring the raw/csv_sales/ layout):
+
+    raw/csv_sales/2026/01/15/unit_001/pedido.csv
+      -> quarantine/rows/2026/01/15/unit_001/pedido.parquet
+
+Every quarantined row keeps its original source values (as strings) plus:
+    _rule            First validation rule the row failed
+    _source_file     Source GCS object
+    _line_number     1-based line in the source CSV (header = line 1)
+    _quarantined_at  UTC timestamp
+
+The objects are queryable through the external tables
+case_ficticio_bronze.quarantine_orders / quarantine_order_items
+(sql/bronze/create_tables.sql) and are
+replayed in bulk by scripts/replay_quarantine.py.
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import io
+from datetime import datetime
+
+import pandas as pd
+
+
+QUARANTINE_PREFIX = "quarantine"
+QUARANTINE_ROWS_PREFIX = f"{QUARANTINE_PREFIX}/rows"
+RAW_SALES_PREFIX = "raw/csv_sales/"
+
+QUARANTINE_METADATA_COLUMNS = ["_rule", "_source_file", "_line_number", "_quarantined_at"]
+
+
+def quarantine_rows_path(source_file: str) -> str:
+    """Map a raw/csv_sales/ object name to its row-quarantine Parquet object."""
+    relative = source_file[len(RAW_SALES_PREFIX):] if source_file.startswith(RAW_SALES_PREFIX) else source_file
+    return f"{QUARANTINE_ROWS_PREFIX}/{relative.rsplit('.', 1)[0]}.parquet"
+
+
+def build_quarantine_frame(
+    rejected: pd.DataFrame,
+    source_file: str | None = None,
+    quarantined_at: datetime | None = None,
+) -> pd.DataFrame:
+    """
+    Normalize rejected rows (from validation.collect_rejected) for storage.
+
+    Source columns are stored as nullable strings so files with malformed
+    values share one schema. When source_file is None the rows must already
+    carry _source_file (bulk replay).
+    """
+    frame = rejected
+    if source_file is not None:
+        frame["_source_file"] = source_file
+    # tz-aware so Parquet stores isAdjustedToUTC=true (BigQuery TIMESTAMP, not DATETIME);
+    # naive datetimes passed in are taken as UTC
+    stamp = pd.Timestamp(quarantined_at) if quarantined_at is not None else pd.Timestamp.now(tz="UTC")
+    frame["_quarantined_at"] = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+
+    data_columns = [c for c in frame.columns if c not in QUARANTINE_METADATA_COLUMNS]
+    frame[data_columns] = frame[data_columns].astype("string")
+    frame["_rule"] = frame["_rule"].astype("string")
+    frame["_source_file"] = frame["_source_file"].astype("string")
+    frame["_line_number"] = frame["_line_number"].astype("int64")
+
+    return frame[data_columns + QUARANTINE_METADATA_COLUMNS].reset_index(drop=True)
+
+
+def to_parquet_bytes(frame: pd.DataFrame) -> bytes:
+    """Serialize a quarantine frame to compressed Parquet bytes."""
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False, compression="zstd")
+    return buffer.getvalue()
+
+
+def read_parquet_bytes(data: bytes) -> pd.DataFrame:
+    """Read a quarantine Parquet object back into a DataFrame of strings."""
+    return pd.read_parquet(io.BytesIO(data))
@@ -0,0 +1,378 @@
+"""
+Case Fictício - Teste -- Declarative Validation Rules
+==========================================
+
+Row-level data quality rules for pedido.csv and item_pedido.csv.
+
+Every rule is declared as a dict with a name, a human-readable message and a
+check function that compiles to a single vectorized boolean mask
+(True = reject the row). All masks are evaluated in one pass over the
+DataFrame, each rejected row is attributed to the FIRST rule it fails (rule
+order = priority), and the frame is filtered exactly once at the end -- adding
+rules never adds DataFrame copies.
+
+This module has no GCP dependencies so it can be shared by the Cloud Function,
+the backfill/replay scripts and the unit tests.
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Expected schemas for validation
+PEDIDO_COLUMNS = [
+    "Id_Unidade", "Id_Pedido", "Tipo_Pedido", "Data_Pedido",
+    "Vlr_Pedido", "Endereco_Entrega", "Taxa_Entrega", "Status"
+]
+ITEM_PEDIDO_COLUMNS = [
+    "Id_Pedido", "Id_Item_Pedido", "Id_Produto", "Qtd", "Vlr_Item", "Observacao"
+]
+
+VALID_STATUSES = {"Finalizado", "Pendente", "Cancelado"}
+VALID_ORDER_TYPES = {"Loja Online", "Loja Fisica"}
+
+# Max absolute difference (BRL) between Vlr_Pedido and sum(items) + Taxa_Entrega
+ORDER_TOTAL_TOLERANCE = 0.01
+
+# Rule name used for rows rejected as duplicates of an earlier valid row
+DUPLICATE_RULE = "duplicate_id"
+
+# Rule name used for values present in the CSV that could not be type-cast
+MALFORMED_RULE = "malformed_value"
+
+# Error prefix for structurally invalid files (quarantined as a whole)
+MISSING_COLUMNS_ERROR = "Missing columns"
+
+# Rule name used for items whose parent order was not accepted (paired ingestion)
+ORPHAN_RULE = "orphan_item"
+
+# Rule name used for orders whose value does not match their items (paired ingestion)
+ORDER_TOTAL_RULE = "order_total_mismatch"
+
+# Column type casts applied before the rules run: column -> "numeric" | "date"
+PEDIDO_CASTS = {
+    "Id_Unidade": "numeric",
+    "Vlr_Pedido": "numeric",
+    "Taxa_Entrega": "numeric",
+    "Data_Pedido": "date",
+}
+ITEM_PEDIDO_CASTS = {
+    "Id_Produto": "numeric",
+    "Qtd": "numeric",
+    "Vlr_Item": "numeric",
+}
+
+PEDIDO_REQUIRED = ["Id_Unidade", "Id_Pedido", "Data_Pedido", "Vlr_Pedido", "Status"]
+ITEM_PEDIDO_REQUIRED = ["Id_Pedido", "Id_Item_Pedido", "Id_Produto", "Qtd", "Vlr_Item"]
+
+# Numeric columns loaded as INT64 in Bronze (a fractional value would fail the
+# whole Arrow conversion instead of one row)
+PEDIDO_INTEGER = ["Id_Unidade"]
+ITEM_PEDIDO_INTEGER = ["Id_Produto", "Qtd"]
+
+
+# ============================================================================
+# RULE DECLARATIONS
+# ============================================================================
+
+def non_integer(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """True where any of the (already numeric) columns holds a fractional value."""
+    values = df[columns]
+    return (values.notnull() & (values % 1 != 0)).any(axis=1)
+
+
+PEDIDO_RULES = [
+    {
+        "name": "null_required",
+        "message": "null required fields",
+        "check": lambda df: df[PEDIDO_REQUIRED].isnull().any(axis=1),
+    },
+    {
+        "name": "non_integer",
+        "message": "fractional Id_Unidade",
+        "check": lambda df: non_integer(df, PEDIDO_INTEGER),
+    },
+    {
+        "name": "invalid_status",
+        "message": "invalid Status",
+        "check": lambda df: ~df["Status"].isin(VALID_STATUSES),
+    },
+    {
+        "name": "invalid_order_type",
+        "message": "invalid Tipo_Pedido",
+        "check": lambda df: ~df["Tipo_Pedido"].isin(VALID_ORDER_TYPES),
+    },
+    {
+        "name": "negative_value",
+        "message": "negative Vlr_Pedido/Taxa_Entrega",
+        "check": lambda df: (df["Vlr_Pedido"] < 0) | (df["Taxa_Entrega"] < 0),
+    },
+]
+
+ITEM_PEDIDO_RULES = [
+    {
+        "name": "null_required",
+        "message": "null required fields",
+        "check": lambda df: df[ITEM_PEDIDO_REQUIRED].isnull().any(axis=1),
+    },
+    {
+        "name": "non_integer",
+        "message": "fractional Id_Produto/Qtd",
+        "check": lambda df: non_integer(df, ITEM_PEDIDO_INTEGER),
+    },
+    {
+        "name": "non_positive_quantity",
+        "message": "Qtd <= 0",
+        "check": lambda df: df["Qtd"] <= 0,
+    },
+    {
+        "name": "negative_value",
+        "message": "negative Vlr_Item",
+        "check": lambda df: df["Vlr_Item"] < 0,
+    },
+]
+
+
+def order_total_rule(item_totals: pd.Series) -> dict:
+    """
+    Build the cross-file rule: Vlr_Pedido must equal sum(Qtd * Vlr_Item) + Taxa_Entrega.
+
+    Args:
+        item_totals: Series indexed by Id_Pedido with the summed item value per order
+                     (see compute_item_totals). Orders absent from the index are
+                     treated as having no items.
+    """
+    def check(df: pd.DataFrame) -> pd.Series:
+        expected = df["Id_Pedido"].map(item_totals).fillna(0.0) + df["Taxa_Entrega"]
+        return (df["Vlr_Pedido"] - expected).abs() > ORDER_TOTAL_TOLERANCE
+
+    return {
+        "name": ORDER_TOTAL_RULE,
+        "message": "Vlr_Pedido != sum(items) + Taxa_Entrega",
+        "check": check,
+    }
+
+
+def compute_item_totals(df_items: pd.DataFrame) -> pd.Series:
+    """Sum Qtd * Vlr_Item per Id_Pedido (hash aggregation) over already-validated items."""
+    return (df_items["Qtd"] * df_items["Vlr_Item"]).groupby(df_items["Id_Pedido"]).sum()
+
+
+# ============================================================================
+# RULE ENGINE
+# ============================================================================
+
+def coerce_columns(df: pd.DataFrame, casts: dict) -> pd.Series:
+    """
+    Cast columns in place and return a mask of values that failed to parse.
+
+    A value counts as malformed when it was present in the source but became
+    null after coercion (e.g. "abc" in a numeric column or "2026-13-45" as a date).
+    """
+    malformed = np.zeros(len(df), dtype=bool)
+    for column, kind in casts.items():
+        raw = df[column]
+        if kind == "date":
+            coerced = pd.to_datetime(raw, format="%Y-%m-%d", errors="coerce").dt.date
+        else:
+            coerced = pd.to_numeric(raw, errors="coerce")
+        malformed |= (coerced.isnull() & raw.notnull()).to_numpy()
+        df[column] = coerced
+    return pd.Series(malformed, index=df.index)
+
+
+def evaluate_rules(
+    df: pd.DataFrame,
+    rules: list[dict],
+    casts: dict | None = None,
+    dedup_key: str | None = None,
+) -> tuple[pd.Series, pd.Series, dict]:
+    """
+    Evaluate all rules against df in a single pass.
+
+    Returns:
+        (valid_mask, failed_rule, counts) where valid_mask is a boolean Series,
+        failed_rule holds the name of the first rule each row failed ("" when
+        valid) and counts maps every rule name to its number of rejections.
+    """
+    names = []
+    masks = []
+
+    if casts:
+        names.append(MALFORMED_RULE)
+        masks.append(coerce_columns(df, casts).to_numpy())
+
+    for rule in rules:
+        names.append(rule["name"])
+        masks.append(rule["check"](df).fillna(False).to_numpy(dtype=bool))
+
+    if masks:
+        rejected = np.logical_or.reduce(masks)
+    else:
+        rejected = np.zeros(len(df), dtype=bool)
+
+    # Deduplicate among surviving rows only, so an invalid first occurrence
+    # never shadows a valid later one
+    if dedup_key is not None:
+        keys = df[dedup_key].where(~rejected)
+        duplicated = keys.duplicated(keep="first").to_numpy() & ~rejected
+        names.append(DUPLICATE_RULE)
+        masks.append(duplicated)
+        rejected = rejected | duplicated
+
+    if masks:
+        failed = np.select(masks, names, default="")
+    else:
+        failed = np.full(len(df), "", dtype=object)
+
+    counts = {}
+    for name in names:
+        counts[name] = int((failed == name).sum())
+
+    return (
+        pd.Series(~rejected, index=df.index),
+        pd.Series(failed, index=df.index, dtype=object),
+        counts,
+    )
+
+
+def format_rejections(counts: dict, rules: list[dict], entity: str) -> list[str]:
+    """Render per-rule rejection counts as warning messages."""
+    messages = {rule["name"]: rule["message"] for rule in rules}
+    messages[MALFORMED_RULE] = "malformed values"
+
+    errors = []
+    for name, count in counts.items():
+        if count == 0:
+            continue
+        if name == DUPLICATE_RULE:
+            errors.append(f"Removed {count} duplicate {entity}")
+        else:
+            errors.append(f"Dropped {count} rows with {messages.get(name, name)} [{name}]")
+    return errors
+
+
+def has_missing_columns(errors: list[str]) -> bool:
+    """True when a validator rejected the file structurally (missing columns)."""
+    return any(MISSING_COLUMNS_ERROR in e for e in errors)
+
+
+def collect_rejected(
+    df: pd.DataFrame,
+    valid_mask: pd.Series,
+    failed_rule: pd.Series,
+    raw_columns: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Gather rejected rows in bulk with the rule that failed and their CSV line number.
+
+    Only the rejected rows are copied. Columns that were type-cast are restored
+    from raw_columns (the pre-cast Series) so quarantined rows keep the exact
+    source values. Rows that already carry _line_number (replayed rows) keep it;
+    otherwise it is derived from the read_csv RangeIndex (header = line 1).
+    """
+    positions = np.flatnonzero(~valid_mask.to_numpy())
+    rejected_index = df.index[positions]
+    rejected = df.take(positions)
+
+    for column, raw in (raw_columns or {}).items():
+        rejected[column] = raw.loc[rejected_index]
+
+    rejected["_rule"] = failed_rule.loc[rejected_index]
+    if "_line_number" not in rejected.columns:
+        rejected["_line_number"] = rejected_index.to_numpy() + 2
+    return rejected
+
+
+# ============================================================================
+# FILE-LEVEL VALIDATORS
+# ============================================================================
+
+def validate_pedido(
+    df: pd.DataFrame,
+    item_totals: pd.Series | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """
+    Validate pedido.csv data. Returns (valid_df, rejected_df, errors).
+
+    When item_totals is given (paired ingestion), also checks that Vlr_Pedido
+    matches the item totals plus Taxa_Entrega. rejected_df holds the rejected
+    rows with _rule and _line_number (see collect_rejected); it is empty when
+    the whole file is structurally invalid (missing columns).
+    """
+    missing = set(PEDIDO_COLUMNS) - set(df.columns)
+    if missing:
+        return pd.DataFrame(), pd.DataFrame(), [f"{MISSING_COLUMNS_ERROR}: {missing}"]
+
+    rules = list(PEDIDO_RULES)
+    if item_totals is not None:
+        rules.append(order_total_rule(item_totals))
+
+    raw_columns = {column: df[column] for column in PEDIDO_CASTS}
+    valid_mask, failed, counts = evaluate_rules(df, rules, PEDIDO_CASTS, dedup_key="Id_Pedido")
+    return (
+        df.loc[valid_mask],
+        collect_rejected(df, valid_mask, failed, raw_columns),
+        format_rejections(counts, rules, "orders"),
+    )
+
+
+def validate_item_pedido(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """Validate item_pedido.csv data. Returns (valid_df, rejected_df, errors)."""
+    missing = set(ITEM_PEDIDO_COLUMNS) - set(df.columns)
+    if missing:
+        return pd.DataFrame(), pd.DataFrame(), [f"{MISSING_COLUMNS_ERROR}: {missing}"]
+
+    raw_columns = {column: df[column] for column in ITEM_PEDIDO_CASTS}
+    valid_mask, failed, counts = evaluate_rules(
+        df, ITEM_PEDIDO_RULES, ITEM_PEDIDO_CASTS, dedup_key="Id_Item_Pedido"
+    )
+    return (
+        df.loc[valid_mask],
+        collect_rejected(df, valid_mask, failed, raw_columns),
+        format_rejections(counts, ITEM_PEDIDO_RULES, "items"),
+    )
+
+
+def reconcile_pair(
+    df_orders: pd.DataFrame,
+    df_items: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, list[str]]:
+    """
+    Validate pedido.csv and item_pedido.csv of the same unit-day together.
+
+    Items are validated first and summed per order (hash aggregation), orders are
+    then checked against those totals, and finally items whose order was not
+    accepted are rejected as orphans (hash semi-join on Id_Pedido).
+
+    Returns:
+        (valid_orders, valid_items, rejected_orders, rejected_items, errors)
+    """
+    empty = pd.DataFrame()
+
+    valid_items, rejected_items, errors = validate_item_pedido(df_items)
+    if has_missing_columns(errors):
+        return empty, empty, empty, empty, [f"item_pedido.csv: {errors[0]}"]
+
+    valid_orders, rejected_orders, order_errors = validate_pedido(
+        df_orders, compute_item_totals(valid_items)
+    )
+    if has_missing_columns(order_errors):
+        return empty, empty, empty, empty, [f"pedido.csv: {order_errors[0]}"]
+    errors.extend(order_errors)
+
+    orphan = ~valid_items["Id_Pedido"].isin(valid_orders["Id_Pedido"])
+    orphan_count = int(orphan.sum())
+    if orphan_count:
+        errors.append(f"Dropped {orphan_count} rows with no valid parent order [{ORPHAN_RULE}]")
+        orphans = valid_items.take(np.flatnonzero(orphan.to_numpy()))
+        orphans["_rule"] = ORPHAN_RULE
+        if "_line_number" not in orphans.columns:
+            orphans["_line_number"] = orphans.index.to_numpy() + 2
+        rejected_items = pd.concat([rejected_items, orphans]).sort_values("_line_number")
+        valid_items = valid_items.loc[~orphan]
+
+    return valid_orders, valid_items, rejected_orders, rejected_items, errors
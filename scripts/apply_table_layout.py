@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Apply Table Layout
+=================================
+
+Brings existing BigQuery tables in line with config/table_layout.yaml
+(partitioning, clustering, partition expiration):
+
+  - clustering and partition expiration are updated in place
+  - tables whose partitioning differs are migrated by copy-and-swap:
+    copy to <table>__layout_migration, DROP the table, recreate it with the
+    new layout from the copy, drop the copy (BigQuery refuses CREATE OR
+    REPLACE with a different partitioning spec); optionally after a
+    zero-copy snapshot. If the script stops half way the data is still in
+    the __layout_migration copy
+  - tables that do not exist yet are skipped (the sql/ DDL creates them
+    with the same layout)
+
+With --compare, the standard dashboard queries from the spec are dry-run
+before and after, and the bytes each would scan are reported side by side.
+Dry-run estimates include partition pruning but not clustering pruning, so
+the real reduction for unit/product filters is larger than reported.
+
+Usage:
+    python scripts/apply_table_layout.py --dry-run
+    python scripts/apply_table_layout.py --compare --snapshot
+    python scripts/apply_table_layout.py --layer silver --layer gold
+    python scripts/apply_table_layout.py --compare-only
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import sys
+import yaml
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from google.cloud import bigquery
+from google.api_core import exceptions
+
+
+LAYOUT_PATH = Path("config/table_layout.yaml")
+LAYERS = ["bronze", "silver", "gold"]
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def load_layout(path: Path = LAYOUT_PATH) -> dict:
+    """Load the table layout spec."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+# ============================================================================
+# LAYOUT COMPARISON
+# ============================================================================
+
+def desired_layout(spec: dict) -> dict:
+    """Normalize one table entry of the spec."""
+    partition = spec.get("partition") or {}
+    return {
+        "partition_field": partition.get("field"),
+        "partition_type": partition.get("type", "DAY") if partition else None,
+        "expiration_days": partition.get("expiration_days"),
+        "cluster": list(spec.get("cluster") or []),
+    }
+
+
+def current_layout(table: bigquery.Table) -> dict:
+    """Describe the layout of an existing table in the same shape."""
+    partitioning = table.time_partitioning
+    expiration_ms = partitioning.expiration_ms if partitioning else None
+    return {
+        "partition_field": partitioning.field if partitioning else None,
+        "partition_type": partitioning.type_ if partitioning else None,
+        "expiration_days": expiration_ms // MS_PER_DAY if expiration_ms else None,
+        "cluster": list(table.clustering_fields or []),
+    }
+
+
+def plan_change(current: dict, desired: dict) -> str:
+    """Return "ok", "update" (in place) or "migrate" (rewrite required)."""
+    if (current["partition_field"], current["partition_type"]) != (
+        desired["partition_field"], desired["partition_type"]
+    ):
+        return "migrate"
+    if current["cluster"] != desired["cluster"] or current["expiration_days"] != desired["expiration_days"]:
+        return "update"
+    return "ok"
+
+
+def partition_clause(desired: dict) -> str:
+    """PARTITION BY expression for a layout (empty when unpartitioned)."""
+    field = desired["partition_field"]
+    if field is None:
+        return ""
+    if desired["partition_type"] == "DAY":
+        return f"PARTITION BY {field}"
+    return f"PARTITION BY DATE_TRUNC({field}, {desired['partition_type']})"
+
+
+def migration_ddl(table_id: str, desired: dict, description: str | None = None) -> str:
+    """Multi-statement script recreating table_id with the desired layout (copy, drop, recreate)."""
+    staging_id = f"{table_id}__layout_migration"
+    lines = [
+        f"CREATE OR REPLACE TABLE `{staging_id}` AS SELECT * FROM `{table_id}`;",
+        f"DROP TABLE `{table_id}`;",
+        f"CREATE TABLE `{table_id}`",
+    ]
+    if desired["partition_field"]:
+        lines.append(partition_clause(desired))
+    if desired["cluster"]:
+        lines.append(f"CLUSTER BY {', '.join(desired['cluster'])}")
+
+    options = []
+    if desired["expiration_days"]:
+        options.append(f"partition_expiration_days={desired['expiration_days']}")
+    if description:
+        options.append('description="{}"'.format(description.replace('"', '\\"')))
+    if options:
+        lines.append(f"OPTIONS({', '.join(options)})")
+
+    lines.append(f"AS SELECT * FROM `{staging_id}`;")
+    lines.append(f"DROP TABLE `{staging_id}`;")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# APPLY
+# ============================================================================
+
+def update_in_place(client, table: bigquery.Table, desired: dict) -> None:
+    """Update clustering and partition expiration without rewriting data."""
+    table.clustering_fields = desired["cluster"] or None
+    fields = ["clustering_fields"]
+    if table.time_partitioning is not None:
+        table.time_partitioning.expiration_ms = (
+            desired["expiration_days"] * MS_PER_DAY if desired["expiration_days"] else None
+        )
+        fields.append("time_partitioning")
+    client.update_table(table, fields)
+
+
+def snapshot_table(client, table_id: str) -> str:
+    """Zero-copy snapshot of table_id kept for 7 days."""
+    snapshot_id = f"{table_id}__pre_layout_{datetime.now().strftime('%Y%m%d%H%M')}"
+    expires = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    client.query(
+        f"CREATE SNAPSHOT TABLE `{snapshot_id}` CLONE `{table_id}` "
+        f"OPTIONS(expiration_timestamp=TIMESTAMP '{expires}')"
+    ).result()
+    return snapshot_id
+
+
+def apply_layout(client, project_id: str, layout: dict, layers: list[str],
+                 dry_run: bool, snapshot: bool) -> dict:
+    """Check every table of the selected layers and apply its layout."""
+    summary = {"ok": 0, "update": 0, "migrate": 0, "missing": 0, "failed": 0}
+
+    for layer in layers:
+        dataset = layout[layer]["dataset"]
+        print(f"\n[{layer.upper()}] {dataset}")
+
+        for table_name, spec in layout[layer]["tables"].items():
+            table_id = f"{project_id}.{dataset}.{table_name}"
+            desired = desired_layout(spec)
+            try:
+                table = client.get_table(table_id)
+            except exceptions.NotFound:
+                print(f"  [SKIP] {table_name:28} not created yet")
+                summary["missing"] += 1
+                continue
+
+            action = plan_change(current_layout(table), desired)
+            summary[action] += 1
+            if action == "ok":
+                print(f"  [OK]   {table_name:28} layout up to date")
+                continue
+
+            print(f"  [{action.upper()}] {table_name:26} -> "
+                  f"{partition_clause(desired) or 'no partitioning'}; "
+                  f"cluster {desired['cluster'] or '-'}; "
+                  f"expiration {desired['expiration_days'] or '-'} days")
+            if dry_run:
+                if action == "migrate":
+                    print("    " + migration_ddl(table_id, desired, table.description).replace("\n", "\n    "))
+                continue
+
+            try:
+                if action == "update":
+                    update_in_place(client, table, desired)
+                else:
+                    if snapshot:
+                        print(f"    Snapshot: {snapshot_table(client, table_id)}")
+                    client.query(migration_ddl(table_id, desired, table.description)).result()
+                print(f"    [OK] Applied")
+            except Exception as e:
+                print(f"    [ERROR] {e}")
+                summary["failed"] += 1
+
+    return summary
+
+
+# ============================================================================
+# BYTES-SCANNED COMPARISON
+# ============================================================================
+
+def estimate_dashboard_bytes(client, project_id: str, layout: dict) -> dict:
+    """Dry-run every standard dashboard query; returns name -> bytes (None on error)."""
+    job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+    estimates = {}
+    for query in layout.get("dashboard_queries", []):
+        try:
+            job = client.query(query["sql"].format(project=project_id), job_config=job_config)
+            estimates[query["name"]] = job.total_bytes_processed
+        except Exception as e:
+            print(f"  [WARN] {query['name']}: {e}")
+            estimates[query["name"]] = None
+    return estimates
+
+
+def print_comparison(before: dict, after: dict) -> None:
+    """Print bytes scanned per dashboard query before and after."""
+    print("\n" + "="*60)
+    print("Dashboard Query Bytes Scanned (dry run)")
+    print("="*60)
+    print(f"  {'Query':<34} {'Before':>12} {'After':>12} {'Change':>8}")
+    for name in before:
+        b, a = before[name], after.get(name)
+        if b is None or a is None:
+            print(f"  {name:<34} {'n/a':>12} {'n/a':>12}")
+            continue
+        change = f"{100.0 * (a - b) / b:+.0f}%" if b else "-"
+        print(f"  {name:<34} {b:>12,} {a:>12,} {change:>8}")
+    print("="*60)
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        layout = load_layout()
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Apply config/table_layout.yaml to existing BigQuery tables"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--layer",
+        action="append",
+        choices=LAYERS,
+        help="Layer to apply (repeatable; default: all)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show planned changes and migration DDL without applying"
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Snapshot each table before migrating it (kept 7 days)"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Report dashboard query bytes scanned before and after"
+    )
+    parser.add_argument(
+        "--compare-only",
+        action="store_true",
+        help="Only report current dashboard query bytes scanned"
+    )
+
+    args = parser.parse_args()
+    layers = args.layer or LAYERS
+
+    print("="*60)
+    print("Case Fictício - Teste -- Apply Table Layout")
+    print("="*60)
+    print(f"Project: {args.project}")
+    print(f"Layers:  {', '.join(layers)}")
+    print(f"Mode:    {'DRY RUN' if args.dry_run else 'APPLY'}")
+
+    client = bigquery.Client(project=args.project)
+
+    before = estimate_dashboard_bytes(client, args.project, layout) if (args.compare or args.compare_only) else None
+    if args.compare_only:
+        print_comparison(before, before)
+        return 0
+
+    summary = apply_layout(client, args.project, layout, layers, args.dry_run, args.snapshot)
+
+    if before is not None and not args.dry_run:
+        print_comparison(before, estimate_dashboard_bytes(client, args.project, layout))
+
+    print("\n" + "="*60)
+    print("LAYOUT SUMMARY")
+    print("="*60)
+    for key in ["ok", "update", "migrate", "missing", "failed"]:
+        print(f"  {key.capitalize():<10} {summary[key]}")
+    print("="*60)
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
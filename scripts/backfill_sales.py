@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Bulk Backfill of Sales CSVs into Bronze
+======================================================
+
+Reprocesses a date range of unit-day files without re-uploading objects to
+retrigger the Cloud Function one file at a time:
+
+  1. Enumerates raw/csv_sales/YYYY/MM/DD/ (or quarantine/YYYY/MM/DD/) for
+     every day in the range -- or, with --source local, the csv_sales/ tree
+     that generate_fake_sales.py wrote under --local-dir, so synthetic
+     history goes straight into Bronze without uploading 36,500 objects
+  2. Validates each unit-day pair in a process pool with the SAME logic as
+     the csv_processor Cloud Function (paired reconciliation, row-level
+     quarantine of rejected rows)
+  3. Loads valid rows through a few large load jobs -- one per Bronze table
+     per calendar month (or per --batch-days days) instead of one per file
+  4. Records completed days in a checkpoint file after every batch, so an
+     interrupted run resumes where it stopped. Unit-days that failed with a
+     transient error (GCS read) are recorded too and retried first on
+     resume; the rest of their day is not reloaded. Files that fail the same
+     way every time (missing columns, undecodable or unparsable CSV) go to
+     whole-file quarantine like the Cloud Function, not to the retry list
+
+Rows are appended; re-loading files that are already in Bronze is safe because
+Silver keeps the latest _ingest_timestamp per id. Local files get the
+_source_file of the raw/csv_sales/ object they would have been uploaded as,
+so Bronze is indistinguishable from the Cloud Function path; their rejected
+rows are quarantined under --local-dir/quarantine/.
+
+Usage:
+    python scripts/backfill_sales.py --start-date 2025-01-01 --end-date 2025-12-31
+    python scripts/backfill_sales.py --start-date 2026-01-01 --end-date 2026-01-31 --source quarantine
+    python scripts/backfill_sales.py --start-date 2025-01-01 --end-date 2025-12-31 --workers 16 --batch-days 7
+    python scripts/backfill_sales.py --start-date 2025-01-01 --end-date 2025-12-31 --source local --local-dir output
+
+Requirements:
+    pip install google-cloud-storage google-cloud-bigquery pandas pyarrow pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+from google.cloud import storage, bigquery
+
+# Shared ingestion modules live with the Cloud Function source
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cloud_functions" / "csv_processor"))
+
+from bronze import to_bronze_arrow, load_bronze_arrow
+from quarantine import QUARANTINE_PREFIX, RAW_SALES_PREFIX, quarantine_rows_path, build_quarantine_frame, to_parquet_bytes
+from validation import reconcile_pair, validate_pedido, validate_item_pedido, has_missing_columns
+from stream_upload import FilesystemBucket
+
+
+# --source -> prefix holding YYYY/MM/DD/unit_NNN/*.csv (local: under --local-dir)
+LOCAL_SALES_PREFIX = "csv_sales"
+SOURCE_PREFIXES = {
+    "raw": RAW_SALES_PREFIX.rstrip("/"),
+    "quarantine": QUARANTINE_PREFIX,
+    "local": LOCAL_SALES_PREFIX,
+}
+
+PAIR_FILES = {"pedido.csv": "orders", "item_pedido.csv": "order_items"}
+
+# Read errors that recur on every retry of the same file
+DETERMINISTIC_ERRORS = (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError)
+
+# Per-process GCS bucket handle (set by init_worker)
+_worker_bucket = None
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+# ============================================================================
+# ENUMERATION AND CHECKPOINTS
+# ============================================================================
+
+def day_prefixes(start_date: datetime, end_date: datetime, source: str) -> list[tuple[str, str]]:
+    """Return (day, prefix) for every day in [start_date, end_date]."""
+    base = SOURCE_PREFIXES[source]
+    days = []
+    current = start_date
+    while current <= end_date:
+        days.append((current.strftime("%Y-%m-%d"), f"{base}/{current.strftime('%Y/%m/%d')}/"))
+        current += timedelta(days=1)
+    return days
+
+
+def group_unit_dirs(blob_names: list[str]) -> dict[str, set[str]]:
+    """Group object names into unit directories -> present pedido/item_pedido files."""
+    units = {}
+    for name in blob_names:
+        unit_dir, _, base_name = name.rpartition("/")
+        if base_name in PAIR_FILES:
+            units.setdefault(unit_dir, set()).add(base_name)
+    return units
+
+
+def to_raw_path(path: str) -> str:
+    """Map a quarantine/ copy or a local generator file to its raw/csv_sales/ object."""
+    if path.startswith(f"{QUARANTINE_PREFIX}/"):
+        return RAW_SALES_PREFIX + path[len(QUARANTINE_PREFIX) + 1:]
+    if path.startswith(f"{LOCAL_SALES_PREFIX}/"):
+        return RAW_SALES_PREFIX + path[len(LOCAL_SALES_PREFIX) + 1:]
+    return path
+
+
+def batch_days(days: list[tuple[str, str]], size: int | None) -> list[list[tuple[str, str]]]:
+    """Split the day list into consecutive batches of at most size days (None: calendar months)."""
+    if size is None:
+        months = {}
+        for day in days:
+            months.setdefault(day[0][:7], []).append(day)
+        return list(months.values())
+    return [days[i:i + size] for i in range(0, len(days), size)]
+
+
+def read_checkpoint(path: Path) -> dict:
+    """Read the checkpoint file (empty state when missing)."""
+    if not path.exists():
+        return {"completed_days": [], "failed_unit_dirs": [], "quarantined_unit_dirs": [],
+                "rows_loaded": {"orders": 0, "order_items": 0}}
+    with open(path, 'r') as f:
+        state = json.load(f)
+    state.setdefault("failed_unit_dirs", [])
+    state.setdefault("quarantined_unit_dirs", [])
+    return state
+
+
+def write_checkpoint(path: Path, state: dict) -> None:
+    """Atomically replace the checkpoint file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# WORKER (runs in the process pool)
+# ============================================================================
+
+def open_source_bucket(project_id: str, bucket_name: str, local_dir: str | None = None):
+    """GCS bucket, or the generator output directory read through the same blob API."""
+    if local_dir is not None:
+        return FilesystemBucket(local_dir)
+    return storage.Client(project=project_id).bucket(bucket_name)
+
+
+def init_worker(project_id: str, bucket_name: str, local_dir: str | None = None) -> None:
+    """Create one GCS client (or local bucket) per worker process."""
+    global _worker_bucket
+    _worker_bucket = open_source_bucket(project_id, bucket_name, local_dir)
+
+
+def read_csv(blob_name: str) -> pd.DataFrame:
+    """Read a unit-day CSV from GCS with every column as string."""
+    content = _worker_bucket.blob(blob_name).download_as_text(encoding="utf-8")
+    return pd.read_csv(io.StringIO(content), sep=";", dtype=str)
+
+
+def write_quarantine(source_file: str, rejected: pd.DataFrame) -> None:
+    """Row-level quarantine, identical to the Cloud Function."""
+    if len(rejected) == 0:
+        return
+    frame = build_quarantine_frame(rejected, source_file)
+    _worker_bucket.blob(quarantine_rows_path(source_file)).upload_from_string(
+        to_parquet_bytes(frame), content_type="application/vnd.apache.parquet"
+    )
+
+
+def write_file_quarantine(unit_dir: str, files: set[str], error_msg: str) -> None:
+    """Whole-file quarantine, identical to the Cloud Function (copy + _error.json)."""
+    for base_name in sorted(files):
+        source_file = f"{to_raw_path(unit_dir)}/{base_name}"
+        quarantine_path = source_file.replace(RAW_SALES_PREFIX, f"{QUARANTINE_PREFIX}/")
+        source_blob = f"{unit_dir}/{base_name}"
+        # A --source quarantine run reads the quarantined copy itself
+        if source_blob != quarantine_path:
+            _worker_bucket.blob(quarantine_path).upload_from_string(
+                _worker_bucket.blob(source_blob).download_as_bytes(), content_type="text/csv"
+            )
+        error_report = {
+            "source_file": source_file,
+            "error": error_msg,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        _worker_bucket.blob(quarantine_path.replace(".csv", "_error.json")).upload_from_string(
+            json.dumps(error_report, indent=2), content_type="application/json"
+        )
+
+
+def process_unit_dir(unit_dir: str, files: set[str], dry_run: bool) -> dict:
+    """
+    Validate one unit-day directory.
+
+    Returns a dict with the valid frames (tagged with _source_file), rejected
+    row counts and warnings. Pairs are reconciled; a lone file falls back to
+    single-file validation. Missing columns and undecodable/unparsable files
+    set "quarantined" and send the unit-day's files to whole-file quarantine;
+    any other exception is reported as "Processing failed" for a retry.
+    """
+    result = {"unit_dir": unit_dir, "orders": None, "order_items": None, "rejected": 0,
+              "errors": [], "quarantined": None}
+    raw_dir = to_raw_path(unit_dir)
+    orders_file = f"{raw_dir}/pedido.csv"
+    items_file = f"{raw_dir}/item_pedido.csv"
+
+    try:
+        if files == set(PAIR_FILES):
+            df_orders = read_csv(f"{unit_dir}/pedido.csv")
+            df_items = read_csv(f"{unit_dir}/item_pedido.csv")
+            valid_orders, valid_items, rejected_orders, rejected_items, errors = reconcile_pair(
+                df_orders, df_items
+            )
+            outputs = [
+                ("orders", orders_file, valid_orders, rejected_orders),
+                ("order_items", items_file, valid_items, rejected_items),
+            ]
+        elif "pedido.csv" in files:
+            valid, rejected, errors = validate_pedido(read_csv(f"{unit_dir}/pedido.csv"))
+            outputs = [("orders", orders_file, valid, rejected)]
+        else:
+            valid, rejected, errors = validate_item_pedido(read_csv(f"{unit_dir}/item_pedido.csv"))
+            outputs = [("order_items", items_file, valid, rejected)]
+
+        result["errors"] = errors
+        if has_missing_columns(errors):
+            result["quarantined"] = errors[0]
+            if not dry_run:
+                write_file_quarantine(unit_dir, files, errors[0])
+            return result
+
+        for table_name, source_file, valid, rejected in outputs:
+            if len(valid) > 0:
+                valid = valid.assign(_source_file=source_file)
+                result[table_name] = valid
+            result["rejected"] += len(rejected)
+            if not dry_run:
+                write_quarantine(source_file, rejected)
+
+    except DETERMINISTIC_ERRORS as e:
+        result["quarantined"] = f"Processing failed: {e}"
+        result["errors"].append(result["quarantined"])
+        if not dry_run:
+            write_file_quarantine(unit_dir, files, result["quarantined"])
+
+    except Exception as e:
+        result["errors"].append(f"Processing failed: {e}")
+
+    return result
+
+
+# ============================================================================
+# BACKFILL DRIVER
+# ============================================================================
+
+def list_unit_dirs(bucket, prefix: str) -> dict[str, set[str]]:
+    """List one day prefix and group its objects by unit directory."""
+    return group_unit_dirs([blob.name for blob in bucket.list_blobs(prefix=prefix)])
+
+
+def run_batch(pool, bucket, batch, dry_run: bool) -> tuple[dict, dict]:
+    """Validate every unit-day of a batch in the pool; return frames per table and stats."""
+    unit_dirs = {}
+    for _, prefix in batch:
+        unit_dirs.update(list_unit_dirs(bucket, prefix))
+    return run_unit_dirs(pool, unit_dirs, dry_run)
+
+
+def run_unit_dirs(pool, unit_dirs: dict[str, set[str]], dry_run: bool) -> tuple[dict, dict]:
+    """Validate the given unit-days in the pool; return frames per table and stats."""
+    tasks = [pool.submit(process_unit_dir, unit_dir, files, dry_run) for unit_dir, files in unit_dirs.items()]
+
+    frames = {"orders": [], "order_items": []}
+    stats = {"unit_days": len(tasks), "rejected": 0, "failed": [], "quarantined": []}
+    for future in as_completed(tasks):
+        result = future.result()
+        stats["rejected"] += result["rejected"]
+        if result["quarantined"] is not None:
+            stats["quarantined"].append((result["unit_dir"], result["quarantined"]))
+        elif any(e.startswith("Processing failed") for e in result["errors"]):
+            stats["failed"].append((result["unit_dir"], result["errors"][-1]))
+        for table_name in frames:
+            if result[table_name] is not None:
+                frames[table_name].append(result[table_name])
+
+    return frames, stats
+
+
+def load_batch(bq_client, dataset: str, frames: dict) -> dict:
+    """Load a whole batch with one load job per Bronze table."""
+    ingest_timestamp = datetime.utcnow()
+    loaded = {}
+    for table_name, parts in frames.items():
+        if not parts:
+            loaded[table_name] = 0
+            continue
+        table = to_bronze_arrow(pd.concat(parts, ignore_index=True), table_name,
+                                ingest_timestamp=ingest_timestamp)
+        table_id = f"{bq_client.project}.{dataset}.{table_name}"
+        loaded[table_name] = load_bronze_arrow(bq_client, table, table_id)
+    return loaded
+
+
+def record_batch(state: dict, days: list[str], loaded: dict, stats: dict) -> None:
+    """Checkpoint a loaded batch: its days are done, its failed unit-days are kept for retry."""
+    state["completed_days"].extend(days)
+    state["failed_unit_dirs"].extend(unit_dir for unit_dir, _ in stats["failed"])
+    state["quarantined_unit_dirs"].extend(unit_dir for unit_dir, _ in stats["quarantined"])
+    for table_name, rows in loaded.items():
+        state["rows_loaded"][table_name] += rows
+
+
+def retry_failed(pool, bucket, state: dict, load, dry_run: bool) -> list[tuple[str, str]]:
+    """Re-run the unit-days that failed in an earlier run; returns the ones that fail again."""
+    unit_dirs = {}
+    for unit_dir in state["failed_unit_dirs"]:
+        unit_dirs.update(list_unit_dirs(bucket, f"{unit_dir}/"))
+    frames, stats = run_unit_dirs(pool, unit_dirs, dry_run)
+    if dry_run:
+        return stats["failed"]
+
+    loaded = load(frames)
+    state["failed_unit_dirs"] = [unit_dir for unit_dir, _ in stats["failed"]]
+    state["quarantined_unit_dirs"].extend(unit_dir for unit_dir, _ in stats["quarantined"])
+    for table_name, rows in loaded.items():
+        state["rows_loaded"][table_name] += rows
+    print(f"  [OK] Retried {stats['unit_days']} failed unit-days: {loaded['orders']} orders, "
+          f"{loaded['order_items']} items, {len(stats['failed'])} still failing")
+    return stats["failed"]
+
+
+def run_backfill(pool, bucket, days: list[tuple[str, str]], state: dict, checkpoint_path: Path,
+                 load, batch_size: int | None = None, dry_run: bool = False) -> list[tuple[str, str]]:
+    """
+    Retry earlier failures, then validate and load the remaining days batch by batch.
+
+    load(frames) loads one batch and returns rows per table. The checkpoint is
+    rewritten after every load. Returns every (unit_dir, error) that failed.
+    """
+    failures = []
+    if state["failed_unit_dirs"]:
+        print(f"\n[RESUME] Retrying {len(state['failed_unit_dirs'])} failed unit-days")
+        failures.extend(retry_failed(pool, bucket, state, load, dry_run))
+        if not dry_run:
+            write_checkpoint(checkpoint_path, state)
+
+    for batch in batch_days(days, batch_size):
+        batch_start = time.perf_counter()
+        frames, stats = run_batch(pool, bucket, batch, dry_run)
+        failures.extend(stats["failed"])
+
+        if dry_run:
+            loaded = {t: sum(len(f) for f in parts) for t, parts in frames.items()}
+        else:
+            loaded = load(frames)
+            record_batch(state, [day for day, _ in batch], loaded, stats)
+            write_checkpoint(checkpoint_path, state)
+
+        print(f"  [OK] {batch[0][0]}..{batch[-1][0]}: {stats['unit_days']} unit-days, "
+              f"{loaded['orders']} orders, {loaded['order_items']} items, "
+              f"{stats['rejected']} rejected rows, {len(stats['quarantined'])} quarantined unit-days "
+              f"({time.perf_counter() - batch_start:.1f}s)")
+        for unit_dir, error in stats["quarantined"]:
+            print(f"  [QUARANTINE] {unit_dir}: {error}")
+    return failures
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        default_bucket = config['storage']['bucket']
+        default_dataset = config['bigquery']['datasets']['bronze']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Bulk backfill of sales CSVs into BigQuery Bronze"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--bucket",
+        default=default_bucket,
+        help=f"GCS bucket name (default from config: {default_bucket})"
+    )
+    parser.add_argument(
+        "--dataset",
+        default=default_dataset,
+        help=f"Bronze dataset (default from config: {default_dataset})"
+    )
+    parser.add_argument(
+        "--start-date",
+        required=True,
+        help="First business date to backfill (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--end-date",
+        required=True,
+        help="Last business date to backfill (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--source",
+        choices=sorted(SOURCE_PREFIXES),
+        default="raw",
+        help="Read from raw/csv_sales/, from whole-file quarantine/ copies, or from local "
+             "generator output under --local-dir (default: raw)"
+    )
+    parser.add_argument(
+        "--local-dir",
+        default="output",
+        help="generate_fake_sales.py output directory read by --source local (default: output)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Validation worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch-days",
+        type=int,
+        default=None,
+        help="Days per load batch; one load job per table per batch (default: one batch per calendar month)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file (default: .backfill_<source>_<start>_<end>.json)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate only, do not load or write quarantine"
+    )
+
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+    checkpoint_path = args.checkpoint or Path(
+        f".backfill_{args.source}_{args.start_date}_{args.end_date}.json"
+    )
+
+    print("="*60)
+    print("Case Fictício - Teste -- Bulk Backfill")
+    print("="*60)
+    print(f"Project:    {args.project}")
+    local_dir = args.local_dir if args.source == "local" else None
+    if local_dir is not None:
+        print(f"Source:     {Path(local_dir).resolve()}/{LOCAL_SALES_PREFIX}/")
+    else:
+        print(f"Bucket:     gs://{args.bucket}/{SOURCE_PREFIXES[args.source]}/")
+    print(f"Dataset:    {args.dataset}")
+    print(f"Range:      {args.start_date} to {args.end_date}")
+    print(f"Workers:    {args.workers}")
+    print(f"Checkpoint: {checkpoint_path}")
+
+    state = read_checkpoint(checkpoint_path)
+    completed = set(state["completed_days"])
+    days = [d for d in day_prefixes(start_date, end_date, args.source) if d[0] not in completed]
+    if completed:
+        print(f"\n[RESUME] {len(completed)} days already completed, {len(days)} remaining")
+
+    bucket = open_source_bucket(args.project, args.bucket, local_dir)
+    bq_client = bigquery.Client(project=args.project)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=init_worker,
+        initargs=(args.project, args.bucket, local_dir),
+    ) as pool:
+        failures = run_backfill(
+            pool, bucket, days, state, checkpoint_path,
+            load=lambda frames: load_batch(bq_client, args.dataset, frames),
+            batch_size=args.batch_days, dry_run=args.dry_run,
+        )
+
+    print("\n" + "="*60)
+    print("BACKFILL SUMMARY")
+    print("="*60)
+    print(f"  Days completed:    {len(state['completed_days'])}")
+    print(f"  Orders loaded:     {state['rows_loaded']['orders']:,}")
+    print(f"  Items loaded:      {state['rows_loaded']['order_items']:,}")
+    retry_note = "" if args.dry_run or not failures else " (retried on the next run)"
+    print(f"  Failed unit-days:  {len(failures)}{retry_note}")
+    print(f"  Quarantined:       {len(state['quarantined_unit_dirs'])} unit-days (whole-file quarantine)")
+    print(f"  Elapsed:           {time.perf_counter() - started:.1f}s")
+    print("="*60)
+    for unit_dir, error in failures:
+        print(f"  [ERROR] {unit_dir}: {error}")
+
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Bronze Load Path Benchmark
+=========================================
+
+Compares the per-invocation cost of the two Bronze load paths in
+cloud_functions/csv_processor/bronze.py on a synthetic validated pedido file:
+
+  legacy  prepare_bronze_frame + client.load_table_from_dataframe
+  arrow   to_bronze_arrow + load_bronze_arrow (Parquet via load_table_from_file)
+
+Both paths run the real google-cloud-bigquery client code up to the HTTP
+upload: the client uses anonymous credentials, get_table returns the Bronze
+schema (as it would in production) and load_table_from_file drains the
+payload and returns a finished job. Each path runs in a fresh process so the
+reported peak RSS is not polluted by the other path.
+
+Usage:
+    python scripts/benchmark_bronze_load.py
+    python scripts/benchmark_bronze_load.py --rows 200000 --repeat 5
+
+Requirements:
+    pip install google-cloud-bigquery pandas pyarrow db-dtypes
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Shared ingestion modules live with the Cloud Function source
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cloud_functions" / "csv_processor"))
+
+from bronze import (
+    BRONZE_ARROW_SCHEMAS,
+    prepare_bronze_frame,
+    load_bronze_frame,
+    to_bronze_arrow,
+    load_bronze_arrow,
+)
+from validation import validate_pedido
+
+
+TABLE_ID = "benchmark.case_ficticio_bronze.orders"
+SOURCE_FILE = "raw/csv_sales/2026/01/15/unit_001/pedido.csv"
+
+
+# ============================================================================
+# OFFLINE CLIENT
+# ============================================================================
+
+class _DoneJob:
+    def result(self):
+        return self
+
+
+def offline_client():
+    """A real BigQuery client whose network calls are replaced by stand-ins."""
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import bigquery
+
+    client = bigquery.Client(project="benchmark", credentials=AnonymousCredentials())
+    schema = [
+        bigquery.SchemaField(
+            field.name,
+            {"int64": "INT64", "string": "STRING", "date32[day]": "DATE",
+             "decimal128(10, 2)": "NUMERIC", "timestamp[us, tz=UTC]": "TIMESTAMP"}[str(field.type)],
+            mode="NULLABLE" if field.nullable else "REQUIRED",
+        )
+        for field in BRONZE_ARROW_SCHEMAS["orders"]
+    ]
+    client.get_table = lambda table_id, **kwargs: bigquery.Table(TABLE_ID, schema=schema)
+
+    def load_table_from_file(file_obj, destination, **kwargs):
+        client.uploaded_bytes = len(file_obj.read())
+        return _DoneJob()
+
+    client.load_table_from_file = load_table_from_file
+    return client
+
+
+# ============================================================================
+# SYNTHETIC INPUT
+# ============================================================================
+
+def make_validated_orders(rows: int) -> pd.DataFrame:
+    """A validated pedido frame shaped like the Cloud Function's input."""
+    rng = np.random.default_rng(42)
+    fees = np.where(rng.random(rows) < 0.4, rng.integers(300, 1500, rows), 0)
+    raw = pd.DataFrame({
+        "Id_Unidade": rng.integers(1, 51, rows).astype(str),
+        "Id_Pedido": [f"{i:032x}" for i in range(rows)],
+        "Tipo_Pedido": np.where(fees > 0, "Loja Online", "Loja Fisica"),
+        "Data_Pedido": "2026-01-15",
+        "Vlr_Pedido": [f"{v / 100:.2f}" for v in rng.integers(1000, 30000, rows) + fees],
+        "Endereco_Entrega": np.where(fees > 0, "Rua Exemplo, 123 - Porto Alegre/RS", None),
+        "Taxa_Entrega": [f"{v / 100:.2f}" for v in fees],
+        "Status": "Finalizado",
+    })
+    valid, _, _ = validate_pedido(raw)
+    return valid
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_legacy(client, df: pd.DataFrame) -> int:
+    return load_bronze_frame(client, prepare_bronze_frame(df.copy(), "orders", SOURCE_FILE), TABLE_ID)
+
+
+def run_arrow(client, df: pd.DataFrame) -> int:
+    return load_bronze_arrow(client, to_bronze_arrow(df, "orders", SOURCE_FILE), TABLE_ID)
+
+
+PATHS = {"legacy": run_legacy, "arrow": run_arrow}
+
+
+def measure(path: str, rows: int, repeat: int) -> dict:
+    """Run one load path in this (fresh) process and report its cost."""
+    df = make_validated_orders(rows)
+    client = offline_client()
+    PATHS[path](client, df)  # warm-up (imports, schema lookups)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        PATHS[path](client, df)
+        timings.append(time.perf_counter() - started)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "path": path,
+        "best_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "python_peak_mb": python_peak / 1024 / 1024,
+        "rss_growth_mb": (rss_after - rss_before) / 1024,
+        "payload_mb": client.uploaded_bytes / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the legacy and Arrow-native Bronze load paths"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=50_000,
+        help="Orders in the synthetic file (default: 50000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per path (default: 3)"
+    )
+
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Case Fictício - Teste -- Bronze Load Path Benchmark")
+    print("="*60)
+    print(f"Rows: {args.rows:,}  Repeat: {args.repeat}")
+
+    results = []
+    for path in PATHS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results.append(pool.submit(measure, path, args.rows, args.repeat).result())
+
+    print(f"\n{'Path':<8} {'Best (s)':>9} {'Median (s)':>11} {'Py peak (MB)':>13} "
+          f"{'RSS growth (MB)':>16} {'Payload (MB)':>13}")
+    for r in results:
+        print(f"{r['path']:<8} {r['best_s']:>9.3f} {r['median_s']:>11.3f} {r['python_peak_mb']:>13.1f} "
+              f"{r['rss_growth_mb']:>16.1f} {r['payload_mb']:>13.2f}")
+
+    legacy, arrow = results
+    print(f"\n[OK] Arrow path: {legacy['best_s'] / arrow['best_s']:.1f}x faster, "
+          f"{legacy['python_peak_mb'] / max(arrow['python_peak_mb'], 0.1):.1f}x less Python heap")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
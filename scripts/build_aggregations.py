@@ -6,8 +6,22 @@ Case Fictício - Teste -- Build KPI Aggregation Tables
 Creates pre-aggregated tables for dashboard performance.
 These tables power the Looker Studio dashboards.
 
+Distinct counts:
+    --distinct-mode exact   (default) COUNT(DISTINCT) over fact_order_items
+    --distinct-mode approx  product orders/units from the daily HLL++ sketches
+                            in agg_daily_product_sketches (~0.5% error,
+                            no fact-table rescan)
+    The sketch table is built in both modes so distinct counts can be rolled
+    up ad hoc across products, units and months.
+
+Every table is refreshed incrementally: only the dates, units or products
+touched by facts ingested since the table's latest _ingest_date are
+recomputed. The sales cube (agg_sales_cube) is refreshed last; query it
+through scripts/cube_router.py.
+
 Usage:
     python scripts/build_aggregations.py
+    python scripts/build_aggregations.py --distinct-mode approx
 
 Requirements:
     pip install google-cloud-bigquery pyyaml
@@ -23,6 +37,10 @@ from pathlib import Path
 from google.cloud import bigquery
 from datetime import datetime
 
+from layer_verification import verify_layers
+from cost_guard import CostGuard, MODES
+from query_cache import QueryCache
+
 
 def load_config():
     """Load project configuration from YAML."""
@@ -32,8 +50,8 @@ def load_config():
     return config
 
 
-def execute_sql_file(client, sql_file_path: Path, description: str):
-    """Execute a SQL file in BigQuery."""
+def execute_sql_file(client, sql_file_path: Path, description: str, guard=None):
+    """Execute a SQL file in BigQuery (through the cost guard when one is given)."""
     print(f"\n[EXECUTING] {description}")
     print(f"  File: {sql_file_path.name}")
 
@@ -42,8 +60,11 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
             sql = f.read()
 
         # Execute query
-        query_job = client.query(sql)
-        query_job.result()  # Wait for completion
+        if guard is not None:
+            query_job = guard.run(sql, step=sql_file_path.name)
+        else:
+            query_job = client.query(sql)
+            query_job.result()  # Wait for completion
 
         # Get statistics
         bytes_processed = query_job.total_bytes_processed or 0
@@ -60,8 +81,8 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
         return False
 
 
-def verify_aggregations(client, project_id, dataset_id="case_ficticio_gold"):
-    """Verify aggregation tables and row counts."""
+def verify_aggregations(client, project_id, dataset_id="case_ficticio_gold", cache=None):
+    """Verify aggregation tables from metadata."""
     print("\n" + "="*60)
     print("Aggregation Tables Verification")
     print("="*60)
@@ -69,25 +90,17 @@ def verify_aggregations(client, project_id, dataset_id="case_ficticio_gold"):
     tables = [
         "agg_daily_sales",
         "agg_unit_performance",
-        "agg_product_performance"
+        "agg_product_performance",
+        "agg_daily_product_sketches",
+        "agg_sales_cube",
     ]
 
-    results = {}
-    for table_name in tables:
-        table_id = f"{project_id}.{dataset_id}.{table_name}"
-
-        try:
-            query = f"SELECT COUNT(*) as row_count FROM `{table_id}`"
-            result = client.query(query).result()
-            row_count = list(result)[0].row_count
-            results[table_name] = row_count
-            print(f"  {table_name:30} {row_count:>6} rows")
-        except Exception as e:
-            print(f"  {table_name:30} [ERROR] {e}")
-            results[table_name] = None
+    datasets = {"silver": "case_ficticio_silver", "gold": dataset_id}
+    _, anomalies = verify_layers(client, project_id, datasets, ["gold"], cache,
+                                 layer_tables={"gold": tables})
 
     print("="*60)
-    return results
+    return anomalies
 
 
 def show_sample_data(client, project_id, dataset_id="case_ficticio_gold"):
@@ -147,6 +160,23 @@ def main():
         default=default_dataset,
         help=f"Gold dataset (default from config: {default_dataset})"
     )
+    parser.add_argument(
+        "--distinct-mode",
+        choices=["exact", "approx"],
+        default="exact",
+        help="Exact COUNT(DISTINCT) or HLL++ sketches for product distinct counts (default: exact)"
+    )
+    parser.add_argument(
+        "--cost-mode",
+        choices=MODES,
+        default=None,
+        help="Cost guard: enforce, warn or off (default from config: cost_guard.mode)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local query result cache for verification queries"
+    )
 
     args = parser.parse_args()
 
@@ -155,18 +185,32 @@ def main():
     print("="*60)
     print(f"Project: {args.project}")
     print(f"Dataset: {args.dataset}")
+    print(f"Distinct: {args.distinct_mode}")
     print(f"Time:    {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # Initialize BigQuery client
     client = bigquery.Client(project=args.project)
+    guard = CostGuard.from_config(client, config, mode=args.cost_mode)
 
     # SQL files to execute (in order)
     sql_dir = Path("sql/gold")
     sql_files = [
         (sql_dir / "07_agg_daily_sales.sql", "Daily sales aggregation"),
         (sql_dir / "08_agg_unit_performance.sql", "Unit performance aggregation"),
-        (sql_dir / "09_agg_product_performance.sql", "Product performance aggregation"),
     ]
+    sketches = (sql_dir / "10_agg_daily_product_sketches.sql", "Daily product HLL++ sketches")
+    if args.distinct_mode == "approx":
+        # Product performance is rolled up from the sketches, so build them first
+        sql_files += [
+            sketches,
+            (sql_dir / "09_agg_product_performance_approx.sql", "Product performance aggregation (HLL++)"),
+        ]
+    else:
+        sql_files += [
+            (sql_dir / "09_agg_product_performance.sql", "Product performance aggregation"),
+            sketches,
+        ]
+    sql_files.append((sql_dir / "11_agg_sales_cube.sql", "Sales cube (incremental)"))
 
     # Execute transformations
     print("\n" + "="*60)
@@ -175,12 +219,18 @@ def main():
 
     success_count = 0
     for sql_file, description in sql_files:
-        if execute_sql_file(client, sql_file, description):
+        if execute_sql_file(client, sql_file, description, guard):
             success_count += 1
+    print(f"\n{guard.summary()}")
 
     # Verify results
     if success_count == len(sql_files):
-        verify_aggregations(client, args.project, args.dataset)
+        cache = QueryCache.from_config(client, config, enabled=not args.no_cache)
+        anomalies = verify_aggregations(client, args.project, args.dataset, cache)
+        if anomalies:
+            print(f"\n[ERROR] Aggregation verification found {len(anomalies)} anomaly(ies)")
+            return 1
+        print(f"\n{cache.summary()}")
         show_sample_data(client, args.project, args.dataset)
 
         print("\n[SUCCESS] KPI aggregation tables built successfully!")
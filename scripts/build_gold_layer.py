@@ -6,6 +6,11 @@ Case Fictício - Teste -- Build Gold Layer (Star Schema)
 Executes SQL transformations to build the Gold layer star schema from Silver data.
 Creates dimension tables (date, product, unit, geography) and fact tables (sales, order_items).
 
+dim_product and dim_unit are SCD Type 2: a hash-diff MERGE versions only
+changed rows, and the facts take their keys from the dim_product_current /
+dim_unit_current views. The facts are incremental: only orders and items
+ingested into Silver since the last build are (re)inserted.
+
 Usage:
     python scripts/build_gold_layer.py
     python scripts/build_gold_layer.py --project sixth-foundry-485810-e5
@@ -24,6 +29,10 @@ from pathlib import Path
 from google.cloud import bigquery
 from datetime import datetime
 
+from layer_verification import verify_layers
+from cost_guard import CostGuard, MODES
+from query_cache import QueryCache
+
 
 def load_config():
     """Load project configuration from YAML."""
@@ -33,8 +42,8 @@ def load_config():
     return config
 
 
-def execute_sql_file(client, sql_file_path: Path, description: str):
-    """Execute a SQL file in BigQuery."""
+def execute_sql_file(client, sql_file_path: Path, description: str, guard=None):
+    """Execute a SQL file in BigQuery (through the cost guard when one is given)."""
     print(f"\n[EXECUTING] {description}")
     print(f"  File: {sql_file_path.name}")
 
@@ -43,8 +52,11 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
             sql = f.read()
 
         # Execute query
-        query_job = client.query(sql)
-        query_job.result()  # Wait for completion
+        if guard is not None:
+            query_job = guard.run(sql, step=sql_file_path.name)
+        else:
+            query_job = client.query(sql)
+            query_job.result()  # Wait for completion
 
         # Get statistics
         bytes_processed = query_job.total_bytes_processed or 0
@@ -61,39 +73,25 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
         return False
 
 
-def verify_gold_layer(client, project_id, dataset_id="case_ficticio_gold"):
-    """Verify Gold layer tables and row counts."""
+def verify_gold_layer(client, project_id, dataset_id="case_ficticio_gold", cache=None):
+    """Verify star schema tables from metadata and check Silver -> Gold ratios."""
     print("\n" + "="*60)
     print("Gold Layer Verification")
     print("="*60)
 
-    tables = {
-        "Dimensions": ["dim_date", "dim_product", "dim_unit", "dim_geography"],
-        "Facts": ["fact_sales", "fact_order_items"]
-    }
-
-    results = {}
-    for category, table_list in tables.items():
-        print(f"\n{category}:")
-        for table_name in table_list:
-            table_id = f"{project_id}.{dataset_id}.{table_name}"
-
-            try:
-                query = f"SELECT COUNT(*) as row_count FROM `{table_id}`"
-                result = client.query(query).result()
-                row_count = list(result)[0].row_count
-                results[table_name] = row_count
-                print(f"  {table_name:20} {row_count:>8} rows")
-            except Exception as e:
-                print(f"  {table_name:20} [ERROR] {e}")
-                results[table_name] = None
+    datasets = {"silver": "case_ficticio_silver", "gold": dataset_id}
+    star_schema = ["dim_date", "dim_product", "dim_unit", "dim_geography", "fact_sales", "fact_order_items"]
+    _, anomalies = verify_layers(client, project_id, datasets, ["gold"], cache,
+                                 layer_tables={"gold": star_schema})
 
     print("="*60)
-    return results
+    return anomalies
 
 
-def test_star_schema_join(client, project_id, dataset_id="case_ficticio_gold"):
+def test_star_schema_join(client, project_id, dataset_id="case_ficticio_gold", cache=None):
     """Test a simple star schema join to validate the model."""
+    if cache is None:
+        cache = QueryCache(client, enabled=False)
     print("\n" + "="*60)
     print("Star Schema Join Test")
     print("="*60)
@@ -118,15 +116,15 @@ def test_star_schema_join(client, project_id, dataset_id="case_ficticio_gold"):
 
     try:
         print("Running sample analytics query...")
-        results = client.query(test_query).result()
+        results = cache.query(test_query)
 
         print(f"\n{'Year-Month':<12} {'State':<15} {'Unit':<20} {'Orders':>8} {'Revenue':>12} {'Avg Order':>10}")
         print("-" * 90)
 
         row_count = 0
         for row in results:
-            print(f"{row.year_month or 'N/A':<12} {row.state_name or 'N/A':<15} {row.unit_name or 'N/A':<20} "
-                  f"{row.total_orders:>8} {row.total_revenue:>12.2f} {row.avg_order_value:>10.2f}")
+            print(f"{row['year_month'] or 'N/A':<12} {row['state_name'] or 'N/A':<15} {row['unit_name'] or 'N/A':<20} "
+                  f"{row['total_orders']:>8} {row['total_revenue']:>12.2f} {row['avg_order_value']:>10.2f}")
             row_count += 1
 
         if row_count == 0:
@@ -164,6 +162,17 @@ def main():
         default=default_dataset,
         help=f"Gold dataset (default from config: {default_dataset})"
     )
+    parser.add_argument(
+        "--cost-mode",
+        choices=MODES,
+        default=None,
+        help="Cost guard: enforce, warn or off (default from config: cost_guard.mode)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local query result cache for verification queries"
+    )
 
     args = parser.parse_args()
 
@@ -176,16 +185,17 @@ def main():
 
     # Initialize BigQuery client
     client = bigquery.Client(project=args.project)
+    guard = CostGuard.from_config(client, config, mode=args.cost_mode)
 
     # SQL files to execute (in dependency order)
     sql_dir = Path("sql/gold")
     sql_files = [
         (sql_dir / "01_dim_date.sql", "Date dimension (2025-2027)"),
-        (sql_dir / "02_dim_product.sql", "Product dimension"),
-        (sql_dir / "03_dim_unit.sql", "Unit dimension with geography"),
+        (sql_dir / "02_dim_product.sql", "Product dimension (SCD Type 2 MERGE)"),
+        (sql_dir / "03_dim_unit.sql", "Unit dimension with geography (SCD Type 2 MERGE)"),
         (sql_dir / "04_dim_geography.sql", "Geography dimension"),
-        (sql_dir / "05_fact_sales.sql", "Sales fact table (order-level)"),
-        (sql_dir / "06_fact_order_items.sql", "Order items fact table (line-level)"),
+        (sql_dir / "05_fact_sales.sql", "Sales fact table (order-level, incremental)"),
+        (sql_dir / "06_fact_order_items.sql", "Order items fact table (line-level, incremental)"),
     ]
 
     # Execute transformations
@@ -195,13 +205,19 @@ def main():
 
     success_count = 0
     for sql_file, description in sql_files:
-        if execute_sql_file(client, sql_file, description):
+        if execute_sql_file(client, sql_file, description, guard):
             success_count += 1
+    print(f"\n{guard.summary()}")
 
     # Verify results
     if success_count == len(sql_files):
-        verify_gold_layer(client, args.project, args.dataset)
-        test_star_schema_join(client, args.project, args.dataset)
+        cache = QueryCache.from_config(client, config, enabled=not args.no_cache)
+        anomalies = verify_gold_layer(client, args.project, args.dataset, cache)
+        if anomalies:
+            print(f"\n[ERROR] Gold verification found {len(anomalies)} anomaly(ies)")
+            return 1
+        test_star_schema_join(client, args.project, args.dataset, cache)
+        print(f"\n{cache.summary()}")
 
         print("\n[SUCCESS] Gold layer (star schema) built successfully!")
         print("\nNext: Set up scheduled queries for automated refresh")
@@ -6,9 +6,15 @@ Case Fictício - Teste -- Build Silver Layer
 Executes SQL transformations to build the Silver layer from Bronze data.
 Silver layer applies data cleaning, normalization, enrichment, and deduplication.
 
+Orders and order items are built incrementally: each run only merges
+Bronze rows ingested since the last run (see the version index tables in
+sql/silver/02_orders.sql). --full-refresh drops the incremental tables so
+the next run rebuilds them from all Bronze history.
+
 Usage:
     python scripts/build_silver_layer.py
     python scripts/build_silver_layer.py --project sixth-foundry-485810-e5
+    python scripts/build_silver_layer.py --full-refresh
 
 Requirements:
     pip install google-cloud-bigquery pyyaml
@@ -24,6 +30,10 @@ from pathlib import Path
 from google.cloud import bigquery
 from datetime import datetime
 
+from layer_verification import verify_layers
+from cost_guard import CostGuard, MODES
+from query_cache import QueryCache
+
 
 def load_config():
     """Load project configuration from YAML."""
@@ -33,8 +43,8 @@ def load_config():
     return config
 
 
-def execute_sql_file(client, sql_file_path: Path, description: str):
-    """Execute a SQL file in BigQuery."""
+def execute_sql_file(client, sql_file_path: Path, description: str, guard=None):
+    """Execute a SQL file in BigQuery (through the cost guard when one is given)."""
     print(f"\n[EXECUTING] {description}")
     print(f"  File: {sql_file_path.name}")
 
@@ -43,8 +53,11 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
             sql = f.read()
 
         # Execute query
-        query_job = client.query(sql)
-        query_job.result()  # Wait for completion
+        if guard is not None:
+            query_job = guard.run(sql, step=sql_file_path.name)
+        else:
+            query_job = client.query(sql)
+            query_job.result()  # Wait for completion
 
         # Get statistics
         bytes_processed = query_job.total_bytes_processed or 0
@@ -61,72 +74,57 @@ def execute_sql_file(client, sql_file_path: Path, description: str):
         return False
 
 
-def verify_silver_tables(client, project_id, dataset_id="case_ficticio_silver"):
-    """Verify Silver layer tables and row counts."""
+# Tables maintained incrementally by 02_orders.sql / 03_order_items.sql
+INCREMENTAL_TABLES = [
+    "orders_version_index",
+    "order_items_version_index",
+    "order_items_pending_orphans",
+    "orders",
+    "order_items",
+]
+
+
+def drop_incremental_tables(client, project_id, dataset_id):
+    """Drop the incremental Silver tables so the next run rebuilds them."""
+    print("\n[FULL REFRESH] Dropping incremental Silver tables")
+    for table_name in INCREMENTAL_TABLES:
+        client.delete_table(f"{project_id}.{dataset_id}.{table_name}", not_found_ok=True)
+        print(f"  [OK] Dropped {dataset_id}.{table_name}")
+
+
+def verify_silver_tables(client, project_id, dataset_id="case_ficticio_silver", cache=None):
+    """Verify Silver tables from metadata and check Bronze -> Silver ratios."""
     print("\n" + "="*60)
     print("Silver Layer Verification")
     print("="*60)
 
-    tables = [
-        "products",
-        "units",
-        "states",
-        "countries",
-        "orders",
-        "order_items"
-    ]
-
-    results = {}
-    for table_name in tables:
-        table_id = f"{project_id}.{dataset_id}.{table_name}"
-
-        try:
-            query = f"SELECT COUNT(*) as row_count FROM `{table_id}`"
-            result = client.query(query).result()
-            row_count = list(result)[0].row_count
-            results[table_name] = row_count
-            print(f"  {table_name:15} {row_count:>6} rows")
-        except Exception as e:
-            print(f"  {table_name:15} [ERROR] {e}")
-            results[table_name] = None
+    datasets = {"bronze": "case_ficticio_bronze", "silver": dataset_id}
+    _, anomalies = verify_layers(client, project_id, datasets, ["silver"], cache)
 
     print("="*60)
-    return results
+    return anomalies
 
 
-def compare_bronze_silver(client, project_id):
+def compare_bronze_silver(client, project_id, cache=None):
     """Compare row counts between Bronze and Silver layers."""
     print("\n" + "="*60)
     print("Bronze vs Silver Comparison")
     print("="*60)
 
-    comparison_query = f"""
-    SELECT 'orders' as table_name,
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_bronze.orders`) as bronze_rows,
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_silver.orders`) as silver_rows
-    UNION ALL
-    SELECT 'order_items',
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_bronze.order_items`),
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_silver.order_items`)
-    UNION ALL
-    SELECT 'products',
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_bronze.products`),
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_silver.products`)
-    UNION ALL
-    SELECT 'units',
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_bronze.units`),
-           (SELECT COUNT(*) FROM `{project_id}.case_ficticio_silver.units`)
-    """
+    if cache is None:
+        cache = QueryCache(client, enabled=False)
+    tables = ["orders", "order_items", "products", "units"]
 
     try:
-        results = client.query(comparison_query).result()
         print(f"  {'Table':<15} {'Bronze':>8} {'Silver':>8} {'Change':>8}")
         print(f"  {'-'*15} {'-'*8} {'-'*8} {'-'*8}")
 
-        for row in results:
-            diff = row.silver_rows - row.bronze_rows
+        for table_name in tables:
+            bronze_rows = cache.row_count(f"{project_id}.case_ficticio_bronze.{table_name}")
+            silver_rows = cache.row_count(f"{project_id}.case_ficticio_silver.{table_name}")
+            diff = silver_rows - bronze_rows
             diff_str = f"{diff:+d}" if diff != 0 else "0"
-            print(f"  {row.table_name:<15} {row.bronze_rows:>8} {row.silver_rows:>8} {diff_str:>8}")
+            print(f"  {table_name:<15} {bronze_rows:>8} {silver_rows:>8} {diff_str:>8}")
 
         print("="*60)
 
@@ -157,6 +155,22 @@ def main():
         default=default_dataset,
         help=f"Silver dataset (default from config: {default_dataset})"
     )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild orders/order_items from all Bronze history instead of merging new data"
+    )
+    parser.add_argument(
+        "--cost-mode",
+        choices=MODES,
+        default=None,
+        help="Cost guard: enforce, warn or off (default from config: cost_guard.mode)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local query result cache for verification queries"
+    )
 
     args = parser.parse_args()
 
@@ -169,13 +183,17 @@ def main():
 
     # Initialize BigQuery client
     client = bigquery.Client(project=args.project)
+    guard = CostGuard.from_config(client, config, mode=args.cost_mode)
+
+    if args.full_refresh:
+        drop_incremental_tables(client, args.project, args.dataset)
 
     # SQL files to execute (in order)
     sql_dir = Path("sql/silver")
     sql_files = [
         (sql_dir / "01_reference_tables.sql", "Reference tables (products, units, states, countries)"),
-        (sql_dir / "02_orders.sql", "Orders with date enrichment and normalization"),
-        (sql_dir / "03_order_items.sql", "Order items with calculated totals"),
+        (sql_dir / "02_orders.sql", "Orders with date enrichment and normalization (incremental)"),
+        (sql_dir / "03_order_items.sql", "Order items with calculated totals (incremental)"),
     ]
 
     # Execute transformations
@@ -185,13 +203,19 @@ def main():
 
     success_count = 0
     for sql_file, description in sql_files:
-        if execute_sql_file(client, sql_file, description):
+        if execute_sql_file(client, sql_file, description, guard):
             success_count += 1
+    print(f"\n{guard.summary()}")
 
     # Verify results
     if success_count == len(sql_files):
-        verify_silver_tables(client, args.project, args.dataset)
-        compare_bronze_silver(client, args.project)
+        cache = QueryCache.from_config(client, config, enabled=not args.no_cache)
+        anomalies = verify_silver_tables(client, args.project, args.dataset, cache)
+        if anomalies:
+            print(f"\n[ERROR] Silver verification found {len(anomalies)} anomaly(ies)")
+            return 1
+        compare_bronze_silver(client, args.project, cache)
+        print(f"\n{cache.summary()}")
 
         print("\n[SUCCESS] Silver layer built successfully!")
         print("\nNext: Build Gold layer (star schema)")
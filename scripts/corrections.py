@@ -0,0 +1,149 @@
+"""
+Case Fictício - Teste -- Late-Arriving Corrections for the Fake Data Generator
+===================================================================
+
+Re-sends a fraction of already generated unit-days with modified rows, the
+way units re-upload a day after closing the till:
+
+  status change     Pendente -> Finalizado/Cancelado, Finalizado -> Cancelado
+  value correction  one item's Qtd adjusted; Vlr_Pedido recomputed so the
+                    corrected file still passes the order-total rule
+
+A corrected file keeps the original object path and ids, so in GCS it
+overwrites the original (new generation -> the Cloud Function reprocesses it
+with a later _ingest_timestamp) and Silver's "latest _ingest_timestamp wins"
+MERGE has to pick the corrected version. Corrections are spread over waves
+that are emitted after all original files, in wave order.
+
+Alongside the files the planner keeps the expected final state of Silver
+(what the tables must hold once every wave is ingested): order counts and
+order_value per order_date and status, item totals, and the final version of
+every corrected order.
+
+Usage:
+    from corrections import CorrectionPlanner
+
+    planner = CorrectionPlanner(rate=0.05, waves=2)
+    planner.observe(unit_dir, orders, items)          # for every unit-day
+    for wave, unit_dir, orders, items in planner.corrected_files():
+        ...
+    planner.write_final_state(Path("output/expected_final_state.json"))
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import json
+import random
+from pathlib import Path
+
+# Share of orders modified inside a corrected unit-day (at least one)
+DEFAULT_ROW_SHARE = 0.2
+
+STATUS_TRANSITIONS = {
+    "Pendente": ["Finalizado", "Cancelado"],
+    "Finalizado": ["Cancelado"],
+}
+
+
+def order_key(order: dict) -> tuple[str, str]:
+    return order["Data_Pedido"], order["Status"]
+
+
+class CorrectionPlanner:
+    """Selects unit-days to re-send, builds their corrected rows and the final state."""
+
+    def __init__(self, rate: float, waves: int = 1, row_share: float = DEFAULT_ROW_SHARE):
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Correction rate must be between 0 and 1 (got {rate})")
+        if waves < 1:
+            raise ValueError(f"Correction waves must be >= 1 (got {waves})")
+        self.rate = rate
+        self.waves = waves
+        self.row_share = row_share
+        self.selected = []
+        self.by_date_status = {}
+        self.items = {"rows": 0, "quantity": 0}
+        self.corrected_orders = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _add(self, order: dict, sign: int) -> None:
+        date, status = order_key(order)
+        bucket = self.by_date_status.setdefault(date, {}).setdefault(status, {"orders": 0, "order_value": 0.0})
+        bucket["orders"] += sign
+        bucket["order_value"] = round(bucket["order_value"] + sign * float(order["Vlr_Pedido"]), 2)
+        if bucket["orders"] == 0:
+            del self.by_date_status[date][status]
+
+    def observe(self, unit_dir: str, orders: list[dict], items: list[dict]) -> None:
+        """Account for one original unit-day and maybe select it for correction."""
+        for order in orders:
+            self._add(order, +1)
+        self.items["rows"] += len(items)
+        self.items["quantity"] += sum(item["Qtd"] for item in items)
+        if orders and random.random() < self.rate:
+            wave = random.randint(1, self.waves)
+            self.selected.append((wave, unit_dir, orders, items))
+
+    def _correct(self, orders: list[dict], items: list[dict]) -> tuple[list[dict], list[dict], int]:
+        chosen = {i for i in range(len(orders)) if random.random() < self.row_share}
+        if not chosen:
+            chosen = {random.randrange(len(orders))}
+
+        new_orders = []
+        new_items = [dict(item) for item in items]
+        new_items_by_order = {}
+        for item in new_items:
+            new_items_by_order.setdefault(item["Id_Pedido"], []).append(item)
+
+        quantity_delta = 0
+        for position, order in enumerate(orders):
+            row = dict(order)
+            if position in chosen:
+                transitions = STATUS_TRANSITIONS.get(row["Status"])
+                if transitions and random.random() < 0.5:
+                    row["Status"] = random.choice(transitions)
+                else:
+                    item = random.choice(new_items_by_order[row["Id_Pedido"]])
+                    delta = -1 if item["Qtd"] > 1 and random.random() < 0.5 else 1
+                    item["Qtd"] += delta
+                    quantity_delta += delta
+                    subtotal = sum(i["Qtd"] * float(i["Vlr_Item"]) for i in new_items_by_order[row["Id_Pedido"]])
+                    row["Vlr_Pedido"] = f"{subtotal + float(row['Taxa_Entrega']):.2f}"
+                self._add(order, -1)
+                self._add(row, +1)
+                self.corrected_orders[row["Id_Pedido"]] = {
+                    "Data_Pedido": row["Data_Pedido"],
+                    "Status": row["Status"],
+                    "Vlr_Pedido": row["Vlr_Pedido"],
+                }
+            new_orders.append(row)
+
+        self.items["quantity"] += quantity_delta
+        return new_orders, new_items, len(chosen)
+
+    def corrected_files(self):
+        """Yield (wave, unit_dir, orders, items) for every re-sent unit-day, in wave order."""
+        for wave, unit_dir, orders, items in sorted(self.selected, key=lambda s: s[0]):
+            new_orders, new_items, _ = self._correct(orders, items)
+            yield wave, unit_dir, new_orders, new_items
+
+    def final_state(self) -> dict:
+        orders = sum(b["orders"] for statuses in self.by_date_status.values() for b in statuses.values())
+        return {
+            "correction_rate": self.rate,
+            "waves": self.waves,
+            "resent_unit_days": len(self.selected),
+            "orders": orders,
+            "order_items": self.items,
+            "by_date_status": {d: self.by_date_status[d] for d in sorted(self.by_date_status)},
+            "corrected_orders": self.corrected_orders,
+        }
+
+    def write_final_state(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.final_state(), f, indent=2)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Query Cost Guard
+===============================
+
+Checks the cost of every build step before it runs, against the 1 TB/month
+query allowance in free_tier_limits (config/project_config.yaml):
+
+  1. dry run        estimated bytes for the SQL (no bytes billed). Scripts
+                    (DECLARE/SET) usually get no estimate from a dry run;
+                    for them every statement's table references are
+                    summed at full table size (metadata only), an upper
+                    bound that ignores partition pruning
+  2. check          refuse a step estimated above step_max_gb, or one that
+                    would push this month's billed bytes past the monthly
+                    budget; warn above warn_ratio of the budget
+  3. run            the real job carries maximum_bytes_billed = step_max_gb,
+                    so BigQuery itself stops a step that is larger than its
+                    estimate
+  4. ledger         estimated and billed bytes of every step are appended to
+                    case_ficticio_monitoring.query_costs; month-to-date
+                    consumption is read from there
+
+mode: enforce refuses (the step fails without running), warn only prints,
+off bypasses the guard. A step that cannot be estimated at all counts as
+over budget, so enforce mode refuses it rather than running it blind.
+
+Usage:
+    from cost_guard import CostGuard
+    guard = CostGuard.from_config(client, config)
+    job = guard.run(sql, step="05_fact_sales.sql")
+
+    python scripts/cost_guard.py             # month-to-date report
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import re
+import sys
+import yaml
+from datetime import datetime, timezone
+from pathlib import Path
+from google.cloud import bigquery
+from google.api_core import exceptions
+
+DEFAULT_MODE = "enforce"
+DEFAULT_STEP_MAX_GB = 20
+DEFAULT_WARN_RATIO = 0.8
+DEFAULT_LEDGER_TABLE = "query_costs"
+DEFAULT_MONTHLY_TB = 1
+MODES = ["enforce", "warn", "off"]
+
+GB = 1024 ** 3
+TB = 1024 ** 4
+
+# Fully qualified `project.dataset.table` references in a SQL script
+TABLE_REF = re.compile(r"`([\w-]+\.\w+\.\w+)`")
+
+LEDGER_SCHEMA = [
+    bigquery.SchemaField("run_at", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("step", "STRING"),
+    bigquery.SchemaField("job_id", "STRING"),
+    bigquery.SchemaField("estimated_bytes", "INT64"),
+    bigquery.SchemaField("bytes_billed", "INT64"),
+    bigquery.SchemaField("verdict", "STRING"),
+    bigquery.SchemaField("status", "STRING"),
+]
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised in enforce mode when a step would overspend."""
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def evaluate(estimate: int | None, used: int, step_max_bytes: int, monthly_budget_bytes: int,
+             warn_ratio: float = DEFAULT_WARN_RATIO) -> tuple[str, str]:
+    """Verdict ('ok', 'warn' or 'refuse') and message for one step's estimate."""
+    if estimate is None:
+        return "refuse", "no dry-run or table-size estimate, budget cannot be checked"
+    if estimate > step_max_bytes:
+        return "refuse", (f"estimated {estimate / GB:.2f} GB exceeds the per-step cap "
+                          f"of {step_max_bytes / GB:.1f} GB")
+    projected = used + estimate
+    if projected > monthly_budget_bytes:
+        return "refuse", (f"would bring this month to {projected / GB:,.1f} GB "
+                          f"(budget {monthly_budget_bytes / GB:,.0f} GB)")
+    if projected > warn_ratio * monthly_budget_bytes:
+        return "warn", (f"this month at {projected / monthly_budget_bytes:.0%} of the "
+                        f"{monthly_budget_bytes / GB:,.0f} GB budget after this step")
+    return "ok", f"estimated {estimate / GB:.3f} GB"
+
+
+class CostGuard:
+    """Dry-runs, caps and records the bytes of every guarded query."""
+
+    def __init__(
+        self,
+        client,
+        ledger_table: str,
+        step_max_bytes: int = DEFAULT_STEP_MAX_GB * GB,
+        monthly_budget_bytes: int = DEFAULT_MONTHLY_TB * TB,
+        warn_ratio: float = DEFAULT_WARN_RATIO,
+        mode: str = DEFAULT_MODE,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cost guard mode '{mode}' (choose from: {', '.join(MODES)})")
+        self.client = client
+        self.ledger_table = ledger_table
+        self.step_max_bytes = step_max_bytes
+        self.monthly_budget_bytes = monthly_budget_bytes
+        self.warn_ratio = warn_ratio
+        self.mode = mode
+        self.steps = 0
+        self.refused = 0
+        self.bytes_billed = 0
+        self._used = None
+
+    @classmethod
+    def from_config(cls, client, config: dict, mode: str | None = None) -> "CostGuard":
+        """Build a guard from the cost_guard and free_tier_limits sections of project_config.yaml."""
+        settings = config.get('cost_guard', {}) or {}
+        monthly_tb = (config.get('free_tier_limits', {}) or {}).get('bq_query_tb', DEFAULT_MONTHLY_TB)
+        dataset = config['bigquery']['datasets']['monitoring']
+        return cls(
+            client,
+            ledger_table=f"{client.project}.{dataset}.{settings.get('ledger_table', DEFAULT_LEDGER_TABLE)}",
+            step_max_bytes=int(settings.get('step_max_gb', DEFAULT_STEP_MAX_GB) * GB),
+            monthly_budget_bytes=int(monthly_tb * TB),
+            warn_ratio=settings.get('warn_ratio', DEFAULT_WARN_RATIO),
+            mode=mode or settings.get('mode', DEFAULT_MODE),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    # ------------------------------------------------------------------
+    # Ledger
+    # ------------------------------------------------------------------
+
+    def ensure_ledger(self) -> None:
+        table = bigquery.Table(self.ledger_table, schema=LEDGER_SCHEMA)
+        table.description = "Cost guard: estimated and billed bytes per build step"
+        self.client.create_table(table, exists_ok=True)
+
+    def month_to_date(self) -> int:
+        """Bytes billed by guarded steps this calendar month (ledger read once per run)."""
+        if self._used is None:
+            self.ensure_ledger()
+            sql = f"""
+                SELECT IFNULL(SUM(bytes_billed), 0) AS bytes_billed
+                FROM `{self.ledger_table}`
+                WHERE run_at >= TIMESTAMP_TRUNC(CURRENT_TIMESTAMP(), MONTH)
+            """
+            self._used = list(self.client.query(sql).result())[0]["bytes_billed"]
+        return self._used
+
+    def record(self, step: str, estimate: int | None, billed: int, verdict: str,
+               status: str, job_id: str | None = None) -> None:
+        self._used = self.month_to_date() + billed
+        errors = self.client.insert_rows_json(self.ledger_table, [{
+            "run_at": datetime.now(timezone.utc).isoformat(),
+            "step": step,
+            "job_id": job_id,
+            "estimated_bytes": estimate,
+            "bytes_billed": billed,
+            "verdict": verdict,
+            "status": status,
+        }])
+        if errors:
+            print(f"  [WARN] Could not record cost of {step}: {errors}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def estimate(self, sql: str) -> int | None:
+        """Bytes the query would process: dry run, else table-size upper bound (None if neither)."""
+        try:
+            job = self.client.query(sql, job_config=bigquery.QueryJobConfig(
+                dry_run=True, use_query_cache=False
+            ))
+            if job.total_bytes_processed is not None:
+                return job.total_bytes_processed
+        except Exception as e:
+            print(f"  [WARN] Dry run failed: {e}")
+        return self.upper_bound(sql)
+
+    def upper_bound(self, sql: str) -> int | None:
+        """Sum of the full size of every table reference (None if a size cannot be read).
+
+        Each reference counts once per occurrence, so a table read by three
+        statements is charged three times. Tables the script itself creates
+        do not exist yet and count as empty.
+        """
+        sizes = {}
+        total = 0
+        for table_id in TABLE_REF.findall(sql):
+            if table_id not in sizes:
+                try:
+                    sizes[table_id] = self.client.get_table(table_id).num_bytes or 0
+                except exceptions.NotFound:
+                    sizes[table_id] = 0
+                except Exception as e:
+                    print(f"  [WARN] Could not read size of {table_id}: {e}")
+                    return None
+            total += sizes[table_id]
+        print(f"  [INFO] No dry-run estimate, using table sizes ({total / GB:.3f} GB upper bound)")
+        return total
+
+    def run(self, sql: str, step: str):
+        """Check, run (with maximum_bytes_billed) and record one query; returns the finished job."""
+        if not self.enabled:
+            job = self.client.query(sql)
+            job.result()
+            return job
+
+        estimate = self.estimate(sql)
+        verdict, message = evaluate(estimate, self.month_to_date(), self.step_max_bytes,
+                                    self.monthly_budget_bytes, self.warn_ratio)
+        self.steps += 1
+        if verdict == "refuse" and self.mode == "enforce":
+            self.refused += 1
+            self.record(step, estimate, 0, verdict, "refused")
+            raise BudgetExceeded(f"{step}: {message}")
+        if verdict == "ok":
+            print(f"  [OK] Cost check: {message}")
+        else:
+            print(f"  [WARN] Cost check: {message}")
+
+        job = self.client.query(sql, job_config=bigquery.QueryJobConfig(
+            maximum_bytes_billed=self.step_max_bytes
+        ))
+        try:
+            job.result()
+        except Exception:
+            self.record(step, estimate, job.total_bytes_billed or 0, verdict, "failed", job.job_id)
+            raise
+        billed = job.total_bytes_billed or 0
+        self.bytes_billed += billed
+        self.record(step, estimate, billed, verdict, "done", job.job_id)
+        return job
+
+    def summary(self) -> str:
+        if not self.enabled:
+            return "Cost guard: off"
+        used = self.month_to_date()
+        return (f"Cost guard: {self.steps} step(s), {self.refused} refused, "
+                f"{self.bytes_billed / GB:.3f} GB billed this run, month to date "
+                f"{used / GB:,.1f} / {self.monthly_budget_bytes / GB:,.0f} GB "
+                f"({used / self.monthly_budget_bytes:.1%})")
+
+
+def main():
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Report month-to-date query bytes recorded by the cost guard"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    args = parser.parse_args()
+
+    client = bigquery.Client(project=args.project)
+    guard = CostGuard.from_config(client, config)
+    guard.ensure_ledger()
+    sql = f"""
+        SELECT step, COUNT(*) AS runs, SUM(bytes_billed) AS bytes_billed,
+               COUNTIF(status = 'refused') AS refused
+        FROM `{guard.ledger_table}`
+        WHERE run_at >= TIMESTAMP_TRUNC(CURRENT_TIMESTAMP(), MONTH)
+        GROUP BY step
+        ORDER BY bytes_billed DESC
+    """
+    print(f"  {'Step':<40} {'Runs':>6} {'GB billed':>12} {'Refused':>8}")
+    print(f"  {'-'*40} {'-'*6} {'-'*12} {'-'*8}")
+    for row in client.query(sql).result():
+        print(f"  {row['step']:<40} {row['runs']:>6} {row['bytes_billed'] / GB:>12.3f} {row['refused']:>8}")
+    print(f"\n{guard.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
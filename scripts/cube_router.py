@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Sales Cube Query Router
+======================================
+
+Answers dashboard groupings coarser than the cube grain from
+case_ficticio_gold.agg_sales_cube (sql/gold/11_agg_sales_cube.sql) instead of
+scanning the fact tables: unit x week, state x product x month, order type x
+status per year, ...
+
+The router picks the cube slice that answers the request exactly:
+  - order slice   (product_id IS NULL): order-level measures, any grouping
+  - product slice (product_id NOT NULL): item measures, or any request that
+    groups or filters by product
+and refuses combinations the cube cannot answer exactly (e.g. order revenue
+split by product), raising ValueError.
+
+Usage:
+    python scripts/cube_router.py --group-by unit_id,order_week --measures orders,order_revenue
+    python scripts/cube_router.py --group-by state_name,product_id,order_month \\
+        --measures quantity,item_revenue --start-date 2026-01-01 --end-date 2026-03-31
+    python scripts/cube_router.py --group-by order_date --measures orders \\
+        --filter order_type=ONLINE --filter unit_id=1,2,3 --execute
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import sys
+import yaml
+from datetime import date, datetime
+from pathlib import Path
+
+from google.cloud import bigquery
+
+
+CUBE_TABLE = "agg_sales_cube"
+
+# Grouping name -> SQL expression over the cube
+DIMENSIONS = {
+    "order_date": "order_date",
+    "order_week": "DATE_TRUNC(order_date, ISOWEEK)",
+    "order_month": "DATE_TRUNC(order_date, MONTH)",
+    "order_year": "EXTRACT(YEAR FROM order_date)",
+    "unit_id": "unit_id",
+    "state_name": "state_name",
+    "product_id": "product_id",
+    "order_type": "order_type",
+    "order_status": "order_status",
+}
+
+# Columns that can be filtered on (cube columns, not derived grains)
+FILTER_COLUMNS = {"unit_id": "INT64", "state_name": "STRING", "product_id": "INT64",
+                  "order_type": "STRING", "order_status": "STRING"}
+
+ORDER_SLICE = "order"
+PRODUCT_SLICE = "product"
+
+# Measure -> (SQL expression, slices that answer it exactly)
+MEASURES = {
+    "orders": ("SUM(orders)", {ORDER_SLICE, PRODUCT_SLICE}),
+    "order_revenue": ("ROUND(SUM(order_revenue), 2)", {ORDER_SLICE}),
+    "delivery_fees": ("ROUND(SUM(delivery_fees), 2)", {ORDER_SLICE}),
+    "avg_order_value": ("ROUND(SUM(order_revenue) / NULLIF(SUM(orders), 0), 2)", {ORDER_SLICE}),
+    "line_items": ("SUM(line_items)", {ORDER_SLICE, PRODUCT_SLICE}),
+    "quantity": ("SUM(quantity)", {ORDER_SLICE, PRODUCT_SLICE}),
+    "item_revenue": ("ROUND(SUM(item_revenue), 2)", {PRODUCT_SLICE}),
+}
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def choose_slice(group_by: list[str], measures: list[str], filters: dict) -> str:
+    """Pick the cube slice that answers the request exactly (ValueError if none)."""
+    by_product = "product_id" in group_by or "product_id" in filters
+    needs_product = any(MEASURES[m][1] == {PRODUCT_SLICE} for m in measures)
+    cube_slice = PRODUCT_SLICE if by_product or needs_product else ORDER_SLICE
+
+    for measure in measures:
+        if cube_slice not in MEASURES[measure][1]:
+            raise ValueError(f"{measure} is order-level and cannot be split or filtered by product")
+
+    # Distinct orders per product row only add up while each group holds one product
+    if cube_slice == PRODUCT_SLICE and "orders" in measures and "product_id" not in group_by:
+        products = filters.get("product_id")
+        if not isinstance(products, (int, str)):
+            raise ValueError("orders across several products would double-count orders; "
+                             "group by product_id or filter a single product")
+    return cube_slice
+
+
+def _parameter(name: str, column: str, value) -> bigquery.ScalarQueryParameter | bigquery.ArrayQueryParameter:
+    param_type = FILTER_COLUMNS[column]
+    if isinstance(value, (list, tuple, set)):
+        return bigquery.ArrayQueryParameter(name, param_type, list(value))
+    return bigquery.ScalarQueryParameter(name, param_type, value)
+
+
+def route(
+    group_by: list[str],
+    measures: list[str],
+    filters: dict | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    project_id: str = "sixth-foundry-485810-e5",
+    dataset_id: str = "case_ficticio_gold",
+) -> tuple[str, list]:
+    """
+    Build the cube query for a grouping.
+
+    Args:
+        group_by: Names from DIMENSIONS
+        measures: Names from MEASURES
+        filters: FILTER_COLUMNS name -> value or list of values
+        start_date, end_date: Inclusive order_date range (prunes cube partitions)
+
+    Returns:
+        (sql, query_parameters)
+    """
+    filters = filters or {}
+    unknown = ([d for d in group_by if d not in DIMENSIONS]
+               + [m for m in measures if m not in MEASURES]
+               + [f for f in filters if f not in FILTER_COLUMNS])
+    if unknown:
+        raise ValueError(f"Not answerable from the cube: {', '.join(unknown)}")
+    if not measures:
+        raise ValueError("At least one measure is required")
+
+    cube_slice = choose_slice(group_by, measures, filters)
+
+    where = ["product_id IS NULL" if cube_slice == ORDER_SLICE else "product_id IS NOT NULL"]
+    params = []
+    if start_date:
+        where.append("order_date >= @start_date")
+        params.append(bigquery.ScalarQueryParameter("start_date", "DATE", start_date))
+    if end_date:
+        where.append("order_date <= @end_date")
+        params.append(bigquery.ScalarQueryParameter("end_date", "DATE", end_date))
+    for column, value in filters.items():
+        name = f"f_{column}"
+        op = f"IN UNNEST(@{name})" if isinstance(value, (list, tuple, set)) else f"= @{name}"
+        where.append(f"{column} {op}")
+        params.append(_parameter(name, column, value))
+
+    select = [f"{DIMENSIONS[d]} AS {d}" for d in group_by]
+    select += [f"{MEASURES[m][0]} AS {m}" for m in measures]
+
+    sql = (
+        f"SELECT\n  " + ",\n  ".join(select) + "\n"
+        f"FROM `{project_id}.{dataset_id}.{CUBE_TABLE}`\n"
+        f"WHERE " + "\n  AND ".join(where)
+    )
+    if group_by:
+        sql += f"\nGROUP BY {', '.join(group_by)}\nORDER BY {', '.join(group_by)}"
+    return sql, params
+
+
+def parse_filters(values: list[str]) -> dict:
+    """Parse --filter column=value[,value...] arguments."""
+    filters = {}
+    for item in values or []:
+        column, _, raw = item.partition("=")
+        parts = raw.split(",")
+        if FILTER_COLUMNS.get(column) == "INT64":
+            parts = [int(p) for p in parts]
+        filters[column] = parts[0] if len(parts) == 1 else parts
+    return filters
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        default_dataset = config['bigquery']['datasets']['gold']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Answer dashboard groupings from the Gold sales cube"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--dataset",
+        default=default_dataset,
+        help=f"Gold dataset (default from config: {default_dataset})"
+    )
+    parser.add_argument(
+        "--group-by",
+        default="",
+        help=f"Comma-separated dimensions: {', '.join(DIMENSIONS)}"
+    )
+    parser.add_argument(
+        "--measures",
+        required=True,
+        help=f"Comma-separated measures: {', '.join(MEASURES)}"
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        help="column=value[,value...] (repeatable)"
+    )
+    parser.add_argument(
+        "--start-date",
+        default=None,
+        help="First order_date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--end-date",
+        default=None,
+        help="Last order_date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--execute",
+        action="store_true",
+        help="Run the query and print the rows (default: print SQL and dry-run bytes)"
+    )
+
+    args = parser.parse_args()
+
+    to_date = lambda s: datetime.strptime(s, "%Y-%m-%d").date() if s else None
+    try:
+        sql, params = route(
+            [d for d in args.group_by.split(",") if d],
+            [m for m in args.measures.split(",") if m],
+            parse_filters(args.filter),
+            to_date(args.start_date),
+            to_date(args.end_date),
+            args.project,
+            args.dataset,
+        )
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    print(sql)
+
+    client = bigquery.Client(project=args.project)
+    dry_run = client.query(sql, job_config=bigquery.QueryJobConfig(
+        query_parameters=params, dry_run=True, use_query_cache=False
+    ))
+    print(f"\n[OK] Bytes scanned: {dry_run.total_bytes_processed:,}")
+
+    if args.execute:
+        rows = client.query(sql, job_config=bigquery.QueryJobConfig(query_parameters=params)).result()
+        print()
+        for row in rows:
+            print("  " + "  ".join(str(v) for v in row.values()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Case Fictício - Teste -- Dirty-Data Injection for the Fake Data Generator
+===============================================================
+
+Corrupts a configurable fraction of generated rows so the csv_processor
+validators and the quarantine path can be load-tested, and records a
+ground-truth manifest of every injected fault with the rejections the
+validators are expected to produce (rule names as in
+cloud_functions/csv_processor/validation.py).
+
+Faults (rates are per order, except truncated_file which is per unit-day):
+  null_required       blank one required pedido field   -> null_required
+  invalid_status      Status outside the domain         -> invalid_status
+  invalid_order_type  Tipo_Pedido outside the domain    -> invalid_order_type
+  malformed_date      unparseable Data_Pedido           -> malformed_value
+  duplicate_order     repeat an order row               -> duplicate_id
+  orphan_item         item whose Id_Pedido has no order -> orphan_item
+  truncated_file      pedido.csv cut inside its last row -> null_required
+                      (simulates an interrupted upload)
+
+Each order gets at most one fault so the expected counts are exact. Items of
+an order the validators reject are rejected too (orphan_item), and the
+manifest accounts for that.
+
+Usage:
+    from fault_injection import FaultInjector, FAULT_PRESETS
+
+    injector = FaultInjector(FAULT_PRESETS["light"])
+    orders, items, truncate = injector.apply(unit_dir, orders, items)
+    ...
+    injector.write_manifest(Path("output/fault_manifest.json"))
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import json
+import random
+import uuid
+from pathlib import Path
+
+# Rule names from cloud_functions/csv_processor/validation.py
+NULL_RULE = "null_required"
+STATUS_RULE = "invalid_status"
+ORDER_TYPE_RULE = "invalid_order_type"
+MALFORMED_RULE = "malformed_value"
+DUPLICATE_RULE = "duplicate_id"
+ORPHAN_RULE = "orphan_item"
+
+# Order-level fault -> rule that rejects the faulty pedido row (None: only items)
+ROW_FAULTS = {
+    "null_required": NULL_RULE,
+    "invalid_status": STATUS_RULE,
+    "invalid_order_type": ORDER_TYPE_RULE,
+    "malformed_date": MALFORMED_RULE,
+    "duplicate_order": DUPLICATE_RULE,
+    "orphan_item": None,
+}
+FILE_FAULTS = {"truncated_file": NULL_RULE}
+
+# Required pedido fields that can be blanked (validation.PEDIDO_REQUIRED)
+NULLABLE_FIELDS = ["Id_Unidade", "Id_Pedido", "Data_Pedido", "Vlr_Pedido", "Status"]
+BAD_STATUSES = ["Entregue", "CANCELADO", "pendente", "?"]
+BAD_ORDER_TYPES = ["Drive Thru", "Loja", "Online"]
+BAD_DATES = ["2026-13-45", "15/01/2026", "2026-02-30", "ontem"]
+
+FAULT_PRESETS = {
+    "none": {},
+    "light": {
+        "null_required": 0.002, "invalid_status": 0.002, "invalid_order_type": 0.002,
+        "malformed_date": 0.002, "duplicate_order": 0.002, "orphan_item": 0.002,
+        "truncated_file": 0.005,
+    },
+    "heavy": {
+        "null_required": 0.02, "invalid_status": 0.02, "invalid_order_type": 0.02,
+        "malformed_date": 0.02, "duplicate_order": 0.02, "orphan_item": 0.02,
+        "truncated_file": 0.05,
+    },
+}
+
+
+def parse_rates(spec: str) -> dict:
+    """Parse a preset name or 'fault=rate,fault=rate' into a rates dict."""
+    if spec in FAULT_PRESETS:
+        return dict(FAULT_PRESETS[spec])
+    rates = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in ROW_FAULTS and name not in FILE_FAULTS:
+            raise ValueError(f"Unknown fault '{name}' (choose from: {', '.join([*ROW_FAULTS, *FILE_FAULTS])})")
+        rates[name] = float(value)
+    return rates
+
+
+def truncate_last_row(data: bytes) -> bytes:
+    """Cut a CSV after the second field of its last row (no trailing newline)."""
+    body = data.rstrip(b"\r\n")
+    start = body.rfind(b"\n") + 1
+    second_sep = body.index(b";", body.index(b";", start) + 1)
+    return body[:second_sep]
+
+
+class FaultInjector:
+    """Applies row and file faults and accumulates the ground-truth manifest."""
+
+    def __init__(self, rates: dict):
+        total = sum(rates.get(name, 0.0) for name in ROW_FAULTS)
+        if total > 1:
+            raise ValueError(f"Row fault rates add up to {total:.3f} (> 1)")
+        self.rates = dict(rates)
+        self.files = {}
+        self.totals = {
+            "orders": 0,
+            "order_items": 0,
+            "faults": {name: 0 for name in [*ROW_FAULTS, *FILE_FAULTS]},
+            "expected_rejections": {"orders": {}, "order_items": {}},
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return any(rate > 0 for rate in self.rates.values())
+
+    def _pick_fault(self) -> str | None:
+        draw = random.random()
+        for name in ROW_FAULTS:
+            draw -= self.rates.get(name, 0.0)
+            if draw < 0:
+                return name
+        return None
+
+    def apply(self, unit_dir: str, orders: list[dict], items: list[dict]) -> tuple[list[dict], list[dict], bool]:
+        """
+        Inject faults into one unit-day.
+
+        Returns (orders, items, truncate) where truncate means pedido.csv must be
+        cut with truncate_last_row after serialization.
+        """
+        if not self.enabled or not orders:
+            return orders, items, False
+
+        truncate = random.random() < self.rates.get("truncated_file", 0.0)
+        # The last row is the one truncation cuts; keep it otherwise clean
+        candidates = orders[:-1] if truncate else orders
+
+        items_by_order = {}
+        for item in items:
+            items_by_order.setdefault(item["Id_Pedido"], []).append(item)
+
+        faults = []
+        out_orders = []
+        out_items = list(items)
+        rejected_order_ids = []
+
+        for position, order in enumerate(orders):
+            fault = self._pick_fault() if position < len(candidates) else None
+            row = dict(order)
+            detail = {}
+            if fault == "null_required":
+                field = random.choice(NULLABLE_FIELDS)
+                row[field] = None
+                detail["field"] = field
+            elif fault == "invalid_status":
+                row["Status"] = random.choice(BAD_STATUSES)
+            elif fault == "invalid_order_type":
+                row["Tipo_Pedido"] = random.choice(BAD_ORDER_TYPES)
+            elif fault == "malformed_date":
+                row["Data_Pedido"] = random.choice(BAD_DATES)
+            elif fault == "orphan_item":
+                template = random.choice(items_by_order.get(order["Id_Pedido"], items))
+                orphan_order_id = str(uuid.UUID(int=random.getrandbits(128), version=4))
+                out_items.append({**template, "Id_Pedido": orphan_order_id,
+                                  "Id_Item_Pedido": str(uuid.UUID(int=random.getrandbits(128), version=4))})
+                detail.update({"id": orphan_order_id, "line": len(out_items) + 1})
+
+            out_orders.append(row)
+            if fault is None:
+                continue
+            if fault != "orphan_item":
+                detail.update({"id": order["Id_Pedido"], "line": len(out_orders) + 1})
+            if fault == "duplicate_order":
+                out_orders.append(dict(order))
+                detail["line"] = len(out_orders) + 1
+            elif ROW_FAULTS[fault] is not None:
+                rejected_order_ids.append(order["Id_Pedido"])
+            faults.append({"fault": fault, "table": "order_items" if fault == "orphan_item" else "orders",
+                           **detail})
+
+        if truncate:
+            last = orders[-1]
+            rejected_order_ids.append(last["Id_Pedido"])
+            faults.append({"fault": "truncated_file", "table": "orders", "id": last["Id_Pedido"],
+                           "line": len(out_orders) + 1})
+
+        self._record(unit_dir, out_orders, out_items, faults, rejected_order_ids, items_by_order)
+        return out_orders, out_items, truncate
+
+    def _record(self, unit_dir, orders, items, faults, rejected_order_ids, items_by_order) -> None:
+        expected = {"orders": {}, "order_items": {}}
+        for fault in faults:
+            name = fault["fault"]
+            rule = ROW_FAULTS.get(name) or FILE_FAULTS.get(name) or ORPHAN_RULE
+            table = fault["table"]
+            expected[table][rule] = expected[table].get(rule, 0) + 1
+            self.totals["faults"][name] += 1
+
+        # Items of a rejected order lose their parent
+        orphaned = sum(len(items_by_order.get(order_id, [])) for order_id in rejected_order_ids)
+        if orphaned:
+            expected["order_items"][ORPHAN_RULE] = expected["order_items"].get(ORPHAN_RULE, 0) + orphaned
+
+        self.totals["orders"] += len(orders)
+        self.totals["order_items"] += len(items)
+        for table, rules in expected.items():
+            totals = self.totals["expected_rejections"][table]
+            for rule, count in rules.items():
+                totals[rule] = totals.get(rule, 0) + count
+
+        if faults:
+            self.files[unit_dir] = {
+                "orders": len(orders),
+                "order_items": len(items),
+                "faults": faults,
+                "expected_rejections": expected,
+            }
+
+    def manifest(self) -> dict:
+        return {"rates": self.rates, "totals": self.totals, "files": self.files}
+
+    def write_manifest(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.manifest(), f, indent=2)
@@ -12,11 +12,17 @@ Produces CSV files matching the schema defined in case_CaseFicticio.md:
   - estado.csv: States (reference)
   - pais.csv: Countries (reference)
 
+By default files are written under --output-dir for upload_fake_data_to_gcs.py.
+With --stream-to, each unit-day is uploaded from memory while generation
+continues (see stream_upload.py), so nothing is staged on local disk.
+
 Usage:
     python generate_fake_sales.py
     python generate_fake_sales.py --units 5 --days 7 --min-orders 5 --max-orders 10
     python generate_fake_sales.py --start-date 2026-01-01 --end-date 2026-01-31
     python generate_fake_sales.py --output-dir ./test_data --seed 42
+    python generate_fake_sales.py --profile skewed --seed 42
+    python generate_fake_sales.py --stream-to gs://case_ficticio-datalake-485810 --upload-workers 16
 
 Author: Arthur Graf -- Case Fictício - Teste Project
 Date: January 2026
@@ -24,14 +30,21 @@ Date: January 2026
 
 import argparse
 import os
-import uuid
 import random
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 from faker import Faker
 
+from id_factory import IdFactory
+from load_profiles import LoadProfile, PROFILES
+from fault_injection import FaultInjector, FAULT_PRESETS, parse_rates, truncate_last_row
+from corrections import CorrectionPlanner
+from generation_manifest import ManifestWriter, file_record
+from stream_upload import StreamUploader, open_bucket, DEFAULT_WORKERS, DEFAULT_QUEUE_SIZE
+
 # ============================================================================
 # CONSTANTS -- Product Catalog (Health/Slow-Food themed)
 # ============================================================================
@@ -176,14 +189,25 @@ def generate_orders_for_unit_day(
     date: datetime,
     min_orders: int,
     max_orders: int,
+    ids: IdFactory | None = None,
+    profile: LoadProfile | None = None,
 ) -> tuple[list[dict], list[dict]]:
-    """Generate orders and order items for one unit on one day."""
-    num_orders = random.randint(min_orders, max_orders)
+    """Generate orders and order items for one unit on one day.
+
+    Order and item ids come from ``ids``; when omitted, a factory seeded from
+    the Faker instance is used so a seeded Faker still gives the same ids.
+    The order count and product mix follow ``profile`` (default: uniform).
+    """
+    if ids is None:
+        ids = IdFactory(fake.random.getrandbits(64), batch_size=256)
+    if profile is None:
+        profile = LoadProfile("uniform")
+
+    num_orders = profile.order_count(unit_id, date, min_orders, max_orders)
     orders = []
     items = []
 
-    for _ in range(num_orders):
-        order_id = str(uuid.uuid4())
+    for order_id in ids.take(num_orders):
         order_type = random.choices(ORDER_TYPE_CHOICES, weights=ORDER_TYPE_WEIGHTS, k=1)[0]
         status = random.choices(STATUS_CHOICES, weights=STATUS_WEIGHTS, k=1)[0]
 
@@ -193,7 +217,7 @@ def generate_orders_for_unit_day(
         total_items_value = 0.0
 
         for _ in range(num_items):
-            product = random.choice(PRODUCT_CATALOG)
+            product = profile.pick_product(PRODUCT_CATALOG)
             qty = random.randint(1, 3)
             item_value = product["price"]
             total_item = round(qty * item_value, 2)
@@ -204,7 +228,7 @@ def generate_orders_for_unit_day(
 
             order_items.append({
                 "Id_Pedido": order_id,
-                "Id_Item_Pedido": str(uuid.uuid4()),
+                "Id_Item_Pedido": ids.next(),
                 "Id_Produto": product["id"],
                 "Qtd": qty,
                 "Vlr_Item": f"{item_value:.2f}",
@@ -241,42 +265,73 @@ def generate_orders_for_unit_day(
 # REFERENCE DATA GENERATORS
 # ============================================================================
 
-def generate_reference_data(units: list[dict], output_dir: Path) -> None:
-    """Generate all static reference data CSVs."""
-    ref_dir = output_dir / "reference_data"
-    ref_dir.mkdir(parents=True, exist_ok=True)
-
-    # produto.csv
-    df_products = pd.DataFrame([
-        {"Id_Produto": p["id"], "Nome_Produto": p["name"]}
-        for p in PRODUCT_CATALOG
-    ])
-    df_products.to_csv(ref_dir / "produto.csv", index=False, sep=";", encoding="utf-8")
-    print(f"  [OK] produto.csv: {len(df_products)} products")
-
-    # unidade.csv
-    df_units = pd.DataFrame([
-        {"Id_Unidade": u["id"], "Nome_Unidade": u["name"], "Id_Estado": u["state_id"]}
-        for u in units
-    ])
-    df_units.to_csv(ref_dir / "unidade.csv", index=False, sep=";", encoding="utf-8")
-    print(f"  [OK] unidade.csv: {len(df_units)} units")
-
-    # estado.csv
-    df_states = pd.DataFrame([
-        {"Id_Estado": s["id"], "Id_Pais": s["country_id"], "Nome_Estado": s["name"]}
-        for s in STATES
-    ])
-    df_states.to_csv(ref_dir / "estado.csv", index=False, sep=";", encoding="utf-8")
-    print(f"  [OK] estado.csv: {len(df_states)} states")
-
-    # pais.csv
-    df_countries = pd.DataFrame([
-        {"Id_Pais": c["id"], "Nome_Pais": c["name"]}
-        for c in COUNTRIES
-    ])
-    df_countries.to_csv(ref_dir / "pais.csv", index=False, sep=";", encoding="utf-8")
-    print(f"  [OK] pais.csv: {len(df_countries)} countries")
+def to_csv_bytes(rows: list[dict]) -> bytes:
+    """Serialize rows as the semicolon-separated UTF-8 CSV the units send."""
+    return pd.DataFrame(rows).to_csv(index=False, sep=";").encode("utf-8")
+
+
+def emit_file(
+    relative_path: str,
+    data: bytes,
+    output_dir: Path,
+    uploader: StreamUploader | None = None,
+    manifest: ManifestWriter | None = None,
+    rows: list[dict] | None = None,
+    object_name: str | None = None,
+    wave: int = 0,
+) -> None:
+    """
+    Write a generated file under output_dir, or queue it for upload, and record
+    it in the manifest.
+
+    object_name is the GCS object the file ends up as (default: raw/<relative_path>).
+    """
+    object_name = object_name or f"raw/{relative_path}"
+    if uploader is not None:
+        uploader.put(object_name, data)
+    else:
+        path = output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    if manifest is not None:
+        local_path = relative_path if uploader is None else None
+        manifest.write(file_record(object_name, local_path, data, rows or [], wave))
+
+
+def generate_reference_data(
+    units: list[dict],
+    output_dir: Path,
+    uploader: StreamUploader | None = None,
+    manifest: ManifestWriter | None = None,
+) -> int:
+    """Generate all static reference data CSVs. Returns the bytes produced."""
+    tables = {
+        "produto.csv": [
+            {"Id_Produto": p["id"], "Nome_Produto": p["name"]}
+            for p in PRODUCT_CATALOG
+        ],
+        "unidade.csv": [
+            {"Id_Unidade": u["id"], "Nome_Unidade": u["name"], "Id_Estado": u["state_id"]}
+            for u in units
+        ],
+        "estado.csv": [
+            {"Id_Estado": s["id"], "Id_Pais": s["country_id"], "Nome_Estado": s["name"]}
+            for s in STATES
+        ],
+        "pais.csv": [
+            {"Id_Pais": c["id"], "Nome_Pais": c["name"]}
+            for c in COUNTRIES
+        ],
+    }
+    labels = {"produto.csv": "products", "unidade.csv": "units", "estado.csv": "states", "pais.csv": "countries"}
+
+    total_bytes = 0
+    for file_name, rows in tables.items():
+        data = to_csv_bytes(rows)
+        emit_file(f"reference_data/{file_name}", data, output_dir, uploader, manifest, rows)
+        total_bytes += len(data)
+        print(f"  [OK] {file_name}: {len(rows)} {labels[file_name]}")
+    return total_bytes
 
 
 # ============================================================================
@@ -291,8 +346,28 @@ def generate_sales_data(
     max_orders: int,
     output_dir: Path,
     seed: int | None = None,
+    uploader: StreamUploader | None = None,
+    profile: LoadProfile | None = None,
+    faults: FaultInjector | None = None,
+    corrections: CorrectionPlanner | None = None,
+    correction_delay: float = 0.0,
+    manifest: ManifestWriter | None = None,
 ) -> dict:
-    """Generate all sales data (orders + items) for all units across date range."""
+    """
+    Generate all sales data (orders + items) for all units across date range.
+
+    ``profile`` shapes per-unit and per-day volume and product popularity
+    (see load_profiles.py); the default is uniform. ``faults`` corrupts rows
+    and files and records the ground truth (see fault_injection.py).
+    ``corrections`` re-sends a fraction of the unit-days with modified rows
+    after all originals (see corrections.py): under corrections/wave_NN/
+    locally, or to the original object paths in streaming mode, flushing and
+    waiting ``correction_delay`` seconds before each wave. Every file is
+    recorded in ``manifest`` as it is emitted (see generation_manifest.py).
+
+    With an uploader, each unit-day's CSVs are queued for upload as soon as
+    they are generated instead of being written under output_dir.
+    """
 
     if seed is not None:
         random.seed(seed)
@@ -302,12 +377,23 @@ def generate_sales_data(
     if seed is not None:
         fake.seed_instance(seed)
 
+    # One factory for the whole run: ids are reproducible under --seed and
+    # generated in batches instead of one os.urandom call per row. The start
+    # date is mixed in so seeded runs over different ranges do not share ids.
+    ids = IdFactory(None if seed is None else [seed, start_date.toordinal()])
+
+    if profile is None:
+        profile = LoadProfile("uniform")
+    profile.assign_units([unit["id"] for unit in units])
+
     stats = {
         "total_orders": 0,
         "total_items": 0,
         "total_files": 0,
         "units_processed": 0,
         "days_processed": 0,
+        "total_bytes": 0,
+        "corrected_files": 0,
     }
 
     current_date = start_date
@@ -324,6 +410,7 @@ def generate_sales_data(
     print(f"  Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     print(f"  Days: {len(dates)}")
     print(f"  Orders per unit per day: {min_orders}-{max_orders}")
+    print(f"  Load profile: {profile.name}")
     print()
 
     for date in dates:
@@ -333,8 +420,7 @@ def generate_sales_data(
 
         for unit in units:
             unit_id = unit["id"]
-            unit_dir = output_dir / "csv_sales" / year / month / day / f"unit_{unit_id:03d}"
-            unit_dir.mkdir(parents=True, exist_ok=True)
+            unit_dir = f"csv_sales/{year}/{month}/{day}/unit_{unit_id:03d}"
 
             orders, items = generate_orders_for_unit_day(
                 fake=fake,
@@ -342,25 +428,22 @@ def generate_sales_data(
                 date=date,
                 min_orders=min_orders,
                 max_orders=max_orders,
+                ids=ids,
+                profile=profile,
             )
 
-            # Write pedido.csv
-            df_orders = pd.DataFrame(orders)
-            df_orders.to_csv(
-                unit_dir / "pedido.csv",
-                index=False,
-                sep=";",
-                encoding="utf-8",
-            )
+            truncate = False
+            if faults is not None:
+                orders, items, truncate = faults.apply(f"raw/{unit_dir}", orders, items)
+            if corrections is not None:
+                corrections.observe(unit_dir, orders, items)
 
-            # Write item_pedido.csv
-            df_items = pd.DataFrame(items)
-            df_items.to_csv(
-                unit_dir / "item_pedido.csv",
-                index=False,
-                sep=";",
-                encoding="utf-8",
-            )
+            for file_name, rows in (("pedido.csv", orders), ("item_pedido.csv", items)):
+                data = to_csv_bytes(rows)
+                if truncate and file_name == "pedido.csv":
+                    data = truncate_last_row(data)
+                emit_file(f"{unit_dir}/{file_name}", data, output_dir, uploader, manifest, rows)
+                stats["total_bytes"] += len(data)
 
             stats["total_orders"] += len(orders)
             stats["total_items"] += len(items)
@@ -368,27 +451,52 @@ def generate_sales_data(
 
         print(f"  [OK] {date.strftime('%Y-%m-%d')}: {len(units)} units processed")
 
+    if corrections is not None:
+        current_wave = 0
+        for wave, unit_dir, orders, items in corrections.corrected_files():
+            if wave != current_wave:
+                current_wave = wave
+                if uploader is not None:
+                    # Originals (and earlier waves) must land before the re-sends
+                    uploader.flush()
+                    time.sleep(correction_delay)
+                print(f"  [OK] Corrections wave {wave}")
+            prefix = unit_dir if uploader is not None else f"corrections/wave_{wave:02d}/{unit_dir}"
+            for file_name, rows in (("pedido.csv", orders), ("item_pedido.csv", items)):
+                data = to_csv_bytes(rows)
+                emit_file(f"{prefix}/{file_name}", data, output_dir, uploader, manifest, rows,
+                          object_name=f"raw/{unit_dir}/{file_name}", wave=wave)
+                stats["total_bytes"] += len(data)
+                stats["corrected_files"] += 1
+
     return stats
 
 
-def print_summary(stats: dict, output_dir: Path) -> None:
+def print_summary(stats: dict, output_dir: Path, upload_stats: dict | None = None, target: str = "") -> None:
     """Print generation summary."""
     print("\n" + "=" * 60)
     print("GENERATION COMPLETE -- SUMMARY")
     print("=" * 60)
-    print(f"  Output directory:  {output_dir.resolve()}")
+    if upload_stats is None:
+        print(f"  Output directory:  {output_dir.resolve()}")
+    else:
+        print(f"  Streamed to:       {target}")
     print(f"  Units processed:   {stats['units_processed']}")
     print(f"  Days processed:    {stats['days_processed']}")
     print(f"  Total orders:      {stats['total_orders']:,}")
     print(f"  Total items:       {stats['total_items']:,}")
     print(f"  Total CSV files:   {stats['total_files']:,}")
+    if stats.get("corrected_files"):
+        print(f"  Corrected files:   {stats['corrected_files']:,} (re-sent after the originals)")
     print()
 
-    # Estimate total size
-    total_size = 0
-    for root, dirs, files in os.walk(output_dir):
-        for f in files:
-            total_size += os.path.getsize(os.path.join(root, f))
+    # Size of everything generated (counted while writing, no rescan)
+    total_size = stats["total_bytes"] + stats.get("reference_bytes", 0)
+    if upload_stats is not None:
+        print(f"  Objects uploaded:  {upload_stats['uploaded']:,}")
+        print(f"  Upload failures:   {len(upload_stats['failed']):,}")
+        print(f"  Wall time:         {upload_stats['elapsed_seconds']:.1f}s "
+              f"(generator blocked on full queue {upload_stats['producer_blocked_seconds']:.1f}s)")
 
     size_mb = total_size / (1024 * 1024)
     print(f"  Total size:        {size_mb:.2f} MB")
@@ -419,6 +527,18 @@ Examples:
 
   # Reproducible output
   python generate_fake_sales.py --seed 42
+
+  # Production-like skew: Zipf unit sizes/products, weekday + holiday seasonality, bursts
+  python generate_fake_sales.py --profile production --seed 42
+
+  # Dirty data for validation/quarantine benchmarks (writes fault_manifest.json)
+  python generate_fake_sales.py --faults heavy --seed 42
+
+  # Re-send 5% of unit-days with corrections in two later waves
+  python generate_fake_sales.py --corrections 0.05 --correction-waves 2 --seed 42
+
+  # Generate straight into the landing zone (no local files)
+  python generate_fake_sales.py --stream-to gs://my-bucket --upload-workers 16
         """,
     )
 
@@ -470,11 +590,75 @@ Examples:
         default=None,
         help="Random seed for reproducible output (default: None)",
     )
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        default="uniform",
+        help="Load profile: unit/product skew, seasonality and burst days (default: uniform)",
+    )
+    parser.add_argument(
+        "--faults",
+        type=str,
+        default="none",
+        help=f"Dirty-data injection: a preset ({', '.join(FAULT_PRESETS)}) or "
+             "'fault=rate,...' e.g. 'invalid_status=0.01,truncated_file=0.02' (default: none)",
+    )
+    parser.add_argument(
+        "--corrections",
+        type=float,
+        default=0.0,
+        help="Fraction of unit-days re-sent later with status changes/corrected values "
+             "(writes expected_final_state.json; default: 0)",
+    )
+    parser.add_argument(
+        "--correction-waves",
+        type=int,
+        default=1,
+        help="Number of later upload waves the corrections are spread over (default: 1)",
+    )
+    parser.add_argument(
+        "--correction-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before each correction wave in --stream-to mode (default: 0)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Per-file generation manifest, JSON Lines (default: <output-dir>/manifest.jsonl)",
+    )
+    parser.add_argument(
+        "--fault-manifest",
+        type=str,
+        default=None,
+        help="Where to write the injected-fault ground truth (default: <output-dir>/fault_manifest.json)",
+    )
+    parser.add_argument(
+        "--stream-to",
+        type=str,
+        default=None,
+        help="Upload files as they are generated instead of writing --output-dir: "
+             "gs://<bucket>, or a local directory used as a bucket stand-in "
+             "(objects land under raw/)",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent uploaders in --stream-to mode (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"Files held in memory before generation waits for uploads (default: {DEFAULT_QUEUE_SIZE})",
+    )
 
     return parser.parse_args()
 
 
-def main() -> None:
+def main() -> int:
     """Main entry point."""
     args = parse_args()
 
@@ -492,12 +676,44 @@ def main() -> None:
 
     output_dir = Path(args.output_dir)
 
+    try:
+        injector = FaultInjector(parse_rates(args.faults))
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if not injector.enabled:
+        injector = None
+
+    try:
+        planner = CorrectionPlanner(args.corrections, args.correction_waves)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if not planner.enabled:
+        planner = None
+    elif injector is not None:
+        print("[ERROR] --corrections and --faults cannot be combined (the expected final state assumes clean rows)")
+        return 1
+
+    uploader = None
+    if args.stream_to:
+        uploader = StreamUploader(
+            open_bucket(args.stream_to, os.environ.get("GCP_PROJECT_ID")),
+            workers=args.upload_workers,
+            queue_size=args.queue_size,
+        )
+        print(f"\n[INFO] Streaming to {args.stream_to} "
+              f"({args.upload_workers} uploaders, queue of {args.queue_size} files)")
+
+    manifest_path = Path(args.manifest) if args.manifest else output_dir / "manifest.jsonl"
+    manifest = ManifestWriter(manifest_path)
+
     # Generate unit list
     units = generate_unit_list(args.units)
 
     # Generate reference data
     print("\nGenerating reference data:")
-    generate_reference_data(units, output_dir)
+    reference_bytes = generate_reference_data(units, output_dir, uploader, manifest)
 
     # Generate sales data
     stats = generate_sales_data(
@@ -508,11 +724,47 @@ def main() -> None:
         max_orders=args.max_orders,
         output_dir=output_dir,
         seed=args.seed,
+        uploader=uploader,
+        profile=LoadProfile(args.profile),
+        faults=injector,
+        corrections=planner,
+        correction_delay=args.correction_delay,
+        manifest=manifest,
     )
+    stats["reference_bytes"] = reference_bytes
+    manifest.close()
+
+    upload_stats = uploader.close() if uploader is not None else None
 
     # Print summary
-    print_summary(stats, output_dir)
+    print_summary(stats, output_dir, upload_stats, args.stream_to)
+    print(f"\n[INFO] Manifest: {manifest_path} ({manifest.records:,} files)")
+
+    if injector is not None:
+        manifest_path = Path(args.fault_manifest) if args.fault_manifest else output_dir / "fault_manifest.json"
+        injector.write_manifest(manifest_path)
+        totals = injector.totals
+        print(f"\n[INFO] Injected faults: " + ", ".join(f"{k}={v}" for k, v in totals["faults"].items() if v))
+        for table, rules in totals["expected_rejections"].items():
+            print(f"  Expected {table} rejections: {sum(rules.values()):,} {rules}")
+        print(f"  Ground truth: {manifest_path}")
+
+    if planner is not None:
+        final_state_path = output_dir / "expected_final_state.json"
+        planner.write_final_state(final_state_path)
+        print(f"\n[INFO] Re-sent unit-days: {len(planner.selected):,} "
+              f"({len(planner.corrected_orders):,} orders changed)")
+        print(f"  Expected final state: {final_state_path}")
+        if uploader is None:
+            print("  Upload the originals first, then each wave in order:")
+            print(f"    python scripts/upload_fake_data_to_gcs.py --local-dir {output_dir} --corrections-wave 1")
+
+    if upload_stats and upload_stats["failed"]:
+        for blob_name, error in upload_stats["failed"][:10]:
+            print(f"  [ERROR] {blob_name}: {error}")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    exit(main())
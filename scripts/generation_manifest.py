@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Generation Manifest
+==================================
+
+JSON Lines manifest written by generate_fake_sales.py while it generates: one
+record per emitted file, computed from the bytes already in memory (no second
+pass over disk):
+
+  {"object": "raw/csv_sales/2026/01/15/unit_001/pedido.csv",
+   "path": "csv_sales/2026/01/15/unit_001/pedido.csv",
+   "table": "orders", "unit_id": 1, "rows": 23, "bytes": 2210,
+   "crc32c": "Nks/tw==", "min_date": "2026-01-15", "max_date": "2026-01-15",
+   "total_value": 1234.5, "wave": 0}
+
+  object       GCS object name the file is uploaded to (= Bronze _source_file)
+  path         location relative to the generator's --output-dir
+  crc32c       base64 CRC32C, same format as blob.crc32c
+  total_value  orders: sum(Vlr_Pedido); items: sum(Qtd * Vlr_Item)
+  quantity     items only: sum(Qtd)
+  wave         0 for originals, N for corrections wave N (same object, re-sent)
+
+Consumers:
+  upload_fake_data_to_gcs.py  uploads the listed files (no directory scan) and
+                              sends each CRC32C so GCS verifies the upload
+  this script --check-bronze  one GROUP BY _source_file query per Bronze table
+                              compared to the manifest row counts
+
+Usage:
+    python scripts/generation_manifest.py output/manifest.jsonl
+    python scripts/generation_manifest.py output/manifest.jsonl --check-bronze
+
+Requirements:
+    pip install google-crc32c google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import base64
+import json
+from pathlib import Path
+
+import google_crc32c
+import yaml
+
+TABLES = {"pedido.csv": "orders", "item_pedido.csv": "order_items"}
+REFERENCE_TABLE = "reference"
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def crc32c_base64(data: bytes) -> str:
+    """CRC32C of data, base64-encoded like GCS object metadata."""
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode("ascii")
+
+
+def file_record(object_name: str, path: str, data: bytes, rows: list[dict], wave: int = 0) -> dict:
+    """Build the manifest record for one generated file from its rows and bytes."""
+    table = TABLES.get(object_name.rsplit("/", 1)[-1], REFERENCE_TABLE)
+    record = {
+        "object": object_name,
+        "path": path,
+        "table": table,
+        "rows": len(rows),
+        "bytes": len(data),
+        "crc32c": crc32c_base64(data),
+        "wave": wave,
+    }
+    if table == "orders":
+        dates = [row["Data_Pedido"] for row in rows if row.get("Data_Pedido")]
+        record["unit_id"] = rows[0]["Id_Unidade"] if rows else None
+        record["min_date"] = min(dates) if dates else None
+        record["max_date"] = max(dates) if dates else None
+        record["total_value"] = round(sum(_float(row.get("Vlr_Pedido")) for row in rows), 2)
+    elif table == "order_items":
+        record["quantity"] = sum(int(_float(row.get("Qtd"))) for row in rows)
+        record["total_value"] = round(
+            sum(_float(row.get("Qtd")) * _float(row.get("Vlr_Item")) for row in rows), 2
+        )
+    return record
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ManifestWriter:
+    """Appends one JSON line per file as it is produced."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w', encoding="utf-8")
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, record: dict) -> None:
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.records += 1
+        self.bytes += record["bytes"]
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_manifest(path: Path) -> list[dict]:
+    """Read every record of a manifest file."""
+    with open(path, 'r', encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records: list[dict]) -> dict:
+    """Totals per table (original files and re-sent corrections counted separately)."""
+    summary = {}
+    for record in records:
+        key = record["table"] if not record.get("wave") else f"{record['table']} (corrections)"
+        totals = summary.setdefault(key, {"files": 0, "rows": 0, "bytes": 0, "total_value": 0.0})
+        totals["files"] += 1
+        totals["rows"] += record["rows"]
+        totals["bytes"] += record["bytes"]
+        totals["total_value"] = round(totals["total_value"] + record.get("total_value", 0.0), 2)
+    return summary
+
+
+# ============================================================================
+# BRONZE COMPLETENESS
+# ============================================================================
+
+def expected_bronze_rows(records: list[dict]) -> dict:
+    """table -> {_source_file: rows}, every upload of an object counted (Bronze appends)."""
+    expected = {"orders": {}, "order_items": {}}
+    for record in records:
+        if record["table"] in expected:
+            by_file = expected[record["table"]]
+            by_file[record["object"]] = by_file.get(record["object"], 0) + record["rows"]
+    return expected
+
+
+def compare_bronze(expected: dict, actual: dict) -> list[str]:
+    """Describe every object whose Bronze row count differs from the manifest."""
+    problems = []
+    for table, by_file in expected.items():
+        loaded = actual.get(table, {})
+        for source_file, rows in sorted(by_file.items()):
+            got = loaded.get(source_file, 0)
+            if got != rows:
+                problems.append(f"{table}: {source_file} has {got} rows in Bronze, manifest says {rows}")
+    return problems
+
+
+def bronze_counts(client, project_id: str, dataset: str, table: str) -> dict:
+    """Rows per _source_file in one Bronze table (reads only the _source_file column)."""
+    sql = f"""
+        SELECT _source_file, COUNT(*) AS row_count
+        FROM `{project_id}.{dataset}.{table}`
+        GROUP BY _source_file
+    """
+    return {row["_source_file"]: row["row_count"] for row in client.query(sql).result()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarize a generation manifest and check Bronze completeness"
+    )
+    parser.add_argument(
+        "manifest",
+        help="Path to manifest.jsonl written by generate_fake_sales.py"
+    )
+    parser.add_argument(
+        "--check-bronze",
+        action="store_true",
+        help="Compare Bronze row counts per _source_file with the manifest"
+    )
+    args = parser.parse_args()
+
+    records = read_manifest(Path(args.manifest))
+    print(f"[INFO] {len(records):,} files in {args.manifest}")
+    for table, totals in summarize(records).items():
+        print(f"  {table:<26} files={totals['files']:>7,}  rows={totals['rows']:>10,}  "
+              f"bytes={totals['bytes']:>12,}  value={totals['total_value']:>14,.2f}")
+
+    if not args.check_bronze:
+        return 0
+
+    # Imported here so the generator can use this module without the BigQuery SDK
+    from google.cloud import bigquery
+    try:
+        config = load_config()
+        project_id = config['project']['id']
+        dataset = config['bigquery']['datasets']['bronze']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    client = bigquery.Client(project=project_id)
+    actual = {table: bronze_counts(client, project_id, dataset, table)
+              for table in ("orders", "order_items")}
+    problems = compare_bronze(expected_bronze_rows(records), actual)
+    if problems:
+        for problem in problems[:50]:
+            print(f"  [WARN] {problem}")
+        print(f"[ERROR] {len(problems):,} files incomplete in Bronze "
+              "(rows rejected by validation are expected to be missing)")
+        return 1
+    print("[OK] Every manifest file is fully loaded in Bronze")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
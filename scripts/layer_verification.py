@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Metadata-Based Layer Verification
+================================================
+
+Verifies Bronze, Silver and Gold tables from table metadata instead of
+running one COUNT(*) query job per table:
+
+  1. Collects row count, size, partition count and last-modified time for
+     every table concurrently (tables.get + the partition summary, both free
+     metadata reads -- no query jobs, no bytes billed)
+  2. Checks the row-count ratios expected between layers (RATIO_CHECKS):
+     Silver dedups Bronze, Gold facts mirror Silver one-to-one, items per
+     order stay in the generator's range, ...
+  3. Stops at the first anomaly (missing table or ratio out of range)
+     unless --all-checks is given
+
+num_rows is exact for native tables without a streaming buffer. Other tables
+are flagged "~" and, when a QueryCache is passed, recounted with a cached
+COUNT(*) (see scripts/query_cache.py).
+
+Usage:
+    python scripts/layer_verification.py
+    python scripts/layer_verification.py --layer silver --layer gold
+    python scripts/layer_verification.py --all-checks
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import sys
+import time
+import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery
+
+
+LAYERS = ["bronze", "silver", "gold"]
+
+LAYER_TABLES = {
+    "bronze": ["orders", "order_items", "products", "units", "states", "countries"],
+    "silver": ["products", "units", "states", "countries", "orders", "order_items"],
+    "gold": [
+        "dim_date", "dim_product", "dim_unit", "dim_geography",
+        "fact_sales", "fact_order_items",
+        "agg_daily_sales", "agg_unit_performance", "agg_product_performance",
+        "agg_daily_product_sketches", "agg_sales_cube",
+    ],
+}
+
+# (numerator, denominator, min ratio, max ratio or None) over "layer.table" row counts
+RATIO_CHECKS = [
+    # Silver keeps the latest version per id. The lower bound allows every
+    # file to have been loaded up to 4 times; there is no upper bound because
+    # Bronze partitions expire after 730 days while Silver keeps the history.
+    ("silver.orders", "bronze.orders", 0.25, None),
+    ("silver.order_items", "bronze.order_items", 0.25, None),
+    # Reference tables only drop rows with a NULL id
+    ("silver.products", "bronze.products", 0.9, 1.0),
+    ("silver.units", "bronze.units", 0.9, 1.0),
+    # generate_fake_sales.py writes 1-5 items per order
+    ("silver.order_items", "silver.orders", 1.0, 5.0),
+    # Gold facts mirror Silver row for row
+    ("gold.fact_sales", "silver.orders", 1.0, 1.0),
+    ("gold.fact_order_items", "silver.order_items", 0.99, 1.0),
+    # SCD Type 2 dimensions: one current version per Silver row plus history
+    ("gold.dim_product", "silver.products", 1.0, None),
+    ("gold.dim_unit", "silver.units", 1.0, None),
+]
+
+DEFAULT_WORKERS = 16
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+# ============================================================================
+# METADATA COLLECTION
+# ============================================================================
+
+def table_stats(client, table_id: str) -> dict:
+    """Row count, size, partition count and modified time from metadata."""
+    table = client.get_table(table_id)
+    partitions = None
+    if table.time_partitioning is not None or table.range_partitioning is not None:
+        partitions = len(client.list_partitions(table))
+    return {
+        "table_id": table_id,
+        "table": table,
+        "rows": table.num_rows,
+        "bytes": table.num_bytes,
+        "partitions": partitions,
+        "modified": table.modified,
+        "exact": table.table_type == "TABLE" and table.streaming_buffer is None,
+    }
+
+
+def collect_metadata(client, tables: dict, workers: int = DEFAULT_WORKERS,
+                     fail_fast: bool = True) -> tuple[dict, list[str]]:
+    """
+    Fetch table_stats for every table concurrently.
+
+    Args:
+        tables: "layer.table" name -> fully qualified table id
+        fail_fast: Cancel outstanding lookups at the first missing table
+
+    Returns:
+        (stats by name, anomalies)
+    """
+    stats = {}
+    anomalies = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(table_stats, client, table_id): name for name, table_id in tables.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                stats[name] = future.result()
+            except NotFound:
+                anomalies.append(f"{name}: table not found")
+            except Exception as e:
+                anomalies.append(f"{name}: metadata lookup failed ({e})")
+            if anomalies and fail_fast:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return stats, anomalies
+
+
+def recount_inexact(stats: dict, cache) -> None:
+    """Replace approximate metadata counts with (cached) COUNT(*) results."""
+    for entry in stats.values():
+        if not entry["exact"]:
+            entry["rows"] = cache.row_count(entry["table_id"])
+            entry["exact"] = True
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def check_ratios(stats: dict, fail_fast: bool = True) -> list[str]:
+    """Compare layer row counts against RATIO_CHECKS (skips checks with missing tables)."""
+    anomalies = []
+    for numerator, denominator, low, high in RATIO_CHECKS:
+        if numerator not in stats or denominator not in stats:
+            continue
+        num_rows = stats[numerator]["rows"] or 0
+        den_rows = stats[denominator]["rows"] or 0
+        if den_rows == 0:
+            if num_rows:
+                anomalies.append(f"{numerator} has {num_rows:,} rows but {denominator} is empty")
+        else:
+            ratio = num_rows / den_rows
+            if ratio < low or (high is not None and ratio > high):
+                expected = f"{low:g}-{high:g}" if high is not None else f">= {low:g}"
+                anomalies.append(f"{numerator}/{denominator} = {ratio:.3f} "
+                                 f"(expected {expected}; {num_rows:,} / {den_rows:,} rows)")
+        if anomalies and fail_fast:
+            break
+    return anomalies
+
+
+def checks_for(layers: list[str]) -> set[str]:
+    """Layers whose tables are needed to run the ratio checks touching `layers`."""
+    needed = set(layers)
+    for numerator, denominator, _, _ in RATIO_CHECKS:
+        if numerator.split(".")[0] in layers:
+            needed.add(denominator.split(".")[0])
+    return needed
+
+
+def verify_layers(client, project_id: str, datasets: dict, layers: list[str], cache=None,
+                  fail_fast: bool = True, workers: int = DEFAULT_WORKERS,
+                  layer_tables: dict | None = None) -> tuple[dict, list[str]]:
+    """
+    Collect metadata for `layers` (plus the upstream layers their ratio checks
+    compare against), print a report and return (stats, anomalies).
+
+    Args:
+        datasets: layer -> dataset id
+        cache: Optional QueryCache; recounts inexact tables and reuses the
+               fetched metadata for later row_count() calls
+        layer_tables: Overrides LAYER_TABLES per layer (e.g. only the tables
+                      a build script has created so far)
+    """
+    start = time.perf_counter()
+    layer_tables = {**LAYER_TABLES, **(layer_tables or {})}
+    tables = {
+        f"{layer}.{table}": f"{project_id}.{datasets[layer]}.{table}"
+        for layer in LAYERS if layer in checks_for(layers)
+        for table in layer_tables[layer]
+    }
+    stats, anomalies = collect_metadata(client, tables, workers, fail_fast)
+    if cache is not None:
+        for entry in stats.values():
+            cache.remember_table(entry["table_id"], entry["table"])
+        if not anomalies:
+            recount_inexact(stats, cache)
+    if not anomalies or not fail_fast:
+        anomalies += check_ratios(stats, fail_fast)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n  {'Table':<36} {'Rows':>10} {'MB':>9} {'Parts':>6}  Modified")
+    print(f"  {'-'*36} {'-'*10} {'-'*9} {'-'*6}  {'-'*19}")
+    for name in tables:
+        if name not in stats:
+            continue
+        entry = stats[name]
+        marker = "" if entry["exact"] else "~"
+        size_mb = (entry["bytes"] or 0) / (1024 * 1024)
+        parts = "-" if entry["partitions"] is None else entry["partitions"]
+        modified = entry["modified"].strftime('%Y-%m-%d %H:%M:%S') if entry["modified"] else "-"
+        print(f"  {name:<36} {marker + str(entry['rows']):>10} {size_mb:>9.2f} {parts:>6}  {modified}")
+        if entry["rows"] == 0:
+            print(f"  [WARN] {name} is empty")
+
+    print(f"\n  Collected {len(stats)}/{len(tables)} tables in {elapsed:.2f}s")
+    for anomaly in anomalies:
+        print(f"  [ERROR] {anomaly}")
+    if not anomalies:
+        print("  [OK] Layer ratio checks passed")
+    return stats, anomalies
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        datasets = config['bigquery']['datasets']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Verify Bronze/Silver/Gold tables from metadata and layer ratios"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--layer",
+        action="append",
+        choices=LAYERS,
+        help="Layer to verify (repeatable; default: all)"
+    )
+    parser.add_argument(
+        "--all-checks",
+        action="store_true",
+        help="Report every anomaly instead of stopping at the first"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent metadata lookups (default: {DEFAULT_WORKERS})"
+    )
+
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Case Fictício - Teste -- Layer Verification (metadata)")
+    print("="*60)
+    print(f"Project: {args.project}")
+
+    client = bigquery.Client(project=args.project)
+    _, anomalies = verify_layers(
+        client, args.project, datasets, args.layer or LAYERS,
+        fail_fast=not args.all_checks, workers=args.workers,
+    )
+    return 1 if anomalies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
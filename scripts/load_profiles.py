@@ -0,0 +1,143 @@
+"""
+Case Fictício - Teste -- Load Profiles for the Fake Data Generator
+=========================================================
+
+Named presets that shape how many orders each unit gets per day and which
+products they contain, so the pipeline and the SQL benchmarks can be run
+against realistic skew as well as uniform data:
+
+  uniform     every unit-day draws randint(min, max); products uniform
+              (the generator's original behaviour, same random draws)
+  skewed      Zipf-distributed unit sizes and product popularity
+  seasonal    weekday curve (quiet Mon/Tue, peak Fri-Sun) + national holidays
+  bursty      rare burst days with several times the normal volume
+  production  all of the above combined
+
+Unit sizes: each unit gets a Zipf rank (ranks shuffled across unit ids, so
+unit 1 is not always the largest) and a scale of 1/rank^s normalised to a
+mean of 1 -- total volume stays comparable across profiles while a few units
+dominate. The daily order count is randint(min, max) x unit scale x day factor.
+
+All randomness comes from the `random` module, which generate_fake_sales.py
+seeds with --seed, so profiled runs stay reproducible.
+
+Usage:
+    from load_profiles import LoadProfile, PROFILES
+
+    profile = LoadProfile("production")
+    profile.assign_units([1, 2, 3])
+    n = profile.order_count(unit_id, date, 10, 50)
+    product = profile.pick_product(PRODUCT_CATALOG)
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import random
+from datetime import date, datetime
+from itertools import accumulate
+
+# Mon..Sun multipliers (restaurant traffic: slow start of week, weekend peak)
+WEEKDAY_CURVE = [0.75, 0.8, 0.9, 1.0, 1.25, 1.4, 1.2]
+
+# Brazilian fixed-date national holidays (MM-DD)
+HOLIDAYS = {
+    "01-01", "04-21", "05-01", "09-07", "10-12", "11-02", "11-15", "11-20", "12-25",
+}
+
+PROFILE_DEFAULTS = {
+    "unit_zipf": 0.0,          # Zipf exponent for unit sizes (0 = all equal)
+    "product_zipf": 0.0,       # Zipf exponent for product popularity (0 = uniform)
+    "weekday_factors": [1.0] * 7,
+    "holiday_factor": 1.0,     # multiplier on HOLIDAYS
+    "burst_probability": 0.0,  # chance that a given day is a burst day
+    "burst_factor": 1.0,       # multiplier on burst days
+}
+
+PROFILES = {
+    "uniform": {},
+    "skewed": {"unit_zipf": 1.1, "product_zipf": 1.0},
+    "seasonal": {"weekday_factors": WEEKDAY_CURVE, "holiday_factor": 1.8},
+    "bursty": {"burst_probability": 0.05, "burst_factor": 4.0},
+    "production": {
+        "unit_zipf": 1.1,
+        "product_zipf": 1.0,
+        "weekday_factors": WEEKDAY_CURVE,
+        "holiday_factor": 1.8,
+        "burst_probability": 0.02,
+        "burst_factor": 3.0,
+    },
+}
+
+
+def zipf_weights(n: int, exponent: float) -> list[float]:
+    """Weights 1/rank^exponent for ranks 1..n, normalised to a mean of 1."""
+    raw = [1.0 / (rank ** exponent) for rank in range(1, n + 1)]
+    scale = n / sum(raw)
+    return [w * scale for w in raw]
+
+
+def is_holiday(day: date | datetime) -> bool:
+    return day.strftime("%m-%d") in HOLIDAYS
+
+
+class LoadProfile:
+    """Order-volume and product-mix shape for one generator run."""
+
+    def __init__(self, name: str = "uniform", **overrides):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown load profile '{name}' (choose from: {', '.join(PROFILES)})")
+        self.name = name
+        self.settings = {**PROFILE_DEFAULTS, **PROFILES[name], **overrides}
+        self.unit_scale = {}
+        self.day_factors = {}
+        self._product_order = None
+        self._product_cum_weights = None
+
+    @property
+    def is_uniform(self) -> bool:
+        return all(self.settings[k] == v for k, v in PROFILE_DEFAULTS.items())
+
+    def assign_units(self, unit_ids: list[int]) -> None:
+        """Give every unit a size scale (Zipf rank shuffled across units)."""
+        exponent = self.settings["unit_zipf"]
+        if exponent == 0:
+            self.unit_scale = {unit_id: 1.0 for unit_id in unit_ids}
+            return
+        weights = zipf_weights(len(unit_ids), exponent)
+        random.shuffle(weights)
+        self.unit_scale = dict(zip(unit_ids, weights))
+
+    def day_factor(self, day: date | datetime) -> float:
+        """Volume multiplier for a calendar day (same for every unit, cached)."""
+        key = day.strftime("%Y-%m-%d")
+        if key not in self.day_factors:
+            s = self.settings
+            factor = s["weekday_factors"][day.weekday()]
+            if is_holiday(day):
+                factor *= s["holiday_factor"]
+            if s["burst_probability"] > 0 and random.random() < s["burst_probability"]:
+                factor *= s["burst_factor"]
+            self.day_factors[key] = factor
+        return self.day_factors[key]
+
+    def order_count(self, unit_id: int, day: date | datetime, min_orders: int, max_orders: int) -> int:
+        """Number of orders for one unit-day."""
+        base = random.randint(min_orders, max_orders)
+        if self.is_uniform:
+            return base
+        scale = self.unit_scale.get(unit_id, 1.0) * self.day_factor(day)
+        # Small units still send a file every day (an empty pedido.csv would
+        # have no header and be rejected) unless the caller allows zero orders
+        return max(min(min_orders, 1), round(base * scale))
+
+    def pick_product(self, catalog: list[dict]) -> dict:
+        """Draw one product, Zipf-weighted by a popularity rank when configured."""
+        exponent = self.settings["product_zipf"]
+        if exponent == 0:
+            return random.choice(catalog)
+        if self._product_order is None:
+            # Popularity rank is fixed for the run (shuffled once, seeded)
+            self._product_order = random.sample(catalog, len(catalog))
+            self._product_cum_weights = list(accumulate(zipf_weights(len(catalog), exponent)))
+        return random.choices(self._product_order, cum_weights=self._product_cum_weights, k=1)[0]
@@ -4,25 +4,48 @@ Case Fictício - Teste -- Load Reference Data into BigQuery Bronze
 =======================================================
 
 Loads static reference data (products, units, states, countries) from GCS
-into BigQuery Bronze layer tables.
+(raw/reference_data/) into BigQuery Bronze layer tables. --local-dir loads
+the CSVs that generate_fake_sales.py wrote under <dir>/reference_data/
+instead (e.g. the sql_regression.py fixture).
+
+The four loads run concurrently, each with the explicit Bronze schema
+(sql/bronze/create_tables.sql) including _ingest_timestamp: the CSV bytes
+are streamed through the loader, which appends the ingestion timestamp to
+every row, so no ALTER TABLE round trip is needed after the load.
+
+Tables whose source CSV is unchanged are skipped: the object's CRC32C
+(read from GCS metadata, no download) is stored in the table label
+source_crc32c after each load and compared on the next run. --force
+reloads everything.
 
 Usage:
     python scripts/load_reference_data.py
     python scripts/load_reference_data.py --project sixth-foundry-485810-e5
+    python scripts/load_reference_data.py --force
+    python scripts/load_reference_data.py --local-dir output/fixture \
+        --dataset case_ficticio_bronze_fixture
 
 Requirements:
-    pip install google-cloud-bigquery pyyaml
+    pip install google-cloud-storage google-cloud-bigquery pyyaml
 
 Author: Arthur Graf -- Case Fictício - Teste Project
 Date: January 2026
 """
 
 import argparse
+import base64
+import io
 import sys
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from google.cloud import bigquery
-from datetime import datetime
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery, storage
+from datetime import datetime, timezone
+
+from query_cache import QueryCache
+from stream_upload import FilesystemBucket
 
 
 def load_config():
@@ -41,91 +64,166 @@ TABLE_MAPPING = {
     "pais.csv": "countries",
 }
 
+# Bronze schemas (CSV column order, then _ingest_timestamp)
+REFERENCE_SCHEMAS = {
+    "products": [
+        bigquery.SchemaField("id_produto", "INT64", mode="REQUIRED"),
+        bigquery.SchemaField("nome_produto", "STRING"),
+    ],
+    "units": [
+        bigquery.SchemaField("id_unidade", "INT64", mode="REQUIRED"),
+        bigquery.SchemaField("nome_unidade", "STRING"),
+        bigquery.SchemaField("id_estado", "INT64"),
+    ],
+    "states": [
+        bigquery.SchemaField("id_estado", "INT64", mode="REQUIRED"),
+        bigquery.SchemaField("id_pais", "INT64"),
+        bigquery.SchemaField("nome_estado", "STRING"),
+    ],
+    "countries": [
+        bigquery.SchemaField("id_pais", "INT64", mode="REQUIRED"),
+        bigquery.SchemaField("nome_pais", "STRING"),
+    ],
+}
+INGEST_FIELD = bigquery.SchemaField("_ingest_timestamp", "TIMESTAMP")
 
-def load_reference_tables(project_id, bucket_name, dataset_id="case_ficticio_bronze"):
-    """Load reference CSVs from GCS into BigQuery Bronze tables."""
-    print("\n" + "="*60)
-    print("Loading Reference Data into BigQuery Bronze")
-    print("="*60)
+CHECKSUM_LABEL = "source_crc32c"
 
-    client = bigquery.Client(project=project_id)
-    gcs_prefix = "raw/reference_data"
 
-    loaded_count = 0
-    total_rows = 0
+def crc32c_label(blob_crc32c: str) -> str:
+    """GCS base64 CRC32C as a label-safe hex string."""
+    return base64.b64decode(blob_crc32c).hex()
 
-    for csv_name, table_name in TABLE_MAPPING.items():
-        table_id = f"{project_id}.{dataset_id}.{table_name}"
-        uri = f"gs://{bucket_name}/{gcs_prefix}/{csv_name}"
 
-        print(f"\n[LOADING] {csv_name} -> {table_name}")
-        print(f"  Source: {uri}")
+def with_ingest_timestamp(csv_bytes: bytes, ingest_timestamp: datetime) -> bytes:
+    """Append an _ingest_timestamp column to a ';'-delimited CSV (header included)."""
+    stamp = ingest_timestamp.strftime("%Y-%m-%d %H:%M:%S.%f UTC").encode("utf-8")
+    lines = csv_bytes.decode("utf-8-sig").encode("utf-8").splitlines()
+    out = io.BytesIO()
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        out.write(line + b";" + (b"_ingest_timestamp" if i == 0 else stamp) + b"\n")
+    return out.getvalue()
+
+
+def load_reference_table(bq_client, bucket, csv_name, table_name, table_id, gcs_prefix,
+                         ingest_timestamp, force=False):
+    """
+    Load one reference CSV unless its checksum matches the last load.
+
+    Returns:
+        dict with table, status (LOADED / SKIPPED / FAILED), rows, crc32c,
+        elapsed_s and error
+    """
+    start = time.perf_counter()
+    result = {"table": table_name, "status": "FAILED", "rows": None, "crc32c": None, "error": None}
+    try:
+        blob = bucket.get_blob(f"{gcs_prefix}/{csv_name}")
+        if blob is None:
+            raise FileNotFoundError(f"gs://{bucket.name}/{gcs_prefix}/{csv_name} not found")
+        checksum = crc32c_label(blob.crc32c)
+        result["crc32c"] = checksum
 
-        # Configure load job
+        try:
+            table = bq_client.get_table(table_id)
+        except NotFound:
+            table = None
+        if not force and table is not None and table.labels.get(CHECKSUM_LABEL) == checksum:
+            result.update(status="SKIPPED", rows=table.num_rows)
+            return result
+
+        # Pin the generation whose checksum was read
+        csv_bytes = blob.download_as_bytes(if_generation_match=blob.generation)
         job_config = bigquery.LoadJobConfig(
+            schema=REFERENCE_SCHEMAS[table_name] + [INGEST_FIELD],
             skip_leading_rows=1,  # Skip header row
             source_format=bigquery.SourceFormat.CSV,
             field_delimiter=";",  # Brazilian CSV format
             write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,  # Replace existing data
-            autodetect=True,  # Auto-detect schema from CSV
         )
+        load_job = bq_client.load_table_from_file(
+            io.BytesIO(with_ingest_timestamp(csv_bytes, ingest_timestamp)), table_id, job_config=job_config
+        )
+        load_job.result()  # Wait for completion
 
-        try:
-            # Start load job
-            load_job = client.load_table_from_uri(uri, table_id, job_config=job_config)
-            load_job.result()  # Wait for completion
-
-            # Get updated table info
-            table = client.get_table(table_id)
-            row_count = table.num_rows
-            total_rows += row_count
-
-            print(f"  [OK] Loaded {row_count} rows into {table_id}")
-
-            # Try to add _ingest_timestamp if column doesn't exist
-            try:
-                alter_query = f"""
-                    ALTER TABLE `{table_id}`
-                    ADD COLUMN IF NOT EXISTS _ingest_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
-                """
-                alter_job = client.query(alter_query)
-                alter_job.result()
-                print(f"  [OK] Added _ingest_timestamp column")
-            except Exception as alter_error:
-                print(f"  [INFO] _ingest_timestamp column already exists or cannot be added")
-
-            loaded_count += 1
+        table = bq_client.get_table(table_id)
+        table.labels = {**(table.labels or {}), CHECKSUM_LABEL: checksum}
+        bq_client.update_table(table, ["labels"])
+        result.update(status="LOADED", rows=table.num_rows)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        result["elapsed_s"] = time.perf_counter() - start
+    return result
 
-        except Exception as e:
-            print(f"  [ERROR] Failed to load {csv_name}: {e}")
-            continue
+
+def load_reference_tables(project_id, bucket_name, dataset_id="case_ficticio_bronze", force=False,
+                          local_dir=None):
+    """Load reference CSVs from GCS (or local_dir) into BigQuery Bronze tables (concurrently)."""
+    print("\n" + "="*60)
+    print("Loading Reference Data into BigQuery Bronze")
+    print("="*60)
+
+    bq_client = bigquery.Client(project=project_id)
+    if local_dir is not None:
+        # generate_fake_sales.py writes raw/reference_data/* as <output-dir>/reference_data/*
+        bucket = FilesystemBucket(local_dir)
+        gcs_prefix = "reference_data"
+    else:
+        bucket = storage.Client(project=project_id).bucket(bucket_name)
+        gcs_prefix = "raw/reference_data"
+    ingest_timestamp = datetime.now(timezone.utc)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(TABLE_MAPPING)) as pool:
+        futures = [
+            pool.submit(load_reference_table, bq_client, bucket, csv_name, table_name,
+                        f"{project_id}.{dataset_id}.{table_name}", gcs_prefix, ingest_timestamp, force)
+            for csv_name, table_name in TABLE_MAPPING.items()
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    for (csv_name, _), result in zip(TABLE_MAPPING.items(), results):
+        label = f"{csv_name} -> {result['table']}"
+        if result["status"] == "LOADED":
+            print(f"  [OK]    {label:28} {result['rows']:>5} rows  crc32c={result['crc32c']}  {result['elapsed_s']:.2f}s")
+        elif result["status"] == "SKIPPED":
+            print(f"  [SKIP]  {label:28} unchanged (crc32c={result['crc32c']})  {result['elapsed_s']:.2f}s")
+        else:
+            print(f"  [ERROR] {label:28} {result['error']}")
+
+    loaded = [r for r in results if r["status"] == "LOADED"]
+    skipped = [r for r in results if r["status"] == "SKIPPED"]
+    ok = len(loaded) + len(skipped)
 
     print("\n" + "="*60)
     print("LOAD SUMMARY")
     print("="*60)
-    print(f"  Tables loaded:  {loaded_count}/{len(TABLE_MAPPING)}")
-    print(f"  Total rows:     {total_rows}")
+    print(f"  Tables loaded:  {len(loaded)}/{len(TABLE_MAPPING)} ({len(skipped)} unchanged)")
+    print(f"  Total rows:     {sum(r['rows'] or 0 for r in loaded)}")
     print(f"  Dataset:        {dataset_id}")
+    print(f"  Elapsed:        {elapsed:.2f}s")
     print("="*60)
 
-    return loaded_count == len(TABLE_MAPPING)
+    return ok == len(TABLE_MAPPING)
 
 
-def verify_reference_data(project_id, dataset_id="case_ficticio_bronze"):
+def verify_reference_data(project_id, dataset_id="case_ficticio_bronze", cache=None):
     """Verify reference data row counts in BigQuery."""
     print("\n" + "="*60)
     print("Verification - Reference Data Row Counts")
     print("="*60)
 
-    client = bigquery.Client(project=project_id)
+    if cache is None:
+        cache = QueryCache(bigquery.Client(project=project_id), enabled=False)
 
     for csv_name, table_name in TABLE_MAPPING.items():
         table_id = f"{project_id}.{dataset_id}.{table_name}"
 
         try:
-            query = f"SELECT COUNT(*) as row_count FROM `{table_id}`"
-            result = client.query(query).result()
-            row_count = list(result)[0].row_count
+            row_count = cache.row_count(table_id)
             print(f"  {table_name:12} {row_count:>4} rows")
         except Exception as e:
             print(f"  {table_name:12} [ERROR] {e}")
@@ -162,6 +260,21 @@ def main():
         default=default_dataset,
         help=f"BigQuery dataset (default from config: {default_dataset})"
     )
+    parser.add_argument(
+        "--local-dir",
+        default=None,
+        help="Load <dir>/reference_data/*.csv written by generate_fake_sales.py instead of GCS"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reload every table even if its source CSV checksum is unchanged"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local query result cache for verification queries"
+    )
 
     args = parser.parse_args()
 
@@ -169,15 +282,21 @@ def main():
     print("Case Fictício - Teste -- Load Reference Data")
     print("="*60)
     print(f"Project: {args.project}")
-    print(f"Bucket:  gs://{args.bucket}/")
+    if args.local_dir:
+        print(f"Source:  {args.local_dir}/reference_data/")
+    else:
+        print(f"Bucket:  gs://{args.bucket}/")
     print(f"Dataset: {args.dataset}")
 
     # Load reference data
-    success = load_reference_tables(args.project, args.bucket, args.dataset)
+    success = load_reference_tables(args.project, args.bucket, args.dataset, args.force, args.local_dir)
 
     if success:
         # Verify loaded data
-        verify_reference_data(args.project, args.dataset)
+        client = bigquery.Client(project=args.project)
+        cache = QueryCache.from_config(client, config, enabled=not args.no_cache)
+        verify_reference_data(args.project, args.dataset, cache)
+        print(f"\n{cache.summary()}")
 
         print("\n[SUCCESS] Reference data loaded into BigQuery Bronze!")
         print("\nNext: Deploy Cloud Function for CSV ingestion")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Local Storage Write API Stand-In
+===============================================
+
+In-process stand-in for bigquery_storage_v1.BigQueryWriteClient, used to test
+and measure the BRONZE_SINK=write_api path (cloud_functions/csv_processor/
+write_api.py) without a GCP project. It implements the four RPCs the sink
+uses with the real request/response types and enforces the semantics that
+make the sink exactly-once:
+
+  - append offsets must match the stream length (a replayed append fails)
+  - pending rows are invisible until the stream is finalized and committed
+  - a stream can be committed only once
+
+Run directly to measure end-to-end visibility latency (validated DataFrame ->
+rows committed) with a simulated per-RPC network latency:
+
+Usage:
+    python scripts/local_write_server.py
+    python scripts/local_write_server.py --rows 500 --runs 50 --rpc-latency-ms 30
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from google.cloud.bigquery_storage_v1 import types
+
+# Shared ingestion modules live with the Cloud Function source
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cloud_functions" / "csv_processor"))
+
+from bronze import to_bronze_arrow
+from write_api import table_path, write_bronze_arrow
+
+
+# google.rpc.Code values returned by the real service
+OUT_OF_RANGE = 11
+ALREADY_EXISTS = 6
+
+
+class LocalWriteServer:
+    """Stand-in BigQueryWriteClient keeping committed rows per table in memory."""
+
+    def __init__(self, rpc_latency: float = 0.0, fail_appends: bool = False):
+        self.rpc_latency = rpc_latency
+        self.fail_appends = fail_appends
+        self.streams = {}
+        self.tables = {}
+        self.commit_times = []
+        self._ids = itertools.count(1)
+
+    def _rpc(self):
+        if self.rpc_latency:
+            time.sleep(self.rpc_latency)
+
+    def create_write_stream(self, parent: str, write_stream: types.WriteStream) -> types.WriteStream:
+        self._rpc()
+        name = f"{parent}/streams/{next(self._ids)}"
+        self.streams[name] = {"parent": parent, "schema": None, "batches": [], "rows": 0,
+                              "finalized": False, "committed": False}
+        return types.WriteStream(name=name, type_=write_stream.type_)
+
+    def append_rows(self, requests, metadata=()):
+        stream = None
+        for request in requests:
+            self._rpc()
+            if request.write_stream:
+                stream = self.streams[request.write_stream]
+                stream["schema"] = pa.ipc.read_schema(
+                    pa.py_buffer(request.arrow_rows.writer_schema.serialized_schema)
+                )
+
+            if self.fail_appends:
+                yield types.AppendRowsResponse(error={"code": 13, "message": "simulated failure"})
+                return
+            if stream["finalized"]:
+                yield types.AppendRowsResponse(error={"code": 9, "message": "stream is finalized"})
+                return
+            if request.offset != stream["rows"]:
+                code = ALREADY_EXISTS if request.offset < stream["rows"] else OUT_OF_RANGE
+                yield types.AppendRowsResponse(error={"code": code, "message": "offset mismatch"})
+                return
+
+            batch = pa.ipc.read_record_batch(
+                pa.py_buffer(request.arrow_rows.rows.serialized_record_batch), stream["schema"]
+            )
+            stream["batches"].append(batch)
+            stream["rows"] += batch.num_rows
+            yield types.AppendRowsResponse(append_result={"offset": request.offset})
+
+    def finalize_write_stream(self, name: str) -> types.FinalizeWriteStreamResponse:
+        self._rpc()
+        self.streams[name]["finalized"] = True
+        return types.FinalizeWriteStreamResponse(row_count=self.streams[name]["rows"])
+
+    def batch_commit_write_streams(self, request) -> types.BatchCommitWriteStreamsResponse:
+        self._rpc()
+        errors = []
+        for name in request.write_streams:
+            stream = self.streams[name]
+            if not stream["finalized"] or stream["committed"]:
+                errors.append(types.StorageError(entity=name, error_message="stream not committable"))
+        if errors:
+            return types.BatchCommitWriteStreamsResponse(stream_errors=errors)
+
+        for name in request.write_streams:
+            stream = self.streams[name]
+            stream["committed"] = True
+            self.tables.setdefault(request.parent, []).extend(stream["batches"])
+        self.commit_times.append(time.perf_counter())
+        return types.BatchCommitWriteStreamsResponse()
+
+    def visible_rows(self, parent: str) -> pa.Table | None:
+        """Committed rows of a table (what a dashboard query would see)."""
+        batches = self.tables.get(parent)
+        return pa.Table.from_batches(batches) if batches else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure Storage Write API visibility latency against a local stand-in"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=60,
+        help="Orders per file (default: 60, a typical unit-day)"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=20,
+        help="Files written (default: 20)"
+    )
+    parser.add_argument(
+        "--rpc-latency-ms",
+        type=float,
+        default=25.0,
+        help="Simulated network latency per RPC (default: 25)"
+    )
+
+    args = parser.parse_args()
+
+    from benchmark_bronze_load import make_validated_orders
+
+    print("="*60)
+    print("Case Fictício - Teste -- Write API Visibility Latency (local stand-in)")
+    print("="*60)
+    print(f"Rows/file: {args.rows}  Files: {args.runs}  RPC latency: {args.rpc_latency_ms:.0f} ms")
+
+    server = LocalWriteServer(rpc_latency=args.rpc_latency_ms / 1000)
+    parent = table_path("benchmark", "case_ficticio_bronze", "orders")
+    df = make_validated_orders(args.rows)
+
+    latencies = []
+    for run in range(args.runs):
+        started = time.perf_counter()
+        table = to_bronze_arrow(df, "orders", f"raw/csv_sales/2026/01/15/unit_{run:03d}/pedido.csv")
+        write_bronze_arrow(server, table, parent)
+        latencies.append(server.commit_times[-1] - started)
+
+    visible = server.visible_rows(parent)
+    print(f"\n  Rows visible: {visible.num_rows:,}")
+    print(f"  Visibility latency p50: {np.percentile(latencies, 50) * 1000:.0f} ms")
+    print(f"  Visibility latency p95: {np.percentile(latencies, 95) * 1000:.0f} ms")
+    print(f"  Visibility latency max: {max(latencies) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Pipeline Coordinator
+===================================
+
+Replaces the fixed 2 AM Silver/Gold run with freshness-driven builds. Every
+tick (Cloud Scheduler every few minutes, or --poll-seconds in a loop) the
+coordinator looks at what landed in Bronze since the last build and decides
+whether to run the downstream SQL now:
+
+  pending     Bronze orders rows ingested after the last build's watermark,
+              grouped by business day (parsed from _source_file, e.g.
+              raw/csv_sales/2026/01/15/unit_003/pedido.csv)
+  complete    a pending business day has files from >= completeness_threshold
+              of the units in Silver -> build (after debounce)
+  deadline    the oldest pending row has waited max_staleness_minutes -> build
+              even if no day is complete (ignores debounce and cooldown)
+  debounce    no build while files are still landing (newest pending row
+              younger than debounce_minutes), so a unit's upload burst is
+              picked up by one build instead of several
+  cooldown    at most one build every min_interval_minutes
+
+A build runs only the incremental steps (Silver orders/order items MERGEs,
+Gold facts, aggregations and the cube), each of which recomputes just the
+orders, dates, units or products touched since its own watermark. The daily
+HLL++ sketches are maintained only with distinct_mode: approx, where product
+performance is rolled up from them. Reference tables and the dimensions
+built from them are rerun only when a Bronze reference table changed since
+the last build. Runs are logged to case_ficticio_monitoring.pipeline_runs,
+which also holds the watermark for the next tick. In loop mode a tick that
+raises is logged there as a failed run (trigger "error") and the loop keeps
+polling.
+
+Usage:
+    python scripts/pipeline_coordinator.py --once            # one scheduler tick
+    python scripts/pipeline_coordinator.py --once --dry-run  # decide, do not build
+    python scripts/pipeline_coordinator.py --once --force    # build now
+    python scripts/pipeline_coordinator.py                   # poll loop
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+import yaml
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from google.cloud import bigquery
+
+from cost_guard import CostGuard, MODES
+
+RUNS_TABLE = "pipeline_runs"
+REFERENCE_TABLES = ["products", "units", "states", "countries"]
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+DEFAULT_SETTINGS = {
+    "completeness_threshold": 0.9,
+    "max_staleness_minutes": 30,
+    "debounce_minutes": 5,
+    "min_interval_minutes": 10,
+    "poll_seconds": 60,
+    "lookback_days": 2,
+    "distinct_mode": "exact",
+}
+DISTINCT_MODES = ["exact", "approx"]
+
+# (sql file, description); incremental steps run on every build
+INCREMENTAL_STEPS = [
+    ("sql/silver/02_orders.sql", "Silver orders (incremental MERGE)"),
+    ("sql/silver/03_order_items.sql", "Silver order items (incremental MERGE)"),
+    ("sql/gold/05_fact_sales.sql", "Gold fact_sales (incremental)"),
+    ("sql/gold/06_fact_order_items.sql", "Gold fact_order_items (incremental)"),
+    ("sql/gold/07_agg_daily_sales.sql", "Aggregation agg_daily_sales (incremental)"),
+    ("sql/gold/08_agg_unit_performance.sql", "Aggregation agg_unit_performance (incremental)"),
+    ("sql/gold/09_agg_product_performance.sql", "Aggregation agg_product_performance (incremental)"),
+    ("sql/gold/11_agg_sales_cube.sql", "Aggregation agg_sales_cube (incremental)"),
+]
+
+# distinct_mode: approx replaces the exact product step with the sketches it reads
+APPROX_PRODUCT_STEPS = [
+    ("sql/gold/10_agg_daily_product_sketches.sql", "Aggregation agg_daily_product_sketches (incremental)"),
+    ("sql/gold/09_agg_product_performance_approx.sql", "Aggregation agg_product_performance (HLL++, incremental)"),
+]
+
+# Reference data and the dimensions built from it; only when Bronze reference tables changed
+REFERENCE_STEPS = [
+    ("sql/silver/01_reference_tables.sql", "Silver reference tables"),
+    ("sql/gold/01_dim_date.sql", "Gold dim_date"),
+    ("sql/gold/02_dim_product.sql", "Gold dim_product (SCD2)"),
+    ("sql/gold/03_dim_unit.sql", "Gold dim_unit (SCD2)"),
+    ("sql/gold/04_dim_geography.sql", "Gold dim_geography"),
+]
+
+RUNS_SCHEMA = [
+    bigquery.SchemaField("run_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("started_at", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("finished_at", "TIMESTAMP"),
+    bigquery.SchemaField("trigger", "STRING"),
+    bigquery.SchemaField("reason", "STRING"),
+    bigquery.SchemaField("watermark", "TIMESTAMP"),
+    bigquery.SchemaField("unit_days", "INT64"),
+    bigquery.SchemaField("status", "STRING"),
+    bigquery.SchemaField("steps", "STRING"),
+]
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+# ============================================================================
+# DECISION
+# ============================================================================
+
+def decide(pending: list[dict], expected_units: int, now: datetime, settings: dict,
+           last_build: datetime | None = None) -> tuple[str | None, str]:
+    """
+    Decide whether to build now.
+
+    pending: one dict per business day with new Bronze rows (business_day,
+    units_landed, new_files, oldest_new, newest_new). Returns (trigger, reason);
+    trigger is None when the tick should not build.
+    """
+    if not pending:
+        return None, "no new Bronze data"
+
+    oldest = min(day["oldest_new"] for day in pending)
+    newest = max(day["newest_new"] for day in pending)
+    waited = now - oldest
+    if waited >= timedelta(minutes=settings["max_staleness_minutes"]):
+        return "deadline", f"oldest pending row waited {waited.total_seconds() / 60:.0f} min"
+
+    if last_build is not None and now - last_build < timedelta(minutes=settings["min_interval_minutes"]):
+        return None, "cooldown after the last build"
+
+    if now - newest < timedelta(minutes=settings["debounce_minutes"]):
+        return None, "files still landing (debounce)"
+
+    complete = [
+        day["business_day"] for day in pending
+        if expected_units and day["units_landed"] / expected_units >= settings["completeness_threshold"]
+    ]
+    if complete:
+        return "complete", f"{len(complete)} business day(s) complete: {', '.join(sorted(complete))}"
+
+    best = max(day["units_landed"] for day in pending)
+    return None, f"waiting for units ({best}/{expected_units} on the most complete day)"
+
+
+def plan_steps(reference_changed: bool, distinct_mode: str = "exact") -> list[tuple[str, str]]:
+    """SQL steps for one build, in dependency order."""
+    incremental = []
+    for step in INCREMENTAL_STEPS:
+        if distinct_mode == "approx" and step[0] == "sql/gold/09_agg_product_performance.sql":
+            incremental += APPROX_PRODUCT_STEPS
+        else:
+            incremental.append(step)
+    if not reference_changed:
+        return incremental
+    # Silver references before the incremental Silver tables, dimensions before facts
+    return REFERENCE_STEPS[:1] + incremental[:2] + REFERENCE_STEPS[1:] + incremental[2:]
+
+
+# ============================================================================
+# BIGQUERY STATE
+# ============================================================================
+
+def ensure_runs_table(client, project_id: str, dataset: str) -> str:
+    table_id = f"{project_id}.{dataset}.{RUNS_TABLE}"
+    table = bigquery.Table(table_id, schema=RUNS_SCHEMA)
+    table.description = "Pipeline coordinator runs (trigger, watermark, steps)"
+    client.create_table(table, exists_ok=True)
+    return table_id
+
+
+def last_successful_run(client, runs_table: str) -> dict | None:
+    sql = f"""
+        SELECT finished_at, watermark
+        FROM `{runs_table}`
+        WHERE status = 'success'
+        ORDER BY finished_at DESC
+        LIMIT 1
+    """
+    rows = list(client.query(sql).result())
+    return dict(rows[0]) if rows else None
+
+
+def pending_unit_days(client, project_id: str, bronze: str, watermark: datetime,
+                      lookback_days: int) -> list[dict]:
+    """Business days with Bronze orders ingested after the watermark."""
+    sql = f"""
+        WITH landed AS (
+          SELECT
+            REGEXP_EXTRACT(_source_file, r'(\\d{{4}}/\\d{{2}}/\\d{{2}})/unit_') AS business_day,
+            REGEXP_EXTRACT(_source_file, r'unit_(\\d+)/') AS unit,
+            _source_file,
+            _ingest_timestamp
+          FROM `{project_id}.{bronze}.orders`
+          WHERE _ingest_date >= DATE_SUB(DATE(@watermark), INTERVAL @lookback DAY)
+        )
+        SELECT
+          REPLACE(business_day, '/', '-') AS business_day,
+          COUNT(DISTINCT unit) AS units_landed,
+          COUNT(DISTINCT IF(_ingest_timestamp > @watermark, _source_file, NULL)) AS new_files,
+          MIN(IF(_ingest_timestamp > @watermark, _ingest_timestamp, NULL)) AS oldest_new,
+          MAX(_ingest_timestamp) AS newest_new
+        FROM landed
+        WHERE business_day IS NOT NULL
+        GROUP BY business_day
+        HAVING newest_new > @watermark
+        ORDER BY business_day
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter("watermark", "TIMESTAMP", watermark),
+        bigquery.ScalarQueryParameter("lookback", "INT64", lookback_days),
+    ])
+    return [dict(row) for row in client.query(sql, job_config=job_config).result()]
+
+
+def reference_changed_since(client, project_id: str, bronze: str, since: datetime | None) -> bool:
+    """True if any Bronze reference table was modified after `since` (always True on the first build)."""
+    if since is None:
+        return True
+    return any(
+        client.get_table(f"{project_id}.{bronze}.{table}").modified > since
+        for table in REFERENCE_TABLES
+    )
+
+
+def execute_sql_file(client, sql_file_path: Path, description: str, guard=None):
+    """Execute a SQL file in BigQuery (through the cost guard when one is given)."""
+    print(f"\n[EXECUTING] {description}")
+    print(f"  File: {sql_file_path.name}")
+
+    try:
+        with open(sql_file_path, 'r', encoding='utf-8') as f:
+            sql = f.read()
+
+        if guard is not None:
+            query_job = guard.run(sql, step=sql_file_path.name)
+        else:
+            query_job = client.query(sql)
+            query_job.result()
+
+        print(f"  [OK] Query completed ({query_job.total_bytes_processed or 0:,} bytes processed)")
+        return True
+
+    except Exception as e:
+        print(f"  [ERROR] Query failed: {e}")
+        return False
+
+
+# ============================================================================
+# TICK
+# ============================================================================
+
+def tick(client, project_id: str, datasets: dict, settings: dict,
+         dry_run: bool = False, force: bool = False, guard=None) -> int:
+    """Run one coordinator tick: decide and, if triggered, build."""
+    now = datetime.now(timezone.utc)
+    runs_table = ensure_runs_table(client, project_id, datasets['monitoring'])
+    last = last_successful_run(client, runs_table)
+    last_build = last["finished_at"] if last else None
+    watermark = last["watermark"] if last and last["watermark"] else EPOCH
+
+    pending = pending_unit_days(client, project_id, datasets['bronze'], watermark,
+                                settings["lookback_days"])
+    expected_units = client.get_table(f"{project_id}.{datasets['silver']}.units").num_rows or 0
+
+    trigger, reason = decide(pending, expected_units, now, settings, last_build)
+    if force:
+        trigger, reason = "manual", "--force"
+    print(f"[INFO] {now:%Y-%m-%d %H:%M:%S} UTC  watermark={watermark:%Y-%m-%d %H:%M:%S}  "
+          f"pending days={len(pending)}  expected units={expected_units}")
+    if trigger is None:
+        print(f"[SKIP] {reason}")
+        return 0
+    print(f"[INFO] Trigger: {trigger} ({reason})")
+
+    steps = plan_steps(reference_changed_since(client, project_id, datasets['bronze'], last_build),
+                       settings["distinct_mode"])
+    if dry_run:
+        for sql_file, description in steps:
+            print(f"  [DRY RUN] {sql_file}  {description}")
+        return 0
+
+    # Rows ingested after this point are picked up by the next build
+    new_watermark = max((day["newest_new"] for day in pending), default=watermark)
+    done = []
+    status = "success"
+    for sql_file, description in steps:
+        if not execute_sql_file(client, Path(sql_file), description, guard):
+            status = "failed"
+            break
+        done.append(Path(sql_file).name)
+    if guard is not None:
+        print(f"\n{guard.summary()}")
+
+    errors = client.insert_rows_json(runs_table, [{
+        "run_id": str(uuid.uuid4()),
+        "started_at": now.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "trigger": trigger,
+        "reason": reason,
+        "watermark": new_watermark.isoformat(),
+        "unit_days": sum(day["new_files"] for day in pending),
+        "status": status,
+        "steps": json.dumps(done),
+    }])
+    if errors:
+        print(f"[WARN] Could not log run: {errors}")
+
+    if status != "success":
+        print(f"[ERROR] Build failed after {len(done)}/{len(steps)} step(s); "
+              "watermark not advanced")
+        return 1
+    print(f"\n[OK] Build finished: {len(steps)} step(s), watermark -> {new_watermark:%Y-%m-%d %H:%M:%S}")
+    return 0
+
+
+# ============================================================================
+# LOOP
+# ============================================================================
+
+def record_failed_tick(client, project_id: str, datasets: dict, started_at: datetime,
+                       error: Exception) -> None:
+    """Log a tick that raised as a failed run (best effort; the watermark is not advanced)."""
+    try:
+        runs_table = ensure_runs_table(client, project_id, datasets['monitoring'])
+        errors = client.insert_rows_json(runs_table, [{
+            "run_id": str(uuid.uuid4()),
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "trigger": "error",
+            "reason": f"{type(error).__name__}: {error}",
+            "status": "failed",
+            "steps": json.dumps([]),
+        }])
+    except Exception as e:
+        errors = [str(e)]
+    if errors:
+        print(f"[WARN] Could not log failed tick: {errors}")
+
+
+def run_loop(client, project_id: str, datasets: dict, settings: dict, poll_seconds: int,
+             dry_run: bool = False, guard=None, cycles: int | None = None) -> None:
+    """Tick every poll_seconds (forever unless cycles is set); one failed tick does not stop the loop."""
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        started_at = datetime.now(timezone.utc)
+        try:
+            tick(client, project_id, datasets, settings, dry_run, guard=guard)
+        except Exception as e:
+            print(f"[ERROR] Tick failed: {type(e).__name__}: {e}")
+            record_failed_tick(client, project_id, datasets, started_at, e)
+        cycle += 1
+        time.sleep(poll_seconds)
+
+
+def main():
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        datasets = config['bigquery']['datasets']
+        settings = {**DEFAULT_SETTINGS, **(config.get('pipeline_coordinator') or {})}
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Trigger incremental Silver/Gold builds when Bronze data is fresh enough"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run a single tick and exit (for Cloud Scheduler)"
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=int,
+        default=settings["poll_seconds"],
+        help=f"Seconds between ticks in loop mode (default from config: {settings['poll_seconds']})"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the decision and planned steps without building"
+    )
+    parser.add_argument(
+        "--cost-mode",
+        choices=MODES,
+        default=None,
+        help="Cost guard: enforce, warn or off (default from config: cost_guard.mode)"
+    )
+    parser.add_argument(
+        "--distinct-mode",
+        choices=DISTINCT_MODES,
+        default=settings["distinct_mode"],
+        help=f"Product distinct counts: exact, or approx from daily HLL++ sketches "
+             f"(default from config: {settings['distinct_mode']})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Build now regardless of completeness, staleness and debounce"
+    )
+    args = parser.parse_args()
+    settings["distinct_mode"] = args.distinct_mode
+
+    print("="*60)
+    print("Case Fictício - Teste -- Pipeline Coordinator")
+    print("="*60)
+    print(f"Project:   {args.project}")
+    print(f"Threshold: {settings['completeness_threshold']:.0%} of units, "
+          f"max staleness {settings['max_staleness_minutes']} min, "
+          f"debounce {settings['debounce_minutes']} min")
+    print(f"Distinct:  {settings['distinct_mode']}")
+
+    client = bigquery.Client(project=args.project)
+    guard = CostGuard.from_config(client, config, mode=args.cost_mode)
+    if args.once or args.force:
+        return tick(client, args.project, datasets, settings, args.dry_run, args.force, guard)
+
+    run_loop(client, args.project, datasets, settings, args.poll_seconds, args.dry_run, guard)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
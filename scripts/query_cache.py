@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Local Query Result Cache
+=======================================
+
+Caches the results of verification and analytics queries on local disk so
+repeated runs of the build/verify scripts cost zero bytes and return
+without waiting on query jobs.
+
+Cache key: normalized SQL (comments stripped, whitespace collapsed) plus the
+last-modified time of every table the query references. Any load, DML or
+CREATE OR REPLACE on a referenced table changes the key, so stale results
+are never served. Queries touching a table with an active streaming buffer
+are not cached (streamed rows do not bump the modified time).
+
+Eviction: entries expire after ttl_seconds; beyond max_entries / max_bytes
+the least recently used entries are dropped.
+
+Row counts come from table metadata (get_table().num_rows) when that is
+exact -- a native table with no streaming buffer -- and fall back to a
+cached COUNT(*) otherwise.
+
+Usage:
+    from query_cache import QueryCache
+    cache = QueryCache.from_config(client, config)
+    cache.row_count("project.dataset.table")
+    rows = cache.query("SELECT ... FROM `project.dataset.table`")
+
+    python scripts/query_cache.py --stats
+    python scripts/query_cache.py --clear
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+import yaml
+from collections import OrderedDict
+from pathlib import Path
+
+
+DEFAULT_CACHE_PATH = ".cache/query_cache.pkl"
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# `project.dataset.table` references (backtick-quoted, as in all repo SQL)
+TABLE_REFERENCE = re.compile(r"`([\w-]+\.\w+\.\w+)`")
+LINE_COMMENT = re.compile(r"--[^\n]*")
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def normalize_sql(sql: str) -> str:
+    """Strip line comments, collapse whitespace and drop a trailing semicolon."""
+    sql = LINE_COMMENT.sub(" ", sql)
+    return " ".join(sql.split()).rstrip(";").strip()
+
+
+def referenced_tables(sql: str) -> list[str]:
+    """Sorted, de-duplicated table ids referenced by the query."""
+    return sorted(set(TABLE_REFERENCE.findall(sql)))
+
+
+class QueryCache:
+    """Disk-backed LRU cache of query results keyed on SQL and table versions."""
+
+    def __init__(
+        self,
+        client,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        self.client = client
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.metadata_counts = 0
+        self.bytes_processed = 0
+        # Table metadata fetched during this run (one get_table per table)
+        self._tables = {}
+        # key -> (created_at, size_bytes, rows), oldest access first
+        self._entries = self._load() if enabled else OrderedDict()
+
+    @classmethod
+    def from_config(cls, client, config: dict, enabled: bool = True) -> "QueryCache":
+        """Build a cache from the query_cache section of project_config.yaml."""
+        settings = config.get('query_cache', {}) or {}
+        return cls(
+            client,
+            path=settings.get('path', DEFAULT_CACHE_PATH),
+            ttl_seconds=settings.get('ttl_seconds', DEFAULT_TTL_SECONDS),
+            max_entries=settings.get('max_entries', DEFAULT_MAX_ENTRIES),
+            max_bytes=settings.get('max_bytes', DEFAULT_MAX_BYTES),
+            enabled=enabled,
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> OrderedDict:
+        if not self.path.exists():
+            return OrderedDict()
+        try:
+            with open(self.path, 'rb') as f:
+                entries = pickle.load(f)
+            return entries if isinstance(entries, OrderedDict) else OrderedDict()
+        except Exception as e:
+            print(f"  [WARN] Ignoring unreadable query cache {self.path}: {e}")
+            return OrderedDict()
+
+    def _save(self) -> None:
+        """Atomically replace the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self._entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        if self.path.exists():
+            self.path.unlink()
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        # An empty cache is still a cache (__len__ alone would make it falsy)
+        return True
+
+    def _evict(self, now: float) -> None:
+        expired = [k for k, (created, _, _) in self._entries.items() if now - created >= self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        total = self.size_bytes
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            total -= size
+
+    # ------------------------------------------------------------------
+    # Table metadata
+    # ------------------------------------------------------------------
+
+    def get_table(self, table_id: str):
+        """Table metadata, fetched once per run."""
+        if table_id not in self._tables:
+            self._tables[table_id] = self.client.get_table(table_id)
+        return self._tables[table_id]
+
+    def remember_table(self, table_id: str, table) -> None:
+        """Reuse table metadata already fetched elsewhere in this run."""
+        self._tables[table_id] = table
+
+    def _table_versions(self, sql: str) -> list[tuple[str, str]] | None:
+        """(table_id, modified) per referenced table; None if any is not cacheable."""
+        versions = []
+        for table_id in referenced_tables(sql):
+            table = self.get_table(table_id)
+            if table.streaming_buffer is not None or table.modified is None:
+                return None
+            versions.append((table_id, table.modified.isoformat()))
+        return versions
+
+    def cache_key(self, sql: str) -> str | None:
+        """Key for a query, or None when its result must not be cached."""
+        versions = self._table_versions(sql)
+        if versions is None:
+            return None
+        payload = normalize_sql(sql) + "\n" + "\n".join(f"{t}@{m}" for t, m in versions)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _run(self, sql: str) -> list[dict]:
+        job = self.client.query(sql)
+        rows = [dict(row.items()) for row in job.result()]
+        self.bytes_processed += job.total_bytes_processed or 0
+        return rows
+
+    def query(self, sql: str) -> list[dict]:
+        """Query rows as dicts, served from the cache when the tables are unchanged."""
+        if not self.enabled:
+            self.misses += 1
+            return self._run(sql)
+
+        key = self.cache_key(sql)
+        now = time.time()
+        if key is not None and key in self._entries:
+            created, _, rows = self._entries[key]
+            if now - created < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._save()
+                return rows
+
+        self.misses += 1
+        rows = self._run(sql)
+        if key is not None:
+            size = len(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+            self._entries[key] = (now, size, rows)
+            self._evict(now)
+            self._save()
+        return rows
+
+    def row_count(self, table_id: str) -> int:
+        """Row count from table metadata when exact, else a cached COUNT(*)."""
+        table = self.get_table(table_id)
+        if table.table_type == "TABLE" and table.streaming_buffer is None and table.num_rows is not None:
+            self.metadata_counts += 1
+            return table.num_rows
+        rows = self.query(f"SELECT COUNT(*) AS row_count FROM `{table_id}`")
+        return rows[0]["row_count"]
+
+    def summary(self) -> str:
+        return (f"Query cache: {self.metadata_counts} metadata count(s), {self.hits} hit(s), "
+                f"{self.misses} miss(es), {self.bytes_processed:,} bytes processed")
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        settings = config.get('query_cache', {}) or {}
+        default_path = settings.get('path', DEFAULT_CACHE_PATH)
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Inspect or clear the local query result cache"
+    )
+    parser.add_argument(
+        "--path",
+        default=default_path,
+        help=f"Cache file (default from config: {default_path})"
+    )
+    parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Delete every cached result"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print entry count and size (default)"
+    )
+
+    args = parser.parse_args()
+
+    cache = QueryCache(client=None, path=args.path)
+    if args.clear:
+        entries = len(cache)
+        cache.clear()
+        print(f"[OK] Cleared {entries} cached result(s) from {args.path}")
+        return 0
+
+    print(f"Cache file: {args.path}")
+    print(f"  Entries:  {len(cache)}")
+    print(f"  Size:     {cache.size_bytes:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
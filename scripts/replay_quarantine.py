@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- Replay Quarantined Rows
+======================================
+
+Re-ingests rows from the row-level quarantine (quarantine/rows/*.parquet,
+written by the csv_processor Cloud Function) in bulk:
+
+  1. Downloads every quarantine object under the given prefix
+  2. Re-validates the rows with the same single-row rules as the Cloud
+     Function. Cross-file rejections are re-checked against the paired
+     entity: order_total_mismatch orders against the items replayed in the
+     same run plus the items already in Bronze, orphan_item items against
+     the orders replayed in the same run plus the orders already in Bronze
+     (so fixing and replaying an order releases its items). duplicate_id
+     rows stay quarantined: checked on their own they would pass, and the
+     replayed copy (later _ingest_timestamp) would win Silver's
+     latest-version dedup over the row that was correctly accepted
+  3. Loads rows that now pass with ONE load job per Bronze table
+     (each row keeps its original _source_file)
+  4. Rewrites each quarantine object with the rows that still fail,
+     or deletes it when nothing is left
+
+Typical workflow:
+    # 1. Export quarantined rows for manual correction
+    python scripts/replay_quarantine.py --prefix 2026/01 --export fixes.csv
+
+    # 2. Edit fixes.csv (keep the _rule/_source_file/_line_number columns;
+    #    rows deleted from the file are discarded from quarantine)
+
+    # 3. Replay the corrected rows
+    python scripts/replay_quarantine.py --input fixes.csv
+
+    # Or re-validate quarantined rows in place (e.g. after a rule change)
+    python scripts/replay_quarantine.py --prefix 2026/01
+
+Requirements:
+    pip install google-cloud-storage google-cloud-bigquery pandas pyarrow pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import sys
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from google.cloud import storage, bigquery
+
+# Shared ingestion modules live with the Cloud Function source
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cloud_functions" / "csv_processor"))
+
+from bronze import to_bronze_arrow, load_bronze_arrow
+from quarantine import (
+    QUARANTINE_ROWS_PREFIX,
+    quarantine_rows_path,
+    build_quarantine_frame,
+    to_parquet_bytes,
+    read_parquet_bytes,
+)
+from validation import (
+    PEDIDO_COLUMNS,
+    ITEM_PEDIDO_COLUMNS,
+    PEDIDO_RULES,
+    ITEM_PEDIDO_RULES,
+    MALFORMED_RULE,
+    ORPHAN_RULE,
+    ORDER_TOTAL_RULE,
+    compute_item_totals,
+    validate_pedido,
+    validate_item_pedido,
+)
+
+
+# Quarantine object base name -> (validator, Bronze table, source columns)
+ENTITIES = {
+    "pedido": (validate_pedido, "orders", PEDIDO_COLUMNS),
+    "item_pedido": (validate_item_pedido, "order_items", ITEM_PEDIDO_COLUMNS),
+}
+
+# Rules decided by the row alone, plus the cross-file rules re-checked against
+# the paired entity (this run + Bronze); anything else (duplicate_id, unknown)
+# is sticky and never replayed
+REPLAYABLE_RULES = (
+    {MALFORMED_RULE, ORPHAN_RULE, ORDER_TOTAL_RULE}
+    | {rule["name"] for rule in PEDIDO_RULES + ITEM_PEDIDO_RULES}
+)
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def entity_of(path: str) -> str:
+    """Return "pedido" or "item_pedido" for a source CSV or quarantine object path."""
+    return path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+
+
+def download_quarantine(bucket, prefix: str, workers: int = 8) -> dict[str, pd.DataFrame]:
+    """Download all quarantine objects under prefix, concatenated per entity."""
+    full_prefix = f"{QUARANTINE_ROWS_PREFIX}/{prefix}".rstrip("/")
+    blobs = [b for b in bucket.list_blobs(prefix=full_prefix) if b.name.endswith(".parquet")]
+    print(f"  Found {len(blobs)} quarantine objects under gs://{bucket.name}/{full_prefix}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(lambda b: (b.name, read_parquet_bytes(b.download_as_bytes())), blobs))
+
+    by_entity = {}
+    for name, frame in frames:
+        by_entity.setdefault(entity_of(name), []).append(frame)
+    return {entity: pd.concat(parts, ignore_index=True) for entity, parts in by_entity.items()}
+
+
+def read_export(input_path: Path) -> dict[str, pd.DataFrame]:
+    """Read a corrected export file, split per entity by _source_file."""
+    df = pd.read_csv(input_path, sep=";", dtype=str)
+    if "_rule" not in df.columns:
+        raise ValueError(f"{input_path} has no _rule column (re-export it with --export)")
+    df["_line_number"] = df["_line_number"].astype("int64")
+    entities = df["_source_file"].map(entity_of)
+
+    frames = {}
+    for entity in entities.unique():
+        columns = ENTITIES[entity][2] + ["_rule", "_source_file", "_line_number"]
+        frames[entity] = df.loc[entities == entity, columns].reset_index(drop=True)
+    return frames
+
+
+def export_rows(frames: dict[str, pd.DataFrame], output_path: Path) -> int:
+    """Write quarantined rows to one local CSV for manual correction."""
+    df = pd.concat(frames.values(), ignore_index=True)
+    df.to_csv(output_path, sep=";", index=False, encoding="utf-8")
+    print(f"  [OK] Exported {len(df)} rows to {output_path}")
+    return len(df)
+
+
+def split_replayable(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(rows a single-row re-check can decide, sticky rows that stay quarantined)."""
+    replayable = df["_rule"].isin(REPLAYABLE_RULES)
+    return df.loc[replayable], df.loc[~replayable].drop(columns=["_quarantined_at"], errors="ignore")
+
+
+def bronze_context(bq_client, dataset: str, order_ids: set) -> tuple[set, pd.Series]:
+    """
+    Orders among order_ids already in Bronze, and the item totals Bronze holds for them.
+
+    Bronze only holds accepted rows; items are deduplicated to their latest
+    version per Id_Item_Pedido before summing. Without a client (dry run in
+    tests) Bronze is treated as empty.
+    """
+    if bq_client is None or not order_ids:
+        return set(), pd.Series(dtype=float)
+
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter("ids", "STRING", sorted(order_ids)),
+    ])
+    dataset_id = f"{bq_client.project}.{dataset}"
+    orders = bq_client.query(f"""
+        SELECT DISTINCT id_pedido
+        FROM `{dataset_id}.orders`
+        WHERE id_pedido IN UNNEST(@ids)
+    """, job_config=job_config).result()
+    totals = bq_client.query(f"""
+        SELECT id_pedido, SUM(qtd * vlr_item) AS total
+        FROM (
+          SELECT id_pedido, qtd, vlr_item
+          FROM `{dataset_id}.order_items`
+          WHERE id_pedido IN UNNEST(@ids)
+          QUALIFY ROW_NUMBER() OVER (PARTITION BY id_item_pedido ORDER BY _ingest_timestamp DESC) = 1
+        )
+        GROUP BY id_pedido
+    """, job_config=job_config).result()
+    return (
+        {row["id_pedido"] for row in orders},
+        pd.Series({row["id_pedido"]: float(row["total"]) for row in totals}, dtype=float),
+    )
+
+
+def revalidate(entity: str, df: pd.DataFrame, item_totals: pd.Series | None = None):
+    """Validate replayable rows of one entity; returns (valid, rejected, errors, rows_by_rule)."""
+    validator = ENTITIES[entity][0]
+    previous_rule = df["_rule"].reset_index(drop=True)
+    df = df.drop(columns=["_rule", "_quarantined_at"], errors="ignore").reset_index(drop=True)
+    if entity != "pedido":
+        valid, rejected, errors = validator(df)
+        return valid, rejected, errors, previous_rule
+
+    # Only orders rejected for their total are checked against item totals again:
+    # single-file orders were never checked, and their items may not be loaded yet
+    recheck = (previous_rule == ORDER_TOTAL_RULE).to_numpy()
+    parts = [validator(df.loc[~recheck]), validator(df.loc[recheck], item_totals)]
+    return (
+        pd.concat([parts[0][0], parts[1][0]]),
+        pd.concat([parts[0][1], parts[1][1]], ignore_index=True),
+        parts[0][2] + parts[1][2],
+        previous_rule,
+    )
+
+
+def replay(frames: dict[str, pd.DataFrame], bucket, bq_client, dataset: str, dry_run: bool) -> dict:
+    """Re-validate, bulk-load and rewrite quarantine for every entity."""
+    stats = {"loaded": 0, "still_rejected": 0, "sticky": 0}
+    empty = {entity: pd.DataFrame(columns=columns + ["_rule", "_source_file", "_line_number"])
+             for entity, (_, _, columns) in ENTITIES.items()}
+
+    # Items first: their totals decide order_total_mismatch orders
+    items, item_sticky = split_replayable(frames.get("item_pedido", empty["item_pedido"]))
+    valid_items, rejected_items, item_errors, item_rule = revalidate("item_pedido", items)
+
+    orders, order_sticky = split_replayable(frames.get("pedido", empty["pedido"]))
+    order_ids = set(orders["Id_Pedido"].dropna()) | set(valid_items["Id_Pedido"])
+    bronze_orders, bronze_totals = bronze_context(bq_client, dataset, order_ids)
+    item_totals = compute_item_totals(valid_items) if len(valid_items) else pd.Series(dtype=float)
+    item_totals = item_totals.astype(float).add(bronze_totals, fill_value=0.0)
+    valid_orders, rejected_orders, order_errors, _ = revalidate("pedido", orders, item_totals)
+
+    # Orphaned items load once their order is accepted (in this run or before)
+    if len(valid_items):
+        known = set(valid_orders["Id_Pedido"]) | bronze_orders
+        still_orphan = (item_rule.loc[valid_items.index] == ORPHAN_RULE) & ~valid_items["Id_Pedido"].isin(known)
+        if still_orphan.any():
+            item_errors.append(f"Kept {int(still_orphan.sum())} items whose order is still not accepted [{ORPHAN_RULE}]")
+            orphans = valid_items.loc[still_orphan].copy()
+            orphans["_rule"] = ORPHAN_RULE
+            rejected_items = pd.concat([rejected_items, orphans], ignore_index=True)
+            valid_items = valid_items.loc[~still_orphan]
+
+    results = [
+        ("pedido", frames.get("pedido"), valid_orders, rejected_orders, order_sticky, order_errors),
+        ("item_pedido", frames.get("item_pedido"), valid_items, rejected_items, item_sticky, item_errors),
+    ]
+    for entity, source_df, valid, rejected, sticky, errors in results:
+        if source_df is None:
+            continue
+        table_name = ENTITIES[entity][1]
+        sources = source_df["_source_file"].unique()
+        print(f"\n[{entity}] {len(source_df)} rows from {len(sources)} source files")
+        for e in errors:
+            print(f"  [WARN] {e}")
+        print(f"  Valid: {len(valid)}  Still rejected: {len(rejected)}  "
+              f"Kept (cross-row rule): {len(sticky)}")
+        rejected = pd.concat([rejected, sticky], ignore_index=True)
+
+        stats["loaded"] += len(valid)
+        stats["still_rejected"] += len(rejected)
+        stats["sticky"] += len(sticky)
+        if dry_run:
+            continue
+
+        if len(valid) > 0:
+            table_id = f"{bq_client.project}.{dataset}.{table_name}"
+            rows = load_bronze_arrow(bq_client, to_bronze_arrow(valid, table_name), table_id)
+            print(f"  [OK] Loaded {rows} rows into {dataset}.{table_name} (1 load job)")
+
+        # Rewrite each affected quarantine object with its remaining rows
+        remaining = dict(tuple(rejected.groupby("_source_file"))) if len(rejected) else {}
+        for source_file in sources:
+            blob = bucket.blob(quarantine_rows_path(source_file))
+            if source_file in remaining:
+                frame = build_quarantine_frame(remaining[source_file].copy())
+                blob.upload_from_string(to_parquet_bytes(frame), content_type="application/vnd.apache.parquet")
+            elif blob.exists():
+                blob.delete()
+        print(f"  [OK] Quarantine updated: {len(remaining)} objects rewritten, "
+              f"{len(sources) - len(remaining)} cleared")
+
+    return stats
+
+
+def main():
+    # Load config
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+        default_bucket = config['storage']['bucket']
+        default_dataset = config['bigquery']['datasets']['bronze']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Bulk replay of row-level quarantined data into BigQuery Bronze"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project ID (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--bucket",
+        default=default_bucket,
+        help=f"GCS bucket name (default from config: {default_bucket})"
+    )
+    parser.add_argument(
+        "--dataset",
+        default=default_dataset,
+        help=f"Bronze dataset (default from config: {default_dataset})"
+    )
+    parser.add_argument(
+        "--prefix",
+        default="",
+        help="Sub-prefix under quarantine/rows/, e.g. 2026/01 or 2026/01/15/unit_001"
+    )
+    parser.add_argument(
+        "--export",
+        type=Path,
+        default=None,
+        help="Export quarantined rows to this CSV instead of replaying"
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=None,
+        help="Replay corrected rows from an exported CSV"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate only, do not load or modify quarantine"
+    )
+
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Case Fictício - Teste -- Replay Quarantined Rows")
+    print("="*60)
+    print(f"Project: {args.project}")
+    print(f"Bucket:  gs://{args.bucket}/")
+    print(f"Dataset: {args.dataset}")
+
+    storage_client = storage.Client(project=args.project)
+    bucket = storage_client.bucket(args.bucket)
+
+    if args.input:
+        try:
+            frames = read_export(args.input)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return 1
+    else:
+        frames = download_quarantine(bucket, args.prefix)
+
+    if not frames:
+        print("\n[OK] Nothing quarantined under this prefix")
+        return 0
+
+    if args.export:
+        export_rows(frames, args.export)
+        return 0
+
+    bq_client = bigquery.Client(project=args.project)
+    stats = replay(frames, bucket, bq_client, args.dataset, args.dry_run)
+
+    print("\n" + "="*60)
+    print("REPLAY SUMMARY")
+    print("="*60)
+    print(f"  Rows loaded:         {stats['loaded']}")
+    print(f"  Rows still rejected: {stats['still_rejected']} ({stats['sticky']} by cross-row rules)")
+    print(f"  Mode:                {'DRY RUN' if args.dry_run else 'LOAD'}")
+    print("="*60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Case Fictício - Teste -- SQL Scan Regression Suite
+========================================
+
+Guards sql/silver and sql/gold against edits that quietly turn a pruned scan
+into a full scan. Every SQL file is measured and compared with the stored
+baseline in sql/plan_baseline.json; the suite fails when a file got more
+expensive than the tolerance allows:
+
+  shape            static plan shape from the SQL text (no GCP needed, also
+                   checked by tests/unit/test_sql_regression.py):
+                     joins, group_bys, windows, distincts, merges
+                       -> shuffle-inducing operators, may not grow
+                     pruning_filters
+                       -> predicates on partition columns (_ingest_date,
+                          order_date), may not shrink
+  bytes_processed  --mode dry-run: BigQuery dry-run estimate
+                   --mode execute: bytes of the executed job (sum of the
+                   child jobs for scripts)
+  stages           --mode execute only: query plan stages, and the stages
+  shuffle_stages   that wrote shuffle output
+
+Measurements run against fixed-scale fixture data, not production: the SQL
+is rewritten to the *_fixture datasets (--dataset-suffix). Bronze is loaded
+once, sales and reference data both from the local generator output:
+
+    python scripts/generate_fake_sales.py --seed 42 --units 5 \\
+        --start-date 2026-01-01 --end-date 2026-01-07 --output-dir output/fixture
+    python scripts/backfill_sales.py --source local --local-dir output/fixture \\
+        --dataset case_ficticio_bronze_fixture \\
+        --start-date 2026-01-01 --end-date 2026-01-07
+    python scripts/load_reference_data.py --local-dir output/fixture \\
+        --dataset case_ficticio_bronze_fixture
+
+Silver and Gold files are incremental (watermarks in the tables they
+write), so execute mode first drops every table of the fixture Silver/Gold
+datasets and then runs the files in dependency order: each run measures a
+build from the same empty state, and leaves the tables that dry runs need.
+
+Usage:
+    python scripts/sql_regression.py                          # static shape only
+    python scripts/sql_regression.py --mode dry-run
+    python scripts/sql_regression.py --mode execute --update  # refresh the baseline
+
+Requirements:
+    pip install google-cloud-bigquery pyyaml
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import argparse
+import json
+import re
+import sys
+import yaml
+from pathlib import Path
+
+from query_cache import normalize_sql
+
+SQL_DIRS = ["sql/silver", "sql/gold"]
+BASELINE_PATH = "sql/plan_baseline.json"
+# Project id hard-coded in the SQL files
+SQL_PROJECT = "sixth-foundry-485810-e5"
+DEFAULT_DATASET_SUFFIX = "_fixture"
+DEFAULT_BYTES_TOLERANCE = 0.10
+DEFAULT_STAGE_TOLERANCE = 0
+# Growth below this is noise on fixture-scale data
+MIN_BYTES_DELTA = 1024 * 1024
+
+SHUFFLE_OPERATORS = {
+    "joins": re.compile(r"\bJOIN\b", re.IGNORECASE),
+    "group_bys": re.compile(r"\bGROUP\s+BY\b", re.IGNORECASE),
+    "windows": re.compile(r"\bOVER\s*\(", re.IGNORECASE),
+    "distincts": re.compile(r"\bDISTINCT\b", re.IGNORECASE),
+    "merges": re.compile(r"\bMERGE\b", re.IGNORECASE),
+}
+PRUNING_FILTER = re.compile(
+    r"\b(_ingest_date|order_date)\s*(>=|<=|>|<|=|IN\b|BETWEEN\b)", re.IGNORECASE
+)
+DATASET = re.compile(r"\b(case_ficticio_(?:bronze|silver|gold))\b")
+
+
+def load_config():
+    """Load project configuration from YAML."""
+    config_path = Path("config/project_config.yaml")
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+def sql_files(root: Path = Path(".")) -> list[Path]:
+    """Silver then Gold files in dependency order (approx variants after the sketches they read)."""
+    files = []
+    for sql_dir in SQL_DIRS:
+        names = sorted((root / sql_dir).glob("*.sql"))
+        files += [f for f in names if not f.stem.endswith("_approx")]
+        files += [f for f in names if f.stem.endswith("_approx")]
+    return files
+
+
+def static_shape(sql: str) -> dict:
+    """Operator counts that drive the plan shape, from the SQL text (comments ignored)."""
+    sql = normalize_sql(sql)
+    shape = {name: len(pattern.findall(sql)) for name, pattern in SHUFFLE_OPERATORS.items()}
+    shape["pruning_filters"] = len(PRUNING_FILTER.findall(sql))
+    return shape
+
+
+def rewrite_for_fixture(sql: str, project_id: str, dataset_suffix: str) -> str:
+    """Point the SQL at the fixture project and datasets."""
+    sql = sql.replace(SQL_PROJECT, project_id)
+    return DATASET.sub(lambda m: m.group(1) + dataset_suffix, sql)
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def reset_fixture(client, project_id: str, dataset_suffix: str) -> int:
+    """Drop every table and view of the fixture Silver/Gold datasets; returns the count."""
+    if not dataset_suffix:
+        raise ValueError("refusing to reset Silver/Gold without a fixture --dataset-suffix")
+    dropped = 0
+    for layer in ("silver", "gold"):
+        dataset_id = f"{project_id}.case_ficticio_{layer}{dataset_suffix}"
+        for table in client.list_tables(dataset_id):
+            client.delete_table(table, not_found_ok=True)
+            dropped += 1
+    return dropped
+
+
+def plan_stats(plan) -> tuple[int, int]:
+    """(stages, stages that wrote shuffle output) of one job's query plan."""
+    stages = list(plan or [])
+    return len(stages), sum(1 for stage in stages if (stage.shuffle_output_bytes or 0) > 0)
+
+
+def measure(client, sql: str, mode: str) -> dict:
+    """bytes_processed (and stages in execute mode) for one SQL file."""
+    from google.cloud import bigquery
+
+    if mode == "dry-run":
+        job = client.query(sql, job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False))
+        return {"bytes_processed": job.total_bytes_processed, "stages": None, "shuffle_stages": None}
+
+    job = client.query(sql, job_config=bigquery.QueryJobConfig(use_query_cache=False))
+    job.result()
+    # Scripts (DECLARE/SET, several statements) report their plan per child job
+    jobs = list(client.list_jobs(parent_job=job.job_id)) if job.num_child_jobs else [job]
+    stages = shuffles = 0
+    for child in jobs:
+        child_stages, child_shuffles = plan_stats(getattr(child, "query_plan", None))
+        stages += child_stages
+        shuffles += child_shuffles
+    return {"bytes_processed": job.total_bytes_processed or 0, "stages": stages, "shuffle_stages": shuffles}
+
+
+def collect(root: Path, client=None, mode: str = "static", project_id: str | None = None,
+            dataset_suffix: str = DEFAULT_DATASET_SUFFIX) -> dict:
+    """Current measurements for every SQL file, keyed by path relative to sql/."""
+    results = {}
+    for path in sql_files(root):
+        key = path.relative_to(root / "sql").as_posix()
+        sql = path.read_text(encoding="utf-8")
+        entry = {"shape": static_shape(sql), "bytes_processed": None, "stages": None, "shuffle_stages": None}
+        if mode != "static":
+            print(f"  [RUN] {key}")
+            entry.update(measure(client, rewrite_for_fixture(sql, project_id, dataset_suffix), mode))
+        results[key] = entry
+    return results
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+
+def compare(baseline: dict, current: dict, bytes_tolerance: float = DEFAULT_BYTES_TOLERANCE,
+            stage_tolerance: int = DEFAULT_STAGE_TOLERANCE) -> list[str]:
+    """Describe every regression of current against baseline (empty list = pass)."""
+    regressions = []
+    for key in sorted(set(baseline) | set(current)):
+        if key not in baseline:
+            regressions.append(f"{key}: not in the baseline (run with --update)")
+            continue
+        if key not in current:
+            regressions.append(f"{key}: in the baseline but the file is gone (run with --update)")
+            continue
+        base, cur = baseline[key], current[key]
+
+        for name in SHUFFLE_OPERATORS:
+            before, after = base["shape"].get(name, 0), cur["shape"].get(name, 0)
+            if after > before:
+                regressions.append(f"{key}: {name} {before} -> {after}")
+        before, after = base["shape"].get("pruning_filters", 0), cur["shape"].get("pruning_filters", 0)
+        if after < before:
+            regressions.append(f"{key}: pruning_filters {before} -> {after} (partition filter removed?)")
+
+        before, after = base.get("bytes_processed"), cur.get("bytes_processed")
+        if before is not None and after is not None:
+            if after > before * (1 + bytes_tolerance) and after - before > MIN_BYTES_DELTA:
+                regressions.append(f"{key}: bytes_processed {before:,} -> {after:,} "
+                                   f"(+{(after - before) / max(before, 1):.0%}, tolerance {bytes_tolerance:.0%})")
+
+        for name in ("stages", "shuffle_stages"):
+            before, after = base.get(name), cur.get(name)
+            if before is not None and after is not None and after > before + stage_tolerance:
+                regressions.append(f"{key}: {name} {before} -> {after}")
+    return regressions
+
+
+def merge_baseline(baseline: dict, current: dict) -> dict:
+    """New baseline: current shapes, keeping stored measurements the current mode did not take."""
+    merged = {}
+    for key, entry in current.items():
+        previous = baseline.get(key, {})
+        merged[key] = {
+            name: entry[name] if entry.get(name) is not None or name == "shape" else previous.get(name)
+            for name in ("shape", "bytes_processed", "stages", "shuffle_stages")
+        }
+    return merged
+
+
+def read_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_baseline(path: Path, files: dict) -> None:
+    with open(path, 'w', encoding="utf-8") as f:
+        json.dump(files, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    try:
+        config = load_config()
+        default_project = config['project']['id']
+    except Exception as e:
+        print(f"[ERROR] Failed to load config: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(
+        description="Compare bytes scanned and plan shape of every SQL file with a stored baseline"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["static", "dry-run", "execute"],
+        default="static",
+        help="static: SQL text only; dry-run: + estimated bytes; execute: + bytes and plan stages"
+    )
+    parser.add_argument(
+        "--project",
+        default=default_project,
+        help=f"GCP project holding the fixture datasets (default from config: {default_project})"
+    )
+    parser.add_argument(
+        "--dataset-suffix",
+        default=DEFAULT_DATASET_SUFFIX,
+        help=f"Suffix of the fixture datasets (default: {DEFAULT_DATASET_SUFFIX})"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help=f"Baseline file (default: {BASELINE_PATH})"
+    )
+    parser.add_argument(
+        "--bytes-tolerance",
+        type=float,
+        default=DEFAULT_BYTES_TOLERANCE,
+        help=f"Allowed relative growth of bytes processed (default: {DEFAULT_BYTES_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--stage-tolerance",
+        type=int,
+        default=DEFAULT_STAGE_TOLERANCE,
+        help=f"Allowed extra plan stages per file (default: {DEFAULT_STAGE_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Write the current measurements as the new baseline instead of comparing"
+    )
+    args = parser.parse_args()
+
+    client = None
+    if args.mode != "static":
+        # Imported here so the static check runs without the BigQuery SDK
+        from google.cloud import bigquery
+        client = bigquery.Client(project=args.project)
+        print(f"[INFO] Measuring against {args.project} (*{args.dataset_suffix} datasets), mode {args.mode}")
+        if args.mode == "execute":
+            try:
+                dropped = reset_fixture(client, args.project, args.dataset_suffix)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return 1
+            print(f"[INFO] Reset fixture Silver/Gold: {dropped} table(s) dropped")
+
+    current = collect(Path("."), client, args.mode, args.project, args.dataset_suffix)
+    baseline_path = Path(args.baseline)
+    baseline = read_baseline(baseline_path)
+
+    if args.update:
+        write_baseline(baseline_path, merge_baseline(baseline, current))
+        print(f"[OK] Baseline for {len(current)} SQL file(s) written to {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"[ERROR] No baseline at {baseline_path} (run with --update)")
+        return 1
+
+    regressions = compare(baseline, current, args.bytes_tolerance, args.stage_tolerance)
+    if regressions:
+        for regression in regressions:
+            print(f"  [ERROR] {regression}")
+        print(f"\n[ERROR] {len(regressions)} regression(s) against {baseline_path}")
+        return 1
+    print(f"[OK] {len(current)} SQL file(s) within the baseline ({args.mode})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
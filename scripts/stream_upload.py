@@ -0,0 +1,189 @@
+"""
+Case Fictício - Teste -- Streaming Upload Queue
+======================================
+
+Bounded in-memory upload queue for the fake data generator's streaming mode
+(generate_fake_sales.py --stream-to). The generator puts each unit-day CSV on
+the queue as bytes and keeps generating while a pool of uploader threads
+drains it, so generation and upload overlap and nothing is staged on local
+disk. When the uploaders fall behind, put() blocks until a slot frees up
+(backpressure), which caps memory at roughly queue_size files.
+
+Targets:
+  gs://<bucket>   -> google.cloud.storage bucket
+  <local dir>     -> FilesystemBucket, a stand-in with the same blob API used
+                     for tests and dry runs (also read by backfill_sales.py
+                     --source local and load_reference_data.py --local-dir)
+
+Usage:
+    from stream_upload import StreamUploader, open_bucket
+
+    with StreamUploader(open_bucket("gs://my-bucket"), workers=8) as uploader:
+        uploader.put("raw/csv_sales/2026/01/01/unit_001/pedido.csv", data)
+    print(uploader.stats())
+
+Requirements:
+    pip install google-cloud-storage   # only for gs:// targets
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 32
+
+
+# ============================================================================
+# BUCKETS
+# ============================================================================
+
+class FilesystemBlob:
+    """Blob stand-in backed by a file under the bucket root."""
+
+    # Local files have no generations; downloads ignore if_generation_match
+    generation = None
+
+    def __init__(self, root: Path, name: str):
+        self.name = name
+        self.path = root / name
+
+    @property
+    def crc32c(self) -> str:
+        """Base64 CRC32C of the file, like GCS object metadata."""
+        # Imported here so streaming uploads do not need google-crc32c
+        from generation_manifest import crc32c_base64
+        return crc32c_base64(self.path.read_bytes())
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        return self.path.read_bytes()
+
+    def download_as_text(self, encoding="utf-8", **kwargs) -> str:
+        return self.path.read_text(encoding=encoding)
+
+    def upload_from_string(self, data, content_type=None):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.path)
+
+
+class FilesystemBucket:
+    """Bucket stand-in backed by a local directory (object name = relative path)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.name = str(self.root)
+
+    def blob(self, name: str) -> FilesystemBlob:
+        return FilesystemBlob(self.root, name)
+
+    def get_blob(self, name: str) -> FilesystemBlob | None:
+        blob = self.blob(name)
+        return blob if blob.path.is_file() else None
+
+    def list_blobs(self, prefix: str = "", **kwargs):
+        """Objects under prefix, in name order (directories are not objects)."""
+        base = self.root / prefix if prefix.endswith("/") else (self.root / prefix).parent
+        if not base.is_dir():
+            return []
+        names = sorted(p.relative_to(self.root).as_posix() for p in base.rglob("*") if p.is_file())
+        return [self.blob(name) for name in names if name.startswith(prefix)]
+
+
+def open_bucket(target: str, project_id: str | None = None):
+    """Return a GCS bucket for gs://<bucket>, otherwise a FilesystemBucket."""
+    if target.startswith("gs://"):
+        # Imported here so local generation does not need the GCP SDK
+        from google.cloud import storage
+        client = storage.Client(project=project_id) if project_id else storage.Client()
+        return client.bucket(target[len("gs://"):].strip("/"))
+    return FilesystemBucket(target)
+
+
+# ============================================================================
+# UPLOADER
+# ============================================================================
+
+class StreamUploader:
+    """Bounded queue drained by concurrent uploader threads."""
+
+    def __init__(self, bucket, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.bucket = bucket
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.uploaded = 0
+        self.bytes_uploaded = 0
+        self.failed = []
+        self.blocked_seconds = 0.0
+        self.started = time.perf_counter()
+        self.closed = False
+        self.threads = [
+            threading.Thread(target=self._run, name=f"uploader-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, blob_name: str, data: bytes, content_type: str = "text/csv") -> None:
+        """Queue one object; blocks while the queue is full."""
+        start = time.perf_counter()
+        self.queue.put((blob_name, data, content_type))
+        self.blocked_seconds += time.perf_counter() - start
+
+    def flush(self) -> None:
+        """Block until every object queued so far has been uploaded (or failed)."""
+        self.queue.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            blob_name, data, content_type = item
+            try:
+                self.bucket.blob(blob_name).upload_from_string(data, content_type=content_type)
+            except Exception as e:
+                with self.lock:
+                    self.failed.append((blob_name, str(e)))
+            else:
+                with self.lock:
+                    self.uploaded += 1
+                    self.bytes_uploaded += len(data)
+            finally:
+                self.queue.task_done()
+
+    def close(self) -> dict:
+        """Drain the queue, stop the uploaders and return the stats."""
+        if self.closed:
+            return self.stats()
+        self.closed = True
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "uploaded": self.uploaded,
+            "bytes_uploaded": self.bytes_uploaded,
+            "failed": list(self.failed),
+            "producer_blocked_seconds": round(self.blocked_seconds, 3),
+            "elapsed_seconds": round(time.perf_counter() - self.started, 3),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
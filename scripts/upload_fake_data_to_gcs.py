@@ -6,9 +6,14 @@ Case Fictício - Teste -- Upload Fake Data to GCS
 Uploads locally generated fake data to the GCS landing zone.
 This simulates the daily upload process from the 50 units.
 
+When the generator's manifest.jsonl is present, the files to upload are taken
+from it instead of scanning the output tree, and each upload carries the
+manifest CRC32C so GCS rejects a corrupted transfer.
+
 Usage:
     python scripts/upload_fake_data_to_gcs.py
     python scripts/upload_fake_data_to_gcs.py --bucket case_ficticio-datalake-485810 --local-dir output
+    python scripts/upload_fake_data_to_gcs.py --corrections-wave 1   # re-send a corrections wave
 
 Requirements:
     pip install google-cloud-storage pyyaml
@@ -23,6 +28,8 @@ import yaml
 from pathlib import Path
 from google.cloud import storage
 
+from generation_manifest import read_manifest
+
 
 def upload_directory_to_gcs(bucket_name, local_directory, gcs_prefix="", project_id=None):
     """
@@ -67,6 +74,33 @@ def upload_directory_to_gcs(bucket_name, local_directory, gcs_prefix="", project
     return uploaded_count
 
 
+def upload_from_manifest(bucket_name, local_directory, records, project_id=None):
+    """
+    Uploads the files listed in manifest records to their recorded object names.
+
+    Args:
+        bucket_name: GCS bucket name
+        local_directory: Generator output directory the record paths are relative to
+        records: Manifest records (see generation_manifest.py) with a local path
+        project_id: GCP project ID (optional)
+    """
+    storage_client = storage.Client(project=project_id) if project_id else storage.Client()
+    bucket = storage_client.bucket(bucket_name)
+
+    print(f"\n[INFO] Uploading {len(records)} manifest files to gs://{bucket_name}/")
+    uploaded_count = 0
+    for record in records:
+        blob = bucket.blob(record["object"])
+        # Sent as object metadata: GCS verifies it against the received bytes
+        blob.crc32c = record["crc32c"]
+        blob.upload_from_filename(str(Path(local_directory) / record["path"]))
+        uploaded_count += 1
+        print(f"  [OK] {record['object']}")
+
+    print(f"\n[COMPLETE] Uploaded {uploaded_count} files to gs://{bucket_name}/")
+    return uploaded_count
+
+
 def load_config():
     """Load project configuration from YAML."""
     config_path = Path("config/project_config.yaml")
@@ -103,6 +137,13 @@ def main():
         default="output",
         help="Local directory containing generated data (default: output)"
     )
+    parser.add_argument(
+        "--corrections-wave",
+        type=int,
+        default=None,
+        help="Upload only corrections/wave_NN/ from generate_fake_sales.py --corrections, "
+             "over the original raw/csv_sales/ objects"
+    )
 
     args = parser.parse_args()
 
@@ -118,6 +159,28 @@ def main():
         print("[HINT] Run: python scripts/generate_fake_sales.py first")
         return 1
 
+    manifest_path = os.path.join(args.local_dir, "manifest.jsonl")
+    if os.path.exists(manifest_path):
+        wave = args.corrections_wave or 0
+        records = [r for r in read_manifest(Path(manifest_path)) if r.get("wave", 0) == wave and r.get("path")]
+        if not records:
+            print(f"[ERROR] No files for wave {wave} in {manifest_path}")
+            return 1
+        print(f"\n[STEP 1] Uploading from manifest: {manifest_path}")
+        count = upload_from_manifest(args.bucket, args.local_dir, records, project_id=project_id)
+        print(f"\n  Files uploaded: {count} (wave {wave})")
+        return 0
+
+    if args.corrections_wave is not None:
+        wave_dir = os.path.join(args.local_dir, "corrections", f"wave_{args.corrections_wave:02d}", "csv_sales")
+        if not os.path.exists(wave_dir):
+            print(f"[ERROR] Corrections wave not found: {wave_dir}")
+            return 1
+        print(f"\n[STEP 1] Re-sending corrections wave {args.corrections_wave}...")
+        count = upload_directory_to_gcs(args.bucket, wave_dir, "raw/csv_sales", project_id=project_id)
+        print(f"\n  Corrected files re-sent: {count}")
+        return 0
+
     # Upload reference data
     print("\n[STEP 1] Uploading reference data...")
     ref_count = upload_directory_to_gcs(
@@ -17,7 +17,9 @@ CREATE TABLE IF NOT EXISTS `case_ficticio-data-mvp-arthur.case_ficticio_bronze.o
   _ingest_date DATE
 )
 PARTITION BY _ingest_date
+CLUSTER BY id_pedido
 OPTIONS(
+  partition_expiration_days=730,
   description="Bronze layer: raw orders from unit CSV files",
   labels=[("layer", "bronze"), ("source", "csv")]
 );
@@ -35,7 +37,9 @@ CREATE TABLE IF NOT EXISTS `case_ficticio-data-mvp-arthur.case_ficticio_bronze.o
   _ingest_date DATE
 )
 PARTITION BY _ingest_date
+CLUSTER BY id_item_pedido
 OPTIONS(
+  partition_expiration_days=730,
   description="Bronze layer: raw order items from unit CSV files",
   labels=[("layer", "bronze"), ("source", "csv")]
 );
@@ -85,3 +89,51 @@ OPTIONS(
   description="Bronze layer: country reference data",
   labels=[("layer", "bronze"), ("source", "reference")]
 );
+
+-- Bronze: Quarantined rows (external tables over row-level quarantine Parquet)
+-- Written by the csv_processor Cloud Function, one object per source file:
+--   quarantine/rows/YYYY/MM/DD/unit_NNN/pedido.parquet       -> quarantine_orders
+--   quarantine/rows/YYYY/MM/DD/unit_NNN/item_pedido.parquet  -> quarantine_order_items
+-- The two entities have different columns, so each gets its own table with an
+-- explicit schema (source values as STRING, as stored by build_quarantine_frame).
+-- Replay fixed rows with:
+--   python scripts/replay_quarantine.py --prefix 2026/01                     (re-validate in place)
+--   python scripts/replay_quarantine.py --prefix 2026/01 --export fixes.csv  (export, edit, then)
+--   python scripts/replay_quarantine.py --input fixes.csv
+CREATE EXTERNAL TABLE IF NOT EXISTS `case_ficticio-data-mvp-arthur.case_ficticio_bronze.quarantine_orders` (
+  Id_Unidade STRING,
+  Id_Pedido STRING,
+  Tipo_Pedido STRING,
+  Data_Pedido STRING,
+  Vlr_Pedido STRING,
+  Endereco_Entrega STRING,
+  Taxa_Entrega STRING,
+  Status STRING,
+  _rule STRING,
+  _source_file STRING,
+  _line_number INT64,
+  _quarantined_at TIMESTAMP
+)
+OPTIONS(
+  format="PARQUET",
+  uris=["gs://case_ficticio-datalake-485810/quarantine/rows/*/pedido.parquet"],
+  description="Bronze layer: pedido.csv rows rejected by ingestion validation rules (_rule, _source_file, _line_number)"
+);
+
+CREATE EXTERNAL TABLE IF NOT EXISTS `case_ficticio-data-mvp-arthur.case_ficticio_bronze.quarantine_order_items` (
+  Id_Pedido STRING,
+  Id_Item_Pedido STRING,
+  Id_Produto STRING,
+  Qtd STRING,
+  Vlr_Item STRING,
+  Observacao STRING,
+  _rule STRING,
+  _source_file STRING,
+  _line_number INT64,
+  _quarantined_at TIMESTAMP
+)
+OPTIONS(
+  format="PARQUET",
+  uris=["gs://case_ficticio-datalake-485810/quarantine/rows/*/item_pedido.parquet"],
+  description="Bronze layer: item_pedido.csv rows rejected by ingestion validation rules (_rule, _source_file, _line_number)"
+);
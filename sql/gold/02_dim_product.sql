@@ -1,29 +1,81 @@
 -- Case Fictício - Teste -- Gold Layer: Product Dimension
 -- ==============================================
 --
--- Product dimension with SCD Type 2 support (slowly changing dimension).
--- Currently implemented as Type 1 (overwrite), but structure allows future Type 2.
+-- Product dimension maintained as SCD Type 2 (slowly changing dimension).
 --
--- Grain: One row per product
--- Key: product_key (same as product_id for now)
+-- Each run hashes the tracked attributes of every Silver product and MERGEs
+-- against the current versions, touching only changed rows:
+--   - new product_id        -> insert a current version
+--   - attribute hash differs -> close the current version (_valid_to = run
+--                               time) and insert a new current version
+--   - unchanged             -> no write
+--   - product_id gone from Silver -> close the current version
+--
+-- Facts look up product_key through dim_product_current (current versions
+-- only), so the join side stays one row per product as history grows.
+--
+-- Grain: One row per product version
+-- Key: product_key = FARM_FINGERPRINT(product_id | _valid_from)
+-- Clustering: By product_id
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` AS
-SELECT
-  -- Surrogate key
-  product_id AS product_key,
+DECLARE run_ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP();
 
-  -- Natural key
-  product_id,
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` (
+  product_key INT64 NOT NULL,
+  product_id INT64 NOT NULL,
+  product_name STRING,
+  _row_hash INT64,
+  _valid_from TIMESTAMP,
+  _valid_to TIMESTAMP,
+  is_current BOOL
+)
+CLUSTER BY product_id
+OPTIONS(
+  description="Gold: product dimension (SCD Type 2)"
+);
+
+-- Tables built by the former full rebuild have no hash: their rows are
+-- versioned once on the first run
+ALTER TABLE `sixth-foundry-485810-e5.case_ficticio_gold.dim_product`
+ADD COLUMN IF NOT EXISTS _row_hash INT64;
 
-  -- Attributes
+CREATE TEMP TABLE product_source AS
+SELECT
+  product_id,
   product_name,
+  FARM_FINGERPRINT(TO_JSON_STRING(STRUCT(product_name))) AS _row_hash
+FROM `sixth-foundry-485810-e5.case_ficticio_silver.products`;
 
-  -- SCD Type 2 support (currently not used, but prepared for future)
-  CURRENT_TIMESTAMP() AS _valid_from,
-  TIMESTAMP('9999-12-31 23:59:59') AS _valid_to,
-  TRUE AS is_current
+MERGE `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` d
+USING (
+  -- Every source row, keyed to its current version (close or keep)
+  SELECT product_id AS merge_key, * FROM product_source
+  UNION ALL
+  -- Changed rows again with no key, so they insert the new version
+  SELECT CAST(NULL AS INT64) AS merge_key, s.*
+  FROM product_source s
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` cur
+    ON cur.product_id = s.product_id
+   AND cur.is_current
+  WHERE cur._row_hash IS DISTINCT FROM s._row_hash
+) src
+ON d.product_id = src.merge_key AND d.is_current
+WHEN MATCHED AND d._row_hash IS DISTINCT FROM src._row_hash THEN
+  UPDATE SET _valid_to = run_ts, is_current = FALSE
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT (product_key, product_id, product_name, _row_hash, _valid_from, _valid_to, is_current)
+  VALUES (
+    FARM_FINGERPRINT(CONCAT(CAST(src.product_id AS STRING), '|', CAST(run_ts AS STRING))),
+    src.product_id, src.product_name, src._row_hash,
+    run_ts, TIMESTAMP('9999-12-31 23:59:59'), TRUE
+  )
+WHEN NOT MATCHED BY SOURCE AND d.is_current THEN
+  UPDATE SET _valid_to = run_ts, is_current = FALSE;
 
-FROM `sixth-foundry-485810-e5.case_ficticio_silver.products`;
+CREATE OR REPLACE VIEW `sixth-foundry-485810-e5.case_ficticio_gold.dim_product_current` AS
+SELECT product_key, product_id, product_name, _valid_from
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_product`
+WHERE is_current;
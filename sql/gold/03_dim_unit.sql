@@ -4,32 +4,85 @@
 -- Unit (store location) dimension denormalized with geography hierarchy.
 -- Includes state and country for simplified reporting.
 --
--- Grain: One row per unit
--- Key: unit_key (same as unit_id)
+-- SCD Type 2: unit renames and state moves create a new version instead of
+-- overwriting history. Same hash-diff MERGE as 02_dim_product.sql -- only
+-- new, changed or removed units are written.
+--
+-- Facts look up unit_key through dim_unit_current (current versions only).
+--
+-- Grain: One row per unit version
+-- Key: unit_key = FARM_FINGERPRINT(unit_id | _valid_from)
+-- Clustering: By unit_id
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` AS
-SELECT
-  -- Surrogate key
-  unit_id AS unit_key,
+DECLARE run_ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP();
 
-  -- Natural key
-  unit_id,
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` (
+  unit_key INT64 NOT NULL,
+  unit_id INT64 NOT NULL,
+  unit_name STRING,
+  state_id INT64,
+  state_name STRING,
+  country_id INT64,
+  country_name STRING,
+  _row_hash INT64,
+  _valid_from TIMESTAMP,
+  _valid_to TIMESTAMP,
+  is_current BOOL
+)
+CLUSTER BY unit_id
+OPTIONS(
+  description="Gold: unit dimension with geography (SCD Type 2)"
+);
 
-  -- Unit attributes
-  unit_name,
+-- Tables built by the former full rebuild have no hash: their rows are
+-- versioned once on the first run
+ALTER TABLE `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit`
+ADD COLUMN IF NOT EXISTS _row_hash INT64;
 
-  -- Geography hierarchy (denormalized for performance)
+CREATE TEMP TABLE unit_source AS
+SELECT
+  unit_id,
+  unit_name,
   state_id,
   state_name,
   country_id,
   country_name,
+  FARM_FINGERPRINT(TO_JSON_STRING(STRUCT(
+    unit_name, state_id, state_name, country_id, country_name
+  ))) AS _row_hash
+FROM `sixth-foundry-485810-e5.case_ficticio_silver.units`;
 
-  -- SCD Type 2 support (prepared for future use)
-  CURRENT_TIMESTAMP() AS _valid_from,
-  TIMESTAMP('9999-12-31 23:59:59') AS _valid_to,
-  TRUE AS is_current
+MERGE `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` d
+USING (
+  -- Every source row, keyed to its current version (close or keep)
+  SELECT unit_id AS merge_key, * FROM unit_source
+  UNION ALL
+  -- Changed rows again with no key, so they insert the new version
+  SELECT CAST(NULL AS INT64) AS merge_key, s.*
+  FROM unit_source s
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` cur
+    ON cur.unit_id = s.unit_id
+   AND cur.is_current
+  WHERE cur._row_hash IS DISTINCT FROM s._row_hash
+) src
+ON d.unit_id = src.merge_key AND d.is_current
+WHEN MATCHED AND d._row_hash IS DISTINCT FROM src._row_hash THEN
+  UPDATE SET _valid_to = run_ts, is_current = FALSE
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT (unit_key, unit_id, unit_name, state_id, state_name, country_id, country_name,
+          _row_hash, _valid_from, _valid_to, is_current)
+  VALUES (
+    FARM_FINGERPRINT(CONCAT(CAST(src.unit_id AS STRING), '|', CAST(run_ts AS STRING))),
+    src.unit_id, src.unit_name, src.state_id, src.state_name, src.country_id, src.country_name,
+    src._row_hash, run_ts, TIMESTAMP('9999-12-31 23:59:59'), TRUE
+  )
+WHEN NOT MATCHED BY SOURCE AND d.is_current THEN
+  UPDATE SET _valid_to = run_ts, is_current = FALSE;
 
-FROM `sixth-foundry-485810-e5.case_ficticio_silver.units`;
+CREATE OR REPLACE VIEW `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current` AS
+SELECT unit_key, unit_id, unit_name, state_id, state_name, country_id, country_name, _valid_from
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit`
+WHERE is_current;
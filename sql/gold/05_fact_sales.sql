@@ -7,14 +7,80 @@
 -- Grain: One row per order
 -- Partitioning: By order_date for performance
 -- Clustering: By unit_key and order_type
+-- Dimension keys: current versions from dim_unit_current (SCD Type 2) at
+-- the time the order is loaded
+--
+-- Incremental: orders whose Silver order or items were ingested since the
+-- fact's latest _ingest_date are deleted and reinserted (in one
+-- transaction); only the partitions holding them are rewritten.
+-- _ingest_date is the later of the order's and its items' ingest dates, so
+-- late items advance the watermark (and 11_agg_sales_cube.sql picks the
+-- order up again).
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`
+DECLARE watermark DATE;
+
+-- Facts from the earlier full rebuilds carry natural ids (or keys of
+-- whatever version was current at the last rebuild) in the key columns, and
+-- share the _ingest_date column, so they are told apart by the table
+-- description written below. They are rebuilt from Silver once, together
+-- with the incremental aggregates that were computed from them.
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'fact_sales' AND NOT CONTAINS_SUBSTR(ddl, 'SCD Type 2 keys')
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`;
+  DROP TABLE IF EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales`;
+  DROP TABLE IF EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance`;
+  DROP TABLE IF EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` (
+  order_id STRING NOT NULL,
+  date_key STRING,
+  order_date DATE,
+  unit_key INT64,
+  order_type STRING,
+  order_status STRING,
+  order_value NUMERIC,
+  delivery_fee NUMERIC,
+  items_subtotal NUMERIC,
+  total_items INT64,
+  distinct_products INT64,
+  total_quantity INT64,
+  delivery_address STRING,
+  _ingest_date DATE
+)
 PARTITION BY order_date
 CLUSTER BY unit_key, order_type
-AS
+OPTIONS(
+  description="Gold: order-level sales fact (SCD Type 2 keys)"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`
+);
+
+CREATE TEMP TABLE changed_order_ids AS
+SELECT order_id FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders`
+WHERE _ingest_date >= watermark
+UNION DISTINCT
+SELECT order_id FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items`
+WHERE _ingest_date >= watermark;
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`
+WHERE order_id IN (SELECT order_id FROM changed_order_ids);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` (
+  order_id, date_key, order_date, unit_key, order_type, order_status,
+  order_value, delivery_fee, items_subtotal, total_items, distinct_products,
+  total_quantity, delivery_address, _ingest_date
+)
 SELECT
   -- Primary key
   o.order_id,
@@ -22,7 +88,7 @@ SELECT
   -- Foreign keys to dimensions
   FORMAT_DATE('%Y%m%d', o.order_date) AS date_key,
   o.order_date,
-  o.unit_id AS unit_key,
+  u.unit_key,
 
   -- Degenerate dimensions (dimensions stored in fact table)
   o.order_type,
@@ -42,7 +108,7 @@ SELECT
   o.delivery_address,
 
   -- Metadata
-  o._ingest_date
+  GREATEST(o._ingest_date, IFNULL(item_agg._ingest_date, o._ingest_date)) AS _ingest_date
 
 FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders` o
 
@@ -51,8 +117,17 @@ LEFT JOIN (
     order_id,
     COUNT(*) AS total_items,
     COUNT(DISTINCT product_id) AS distinct_products,
-    SUM(quantity) AS total_quantity
+    SUM(quantity) AS total_quantity,
+    MAX(_ingest_date) AS _ingest_date
   FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items`
+  WHERE order_id IN (SELECT order_id FROM changed_order_ids)
   GROUP BY order_id
 ) item_agg
-  ON o.order_id = item_agg.order_id;
+  ON o.order_id = item_agg.order_id
+
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current` u
+  ON o.unit_id = u.unit_id
+
+WHERE o.order_id IN (SELECT order_id FROM changed_order_ids);
+
+COMMIT TRANSACTION;
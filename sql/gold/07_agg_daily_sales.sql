@@ -5,12 +5,92 @@
 -- Powers the Executive and Operations dashboards.
 --
 -- Grain: One row per date
--- Refresh: Daily after Silver/Gold layer updates
+-- Partitioning: Monthly on order_date (one row per day is too small for daily partitions)
+-- Clustering: By order_date
+--
+-- fact_sales is one row per order, so order counts are plain COUNT/COUNTIF
+-- (no COUNT(DISTINCT order_id) needed).
+--
+-- Incremental: only order dates touched by facts ingested since the table's
+-- latest _ingest_date are deleted and recomputed (in one transaction), as in
+-- 11_agg_sales_cube.sql.
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales` AS
+DECLARE watermark DATE;
+DECLARE changed_dates ARRAY<DATE>;
+
+-- Tables from the earlier full rebuilds (unpartitioned, or without the
+-- _ingest_date watermark) are rebuilt from scratch
+IF EXISTS (
+  SELECT 1
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'agg_daily_sales'
+    AND (NOT CONTAINS_SUBSTR(ddl, 'PARTITION BY DATE_TRUNC(order_date, MONTH)')
+      OR NOT CONTAINS_SUBSTR(ddl, '_ingest_date'))
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales` (
+  date_key STRING,
+  order_date DATE NOT NULL,
+  year INT64,
+  month INT64,
+  month_name STRING,
+  year_month STRING,
+  day_of_week_name STRING,
+  is_weekend BOOL,
+  total_orders INT64,
+  online_orders INT64,
+  physical_orders INT64,
+  total_revenue NUMERIC,
+  online_revenue NUMERIC,
+  physical_revenue NUMERIC,
+  avg_order_value NUMERIC,
+  total_delivery_fees NUMERIC,
+  avg_delivery_fee NUMERIC,
+  total_items_sold INT64,
+  avg_items_per_order FLOAT64,
+  active_units INT64,
+  completed_orders INT64,
+  canceled_orders INT64,
+  pending_orders INT64,
+  online_pct FLOAT64,
+  cancellation_rate FLOAT64,
+  _ingest_date DATE
+)
+PARTITION BY DATE_TRUNC(order_date, MONTH)
+CLUSTER BY order_date
+OPTIONS(
+  description="Gold: daily sales KPIs"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales`
+);
+
+SET changed_dates = (
+  SELECT ARRAY_AGG(DISTINCT order_date)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`
+  WHERE _ingest_date >= watermark
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales`
+WHERE order_date IN UNNEST(changed_dates);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_sales` (
+  date_key, order_date, year, month, month_name, year_month, day_of_week_name, is_weekend,
+  total_orders, online_orders, physical_orders,
+  total_revenue, online_revenue, physical_revenue, avg_order_value,
+  total_delivery_fees, avg_delivery_fee, total_items_sold, avg_items_per_order,
+  active_units, completed_orders, canceled_orders, pending_orders,
+  online_pct, cancellation_rate, _ingest_date
+)
 SELECT
   -- Date dimension
   d.date_key,
@@ -23,9 +103,9 @@ SELECT
   d.is_weekend,
 
   -- Order counts by type
-  COUNT(DISTINCT f.order_id) AS total_orders,
-  COUNT(DISTINCT CASE WHEN f.order_type = 'ONLINE' THEN f.order_id END) AS online_orders,
-  COUNT(DISTINCT CASE WHEN f.order_type = 'PHYSICAL' THEN f.order_id END) AS physical_orders,
+  COUNT(f.order_id) AS total_orders,
+  COUNTIF(f.order_type = 'ONLINE') AS online_orders,
+  COUNTIF(f.order_type = 'PHYSICAL') AS physical_orders,
 
   -- Revenue metrics
   ROUND(SUM(f.order_value), 2) AS total_revenue,
@@ -44,27 +124,31 @@ SELECT
   ROUND(AVG(f.total_items), 2) AS avg_items_per_order,
 
   -- Unit metrics
-  COUNT(DISTINCT f.unit_key) AS active_units,
+  COUNT(DISTINCT u.unit_id) AS active_units,  -- by unit_id: fact keys point at SCD Type 2 versions
 
   -- Status distribution
-  COUNT(DISTINCT CASE WHEN f.order_status = 'Finalizado' THEN f.order_id END) AS completed_orders,
-  COUNT(DISTINCT CASE WHEN f.order_status = 'Cancelado' THEN f.order_id END) AS canceled_orders,
-  COUNT(DISTINCT CASE WHEN f.order_status = 'Pendente' THEN f.order_id END) AS pending_orders,
+  COUNTIF(f.order_status = 'Finalizado') AS completed_orders,
+  COUNTIF(f.order_status = 'Cancelado') AS canceled_orders,
+  COUNTIF(f.order_status = 'Pendente') AS pending_orders,
 
   -- Calculated percentages
-  ROUND(100.0 * COUNT(DISTINCT CASE WHEN f.order_type = 'ONLINE' THEN f.order_id END) /
-    NULLIF(COUNT(DISTINCT f.order_id), 0), 2) AS online_pct,
-  ROUND(100.0 * COUNT(DISTINCT CASE WHEN f.order_status = 'Cancelado' THEN f.order_id END) /
-    NULLIF(COUNT(DISTINCT f.order_id), 0), 2) AS cancellation_rate
+  ROUND(100.0 * COUNTIF(f.order_type = 'ONLINE') /
+    NULLIF(COUNT(f.order_id), 0), 2) AS online_pct,
+  ROUND(100.0 * COUNTIF(f.order_status = 'Cancelado') /
+    NULLIF(COUNT(f.order_id), 0), 2) AS cancellation_rate,
 
-FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_date` d
-LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
+  -- Metadata
+  MAX(f._ingest_date) AS _ingest_date
+
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_date` d
   ON d.date_key = f.date_key
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
+  ON f.unit_key = u.unit_key
+WHERE f.order_date IN UNNEST(changed_dates)
 
 GROUP BY
   d.date_key, d.full_date, d.year, d.month, d.month_name,
-  d.year_month, d.day_of_week_name, d.is_weekend
-
-HAVING total_orders > 0  -- Only include dates with actual orders
+  d.year_month, d.day_of_week_name, d.is_weekend;
 
-ORDER BY d.full_date DESC;
+COMMIT TRANSACTION;
@@ -5,12 +5,93 @@
 -- Ranks units by revenue and identifies performance leaders/laggards.
 --
 -- Grain: One row per unit
--- Refresh: Daily after Silver/Gold layer updates
+-- Clustering: By unit_id (dashboard unit filters)
+--
+-- fact_sales is one row per order, so order counts are plain COUNT/COUNTIF
+-- (no COUNT(DISTINCT order_id) needed).
+--
+-- Incremental: only units with facts ingested since the table's latest
+-- _ingest_date are deleted and recomputed, reading just their fact_sales
+-- clusters. Fact keys point at the SCD Type 2 version current when the fact
+-- was loaded, so a unit's facts are gathered over all of its versions and
+-- reported under the current one. Ranks span every unit and are refreshed
+-- over this (one row per unit) table afterwards.
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance` AS
+DECLARE watermark DATE;
+DECLARE changed_units ARRAY<INT64>;
+DECLARE changed_unit_keys ARRAY<INT64>;
+
+-- Tables from the earlier full rebuild have no _ingest_date watermark
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'agg_unit_performance' AND NOT CONTAINS_SUBSTR(ddl, '_ingest_date')
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance` (
+  unit_key INT64,
+  unit_id INT64 NOT NULL,
+  unit_name STRING,
+  state_name STRING,
+  country_name STRING,
+  total_orders INT64,
+  online_orders INT64,
+  physical_orders INT64,
+  total_revenue NUMERIC,
+  avg_order_value NUMERIC,
+  total_items_sold INT64,
+  avg_items_per_order FLOAT64,
+  completed_orders INT64,
+  canceled_orders INT64,
+  cancellation_rate FLOAT64,
+  online_pct FLOAT64,
+  first_order_date DATE,
+  last_order_date DATE,
+  days_active INT64,
+  revenue_rank INT64,
+  order_volume_rank INT64,
+  _ingest_date DATE
+)
+CLUSTER BY unit_id
+OPTIONS(
+  description="Gold: unit-level sales KPIs and rankings"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance`
+);
+
+SET changed_units = (
+  SELECT ARRAY_AGG(DISTINCT v.unit_id)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` v
+    ON f.unit_key = v.unit_key
+  WHERE f._ingest_date >= watermark
+);
+
+SET changed_unit_keys = (
+  SELECT ARRAY_AGG(unit_key)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit`
+  WHERE unit_id IN UNNEST(changed_units)
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance`
+WHERE unit_id IN UNNEST(changed_units);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance` (
+  unit_key, unit_id, unit_name, state_name, country_name,
+  total_orders, online_orders, physical_orders, total_revenue, avg_order_value,
+  total_items_sold, avg_items_per_order, completed_orders, canceled_orders,
+  cancellation_rate, online_pct, first_order_date, last_order_date, days_active,
+  _ingest_date
+)
 SELECT
   -- Unit dimensions
   u.unit_key,
@@ -20,9 +101,9 @@ SELECT
   u.country_name,
 
   -- Order counts
-  COUNT(DISTINCT f.order_id) AS total_orders,
-  COUNT(DISTINCT CASE WHEN f.order_type = 'ONLINE' THEN f.order_id END) AS online_orders,
-  COUNT(DISTINCT CASE WHEN f.order_type = 'PHYSICAL' THEN f.order_id END) AS physical_orders,
+  COUNT(f.order_id) AS total_orders,
+  COUNTIF(f.order_type = 'ONLINE') AS online_orders,
+  COUNTIF(f.order_type = 'PHYSICAL') AS physical_orders,
 
   -- Revenue metrics
   ROUND(SUM(f.order_value), 2) AS total_revenue,
@@ -33,31 +114,55 @@ SELECT
   ROUND(AVG(f.total_items), 2) AS avg_items_per_order,
 
   -- Status distribution
-  COUNT(DISTINCT CASE WHEN f.order_status = 'Finalizado' THEN f.order_id END) AS completed_orders,
-  COUNT(DISTINCT CASE WHEN f.order_status = 'Cancelado' THEN f.order_id END) AS canceled_orders,
+  COUNTIF(f.order_status = 'Finalizado') AS completed_orders,
+  COUNTIF(f.order_status = 'Cancelado') AS canceled_orders,
 
   -- Performance metrics
-  ROUND(100.0 * COUNT(DISTINCT CASE WHEN f.order_status = 'Cancelado' THEN f.order_id END) /
-    NULLIF(COUNT(DISTINCT f.order_id), 0), 2) AS cancellation_rate,
-  ROUND(100.0 * COUNT(DISTINCT CASE WHEN f.order_type = 'ONLINE' THEN f.order_id END) /
-    NULLIF(COUNT(DISTINCT f.order_id), 0), 2) AS online_pct,
+  ROUND(100.0 * COUNTIF(f.order_status = 'Cancelado') /
+    NULLIF(COUNT(f.order_id), 0), 2) AS cancellation_rate,
+  ROUND(100.0 * COUNTIF(f.order_type = 'ONLINE') /
+    NULLIF(COUNT(f.order_id), 0), 2) AS online_pct,
 
   -- Date range
   MIN(f.order_date) AS first_order_date,
   MAX(f.order_date) AS last_order_date,
   DATE_DIFF(MAX(f.order_date), MIN(f.order_date), DAY) + 1 AS days_active,
 
-  -- Ranking (calculated in outer query)
-  RANK() OVER (ORDER BY SUM(f.order_value) DESC) AS revenue_rank,
-  RANK() OVER (ORDER BY COUNT(DISTINCT f.order_id) DESC) AS order_volume_rank
+  -- Metadata
+  MAX(f._ingest_date) AS _ingest_date
 
-FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
-LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
-  ON u.unit_key = f.unit_key
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` v
+  ON f.unit_key = v.unit_key
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current` u
+  ON v.unit_id = u.unit_id
+WHERE f.unit_key IN UNNEST(changed_unit_keys)
 
 GROUP BY
-  u.unit_key, u.unit_id, u.unit_name, u.state_name, u.country_name
+  u.unit_key, u.unit_id, u.unit_name, u.state_name, u.country_name;
 
-HAVING total_orders > 0  -- Only include units with orders
+-- Rankings and unit attributes (a dimension change needs no new facts)
+UPDATE `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance` t
+SET
+  unit_key = r.unit_key,
+  unit_name = r.unit_name,
+  state_name = r.state_name,
+  country_name = r.country_name,
+  revenue_rank = r.revenue_rank,
+  order_volume_rank = r.order_volume_rank
+FROM (
+  SELECT
+    a.unit_id,
+    u.unit_key,
+    u.unit_name,
+    u.state_name,
+    u.country_name,
+    RANK() OVER (ORDER BY a.total_revenue DESC) AS revenue_rank,
+    RANK() OVER (ORDER BY a.total_orders DESC) AS order_volume_rank
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_unit_performance` a
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current` u
+    ON a.unit_id = u.unit_id
+) r
+WHERE t.unit_id = r.unit_id;
 
-ORDER BY total_revenue DESC;
+COMMIT TRANSACTION;
@@ -5,12 +5,88 @@
 -- Identifies best-selling products and revenue contributors.
 --
 -- Grain: One row per product
--- Refresh: Daily after Silver/Gold layer updates
+-- Clustering: By product_id (dashboard product filters)
+--
+-- fact_order_items is one row per item, so line items are a plain COUNT.
+-- Orders and units per product are genuinely distinct (exact here; see
+-- 09_agg_product_performance_approx.sql for the HLL++ sketch variant).
+-- Units are counted by unit_id: fact keys point at SCD Type 2 versions.
+--
+-- Incremental: only products with items ingested since the table's latest
+-- _ingest_date are deleted and recomputed, reading just their
+-- fact_order_items clusters (over every version of the product, reported
+-- under the current one). Ranks and unit penetration span every product and
+-- are refreshed over this (one row per product) table afterwards.
 --
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` AS
+DECLARE watermark DATE;
+DECLARE changed_products ARRAY<INT64>;
+DECLARE changed_product_keys ARRAY<INT64>;
+
+-- Tables from the earlier full rebuild have no _ingest_date watermark
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'agg_product_performance' AND NOT CONTAINS_SUBSTR(ddl, '_ingest_date')
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` (
+  product_key INT64,
+  product_id INT64 NOT NULL,
+  product_name STRING,
+  total_orders INT64,
+  total_line_items INT64,
+  total_quantity_sold INT64,
+  avg_quantity_per_order FLOAT64,
+  total_revenue NUMERIC,
+  avg_unit_price NUMERIC,
+  avg_line_value NUMERIC,
+  units_selling_product INT64,
+  unit_penetration_pct FLOAT64,
+  first_sold_date DATE,
+  last_sold_date DATE,
+  revenue_rank INT64,
+  volume_rank INT64,
+  _ingest_date DATE
+)
+CLUSTER BY product_id
+OPTIONS(
+  description="Gold: product-level sales KPIs and rankings"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`
+);
+
+SET changed_products = (
+  SELECT ARRAY_AGG(DISTINCT v.product_id)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items` fi
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` v
+    ON fi.product_key = v.product_key
+  WHERE fi._ingest_date >= watermark
+);
+
+SET changed_product_keys = (
+  SELECT ARRAY_AGG(product_key)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_product`
+  WHERE product_id IN UNNEST(changed_products)
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`
+WHERE product_id IN UNNEST(changed_products);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` (
+  product_key, product_id, product_name,
+  total_orders, total_line_items, total_quantity_sold, avg_quantity_per_order,
+  total_revenue, avg_unit_price, avg_line_value, units_selling_product,
+  first_sold_date, last_sold_date, _ingest_date
+)
 SELECT
   -- Product dimensions
   p.product_key,
@@ -19,7 +95,7 @@ SELECT
 
   -- Order and item counts
   COUNT(DISTINCT fi.order_id) AS total_orders,
-  COUNT(DISTINCT fi.item_id) AS total_line_items,
+  COUNT(fi.item_id) AS total_line_items,
 
   -- Quantity metrics
   SUM(fi.quantity) AS total_quantity_sold,
@@ -31,25 +107,49 @@ SELECT
   ROUND(AVG(fi.total_item_value), 2) AS avg_line_value,
 
   -- Distribution metrics
-  COUNT(DISTINCT fi.unit_key) AS units_selling_product,
-  ROUND(100.0 * COUNT(DISTINCT fi.unit_key) /
-    (SELECT COUNT(*) FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit`), 2) AS unit_penetration_pct,
+  COUNT(DISTINCT u.unit_id) AS units_selling_product,
 
   -- Date range
   MIN(fi.order_date) AS first_sold_date,
   MAX(fi.order_date) AS last_sold_date,
 
-  -- Rankings
-  RANK() OVER (ORDER BY SUM(fi.total_item_value) DESC) AS revenue_rank,
-  RANK() OVER (ORDER BY SUM(fi.quantity) DESC) AS volume_rank
+  -- Metadata
+  MAX(fi._ingest_date) AS _ingest_date
 
-FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` p
-LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items` fi
-  ON p.product_key = fi.product_key
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items` fi
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` v
+  ON fi.product_key = v.product_key
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product_current` p
+  ON v.product_id = p.product_id
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
+  ON fi.unit_key = u.unit_key
+WHERE fi.product_key IN UNNEST(changed_product_keys)
 
 GROUP BY
-  p.product_key, p.product_id, p.product_name
+  p.product_key, p.product_id, p.product_name;
 
-HAVING total_orders > 0  -- Only include products that have been sold
+-- Rankings, unit penetration and product attributes (the unit count and a
+-- dimension change need no new facts)
+UPDATE `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` t
+SET
+  product_key = r.product_key,
+  product_name = r.product_name,
+  unit_penetration_pct = r.unit_penetration_pct,
+  revenue_rank = r.revenue_rank,
+  volume_rank = r.volume_rank
+FROM (
+  SELECT
+    a.product_id,
+    p.product_key,
+    p.product_name,
+    ROUND(100.0 * a.units_selling_product /
+      (SELECT COUNT(*) FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current`), 2) AS unit_penetration_pct,
+    RANK() OVER (ORDER BY a.total_revenue DESC) AS revenue_rank,
+    RANK() OVER (ORDER BY a.total_quantity_sold DESC) AS volume_rank
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` a
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product_current` p
+    ON a.product_id = p.product_id
+) r
+WHERE t.product_id = r.product_id;
 
-ORDER BY total_revenue DESC;
+COMMIT TRANSACTION;
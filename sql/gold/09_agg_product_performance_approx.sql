@@ -0,0 +1,149 @@
+-- Case Fictício - Teste -- Gold Layer: Product Performance Aggregation (approximate)
+-- ========================================================================
+--
+-- Same table and columns as 09_agg_product_performance.sql, built from the
+-- daily HLL++ sketches in agg_daily_product_sketches instead of exact
+-- COUNT(DISTINCT) over fact_order_items. total_orders and
+-- units_selling_product are approximate (~0.5% error); every other column
+-- is exact. Used by build_aggregations.py --distinct-mode approx and by
+-- pipeline_coordinator.py with distinct_mode: approx.
+--
+-- Incremental like the exact variant: only products whose sketches were
+-- ingested since the table's latest _ingest_date are recomputed.
+--
+-- Grain: One row per product
+-- Clustering: By product_id (dashboard product filters)
+--
+-- Author: Arthur Graf -- Case Fictício - Teste Project
+-- Date: October 2026
+
+DECLARE watermark DATE;
+DECLARE changed_products ARRAY<INT64>;
+DECLARE changed_product_keys ARRAY<INT64>;
+
+-- Tables from the earlier full rebuild have no _ingest_date watermark
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'agg_product_performance' AND NOT CONTAINS_SUBSTR(ddl, '_ingest_date')
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` (
+  product_key INT64,
+  product_id INT64 NOT NULL,
+  product_name STRING,
+  total_orders INT64,
+  total_line_items INT64,
+  total_quantity_sold INT64,
+  avg_quantity_per_order FLOAT64,
+  total_revenue NUMERIC,
+  avg_unit_price NUMERIC,
+  avg_line_value NUMERIC,
+  units_selling_product INT64,
+  unit_penetration_pct FLOAT64,
+  first_sold_date DATE,
+  last_sold_date DATE,
+  revenue_rank INT64,
+  volume_rank INT64,
+  _ingest_date DATE
+)
+CLUSTER BY product_id
+OPTIONS(
+  description="Gold: product-level sales KPIs and rankings"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`
+);
+
+SET changed_products = (
+  SELECT ARRAY_AGG(DISTINCT v.product_id)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches` s
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` v
+    ON s.product_key = v.product_key
+  WHERE s._ingest_date >= watermark
+);
+
+SET changed_product_keys = (
+  SELECT ARRAY_AGG(product_key)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_product`
+  WHERE product_id IN UNNEST(changed_products)
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance`
+WHERE product_id IN UNNEST(changed_products);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` (
+  product_key, product_id, product_name,
+  total_orders, total_line_items, total_quantity_sold, avg_quantity_per_order,
+  total_revenue, avg_unit_price, avg_line_value, units_selling_product,
+  first_sold_date, last_sold_date, _ingest_date
+)
+SELECT
+  -- Product dimensions
+  p.product_key,
+  p.product_id,
+  p.product_name,
+
+  -- Order and item counts
+  HLL_COUNT.MERGE(s.orders_sketch) AS total_orders,
+  SUM(s.line_items) AS total_line_items,
+
+  -- Quantity metrics
+  SUM(s.total_quantity) AS total_quantity_sold,
+  ROUND(SUM(s.total_quantity) / SUM(s.line_items), 2) AS avg_quantity_per_order,
+
+  -- Revenue metrics
+  ROUND(SUM(s.total_revenue), 2) AS total_revenue,
+  ROUND(SUM(s.unit_price_sum) / SUM(s.line_items), 2) AS avg_unit_price,
+  ROUND(SUM(s.total_revenue) / SUM(s.line_items), 2) AS avg_line_value,
+
+  -- Distribution metrics
+  HLL_COUNT.MERGE(s.units_sketch) AS units_selling_product,
+
+  -- Date range
+  MIN(s.order_date) AS first_sold_date,
+  MAX(s.order_date) AS last_sold_date,
+
+  -- Metadata
+  MAX(s._ingest_date) AS _ingest_date
+
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches` s
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` v
+  ON s.product_key = v.product_key
+JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product_current` p
+  ON v.product_id = p.product_id
+WHERE s.product_key IN UNNEST(changed_product_keys)
+
+GROUP BY
+  p.product_key, p.product_id, p.product_name;
+
+-- Rankings, unit penetration and product attributes (the unit count and a
+-- dimension change need no new facts)
+UPDATE `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` t
+SET
+  product_key = r.product_key,
+  product_name = r.product_name,
+  unit_penetration_pct = r.unit_penetration_pct,
+  revenue_rank = r.revenue_rank,
+  volume_rank = r.volume_rank
+FROM (
+  SELECT
+    a.product_id,
+    p.product_key,
+    p.product_name,
+    ROUND(100.0 * a.units_selling_product /
+      (SELECT COUNT(*) FROM `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit_current`), 2) AS unit_penetration_pct,
+    RANK() OVER (ORDER BY a.total_revenue DESC) AS revenue_rank,
+    RANK() OVER (ORDER BY a.total_quantity_sold DESC) AS volume_rank
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_product_performance` a
+  JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product_current` p
+    ON a.product_id = p.product_id
+) r
+WHERE t.product_id = r.product_id;
+
+COMMIT TRANSACTION;
@@ -0,0 +1,107 @@
+-- Case Fictício - Teste -- Gold Layer: Daily Product Distinct-Count Sketches
+-- ================================================================
+--
+-- HyperLogLog++ sketches of the genuinely distinct counts in
+-- fact_order_items (orders and units per product), stored per day so they
+-- can be rolled up across products, units and months without rescanning
+-- the fact table:
+--
+--   -- Orders containing product 3 in January (approximate, ~0.5% error);
+--   -- product_key is an SCD Type 2 key, so filter on the natural id through
+--   -- dim_product (every version of the product is merged)
+--   SELECT HLL_COUNT.MERGE(s.orders_sketch)
+--   FROM agg_daily_product_sketches s
+--   JOIN dim_product p ON s.product_key = p.product_key
+--   WHERE p.product_id = 3 AND s.order_date BETWEEN '2026-01-01' AND '2026-01-31';
+--
+--   -- Active units per month across all products
+--   SELECT DATE_TRUNC(order_date, MONTH) AS month, HLL_COUNT.MERGE(units_sketch)
+--   FROM agg_daily_product_sketches GROUP BY month;
+--
+-- Additive measures are stored alongside so sketch rollups need no join.
+--
+-- Incremental: only order dates touched by items ingested since the
+-- table's latest _ingest_date are deleted and recomputed (in one
+-- transaction), as in 11_agg_sales_cube.sql.
+--
+-- Grain: One row per date x product
+-- Partitioning: Monthly on order_date
+-- Clustering: By product_key
+--
+-- Author: Arthur Graf -- Case Fictício - Teste Project
+-- Date: October 2026
+
+DECLARE watermark DATE;
+DECLARE changed_dates ARRAY<DATE>;
+
+-- Tables built by the earlier full rebuild have no _ingest_date watermark
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'agg_daily_product_sketches'
+) AND NOT EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.COLUMNS`
+  WHERE table_name = 'agg_daily_product_sketches' AND column_name = '_ingest_date'
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches` (
+  order_date DATE NOT NULL,
+  product_key INT64,
+  orders_sketch BYTES,
+  units_sketch BYTES,
+  line_items INT64,
+  total_quantity INT64,
+  unit_price_sum NUMERIC,
+  total_revenue NUMERIC,
+  _ingest_date DATE
+)
+PARTITION BY DATE_TRUNC(order_date, MONTH)
+CLUSTER BY product_key
+OPTIONS(
+  description="Gold: daily HLL++ sketches of orders and units per product"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches`
+);
+
+SET changed_dates = (
+  SELECT ARRAY_AGG(DISTINCT order_date)
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items`
+  WHERE _ingest_date >= watermark
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches`
+WHERE order_date IN UNNEST(changed_dates);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_daily_product_sketches` (
+  order_date, product_key, orders_sketch, units_sketch,
+  line_items, total_quantity, unit_price_sum, total_revenue, _ingest_date
+)
+SELECT
+  fi.order_date,
+  fi.product_key,
+
+  -- Distinct-count sketches (default precision 15)
+  HLL_COUNT.INIT(fi.order_id) AS orders_sketch,
+  HLL_COUNT.INIT(u.unit_id) AS units_sketch,  -- by unit_id: fact keys point at SCD Type 2 versions
+
+  -- Additive measures
+  COUNT(*) AS line_items,
+  SUM(fi.quantity) AS total_quantity,
+  SUM(fi.unit_price) AS unit_price_sum,
+  SUM(fi.total_item_value) AS total_revenue,
+
+  MAX(fi._ingest_date) AS _ingest_date
+
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items` fi
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
+  ON fi.unit_key = u.unit_key
+WHERE fi.order_date IN UNNEST(changed_dates)
+GROUP BY fi.order_date, fi.product_key;
+
+COMMIT TRANSACTION;
@@ -0,0 +1,135 @@
+-- Case Fictício - Teste -- Gold Layer: Sales Cube
+-- =======================================
+--
+-- Pre-aggregated cube over (order_date, unit, state, product, order_type,
+-- order_status). Any coarser grouping (unit x week, state x product x month,
+-- ...) is answered from this table by scripts/cube_router.py instead of
+-- scanning fact_order_items.
+--
+-- Two slices share the table:
+--   product_id IS NULL       order-level rows from fact_sales
+--                            (orders, order_revenue, delivery_fees are exact
+--                            for any grouping)
+--   product_id IS NOT NULL   product rows from fact_order_items
+--                            (orders = distinct orders containing the product;
+--                            additive only while grouping/filtering by product)
+--
+-- Incremental: only order dates touched by facts ingested since the cube's
+-- latest _ingest_date are deleted and recomputed (in one transaction).
+--
+-- Units and products are stored by natural id (unit_id, product_id): fact
+-- keys point at SCD Type 2 versions, and cube rows kept from earlier runs
+-- must still group with newly computed ones after a dimension change.
+-- state_name is the unit's state in the version the fact was keyed to.
+--
+-- Grain: One row per date x unit x product (or order slice) x type x status
+-- Partitioning: Monthly on order_date
+-- Clustering: By unit_id, product_id
+--
+-- Author: Arthur Graf -- Case Fictício - Teste Project
+-- Date: October 2026
+
+DECLARE watermark DATE;
+DECLARE changed_dates ARRAY<DATE>;
+
+-- Cubes built before the switch to natural ids are rebuilt from scratch
+IF EXISTS (
+  SELECT 1 FROM `sixth-foundry-485810-e5.case_ficticio_gold.INFORMATION_SCHEMA.COLUMNS`
+  WHERE table_name = 'agg_sales_cube' AND column_name = 'unit_key'
+) THEN
+  DROP TABLE `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube`;
+END IF;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube` (
+  order_date DATE NOT NULL,
+  unit_id INT64,
+  state_name STRING,
+  product_id INT64,
+  order_type STRING,
+  order_status STRING,
+  orders INT64,
+  order_revenue NUMERIC,
+  delivery_fees NUMERIC,
+  line_items INT64,
+  quantity INT64,
+  item_revenue NUMERIC,
+  _ingest_date DATE
+)
+PARTITION BY DATE_TRUNC(order_date, MONTH)
+CLUSTER BY unit_id, product_id
+OPTIONS(
+  description="Gold: sales cube (date x unit x state x product x type x status) for dashboard rollups"
+);
+
+SET watermark = (
+  SELECT IFNULL(MAX(_ingest_date), DATE '1970-01-01')
+  FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube`
+);
+
+SET changed_dates = (
+  SELECT ARRAY_AGG(DISTINCT order_date)
+  FROM (
+    SELECT order_date FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales`
+    WHERE _ingest_date >= watermark
+    UNION ALL
+    SELECT order_date FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items`
+    WHERE _ingest_date >= watermark
+  )
+);
+
+BEGIN TRANSACTION;
+
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube`
+WHERE order_date IN UNNEST(changed_dates);
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_gold.agg_sales_cube` (
+  order_date, unit_id, state_name, product_id, order_type, order_status,
+  orders, order_revenue, delivery_fees, line_items, quantity, item_revenue, _ingest_date
+)
+-- Order-level slice
+SELECT
+  f.order_date,
+  u.unit_id,
+  u.state_name,
+  CAST(NULL AS INT64) AS product_id,
+  f.order_type,
+  f.order_status,
+  COUNT(*) AS orders,
+  SUM(f.order_value) AS order_revenue,
+  SUM(f.delivery_fee) AS delivery_fees,
+  SUM(f.total_items) AS line_items,
+  SUM(f.total_quantity) AS quantity,
+  CAST(NULL AS NUMERIC) AS item_revenue,
+  MAX(f._ingest_date) AS _ingest_date
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_sales` f
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
+  ON f.unit_key = u.unit_key
+WHERE f.order_date IN UNNEST(changed_dates)
+GROUP BY f.order_date, u.unit_id, u.state_name, f.order_type, f.order_status
+
+UNION ALL
+
+-- Product slice
+SELECT
+  fi.order_date,
+  u.unit_id,
+  u.state_name,
+  IFNULL(p.product_id, -1) AS product_id,  -- -1: product missing from dim_product
+  fi.order_type,
+  fi.order_status,
+  COUNT(DISTINCT fi.order_id) AS orders,
+  CAST(NULL AS NUMERIC) AS order_revenue,
+  CAST(NULL AS NUMERIC) AS delivery_fees,
+  COUNT(*) AS line_items,
+  SUM(fi.quantity) AS quantity,
+  SUM(fi.total_item_value) AS item_revenue,
+  MAX(fi._ingest_date) AS _ingest_date
+FROM `sixth-foundry-485810-e5.case_ficticio_gold.fact_order_items` fi
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_unit` u
+  ON fi.unit_key = u.unit_key
+LEFT JOIN `sixth-foundry-485810-e5.case_ficticio_gold.dim_product` p
+  ON fi.product_key = p.product_key
+WHERE fi.order_date IN UNNEST(changed_dates)
+GROUP BY fi.order_date, u.unit_id, u.state_name, product_id, fi.order_type, fi.order_status;
+
+COMMIT TRANSACTION;
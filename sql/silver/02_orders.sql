@@ -9,10 +9,80 @@
 --   - Calculated fields (items_subtotal)
 --   - Deduplication (latest ingestion per order_id)
 --
+-- Incremental dedup:
+--   orders_version_index keeps the winning version of every order_id
+--   (_ingest_timestamp, _ingest_date, _source_file). Each run:
+--     1. reads only Bronze partitions ingested since the index watermark
+--        (minus a lookback for loads that committed out of order)
+--     2. merges their latest versions into the index
+--     3. re-reads only the Bronze partitions holding versions that won and
+--        merges them into Silver
+--   so the dedup shuffle is proportional to new data, not to all history.
+--   The first run (empty index) processes the full Bronze table once.
+--   Full refresh: drop orders_version_index (build_silver_layer.py --full-refresh).
+--
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_silver.orders` AS
+DECLARE watermark TIMESTAMP;
+DECLARE winning_dates ARRAY<DATE>;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_silver.orders_version_index` (
+  order_id STRING NOT NULL,
+  _ingest_timestamp TIMESTAMP NOT NULL,
+  _ingest_date DATE NOT NULL,
+  _source_file STRING
+)
+CLUSTER BY order_id
+OPTIONS(
+  description="Silver: latest Bronze version per order_id (incremental dedup index)"
+);
+
+SET watermark = (
+  SELECT TIMESTAMP_SUB(IFNULL(MAX(_ingest_timestamp), TIMESTAMP '1970-01-01'), INTERVAL 1 HOUR)
+  FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders_version_index`
+);
+
+-- 1. Latest version per order_id among newly ingested rows
+CREATE TEMP TABLE new_versions AS
+SELECT
+  o.id_pedido AS order_id,
+  o._ingest_timestamp,
+  o._ingest_date,
+  o._source_file
+FROM `sixth-foundry-485810-e5.case_ficticio_bronze.orders` o
+WHERE o._ingest_date >= DATE(watermark)
+  AND o._ingest_timestamp > watermark
+QUALIFY ROW_NUMBER() OVER (
+  PARTITION BY o.id_pedido
+  ORDER BY o._ingest_timestamp DESC, o._source_file DESC
+) = 1;
+
+-- 2. Advance the index (only strictly newer versions win)
+MERGE `sixth-foundry-485810-e5.case_ficticio_silver.orders_version_index` idx
+USING new_versions nv
+ON idx.order_id = nv.order_id
+WHEN MATCHED AND nv._ingest_timestamp > idx._ingest_timestamp THEN
+  UPDATE SET
+    _ingest_timestamp = nv._ingest_timestamp,
+    _ingest_date = nv._ingest_date,
+    _source_file = nv._source_file
+WHEN NOT MATCHED THEN
+  INSERT (order_id, _ingest_timestamp, _ingest_date, _source_file)
+  VALUES (nv.order_id, nv._ingest_timestamp, nv._ingest_date, nv._source_file);
+
+CREATE TEMP TABLE winners AS
+SELECT idx.*
+FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders_version_index` idx
+JOIN new_versions nv
+  ON idx.order_id = nv.order_id
+ AND idx._ingest_timestamp = nv._ingest_timestamp
+ AND idx._source_file = nv._source_file;
+
+SET winning_dates = (SELECT ARRAY_AGG(DISTINCT _ingest_date) FROM winners);
+
+-- 3. Transform the winning versions (Bronze read limited to their partitions)
+CREATE TEMP TABLE changed_orders AS
 SELECT
   -- Primary key
   o.id_pedido AS order_id,
@@ -52,9 +122,39 @@ SELECT
   o._ingest_date
 
 FROM `sixth-foundry-485810-e5.case_ficticio_bronze.orders` o
+JOIN winners w
+  ON o.id_pedido = w.order_id
+ AND o._ingest_timestamp = w._ingest_timestamp
+ AND o._source_file = w._source_file
+WHERE o._ingest_date IN UNNEST(winning_dates)
+-- Byte-identical Bronze copies (e.g. a retried load job) match the same
+-- winner; keep one so the MERGE sees at most one source row per key
+QUALIFY ROW_NUMBER() OVER (PARTITION BY o.id_pedido) = 1;
 
--- Deduplication: keep latest ingestion per order_id
-QUALIFY ROW_NUMBER() OVER (
-  PARTITION BY o.id_pedido
-  ORDER BY o._ingest_timestamp DESC
-) = 1;
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_silver.orders`
+PARTITION BY order_date
+CLUSTER BY unit_id, order_id
+AS SELECT * FROM changed_orders LIMIT 0;
+
+MERGE `sixth-foundry-485810-e5.case_ficticio_silver.orders` s
+USING changed_orders c
+ON s.order_id = c.order_id
+WHEN MATCHED THEN
+  UPDATE SET
+    unit_id = c.unit_id,
+    order_type = c.order_type,
+    order_status = c.order_status,
+    order_date = c.order_date,
+    order_year = c.order_year,
+    order_month = c.order_month,
+    order_day = c.order_day,
+    order_day_of_week = c.order_day_of_week,
+    order_value = c.order_value,
+    delivery_fee = c.delivery_fee,
+    items_subtotal = c.items_subtotal,
+    delivery_address = c.delivery_address,
+    _source_file = c._source_file,
+    _ingest_timestamp = c._ingest_timestamp,
+    _ingest_date = c._ingest_date
+WHEN NOT MATCHED THEN
+  INSERT ROW;
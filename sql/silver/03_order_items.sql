@@ -5,14 +5,118 @@
 -- Transformations:
 --   - Calculated field: total_item_value = quantity * unit_price
 --   - Type casting (quantity as INT64)
---   - Referential integrity (INNER JOIN with orders)
+--   - Referential integrity: the csv_processor (INGESTION_MODE=paired)
+--     drops orphaned items before they reach Bronze, but single mode, the
+--     backfill's lone-file fallback, quarantine replays and older Bronze
+--     history do not reconcile pairs. New item versions are therefore
+--     semi-joined against Silver orders (order_id column only, clustered)
+--     instead of the old full join against Bronze orders. An item version
+--     whose order is not in Silver yet is parked in
+--     order_items_pending_orphans and re-checked on every run, so it
+--     reaches Silver once its order does, however late that is.
 --   - Deduplication (latest ingestion per order_item_id)
 --   - Observation field cleaning
 --
+-- Incremental dedup: same scheme as 02_orders.sql, with
+-- order_items_version_index keyed on order_item_id.
+--
 -- Author: Arthur Graf -- Case Fictício - Teste Project
 -- Date: January 2026
 
-CREATE OR REPLACE TABLE `sixth-foundry-485810-e5.case_ficticio_silver.order_items` AS
+DECLARE watermark TIMESTAMP;
+DECLARE winning_dates ARRAY<DATE>;
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_silver.order_items_version_index` (
+  order_item_id STRING NOT NULL,
+  _ingest_timestamp TIMESTAMP NOT NULL,
+  _ingest_date DATE NOT NULL,
+  _source_file STRING
+)
+CLUSTER BY order_item_id
+OPTIONS(
+  description="Silver: latest Bronze version per order_item_id (incremental dedup index)"
+);
+
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_silver.order_items_pending_orphans` (
+  order_item_id STRING NOT NULL,
+  order_id STRING,
+  _ingest_timestamp TIMESTAMP NOT NULL,
+  _ingest_date DATE NOT NULL,
+  _source_file STRING
+)
+CLUSTER BY order_id
+OPTIONS(
+  description="Silver: item versions waiting for their order to reach Silver"
+);
+
+SET watermark = (
+  SELECT TIMESTAMP_SUB(IFNULL(MAX(_ingest_timestamp), TIMESTAMP '1970-01-01'), INTERVAL 1 HOUR)
+  FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items_version_index`
+);
+
+-- 1. Latest version per order_item_id among newly ingested rows and the
+--    item versions still waiting for their order
+CREATE TEMP TABLE candidate_versions AS
+SELECT *
+FROM (
+  SELECT
+    oi.id_item_pedido AS order_item_id,
+    oi.id_pedido AS order_id,
+    oi._ingest_timestamp,
+    oi._ingest_date,
+    oi._source_file
+  FROM `sixth-foundry-485810-e5.case_ficticio_bronze.order_items` oi
+  WHERE oi._ingest_date >= DATE(watermark)
+    AND oi._ingest_timestamp > watermark
+
+  UNION ALL
+
+  SELECT order_item_id, order_id, _ingest_timestamp, _ingest_date, _source_file
+  FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items_pending_orphans`
+)
+QUALIFY ROW_NUMBER() OVER (
+  PARTITION BY order_item_id
+  ORDER BY _ingest_timestamp DESC, _source_file DESC
+) = 1;
+
+CREATE TEMP TABLE new_versions AS
+SELECT
+  c.order_item_id,
+  c._ingest_timestamp,
+  c._ingest_date,
+  c._source_file
+FROM candidate_versions c
+WHERE EXISTS (
+  SELECT 1
+  FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders` o
+  WHERE o.order_id = c.order_id
+);
+
+-- 2. Advance the index (only strictly newer versions win)
+MERGE `sixth-foundry-485810-e5.case_ficticio_silver.order_items_version_index` idx
+USING new_versions nv
+ON idx.order_item_id = nv.order_item_id
+WHEN MATCHED AND nv._ingest_timestamp > idx._ingest_timestamp THEN
+  UPDATE SET
+    _ingest_timestamp = nv._ingest_timestamp,
+    _ingest_date = nv._ingest_date,
+    _source_file = nv._source_file
+WHEN NOT MATCHED THEN
+  INSERT (order_item_id, _ingest_timestamp, _ingest_date, _source_file)
+  VALUES (nv.order_item_id, nv._ingest_timestamp, nv._ingest_date, nv._source_file);
+
+CREATE TEMP TABLE winners AS
+SELECT idx.*
+FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items_version_index` idx
+JOIN new_versions nv
+  ON idx.order_item_id = nv.order_item_id
+ AND idx._ingest_timestamp = nv._ingest_timestamp
+ AND idx._source_file = nv._source_file;
+
+SET winning_dates = (SELECT ARRAY_AGG(DISTINCT _ingest_date) FROM winners);
+
+-- 3. Transform the winning versions (Bronze read limited to their partitions)
+CREATE TEMP TABLE changed_order_items AS
 SELECT
   -- Primary key
   oi.id_item_pedido AS order_item_id,
@@ -39,13 +143,47 @@ SELECT
   oi._ingest_date
 
 FROM `sixth-foundry-485810-e5.case_ficticio_bronze.order_items` oi
+JOIN winners w
+  ON oi.id_item_pedido = w.order_item_id
+ AND oi._ingest_timestamp = w._ingest_timestamp
+ AND oi._source_file = w._source_file
+WHERE oi._ingest_date IN UNNEST(winning_dates)
+-- Byte-identical Bronze copies (e.g. a retried load job) match the same
+-- winner; keep one so the MERGE sees at most one source row per key
+QUALIFY ROW_NUMBER() OVER (PARTITION BY oi.id_item_pedido) = 1;
 
--- Referential integrity: only include items that have matching orders
-INNER JOIN `sixth-foundry-485810-e5.case_ficticio_bronze.orders` o
-  ON oi.id_pedido = o.id_pedido
+CREATE TABLE IF NOT EXISTS `sixth-foundry-485810-e5.case_ficticio_silver.order_items`
+CLUSTER BY order_id, product_id
+AS SELECT * FROM changed_order_items LIMIT 0;
 
--- Deduplication: keep latest ingestion per order_item_id
-QUALIFY ROW_NUMBER() OVER (
-  PARTITION BY oi.id_item_pedido
-  ORDER BY oi._ingest_timestamp DESC
-) = 1;
+MERGE `sixth-foundry-485810-e5.case_ficticio_silver.order_items` s
+USING changed_order_items c
+ON s.order_item_id = c.order_item_id
+WHEN MATCHED THEN
+  UPDATE SET
+    order_id = c.order_id,
+    product_id = c.product_id,
+    quantity = c.quantity,
+    unit_price = c.unit_price,
+    total_item_value = c.total_item_value,
+    observation = c.observation,
+    _source_file = c._source_file,
+    _ingest_timestamp = c._ingest_timestamp,
+    _ingest_date = c._ingest_date
+WHEN NOT MATCHED THEN
+  INSERT ROW;
+
+-- 4. Park the versions whose order is still missing. Rewritten last, so a run
+--    that fails earlier keeps the previous pending set for the next attempt.
+DELETE FROM `sixth-foundry-485810-e5.case_ficticio_silver.order_items_pending_orphans`
+WHERE TRUE;
+
+INSERT INTO `sixth-foundry-485810-e5.case_ficticio_silver.order_items_pending_orphans`
+  (order_item_id, order_id, _ingest_timestamp, _ingest_date, _source_file)
+SELECT c.order_item_id, c.order_id, c._ingest_timestamp, c._ingest_date, c._source_file
+FROM candidate_versions c
+WHERE NOT EXISTS (
+  SELECT 1
+  FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders` o
+  WHERE o.order_id = c.order_id
+);
@@ -0,0 +1,198 @@
+"""
+Case Fictício - Teste -- Unit Tests for Bulk Backfill
+============================================
+
+Unit tests for scripts/backfill_sales.py enumeration and checkpoint helpers.
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_backfill_sales.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+import backfill_sales
+from backfill_sales import (
+    day_prefixes,
+    group_unit_dirs,
+    to_raw_path,
+    batch_days,
+    read_checkpoint,
+    write_checkpoint,
+    init_worker,
+    list_unit_dirs,
+    process_unit_dir,
+    open_source_bucket,
+    run_backfill,
+)
+from fault_injection import FaultInjector
+from generate_fake_sales import generate_sales_data, generate_unit_list
+
+
+class TestEnumeration:
+    """Tests for date-range prefix enumeration."""
+
+    def test_day_prefixes_inclusive(self):
+        """Test that both ends of the range are included."""
+        days = day_prefixes(datetime(2026, 1, 30), datetime(2026, 2, 1), "raw")
+        assert days == [
+            ("2026-01-30", "raw/csv_sales/2026/01/30/"),
+            ("2026-01-31", "raw/csv_sales/2026/01/31/"),
+            ("2026-02-01", "raw/csv_sales/2026/02/01/"),
+        ]
+
+    def test_quarantine_source_maps_back_to_raw(self):
+        """Test that quarantined copies keep their original raw source path."""
+        days = day_prefixes(datetime(2026, 1, 15), datetime(2026, 1, 15), "quarantine")
+        assert days[0][1] == "quarantine/2026/01/15/"
+        assert to_raw_path("quarantine/2026/01/15/unit_001") == "raw/csv_sales/2026/01/15/unit_001"
+
+    def test_group_unit_dirs(self):
+        """Test that objects are grouped per unit and unrelated files ignored."""
+        units = group_unit_dirs([
+            "raw/csv_sales/2026/01/15/unit_001/pedido.csv",
+            "raw/csv_sales/2026/01/15/unit_001/item_pedido.csv",
+            "raw/csv_sales/2026/01/15/unit_002/pedido.csv",
+            "raw/csv_sales/2026/01/15/unit_002/notes.txt",
+        ])
+        assert units == {
+            "raw/csv_sales/2026/01/15/unit_001": {"pedido.csv", "item_pedido.csv"},
+            "raw/csv_sales/2026/01/15/unit_002": {"pedido.csv"},
+        }
+
+    def test_batch_days(self):
+        """Test that days are split into consecutive load batches."""
+        days = day_prefixes(datetime(2026, 1, 1), datetime(2026, 1, 10), "raw")
+        batches = batch_days(days, 4)
+        assert [len(b) for b in batches] == [4, 4, 2]
+
+    def test_default_batches_are_calendar_months(self):
+        """Test that without --batch-days every batch is one calendar month."""
+        days = day_prefixes(datetime(2026, 1, 20), datetime(2026, 3, 2), "raw")
+        assert [(b[0][0], b[-1][0]) for b in batch_days(days, None)] == [
+            ("2026-01-20", "2026-01-31"), ("2026-02-01", "2026-02-28"), ("2026-03-01", "2026-03-02"),
+        ]
+
+
+class TestLocalSource:
+    """Tests for backfilling straight from generator output."""
+
+    def test_local_files_validated_as_raw_objects(self, tmp_path):
+        """Test that local unit-days are validated and tagged with their raw/ object name."""
+        generate_sales_data(units=generate_unit_list(2), start_date=datetime(2026, 1, 15),
+                            end_date=datetime(2026, 1, 15), min_orders=20, max_orders=20,
+                            output_dir=tmp_path, seed=5,
+                            faults=FaultInjector({"invalid_status": 0.2}))
+        init_worker(None, None, str(tmp_path))
+        bucket = open_source_bucket(None, None, str(tmp_path))
+        (_, prefix), = day_prefixes(datetime(2026, 1, 15), datetime(2026, 1, 15), "local")
+        unit_dirs = list_unit_dirs(bucket, prefix)
+        assert sorted(unit_dirs) == ["csv_sales/2026/01/15/unit_001", "csv_sales/2026/01/15/unit_002"]
+
+        result = process_unit_dir("csv_sales/2026/01/15/unit_001",
+                                  unit_dirs["csv_sales/2026/01/15/unit_001"], dry_run=False)
+        assert result["rejected"] > 0
+        assert set(result["orders"]["_source_file"]) == {"raw/csv_sales/2026/01/15/unit_001/pedido.csv"}
+        assert len(result["orders"]) < 20
+        assert list((tmp_path / "quarantine").rglob("*.parquet"))
+
+
+class TestCheckpoint:
+    """Tests for resumable progress checkpoints."""
+
+    def test_missing_checkpoint_is_empty(self, tmp_path):
+        """Test that a fresh run starts with no completed days."""
+        state = read_checkpoint(tmp_path / "missing.json")
+        assert state["completed_days"] == []
+
+    def test_checkpoint_roundtrip(self, tmp_path):
+        """Test that completed days survive a restart."""
+        path = tmp_path / "checkpoint.json"
+        state = read_checkpoint(path)
+        state["completed_days"].extend(["2026-01-01", "2026-01-02"])
+        state["rows_loaded"]["orders"] += 10
+        write_checkpoint(path, state)
+
+        restored = read_checkpoint(path)
+        assert restored["completed_days"] == ["2026-01-01", "2026-01-02"]
+        assert restored["rows_loaded"]["orders"] == 10
+        assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+    def test_resume_retries_failed_unit_days(self, tmp_path, monkeypatch):
+        """Test that a transient failure is checkpointed for retry and reloaded alone on resume."""
+        generate_sales_data(units=generate_unit_list(2), start_date=datetime(2026, 1, 15),
+                            end_date=datetime(2026, 1, 16), min_orders=5, max_orders=5,
+                            output_dir=tmp_path, seed=5)
+        read_csv = backfill_sales.read_csv
+
+        def flaky_read_csv(blob_name):
+            if blob_name == "csv_sales/2026/01/15/unit_002/pedido.csv":
+                raise ConnectionError("503 Service Unavailable")
+            return read_csv(blob_name)
+
+        monkeypatch.setattr(backfill_sales, "read_csv", flaky_read_csv)
+        init_worker(None, None, str(tmp_path))
+        bucket = open_source_bucket(None, None, str(tmp_path))
+        days = day_prefixes(datetime(2026, 1, 15), datetime(2026, 1, 16), "local")
+        path = tmp_path / "checkpoint.json"
+        load = lambda frames: {t: sum(len(f) for f in parts) for t, parts in frames.items()}
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            state = read_checkpoint(path)
+            failures = run_backfill(pool, bucket, days, state, path, load)
+        assert [unit_dir for unit_dir, _ in failures] == ["csv_sales/2026/01/15/unit_002"]
+        state = read_checkpoint(path)
+        assert state["completed_days"] == ["2026-01-15", "2026-01-16"]
+        assert state["failed_unit_dirs"] == ["csv_sales/2026/01/15/unit_002"]
+        assert state["rows_loaded"]["orders"] == 15
+
+        monkeypatch.setattr(backfill_sales, "read_csv", read_csv)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            failures = run_backfill(pool, bucket, [], state, path, load)
+        assert failures == []
+        state = read_checkpoint(path)
+        assert state["failed_unit_dirs"] == []
+        assert state["rows_loaded"]["orders"] == 20
+
+    def test_deterministic_failure_quarantines_whole_files(self, tmp_path):
+        """Test that an undecodable file goes to whole-file quarantine instead of the retry list."""
+        generate_sales_data(units=generate_unit_list(2), start_date=datetime(2026, 1, 15),
+                            end_date=datetime(2026, 1, 15), min_orders=5, max_orders=5,
+                            output_dir=tmp_path, seed=5)
+        (tmp_path / "csv_sales/2026/01/15/unit_002/pedido.csv").write_bytes(b"\xff\xfe not utf-8")
+
+        init_worker(None, None, str(tmp_path))
+        bucket = open_source_bucket(None, None, str(tmp_path))
+        days = day_prefixes(datetime(2026, 1, 15), datetime(2026, 1, 15), "local")
+        path = tmp_path / "checkpoint.json"
+        load = lambda frames: {t: sum(len(f) for f in parts) for t, parts in frames.items()}
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            state = read_checkpoint(path)
+            failures = run_backfill(pool, bucket, days, state, path, load)
+        assert failures == []
+        state = read_checkpoint(path)
+        assert state["failed_unit_dirs"] == []
+        assert state["quarantined_unit_dirs"] == ["csv_sales/2026/01/15/unit_002"]
+        assert state["rows_loaded"]["orders"] == 5
+
+        quarantined = tmp_path / "quarantine/2026/01/15/unit_002"
+        assert (quarantined / "pedido.csv").read_bytes() == b"\xff\xfe not utf-8"
+        assert (quarantined / "item_pedido.csv").exists()
+        report = json.loads((quarantined / "pedido_error.json").read_text())
+        assert report["source_file"] == "raw/csv_sales/2026/01/15/unit_002/pedido.csv"
+        assert report["error"].startswith("Processing failed")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Arrow Bronze Load Path
+========================================================
+
+Unit tests for cloud_functions/csv_processor/bronze.py (to_bronze_arrow).
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_bronze_arrow.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+
+# Add Cloud Function source directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'cloud_functions', 'csv_processor'))
+
+from bronze import (
+    BRONZE_ARROW_SCHEMAS,
+    decimal_array,
+    prepare_bronze_frame,
+    to_bronze_arrow,
+    to_parquet_buffer,
+)
+from validation import validate_pedido, validate_item_pedido
+
+
+INGEST_TS = datetime(2026, 1, 16, 3, 0, 0)
+SOURCE_FILE = "raw/csv_sales/2026/01/15/unit_001/pedido.csv"
+
+
+def validated_orders() -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Id_Unidade": ["1", "2", "3"],
+        "Id_Pedido": ["A", "B", "C"],
+        "Tipo_Pedido": ["Loja Fisica", "Loja Online", "Loja Online"],
+        "Data_Pedido": ["2026-01-15", "2026-01-15", "2026-01-14"],
+        "Vlr_Pedido": ["30.10", "45.99", "1234567.89"],
+        "Endereco_Entrega": [None, "Rua A, 1", "Rua B, 2"],
+        "Taxa_Entrega": ["0.00", "5.05", None],
+        "Status": ["Finalizado", "Pendente", "Cancelado"],
+    })
+    valid, _, _ = validate_pedido(df)
+    return valid
+
+
+class TestDecimalArray:
+    """Tests for vectorized NUMERIC(10,2) conversion."""
+
+    def test_matches_decimal_conversion(self):
+        """Test that scaled integers match the Decimal(str(round(x, 2))) values."""
+        values = pd.Series([0.0, 0.01, 0.07, 12.5, -12.34, 99999999.99, 19.99, np.nan])
+        expected = [Decimal(str(round(v, 2))) if pd.notna(v) else None for v in values]
+        assert decimal_array(values).to_pylist() == expected
+
+    def test_null_count(self):
+        """Test that NaN values become Arrow nulls."""
+        array = decimal_array(pd.Series([1.0, np.nan, np.nan]))
+        assert array.null_count == 2
+
+
+class TestBronzeArrowTable:
+    """Tests for the Arrow-native Bronze table."""
+
+    def test_schema_is_exact(self):
+        """Test that the table carries the Bronze schema, NOT NULL modes included."""
+        table = to_bronze_arrow(validated_orders(), "orders", SOURCE_FILE, INGEST_TS)
+        assert table.schema.equals(BRONZE_ARROW_SCHEMAS["orders"])
+
+    def test_values_match_legacy_path(self):
+        """Test that both load paths produce the same Bronze rows."""
+        df = validated_orders()
+        table = to_bronze_arrow(df, "orders", SOURCE_FILE, INGEST_TS)
+        legacy = prepare_bronze_frame(df.copy(), "orders", SOURCE_FILE, INGEST_TS)
+
+        arrow_rows = table.to_pylist()
+        for arrow_row, legacy_row in zip(arrow_rows, legacy.to_dict("records")):
+            for column, value in legacy_row.items():
+                if column == "_ingest_timestamp":
+                    assert arrow_row[column].replace(tzinfo=None) == value
+                elif pd.isna(value):
+                    assert arrow_row[column] is None
+                else:
+                    assert arrow_row[column] == value
+
+    def test_per_row_source_file(self):
+        """Test that bulk loads keep each row's own _source_file."""
+        items = pd.DataFrame({
+            "Id_Pedido": ["A", "B"],
+            "Id_Item_Pedido": ["I1", "I2"],
+            "Id_Produto": ["1", "2"],
+            "Qtd": ["1", "3"],
+            "Vlr_Item": ["10.00", "2.50"],
+            "Observacao": [None, "sem cebola"],
+        })
+        valid, _, _ = validate_item_pedido(items)
+        valid = valid.assign(_source_file=["f1.csv", "f2.csv"])
+        table = to_bronze_arrow(valid, "order_items", ingest_timestamp=INGEST_TS)
+        assert table.column("_source_file").to_pylist() == ["f1.csv", "f2.csv"]
+        assert table.column("qtd").to_pylist() == [1, 3]
+
+    def test_parquet_roundtrip(self):
+        """Test that the Parquet payload keeps decimal and date logical types."""
+        table = to_bronze_arrow(validated_orders(), "orders", SOURCE_FILE, INGEST_TS)
+        restored = pq.read_table(pa.BufferReader(to_parquet_buffer(table)))
+        assert restored.schema.field("vlr_pedido").type == pa.decimal128(10, 2)
+        assert restored.schema.field("data_pedido").type == pa.date32()
+        assert restored.equals(table)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
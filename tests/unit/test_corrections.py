@@ -0,0 +1,123 @@
+"""
+Case Fictício - Teste -- Unit Tests for Late-Arriving Corrections
+=======================================================
+
+Unit tests for scripts/corrections.py and the --corrections mode of
+scripts/generate_fake_sales.py. Replays the generated files with "latest
+upload wins" (Silver's dedup rule) and checks the expected final state.
+
+Usage:
+    pytest tests/unit/test_corrections.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# Add scripts and Cloud Function source directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'cloud_functions', 'csv_processor'))
+
+from corrections import CorrectionPlanner
+from generate_fake_sales import generate_sales_data, generate_unit_list
+from stream_upload import StreamUploader
+from validation import reconcile_pair
+
+
+def read(path):
+    return pd.read_csv(path, sep=";", dtype=str)
+
+
+def replay(roots) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Apply file trees in upload order; later versions of an id replace earlier ones."""
+    orders, items = {}, {}
+    for root in roots:
+        for path in sorted(root.glob("csv_sales/*/*/*/unit_*/pedido.csv")):
+            for row in read(path).to_dict("records"):
+                orders[row["Id_Pedido"]] = row
+            for row in read(path.with_name("item_pedido.csv")).to_dict("records"):
+                items[row["Id_Item_Pedido"]] = row
+    return pd.DataFrame(orders.values()), pd.DataFrame(items.values())
+
+
+class TestCorrectionPlanner:
+    """Tests for selecting and correcting unit-days."""
+
+    def test_invalid_settings_rejected(self):
+        """Test that out-of-range rates and waves raise ValueError."""
+        with pytest.raises(ValueError):
+            CorrectionPlanner(1.5)
+        with pytest.raises(ValueError):
+            CorrectionPlanner(0.1, waves=0)
+
+    def test_corrected_files_stay_valid(self, tmp_path):
+        """Test that every re-sent file passes validation with the same ids."""
+        planner = CorrectionPlanner(0.5, waves=2)
+        generate_sales_data(units=generate_unit_list(3), start_date=datetime(2026, 1, 1),
+                            end_date=datetime(2026, 1, 4), min_orders=10, max_orders=20,
+                            output_dir=tmp_path, seed=8, corrections=planner)
+
+        waves = sorted((tmp_path / "corrections").iterdir())
+        assert [w.name for w in waves] == ["wave_01", "wave_02"]
+        for path in (tmp_path / "corrections").glob("wave_*/csv_sales/*/*/*/unit_*/pedido.csv"):
+            df_orders, df_items = read(path), read(path.with_name("item_pedido.csv"))
+            _, _, rejected_orders, rejected_items, _ = reconcile_pair(df_orders.copy(), df_items.copy())
+            assert len(rejected_orders) == 0 and len(rejected_items) == 0
+            original = path.relative_to(path.parents[5]).as_posix()
+            assert set(df_orders["Id_Pedido"]) == set(read(tmp_path / original)["Id_Pedido"])
+
+    def test_final_state_matches_latest_wins_replay(self, tmp_path):
+        """Test that replaying originals then waves gives the expected final state."""
+        planner = CorrectionPlanner(0.4, waves=2)
+        generate_sales_data(units=generate_unit_list(4), start_date=datetime(2026, 1, 1),
+                            end_date=datetime(2026, 1, 5), min_orders=10, max_orders=20,
+                            output_dir=tmp_path, seed=21, corrections=planner)
+        state = planner.final_state()
+        assert state["corrected_orders"]
+
+        roots = [tmp_path] + sorted((tmp_path / "corrections").iterdir())
+        orders, items = replay(roots)
+        assert len(orders) == state["orders"]
+        assert len(items) == state["order_items"]["rows"]
+        assert items["Qtd"].astype(int).sum() == state["order_items"]["quantity"]
+
+        orders["Vlr_Pedido"] = orders["Vlr_Pedido"].astype(float)
+        grouped = orders.groupby(["Data_Pedido", "Status"])["Vlr_Pedido"].agg(["count", "sum"])
+        for (date, status), row in grouped.iterrows():
+            expected = state["by_date_status"][date][status]
+            assert row["count"] == expected["orders"]
+            assert row["sum"] == pytest.approx(expected["order_value"], abs=0.01)
+        final = orders.set_index("Id_Pedido")
+        for order_id, version in state["corrected_orders"].items():
+            assert final.loc[order_id, "Status"] == version["Status"]
+
+    def test_streaming_resends_after_originals(self, tmp_path):
+        """Test that streamed corrections overwrite the original objects after them."""
+        class RecordingBucket:
+            def __init__(self):
+                self.names = []
+
+            def blob(self, name):
+                names = self.names
+                return type("Blob", (), {"upload_from_string": lambda self, data, content_type=None: names.append(name)})()
+
+        bucket = RecordingBucket()
+        planner = CorrectionPlanner(1.0)
+        with StreamUploader(bucket, workers=4) as uploader:
+            stats = generate_sales_data(units=generate_unit_list(2), start_date=datetime(2026, 1, 1),
+                                        end_date=datetime(2026, 1, 1), min_orders=5, max_orders=5,
+                                        output_dir=tmp_path / "unused", seed=2, uploader=uploader,
+                                        corrections=planner)
+        assert stats["corrected_files"] == 4
+        assert bucket.names[4:] and set(bucket.names[4:]) == set(bucket.names[:4])
+        assert not (tmp_path / "unused").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
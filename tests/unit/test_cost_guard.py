@@ -0,0 +1,164 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Query Cost Guard
+==================================================
+
+Unit tests for scripts/cost_guard.py
+Tests run locally without GCP access (fake BigQuery client).
+
+Usage:
+    pytest tests/unit/test_cost_guard.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from google.api_core.exceptions import NotFound
+from cost_guard import CostGuard, BudgetExceeded, evaluate, GB, TB
+
+
+class FakeClient:
+    """Dry runs return a fixed estimate; real jobs bill it; the ledger is a list."""
+
+    project = "proj"
+
+    def __init__(self, estimate, used=0, table_bytes=None):
+        self.estimate = estimate
+        self.used = used
+        self.table_bytes = table_bytes or {}
+        self.jobs = []
+        self.ledger = []
+
+    def create_table(self, table, exists_ok=False):
+        return table
+
+    def get_table(self, table_id):
+        if table_id not in self.table_bytes:
+            raise NotFound(table_id)
+        if self.table_bytes[table_id] is None:
+            raise RuntimeError("permission denied")
+        return SimpleNamespace(num_bytes=self.table_bytes[table_id])
+
+    def insert_rows_json(self, table_id, rows):
+        self.ledger.extend(rows)
+        return []
+
+    def query(self, sql, job_config=None):
+        if "query_costs" in sql:
+            return SimpleNamespace(result=lambda: [{"bytes_billed": self.used}])
+        if job_config is not None and job_config.dry_run:
+            return SimpleNamespace(total_bytes_processed=self.estimate)
+        self.jobs.append(job_config)
+        return SimpleNamespace(result=lambda: [], total_bytes_billed=self.estimate,
+                               total_bytes_processed=self.estimate, job_id="job-1")
+
+
+CONFIG = {
+    "bigquery": {"datasets": {"monitoring": "case_ficticio_monitoring"}},
+    "free_tier_limits": {"bq_query_tb": 1},
+    "cost_guard": {"mode": "enforce", "step_max_gb": 20, "warn_ratio": 0.8},
+}
+
+
+class TestEvaluate:
+    """Tests for the per-step and monthly budget checks."""
+
+    def test_within_budget(self):
+        """Test that a small step well inside the budget passes."""
+        assert evaluate(1 * GB, 0, 20 * GB, TB)[0] == "ok"
+
+    def test_step_cap(self):
+        """Test that a step estimated above the per-step cap is refused."""
+        verdict, message = evaluate(25 * GB, 0, 20 * GB, TB)
+        assert verdict == "refuse"
+        assert "per-step cap" in message
+
+    def test_monthly_budget(self):
+        """Test that the monthly budget refuses and warns near the limit."""
+        assert evaluate(10 * GB, TB - 5 * GB, 20 * GB, TB)[0] == "refuse"
+        assert evaluate(10 * GB, int(0.8 * TB), 20 * GB, TB)[0] == "warn"
+
+    def test_unknown_estimate_refuses(self):
+        """Test that a step with no estimate at all is refused."""
+        assert evaluate(None, 0, 20 * GB, TB)[0] == "refuse"
+
+
+class TestCostGuard:
+    """Tests for guarded query execution."""
+
+    def test_run_sets_cap_and_records(self):
+        """Test that a real job carries maximum_bytes_billed and is written to the ledger."""
+        client = FakeClient(estimate=2 * GB, used=10 * GB)
+        guard = CostGuard.from_config(client, CONFIG)
+        guard.run("SELECT 1", step="07_agg_daily_sales.sql")
+        assert client.jobs[0].maximum_bytes_billed == 20 * GB
+        assert client.ledger[0]["step"] == "07_agg_daily_sales.sql"
+        assert client.ledger[0]["bytes_billed"] == 2 * GB
+        assert guard.month_to_date() == 12 * GB
+        assert guard.ledger_table == "proj.case_ficticio_monitoring.query_costs"
+
+    def test_enforce_refuses_without_running(self):
+        """Test that an over-budget step raises and no job is started."""
+        client = FakeClient(estimate=50 * GB)
+        guard = CostGuard.from_config(client, CONFIG)
+        with pytest.raises(BudgetExceeded, match="05_fact_sales.sql"):
+            guard.run("SELECT 1", step="05_fact_sales.sql")
+        assert client.jobs == []
+        assert client.ledger[0]["status"] == "refused"
+
+    def test_warn_mode_runs_anyway(self):
+        """Test that warn mode runs an over-budget step under the byte cap."""
+        client = FakeClient(estimate=50 * GB)
+        guard = CostGuard.from_config(client, CONFIG, mode="warn")
+        guard.run("SELECT 1", step="05_fact_sales.sql")
+        assert len(client.jobs) == 1
+        assert guard.refused == 0
+
+
+class TestScriptEstimate:
+    """Tests for steps whose dry run returns no estimate (DECLARE/SET scripts)."""
+
+    SCRIPT = """
+        DECLARE watermark DATE;
+        SET watermark = (SELECT MAX(d) FROM `proj.gold.fact_sales`);
+        DELETE FROM `proj.gold.fact_sales` WHERE d >= watermark;
+        INSERT INTO `proj.gold.fact_sales` SELECT * FROM `proj.silver.orders`;
+        CREATE TABLE IF NOT EXISTS `proj.gold.new_table` AS SELECT 1 AS x;
+    """
+
+    def test_upper_bound_from_table_sizes(self):
+        """Test that every table reference is charged at full size and new tables count as empty."""
+        client = FakeClient(estimate=None, table_bytes={
+            "proj.gold.fact_sales": 2 * GB, "proj.silver.orders": 1 * GB,
+        })
+        guard = CostGuard.from_config(client, CONFIG)
+        assert guard.estimate(self.SCRIPT) == 7 * GB
+
+    def test_enforce_refuses_large_script(self):
+        """Test that enforce mode refuses a script whose upper bound exceeds the step cap."""
+        client = FakeClient(estimate=None, table_bytes={
+            "proj.gold.fact_sales": 10 * GB, "proj.silver.orders": 1 * GB,
+        })
+        guard = CostGuard.from_config(client, CONFIG)
+        with pytest.raises(BudgetExceeded, match="per-step cap"):
+            guard.run(self.SCRIPT, step="05_fact_sales.sql")
+        assert client.jobs == []
+
+    def test_enforce_refuses_unestimated_script(self):
+        """Test that enforce mode refuses a script when no table size can be read."""
+        client = FakeClient(estimate=None, table_bytes={"proj.gold.fact_sales": None})
+        guard = CostGuard.from_config(client, CONFIG)
+        with pytest.raises(BudgetExceeded, match="no dry-run"):
+            guard.run(self.SCRIPT, step="05_fact_sales.sql")
+        assert client.ledger[0]["status"] == "refused"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,314 @@
+"""
+Case Fictício - Teste -- Unit Tests for CSV Validation Rules
+==================================================
+
+Unit tests for cloud_functions/csv_processor/validation.py
+Tests run locally without GCP dependencies.
+
+Usage:
+    pytest tests/unit/test_csv_validation.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import pandas as pd
+import pyarrow.parquet as pq
+import io
+import sys
+import os
+from datetime import datetime
+
+# Add Cloud Function source directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'cloud_functions', 'csv_processor'))
+
+from quarantine import (
+    quarantine_rows_path,
+    build_quarantine_frame,
+    to_parquet_bytes,
+    read_parquet_bytes,
+)
+from bronze import to_bronze_arrow
+from validation import (
+    validate_pedido,
+    validate_item_pedido,
+    evaluate_rules,
+    compute_item_totals,
+    reconcile_pair,
+    has_missing_columns,
+    PEDIDO_RULES,
+    PEDIDO_CASTS,
+    DUPLICATE_RULE,
+    MALFORMED_RULE,
+)
+
+
+def make_orders(rows: list[dict]) -> pd.DataFrame:
+    """Build a pedido DataFrame with valid defaults overridden per row."""
+    base = {
+        "Id_Unidade": "1",
+        "Id_Pedido": "A",
+        "Tipo_Pedido": "Loja Fisica",
+        "Data_Pedido": "2026-01-15",
+        "Vlr_Pedido": "30.00",
+        "Endereco_Entrega": "",
+        "Taxa_Entrega": "0.00",
+        "Status": "Finalizado",
+    }
+    return pd.DataFrame([{**base, **row} for row in rows])
+
+
+def make_items(rows: list[dict]) -> pd.DataFrame:
+    """Build an item_pedido DataFrame with valid defaults overridden per row."""
+    base = {
+        "Id_Pedido": "A",
+        "Id_Item_Pedido": "I1",
+        "Id_Produto": "1",
+        "Qtd": "1",
+        "Vlr_Item": "30.00",
+        "Observacao": "",
+    }
+    return pd.DataFrame([{**base, **row} for row in rows])
+
+
+class TestPedidoRules:
+    """Tests for pedido.csv validation."""
+
+    def test_valid_rows_pass(self):
+        """Test that clean rows are all kept."""
+        df = make_orders([{"Id_Pedido": "A"}, {"Id_Pedido": "B"}])
+        valid, _, errors = validate_pedido(df)
+        assert len(valid) == 2
+        assert errors == []
+
+    def test_missing_columns(self):
+        """Test that a missing column rejects the whole file."""
+        df = make_orders([{}]).drop(columns=["Status"])
+        valid, _, errors = validate_pedido(df)
+        assert len(valid) == 0
+        assert "Missing columns" in errors[0]
+
+    def test_invalid_order_type_rejected(self):
+        """Test that Tipo_Pedido outside VALID_ORDER_TYPES is rejected."""
+        df = make_orders([{"Id_Pedido": "A"}, {"Id_Pedido": "B", "Tipo_Pedido": "Drive Thru"}])
+        valid, _, errors = validate_pedido(df)
+        assert list(valid["Id_Pedido"]) == ["A"]
+        assert any("invalid_order_type" in e for e in errors)
+
+    def test_negative_value_rejected(self):
+        """Test that negative monetary values are rejected."""
+        df = make_orders([{"Id_Pedido": "A", "Taxa_Entrega": "-1.00"}])
+        valid, _, errors = validate_pedido(df)
+        assert len(valid) == 0
+        assert any("negative_value" in e for e in errors)
+
+    def test_order_total_mismatch_with_item_totals(self):
+        """Test that Vlr_Pedido must match item totals plus delivery fee."""
+        df = make_orders([
+            {"Id_Pedido": "A", "Vlr_Pedido": "35.00", "Taxa_Entrega": "5.00"},
+            {"Id_Pedido": "B", "Vlr_Pedido": "99.00"},
+        ])
+        item_totals = pd.Series({"A": 30.0, "B": 30.0})
+        valid, _, errors = validate_pedido(df, item_totals=item_totals)
+        assert list(valid["Id_Pedido"]) == ["A"]
+        assert any("order_total_mismatch" in e for e in errors)
+
+    def test_invalid_first_occurrence_does_not_shadow_valid_duplicate(self):
+        """Test that dedup only considers rows that passed every other rule."""
+        df = make_orders([
+            {"Id_Pedido": "A", "Status": "Unknown"},
+            {"Id_Pedido": "A"},
+        ])
+        valid, _, _ = validate_pedido(df)
+        assert len(valid) == 1
+        assert valid.iloc[0]["Status"] == "Finalizado"
+
+
+class TestRuleEngine:
+    """Tests for single-pass rule evaluation."""
+
+    def test_first_failing_rule_wins(self):
+        """Test that each rejected row is attributed to exactly one rule."""
+        df = make_orders([
+            {"Id_Pedido": "A", "Status": None, "Tipo_Pedido": "X"},
+            {"Id_Pedido": "B", "Status": "X", "Tipo_Pedido": "X"},
+            {"Id_Pedido": "C", "Vlr_Pedido": "abc"},
+            {"Id_Pedido": "D"},
+            {"Id_Pedido": "D"},
+        ])
+        valid_mask, failed, counts = evaluate_rules(
+            df, PEDIDO_RULES, PEDIDO_CASTS, dedup_key="Id_Pedido"
+        )
+        assert list(failed) == ["null_required", "invalid_status", MALFORMED_RULE, "", DUPLICATE_RULE]
+        assert counts["null_required"] == 1
+        assert counts["invalid_status"] == 1
+        assert counts["invalid_order_type"] == 0
+        assert counts[MALFORMED_RULE] == 1
+        assert counts[DUPLICATE_RULE] == 1
+        assert sum(counts.values()) == int((~valid_mask).sum())
+
+    def test_malformed_date_detected(self):
+        """Test that unparseable dates are reported separately from nulls."""
+        df = make_orders([{"Id_Pedido": "A", "Data_Pedido": "15/01/2026"}])
+        _, failed, _ = evaluate_rules(df, PEDIDO_RULES, PEDIDO_CASTS)
+        assert failed.iloc[0] == MALFORMED_RULE
+
+
+class TestItemPedidoRules:
+    """Tests for item_pedido.csv validation."""
+
+    def test_non_positive_quantity_rejected(self):
+        """Test that zero quantities are rejected."""
+        df = make_items([{"Id_Item_Pedido": "I1"}, {"Id_Item_Pedido": "I2", "Qtd": "0"}])
+        valid, _, errors = validate_item_pedido(df)
+        assert list(valid["Id_Item_Pedido"]) == ["I1"]
+        assert any("non_positive_quantity" in e for e in errors)
+
+    def test_fractional_integer_columns_rejected(self):
+        """Test that fractional Qtd/Id_Produto are rejected per row and the rest converts to Arrow."""
+        df = make_items([{"Id_Item_Pedido": "I1"}, {"Id_Item_Pedido": "I2", "Qtd": "2.5"},
+                         {"Id_Item_Pedido": "I3", "Id_Produto": "1.5"}, {"Id_Item_Pedido": "I4", "Qtd": "2.0"}])
+        valid, rejected, errors = validate_item_pedido(df)
+        assert list(valid["Id_Item_Pedido"]) == ["I1", "I4"]
+        assert list(rejected["_rule"]) == ["non_integer", "non_integer"]
+        assert list(rejected["Qtd"]) == ["2.5", "1"]
+        assert any("non_integer" in e for e in errors)
+        table = to_bronze_arrow(valid, "order_items", "raw/x/item_pedido.csv", datetime(2026, 1, 16))
+        assert table.column("qtd").to_pylist() == [1, 2]
+
+    def test_fractional_unit_id_rejected(self):
+        """Test that a fractional Id_Unidade is rejected instead of failing the file."""
+        df = make_orders([{"Id_Pedido": "A"}, {"Id_Pedido": "B", "Id_Unidade": "1.5"}])
+        valid, rejected, _ = validate_pedido(df)
+        assert list(valid["Id_Pedido"]) == ["A"]
+        assert list(rejected["_rule"]) == ["non_integer"]
+
+    def test_duplicate_items_removed(self):
+        """Test that duplicate item IDs are removed."""
+        df = make_items([{"Id_Item_Pedido": "I1"}, {"Id_Item_Pedido": "I1"}])
+        valid, _, errors = validate_item_pedido(df)
+        assert len(valid) == 1
+        assert errors == ["Removed 1 duplicate items"]
+
+    def test_item_totals(self):
+        """Test that item totals are summed per order."""
+        df = make_items([
+            {"Id_Pedido": "A", "Id_Item_Pedido": "I1", "Qtd": "2", "Vlr_Item": "10.00"},
+            {"Id_Pedido": "A", "Id_Item_Pedido": "I2", "Qtd": "1", "Vlr_Item": "5.50"},
+        ])
+        valid, _, _ = validate_item_pedido(df)
+        totals = compute_item_totals(valid)
+        assert totals["A"] == pytest.approx(25.50)
+
+
+class TestPairedReconciliation:
+    """Tests for cross-file order/item reconciliation."""
+
+    def test_matching_pair_loads_everything(self):
+        """Test that consistent orders and items are all kept."""
+        orders = make_orders([
+            {"Id_Pedido": "A", "Vlr_Pedido": "30.00"},
+            {"Id_Pedido": "B", "Vlr_Pedido": "45.00", "Tipo_Pedido": "Loja Online", "Taxa_Entrega": "5.00"},
+        ])
+        items = make_items([
+            {"Id_Pedido": "A", "Id_Item_Pedido": "I1"},
+            {"Id_Pedido": "B", "Id_Item_Pedido": "I2", "Qtd": "2", "Vlr_Item": "20.00"},
+        ])
+        valid_orders, valid_items, _, _, errors = reconcile_pair(orders, items)
+        assert len(valid_orders) == 2
+        assert len(valid_items) == 2
+        assert errors == []
+
+    def test_orphan_items_dropped(self):
+        """Test that items without a parent order are dropped."""
+        orders = make_orders([{"Id_Pedido": "A"}])
+        items = make_items([
+            {"Id_Pedido": "A", "Id_Item_Pedido": "I1"},
+            {"Id_Pedido": "Z", "Id_Item_Pedido": "I2"},
+        ])
+        _, valid_items, _, rejected_items, errors = reconcile_pair(orders, items)
+        assert list(valid_items["Id_Item_Pedido"]) == ["I1"]
+        assert any("orphan_item" in e for e in errors)
+        assert list(rejected_items["_rule"]) == ["orphan_item"]
+        assert list(rejected_items["_line_number"]) == [3]
+
+    def test_mismatched_order_drops_its_items(self):
+        """Test that items of an order failing the total check become orphans."""
+        orders = make_orders([
+            {"Id_Pedido": "A"},
+            {"Id_Pedido": "B", "Vlr_Pedido": "10.00"},
+        ])
+        items = make_items([
+            {"Id_Pedido": "A", "Id_Item_Pedido": "I1"},
+            {"Id_Pedido": "B", "Id_Item_Pedido": "I2"},
+        ])
+        valid_orders, valid_items, _, _, errors = reconcile_pair(orders, items)
+        assert list(valid_orders["Id_Pedido"]) == ["A"]
+        assert list(valid_items["Id_Item_Pedido"]) == ["I1"]
+        assert any("order_total_mismatch" in e for e in errors)
+
+    def test_order_without_items_must_equal_fee(self):
+        """Test that an order with no items must be valued at its delivery fee."""
+        orders = make_orders([{"Id_Pedido": "A"}])
+        items = make_items([{"Id_Pedido": "B", "Id_Item_Pedido": "I1"}])
+        valid_orders, _, _, _, _ = reconcile_pair(orders, items)
+        assert len(valid_orders) == 0
+
+
+class TestRowQuarantine:
+    """Tests for row-level quarantine of rejected rows."""
+
+    def test_rejected_rows_keep_rule_and_line_number(self):
+        """Test that rejected rows carry the failed rule and CSV line."""
+        df = make_orders([
+            {"Id_Pedido": "A"},
+            {"Id_Pedido": "B", "Status": "Unknown"},
+            {"Id_Pedido": "C", "Vlr_Pedido": "12,50"},
+        ])
+        _, rejected, _ = validate_pedido(df)
+        assert list(rejected["Id_Pedido"]) == ["B", "C"]
+        assert list(rejected["_rule"]) == ["invalid_status", MALFORMED_RULE]
+        assert list(rejected["_line_number"]) == [3, 4]
+
+    def test_rejected_rows_keep_raw_source_values(self):
+        """Test that malformed values are quarantined exactly as received."""
+        df = make_orders([{"Id_Pedido": "A", "Vlr_Pedido": "12,50"}])
+        _, rejected, _ = validate_pedido(df)
+        assert rejected.iloc[0]["Vlr_Pedido"] == "12,50"
+
+    def test_missing_columns_is_structural(self):
+        """Test that missing columns are reported as a whole-file problem."""
+        df = make_orders([{}]).drop(columns=["Status"])
+        _, rejected, errors = validate_pedido(df)
+        assert len(rejected) == 0
+        assert has_missing_columns(errors)
+
+    def test_quarantine_path_mirrors_source(self):
+        """Test that quarantine objects mirror the raw/csv_sales layout."""
+        path = quarantine_rows_path("raw/csv_sales/2026/01/15/unit_001/pedido.csv")
+        assert path == "quarantine/rows/2026/01/15/unit_001/pedido.parquet"
+
+    def test_quarantine_parquet_roundtrip(self):
+        """Test that quarantined rows survive a Parquet round trip."""
+        df = make_orders([{"Id_Pedido": "A", "Status": "Unknown"}])
+        _, rejected, _ = validate_pedido(df)
+        frame = build_quarantine_frame(rejected, "raw/csv_sales/2026/01/15/unit_001/pedido.csv")
+        restored = read_parquet_bytes(to_parquet_bytes(frame))
+        assert list(restored.columns[-4:]) == ["_rule", "_source_file", "_line_number", "_quarantined_at"]
+        assert restored.iloc[0]["Id_Pedido"] == "A"
+        assert restored.iloc[0]["_rule"] == "invalid_status"
+        assert restored.iloc[0]["_line_number"] == 2
+
+    def test_quarantined_at_is_utc_timestamp(self):
+        """Test that _quarantined_at is written as a UTC-adjusted Parquet timestamp."""
+        df = make_orders([{"Id_Pedido": "A", "Status": "Unknown"}])
+        _, rejected, _ = validate_pedido(df)
+        for quarantined_at in (None, datetime(2026, 1, 16, 3, 0)):
+            frame = build_quarantine_frame(rejected.copy(), "raw/x/pedido.csv", quarantined_at)
+            schema = pq.read_schema(io.BytesIO(to_parquet_bytes(frame)))
+            assert schema.field("_quarantined_at").type.tz == "UTC"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
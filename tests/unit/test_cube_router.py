@@ -0,0 +1,83 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Sales Cube Router
+===================================================
+
+Unit tests for scripts/cube_router.py
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_cube_router.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import date
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from cube_router import route, choose_slice, parse_filters, ORDER_SLICE, PRODUCT_SLICE
+
+
+class TestSliceSelection:
+    """Tests for choosing the cube slice."""
+
+    def test_order_measures_use_order_slice(self):
+        """Test that order-level groupings read order rows."""
+        assert choose_slice(["unit_id", "order_week"], ["orders", "order_revenue"], {}) == ORDER_SLICE
+
+    def test_product_grouping_uses_product_slice(self):
+        """Test that grouping by product reads product rows."""
+        assert choose_slice(["product_id"], ["orders", "quantity"], {}) == PRODUCT_SLICE
+
+    def test_order_revenue_by_product_rejected(self):
+        """Test that order-level measures cannot be split by product."""
+        with pytest.raises(ValueError, match="order_revenue"):
+            choose_slice(["product_id"], ["order_revenue"], {})
+
+    def test_orders_across_products_rejected(self):
+        """Test that summing distinct orders over several products is refused."""
+        with pytest.raises(ValueError, match="double-count"):
+            choose_slice(["unit_id"], ["orders", "item_revenue"], {})
+        assert choose_slice(["unit_id"], ["orders"], {"product_id": 3}) == PRODUCT_SLICE
+
+
+class TestRoute:
+    """Tests for SQL generation."""
+
+    def test_coarser_grouping_sql(self):
+        """Test that a unit x week request aggregates the order slice."""
+        sql, params = route(["unit_id", "order_week"], ["orders"], project_id="p", dataset_id="g",
+                            start_date=date(2026, 1, 1), end_date=date(2026, 1, 31))
+        assert "FROM `p.g.agg_sales_cube`" in sql
+        assert "DATE_TRUNC(order_date, ISOWEEK) AS order_week" in sql
+        assert "product_id IS NULL" in sql
+        assert "GROUP BY unit_id, order_week" in sql
+        assert [p.name for p in params] == ["start_date", "end_date"]
+
+    def test_filters_are_parameterized(self):
+        """Test that filter values are passed as query parameters, not inlined."""
+        sql, params = route(["order_date"], ["quantity"], {"unit_id": [1, 2], "order_type": "ONLINE"})
+        assert "unit_id IN UNNEST(@f_unit_id)" in sql
+        assert "order_type = @f_order_type" in sql
+        assert "ONLINE" not in sql
+        assert len(params) == 2
+
+    def test_unknown_dimension_rejected(self):
+        """Test that groupings outside the cube are refused."""
+        with pytest.raises(ValueError, match="customer_id"):
+            route(["customer_id"], ["orders"])
+
+    def test_parse_filters(self):
+        """Test CLI filter parsing with integer columns and lists."""
+        assert parse_filters(["unit_id=1,2", "order_type=ONLINE"]) == {
+            "unit_id": [1, 2], "order_type": "ONLINE"
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""
+Case Fictício - Teste -- Unit Tests for Dirty-Data Injection
+==================================================
+
+Unit tests for scripts/fault_injection.py. The ground-truth manifest is
+checked against the real csv_processor validators.
+
+Usage:
+    pytest tests/unit/test_fault_injection.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+from datetime import datetime
+
+import pandas as pd
+
+# Add scripts and Cloud Function source directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'cloud_functions', 'csv_processor'))
+
+from fault_injection import FaultInjector, parse_rates, truncate_last_row, FAULT_PRESETS
+from generate_fake_sales import generate_sales_data, generate_unit_list
+from validation import reconcile_pair
+
+
+def rule_counts(rejected: pd.DataFrame) -> dict:
+    return rejected["_rule"].value_counts().to_dict() if len(rejected) else {}
+
+
+class TestRates:
+    """Tests for fault rate parsing."""
+
+    def test_presets_and_explicit_rates(self):
+        """Test that presets resolve and explicit rates are parsed."""
+        assert parse_rates("heavy") == FAULT_PRESETS["heavy"]
+        assert parse_rates("invalid_status=0.1,truncated_file=0.5") == {
+            "invalid_status": 0.1, "truncated_file": 0.5,
+        }
+
+    def test_unknown_fault_rejected(self):
+        """Test that an unknown fault name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown fault"):
+            parse_rates("typo=0.1")
+
+    def test_row_rates_capped(self):
+        """Test that row fault rates above 1 in total are rejected."""
+        with pytest.raises(ValueError):
+            FaultInjector({"invalid_status": 0.6, "duplicate_order": 0.6})
+
+
+class TestTruncation:
+    """Tests for truncated file simulation."""
+
+    def test_last_row_cut_after_second_field(self):
+        """Test that only the last row is cut, keeping unit and order id."""
+        data = b"a;b;c;d\n1;x;y;z\n2;p;q;r\n"
+        assert truncate_last_row(data) == b"a;b;c;d\n1;x;y;z\n2;p"
+        df = pd.read_csv(io.BytesIO(truncate_last_row(data)), sep=";", dtype=str)
+        assert len(df) == 2 and df["c"].isnull().tolist() == [False, True]
+
+
+class TestGroundTruth:
+    """Tests that the manifest predicts the validators' rejections exactly."""
+
+    def test_manifest_matches_validators(self, tmp_path):
+        """Test that every unit-day's rejections per rule equal the manifest."""
+        injector = FaultInjector(FAULT_PRESETS["heavy"] | {"truncated_file": 0.3})
+        generate_sales_data(
+            units=generate_unit_list(4), start_date=datetime(2026, 1, 1), end_date=datetime(2026, 1, 3),
+            min_orders=20, max_orders=30, output_dir=tmp_path, seed=11, faults=injector,
+        )
+        injector.write_manifest(tmp_path / "fault_manifest.json")
+        manifest = json.loads((tmp_path / "fault_manifest.json").read_text())
+
+        assert all(manifest["totals"]["faults"][name] > 0 for name in manifest["totals"]["faults"])
+        for unit_dir in sorted(tmp_path.glob("csv_sales/*/*/*/unit_*")):
+            df_orders = pd.read_csv(unit_dir / "pedido.csv", sep=";", dtype=str)
+            df_items = pd.read_csv(unit_dir / "item_pedido.csv", sep=";", dtype=str)
+            _, _, rejected_orders, rejected_items, _ = reconcile_pair(df_orders, df_items)
+
+            key = "raw/" + unit_dir.relative_to(tmp_path).as_posix()
+            expected = manifest["files"].get(key, {}).get("expected_rejections", {"orders": {}, "order_items": {}})
+            assert rule_counts(rejected_orders) == expected["orders"], key
+            assert rule_counts(rejected_items) == expected["order_items"], key
+
+    def test_disabled_injector_leaves_rows_untouched(self):
+        """Test that zero rates return the input unchanged without drawing."""
+        orders, items = [{"Id_Pedido": "a"}], [{"Id_Pedido": "a"}]
+        assert FaultInjector({}).apply("raw/x", orders, items) == (orders, items, False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
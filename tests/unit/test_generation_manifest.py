@@ -0,0 +1,102 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Generation Manifest
+=====================================================
+
+Unit tests for scripts/generation_manifest.py and the manifest written by
+scripts/generate_fake_sales.py.
+
+Usage:
+    pytest tests/unit/test_generation_manifest.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from generation_manifest import (
+    ManifestWriter, read_manifest, summarize, crc32c_base64,
+    expected_bronze_rows, compare_bronze,
+)
+from generate_fake_sales import generate_sales_data, generate_unit_list
+
+
+@pytest.fixture
+def generated(tmp_path):
+    with ManifestWriter(tmp_path / "manifest.jsonl") as manifest:
+        stats = generate_sales_data(
+            units=generate_unit_list(2), start_date=datetime(2026, 1, 30), end_date=datetime(2026, 2, 1),
+            min_orders=5, max_orders=9, output_dir=tmp_path, seed=4, manifest=manifest,
+        )
+    return tmp_path, stats, read_manifest(tmp_path / "manifest.jsonl")
+
+
+class TestManifest:
+    """Tests for per-file manifest records."""
+
+    def test_record_per_file_matches_disk(self, generated):
+        """Test that every record's bytes, CRC32C and row count match the written file."""
+        root, stats, records = generated
+        assert len(records) == stats["total_files"] == 12
+        for record in records:
+            data = (root / record["path"]).read_bytes()
+            assert record["bytes"] == len(data)
+            assert record["crc32c"] == crc32c_base64(data)
+            assert record["rows"] == len(pd.read_csv(root / record["path"], sep=";"))
+            assert record["object"] == "raw/" + record["path"]
+
+    def test_order_statistics(self, generated):
+        """Test that order records carry dates, unit and value totals."""
+        root, _, records = generated
+        record = next(r for r in records if r["path"].endswith("2026/01/31/unit_002/pedido.csv"))
+        df = pd.read_csv(root / record["path"], sep=";")
+        assert record["min_date"] == record["max_date"] == "2026-01-31"
+        assert record["unit_id"] == 2
+        assert record["total_value"] == pytest.approx(df["Vlr_Pedido"].sum(), abs=0.01)
+
+    def test_summary_totals(self, generated):
+        """Test that summarized byte totals equal the generator's counters."""
+        _, stats, records = generated
+        summary = summarize(records)
+        assert summary["orders"]["rows"] == stats["total_orders"]
+        assert summary["order_items"]["rows"] == stats["total_items"]
+        assert summary["orders"]["bytes"] + summary["order_items"]["bytes"] == stats["total_bytes"]
+
+    def test_known_crc32c(self):
+        """Test the CRC32C encoding against the GCS format."""
+        assert crc32c_base64(b"abc") == "Nks/tw=="
+
+
+class TestBronzeCompleteness:
+    """Tests for comparing Bronze row counts with the manifest."""
+
+    def test_resent_objects_expected_twice(self):
+        """Test that a re-sent object's rows are expected once per upload."""
+        records = [
+            {"object": "raw/a/pedido.csv", "table": "orders", "rows": 3, "wave": 0},
+            {"object": "raw/a/pedido.csv", "table": "orders", "rows": 3, "wave": 1},
+            {"object": "raw/a/item_pedido.csv", "table": "order_items", "rows": 5, "wave": 0},
+            {"object": "raw/reference_data/pais.csv", "table": "reference", "rows": 1, "wave": 0},
+        ]
+        expected = expected_bronze_rows(records)
+        assert expected == {"orders": {"raw/a/pedido.csv": 6}, "order_items": {"raw/a/item_pedido.csv": 5}}
+
+    def test_missing_and_partial_files_reported(self):
+        """Test that partially loaded and missing files are reported."""
+        expected = {"orders": {"raw/a/pedido.csv": 6, "raw/b/pedido.csv": 2}, "order_items": {}}
+        actual = {"orders": {"raw/a/pedido.csv": 6, "raw/c/pedido.csv": 9}}
+        assert compare_bronze(expected, actual) == [
+            "orders: raw/b/pedido.csv has 0 rows in Bronze, manifest says 2"
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,53 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Batch UUID Factory
+====================================================
+
+Unit tests for scripts/id_factory.py
+
+Usage:
+    pytest tests/unit/test_id_factory.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import uuid
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from id_factory import IdFactory
+
+
+class TestIdFactory:
+    """Tests for seeded batch UUID generation."""
+
+    def test_ids_are_rfc4122_v4(self):
+        """Test that every id parses as a version 4, RFC 4122 variant UUID."""
+        for value in IdFactory(seed=1).take(1000):
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_seed_is_reproducible(self):
+        """Test that the same seed gives the same sequence and different seeds differ."""
+        assert IdFactory(seed=42).take(100) == IdFactory(seed=42).take(100)
+        assert IdFactory(seed=42).take(100) != IdFactory(seed=43).take(100)
+
+    def test_next_and_take_share_sequence_across_batches(self):
+        """Test that next() and take() return the same stream across buffer refills."""
+        a, b = IdFactory(seed=7, batch_size=8), IdFactory(seed=7, batch_size=8)
+        assert [a.next() for _ in range(20)] == b.take(3) + b.take(17)
+
+    def test_ids_are_unique(self):
+        """Test that a large batch contains no duplicates."""
+        values = IdFactory().take(100_000)
+        assert len(set(values)) == len(values)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+Case Fictício - Teste -- Unit Tests for Metadata-Based Layer Verification
+===============================================================
+
+Unit tests for scripts/layer_verification.py
+Tests run locally without GCP access (fake BigQuery client).
+
+Usage:
+    pytest tests/unit/test_layer_verification.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from google.api_core.exceptions import NotFound
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from layer_verification import verify_layers, check_ratios, checks_for, LAYER_TABLES
+
+
+DATASETS = {"bronze": "b", "silver": "s", "gold": "g"}
+
+ROWS = {
+    "b.orders": 1200, "b.order_items": 3600, "b.products": 30, "b.units": 3,
+    "b.states": 3, "b.countries": 1,
+    "s.orders": 1000, "s.order_items": 3000, "s.products": 30, "s.units": 3,
+    "s.states": 3, "s.countries": 1,
+}
+
+
+class FakeClient:
+    """Serves table metadata from a dict; counts query jobs (there should be none)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def get_table(self, table_id):
+        key = table_id.split(".", 1)[1]
+        if key not in self.rows:
+            raise NotFound(table_id)
+        return SimpleNamespace(
+            num_rows=self.rows[key], num_bytes=self.rows[key] * 100,
+            time_partitioning=object() if key.endswith("orders") else None,
+            range_partitioning=None, modified=datetime(2026, 10, 1, tzinfo=timezone.utc),
+            table_type="TABLE", streaming_buffer=None,
+        )
+
+    def list_partitions(self, table):
+        return ["20261001", "20261002"]
+
+    def query(self, sql):
+        self.queries += 1
+        raise AssertionError("verification must not run query jobs")
+
+
+class TestRatioChecks:
+    """Tests for the layer ratio checks."""
+
+    def test_healthy_layers_pass(self):
+        """Test that deduplicated Silver counts are within the expected ratios."""
+        stats, anomalies = verify_layers(FakeClient(ROWS), "p", DATASETS, ["silver"])
+        assert anomalies == []
+        assert stats["silver.orders"]["partitions"] == 2
+
+    def test_silver_outliving_bronze_allowed(self):
+        """Test that Silver may hold more rows than Bronze after Bronze partitions expire."""
+        rows = {**ROWS, "s.orders": 1300}
+        _, anomalies = verify_layers(FakeClient(rows), "p", DATASETS, ["silver"])
+        assert anomalies == []
+
+    def test_silver_far_below_bronze_flagged(self):
+        """Test that Silver holding under a quarter of the Bronze rows is an anomaly."""
+        rows = {**ROWS, "s.orders": 200, "s.order_items": 600}
+        _, anomalies = verify_layers(FakeClient(rows), "p", DATASETS, ["silver"])
+        assert len(anomalies) == 1 and "silver.orders/bronze.orders" in anomalies[0]
+
+    def test_rows_without_upstream_flagged(self):
+        """Test that rows downstream of an empty table are an anomaly."""
+        stats = {"silver.orders": {"rows": 5}, "bronze.orders": {"rows": 0}}
+        assert check_ratios(stats) == ["silver.orders has 5 rows but bronze.orders is empty"]
+
+    def test_dimension_history_allowed(self):
+        """Test that SCD Type 2 dimensions may hold more rows than Silver."""
+        stats = {"gold.dim_unit": {"rows": 5}, "silver.units": {"rows": 3},
+                 "gold.dim_product": {"rows": 2}, "silver.products": {"rows": 3}}
+        assert check_ratios(stats, fail_fast=False) == [
+            "gold.dim_product/silver.products = 0.667 (expected >= 1; 2 / 3 rows)"
+        ]
+
+    def test_fail_fast_stops_at_first(self):
+        """Test that fail-fast reports one anomaly and --all-checks reports all."""
+        stats = {
+            "silver.orders": {"rows": 10}, "bronze.orders": {"rows": 100},
+            "silver.order_items": {"rows": 100}, "bronze.order_items": {"rows": 1000},
+        }
+        assert len(check_ratios(stats, fail_fast=True)) == 1
+        assert len(check_ratios(stats, fail_fast=False)) == 3
+
+
+class TestCollection:
+    """Tests for concurrent metadata collection."""
+
+    def test_missing_table_is_anomaly(self):
+        """Test that a missing table is reported without issuing queries."""
+        rows = {k: v for k, v in ROWS.items() if k != "s.units"}
+        client = FakeClient(rows)
+        _, anomalies = verify_layers(client, "p", DATASETS, ["silver"])
+        assert anomalies == ["silver.units: table not found"]
+        assert client.queries == 0
+
+    def test_upstream_layers_collected(self):
+        """Test that Gold checks pull in Silver, and Silver checks pull in Bronze."""
+        assert checks_for(["gold"]) == {"gold", "silver"}
+        assert checks_for(["silver"]) == {"silver", "bronze"}
+
+    def test_layer_tables_override(self):
+        """Test that only the requested Gold tables are looked up."""
+        rows = {**ROWS, "g.dim_product": 30, "g.dim_unit": 3}
+        stats, anomalies = verify_layers(FakeClient(rows), "p", DATASETS, ["gold"],
+                                         layer_tables={"gold": ["dim_product", "dim_unit"]})
+        assert anomalies == []
+        assert {n for n in stats if n.startswith("gold.")} == {"gold.dim_product", "gold.dim_unit"}
+        assert len(stats) == 2 + len(LAYER_TABLES["silver"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+Case Fictício - Teste -- Unit Tests for Generator Load Profiles
+=====================================================
+
+Unit tests for scripts/load_profiles.py and its use in
+scripts/generate_fake_sales.py.
+
+Usage:
+    pytest tests/unit/test_load_profiles.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import random
+from collections import Counter
+from datetime import datetime
+
+from faker import Faker
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from load_profiles import LoadProfile, zipf_weights, PROFILES
+from generate_fake_sales import generate_orders_for_unit_day, PRODUCT_CATALOG
+
+
+class TestProfiles:
+    """Tests for the named load profile presets."""
+
+    def test_uniform_keeps_original_draws(self):
+        """Test that the uniform profile consumes the same random draws as before."""
+        random.seed(3)
+        expected = [random.randint(10, 50) for _ in range(5)]
+        random.seed(3)
+        profile = LoadProfile("uniform")
+        profile.assign_units([1])
+        assert [profile.order_count(1, datetime(2026, 1, 5), 10, 50) for _ in range(5)] == expected
+
+    def test_zipf_weights_mean_one(self):
+        """Test that Zipf weights are decreasing and keep the mean volume."""
+        weights = zipf_weights(50, 1.1)
+        assert weights == sorted(weights, reverse=True)
+        assert sum(weights) == pytest.approx(50)
+        assert weights[0] > 10 * weights[-1]
+
+    def test_skewed_units(self):
+        """Test that a skewed profile concentrates volume in a few units."""
+        random.seed(1)
+        profile = LoadProfile("skewed")
+        profile.assign_units(list(range(1, 51)))
+        totals = {u: sum(profile.order_count(u, datetime(2026, 1, 6), 10, 50) for _ in range(20))
+                  for u in range(1, 51)}
+        top5 = sum(sorted(totals.values(), reverse=True)[:5])
+        assert top5 > 0.3 * sum(totals.values())
+
+    def test_seasonality_and_holidays(self):
+        """Test that weekends and holidays scale the day factor."""
+        profile = LoadProfile("seasonal")
+        monday, saturday = datetime(2026, 1, 5), datetime(2026, 1, 10)
+        christmas = datetime(2026, 12, 25)  # a Friday
+        assert profile.day_factor(saturday) > profile.day_factor(monday)
+        assert profile.day_factor(christmas) == pytest.approx(1.25 * 1.8)
+
+    def test_burst_days(self):
+        """Test that a certain burst multiplies the day, once for every unit."""
+        profile = LoadProfile("bursty", burst_probability=1.0)
+        day = datetime(2026, 1, 7)
+        assert profile.day_factor(day) == 4.0
+        assert profile.day_factors == {"2026-01-07": 4.0}
+
+    def test_unknown_profile_rejected(self):
+        """Test that an unknown preset name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown load profile"):
+            LoadProfile("black-friday")
+
+
+class TestProfiledGeneration:
+    """Tests for generate_orders_for_unit_day under a profile."""
+
+    def test_product_popularity_skewed(self):
+        """Test that a product Zipf profile makes one product dominate the items."""
+        random.seed(5)
+        fake = Faker("pt_BR")
+        fake.seed_instance(5)
+        profile = LoadProfile("skewed")
+        profile.assign_units([1])
+        _, items = generate_orders_for_unit_day(fake, 1, datetime(2026, 1, 5), 200, 200, profile=profile)
+        counts = Counter(item["Id_Produto"] for item in items).most_common()
+        assert counts[0][1] > 5 * (len(items) / len(PRODUCT_CATALOG))
+
+    def test_all_presets_generate(self):
+        """Test that every preset produces a non-negative, valid day of orders."""
+        for name in PROFILES:
+            profile = LoadProfile(name)
+            profile.assign_units([1, 2])
+            orders, items = generate_orders_for_unit_day(Faker("pt_BR"), 2, datetime(2026, 5, 1), 5, 10,
+                                                         profile=profile)
+            assert all(o["Id_Unidade"] == 2 for o in orders)
+            assert {i["Id_Pedido"] for i in items} <= {o["Id_Pedido"] for o in orders}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Reference Data Loader
+=======================================================
+
+Unit tests for scripts/load_reference_data.py
+Tests run locally without GCP access (fake GCS and BigQuery clients).
+
+Usage:
+    pytest tests/unit/test_load_reference_data.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import base64
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from google.api_core.exceptions import NotFound
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from load_reference_data import (
+    load_reference_table, with_ingest_timestamp, crc32c_label,
+    REFERENCE_SCHEMAS, CHECKSUM_LABEL,
+)
+from stream_upload import FilesystemBucket
+
+
+TS = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+CSV = "Id_Produto;Nome_Produto\r\n1;Pizza Margherita\r\n2;Suco\r\n".encode("utf-8")
+CRC = base64.b64encode(bytes.fromhex("1a2b3c4d")).decode()
+
+
+class FakeBlob:
+    def __init__(self):
+        self.crc32c = CRC
+        self.generation = 7
+        self.downloads = 0
+
+    def download_as_bytes(self, if_generation_match=None):
+        assert if_generation_match == 7
+        self.downloads += 1
+        return CSV
+
+
+class FakeBigQuery:
+    """Records load jobs and label updates for one table."""
+
+    def __init__(self, labels=None):
+        self.table = None if labels is None else SimpleNamespace(labels=labels, num_rows=2)
+        self.loads = []
+
+    def get_table(self, table_id):
+        if self.table is None:
+            raise NotFound(table_id)
+        return self.table
+
+    def load_table_from_file(self, file_obj, table_id, job_config=None):
+        self.loads.append((file_obj.read(), job_config))
+        self.table = self.table or SimpleNamespace(labels={}, num_rows=2)
+        return SimpleNamespace(result=lambda: None)
+
+    def update_table(self, table, fields):
+        assert fields == ["labels"]
+        self.table = table
+
+
+def load(bq_client, blob, force=False):
+    bucket = SimpleNamespace(name="bucket", get_blob=lambda name: blob)
+    return load_reference_table(bq_client, bucket, "produto.csv", "products", "p.d.products",
+                                "raw/reference_data", TS, force)
+
+
+class TestCsvRewrite:
+    """Tests for appending the ingestion timestamp column."""
+
+    def test_timestamp_column_appended(self):
+        """Test that every data row gets the timestamp and the header gets its name."""
+        lines = with_ingest_timestamp(CSV, TS).decode().splitlines()
+        assert lines[0] == "Id_Produto;Nome_Produto;_ingest_timestamp"
+        assert lines[1] == "1;Pizza Margherita;2026-10-19 12:00:00.000000 UTC"
+        assert len(lines) == 3
+
+    def test_checksum_label_is_label_safe(self):
+        """Test that the base64 CRC32C becomes lowercase hex."""
+        assert crc32c_label(CRC) == "1a2b3c4d"
+
+
+class TestLoader:
+    """Tests for schema-declared loads and checksum skipping."""
+
+    def test_first_load_declares_schema_and_labels(self):
+        """Test that a new table is loaded with the explicit schema and labelled."""
+        bq_client, blob = FakeBigQuery(), FakeBlob()
+        result = load(bq_client, blob)
+        assert result["status"] == "LOADED" and result["rows"] == 2
+        data, job_config = bq_client.loads[0]
+        names = [f.name for f in job_config.schema]
+        assert names == [f.name for f in REFERENCE_SCHEMAS["products"]] + ["_ingest_timestamp"]
+        assert not job_config.autodetect
+        assert b";_ingest_timestamp\n" in data
+        assert bq_client.table.labels[CHECKSUM_LABEL] == "1a2b3c4d"
+
+    def test_unchanged_checksum_skipped(self):
+        """Test that a matching checksum label skips download and load."""
+        bq_client, blob = FakeBigQuery(labels={CHECKSUM_LABEL: "1a2b3c4d"}), FakeBlob()
+        result = load(bq_client, blob)
+        assert result["status"] == "SKIPPED"
+        assert blob.downloads == 0 and bq_client.loads == []
+
+    def test_force_reloads(self):
+        """Test that --force reloads an unchanged table."""
+        bq_client, blob = FakeBigQuery(labels={CHECKSUM_LABEL: "1a2b3c4d", "layer": "bronze"}), FakeBlob()
+        assert load(bq_client, blob, force=True)["status"] == "LOADED"
+        assert bq_client.table.labels["layer"] == "bronze"
+
+    def test_missing_source_reported(self):
+        """Test that a missing CSV is a FAILED result, not an exception."""
+        result = load(FakeBigQuery(), None)
+        assert result["status"] == "FAILED" and "not found" in result["error"]
+
+    def test_local_dir_source(self, tmp_path):
+        """Test that generator output is loaded and skipped by checksum like a GCS object."""
+        (tmp_path / "reference_data").mkdir()
+        (tmp_path / "reference_data" / "produto.csv").write_bytes(CSV)
+        bucket = FilesystemBucket(tmp_path)
+        bq_client = FakeBigQuery()
+        args = (bq_client, bucket, "produto.csv", "products", "p.d.products", "reference_data", TS)
+        assert load_reference_table(*args)["status"] == "LOADED"
+        assert load_reference_table(*args)["status"] == "SKIPPED"
+        assert len(bq_client.loads) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
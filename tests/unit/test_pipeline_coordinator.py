@@ -0,0 +1,168 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Pipeline Coordinator
+======================================================
+
+Unit tests for scripts/pipeline_coordinator.py
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_pipeline_coordinator.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+import pipeline_coordinator
+from pipeline_coordinator import (
+    decide, plan_steps, run_loop, DEFAULT_SETTINGS, INCREMENTAL_STEPS, REFERENCE_STEPS, APPROX_PRODUCT_STEPS,
+)
+
+NOW = datetime(2026, 1, 16, 3, 30, tzinfo=timezone.utc)
+
+
+def pending_day(units, oldest_minutes, newest_minutes, day="2026-01-15"):
+    return {
+        "business_day": day,
+        "units_landed": units,
+        "new_files": units,
+        "oldest_new": NOW - timedelta(minutes=oldest_minutes),
+        "newest_new": NOW - timedelta(minutes=newest_minutes),
+    }
+
+
+class TestDecide:
+    """Tests for the build trigger decision."""
+
+    def test_nothing_pending(self):
+        """Test that a tick without new Bronze data does not build."""
+        assert decide([], 50, NOW, DEFAULT_SETTINGS) == (None, "no new Bronze data")
+
+    def test_complete_day_triggers_after_debounce(self):
+        """Test that a day with enough units builds once uploads settle."""
+        trigger, reason = decide([pending_day(46, 20, 6)], 50, NOW, DEFAULT_SETTINGS)
+        assert trigger == "complete"
+        assert "2026-01-15" in reason
+
+    def test_debounce_holds_complete_day(self):
+        """Test that a complete day waits while files are still landing."""
+        trigger, reason = decide([pending_day(50, 20, 1)], 50, NOW, DEFAULT_SETTINGS)
+        assert trigger is None
+        assert "debounce" in reason
+
+    def test_incomplete_day_waits(self):
+        """Test that a day below the threshold waits for more units."""
+        trigger, reason = decide([pending_day(10, 20, 10)], 50, NOW, DEFAULT_SETTINGS)
+        assert trigger is None
+        assert "10/50" in reason
+
+    def test_deadline_overrides_debounce_and_cooldown(self):
+        """Test that data older than max staleness builds regardless."""
+        last_build = NOW - timedelta(minutes=1)
+        trigger, _ = decide([pending_day(3, 31, 0)], 50, NOW, DEFAULT_SETTINGS, last_build)
+        assert trigger == "deadline"
+
+    def test_cooldown_after_recent_build(self):
+        """Test that a complete day does not rebuild inside the minimum interval."""
+        last_build = NOW - timedelta(minutes=5)
+        trigger, reason = decide([pending_day(50, 20, 10)], 50, NOW, DEFAULT_SETTINGS, last_build)
+        assert trigger is None
+        assert "cooldown" in reason
+
+
+class TestPlanSteps:
+    """Tests for the SQL steps of one build."""
+
+    def test_incremental_only(self):
+        """Test that unchanged reference data skips reference tables and dimensions."""
+        assert plan_steps(False) == INCREMENTAL_STEPS
+
+    def test_reference_changes_keep_dependency_order(self):
+        """Test that reference steps run before the tables that read them."""
+        files = [sql_file for sql_file, _ in plan_steps(True)]
+        assert len(files) == len(INCREMENTAL_STEPS) + len(REFERENCE_STEPS)
+        assert files.index("sql/silver/01_reference_tables.sql") < files.index("sql/silver/02_orders.sql")
+        assert files.index("sql/gold/03_dim_unit.sql") < files.index("sql/gold/05_fact_sales.sql")
+        assert all(os.path.exists(os.path.join(os.path.dirname(__file__), '..', '..', f)) for f in files)
+
+    def test_sketches_only_in_approx_mode(self):
+        """Test that the daily sketches run only when product counts come from them."""
+        exact = [sql_file for sql_file, _ in plan_steps(False)]
+        approx = [sql_file for sql_file, _ in plan_steps(True, "approx")]
+        assert "sql/gold/10_agg_daily_product_sketches.sql" not in exact
+        assert "sql/gold/09_agg_product_performance.sql" not in approx
+        assert approx.index("sql/gold/06_fact_order_items.sql") \
+            < approx.index("sql/gold/10_agg_daily_product_sketches.sql") \
+            < approx.index("sql/gold/09_agg_product_performance_approx.sql")
+        assert all(os.path.exists(os.path.join(os.path.dirname(__file__), '..', '..', f))
+                   for f, _ in APPROX_PRODUCT_STEPS)
+
+
+class FakeRunsClient:
+    """Accepts the runs table and records inserted run rows."""
+
+    def __init__(self):
+        self.runs = []
+
+    def create_table(self, table, exists_ok=False):
+        return table
+
+    def insert_rows_json(self, table_id, rows):
+        self.runs.extend(rows)
+        return []
+
+
+class TestRunLoop:
+    """Tests for the polling loop."""
+
+    DATASETS = {"monitoring": "case_ficticio_monitoring"}
+
+    def test_failed_tick_is_logged_and_loop_continues(self, monkeypatch):
+        """Test that an exception in one tick is recorded as a failed run and the next tick still runs."""
+        calls = []
+
+        def flaky_tick(*args, **kwargs):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("Bronze query timed out")
+            return 0
+
+        monkeypatch.setattr(pipeline_coordinator, "tick", flaky_tick)
+        monkeypatch.setattr(pipeline_coordinator.time, "sleep", lambda seconds: None)
+        client = FakeRunsClient()
+        run_loop(client, "proj", self.DATASETS, DEFAULT_SETTINGS, poll_seconds=60, cycles=3)
+
+        assert len(calls) == 3
+        assert len(client.runs) == 1
+        assert client.runs[0]["status"] == "failed"
+        assert client.runs[0]["trigger"] == "error"
+        assert client.runs[0]["reason"] == "RuntimeError: Bronze query timed out"
+        assert "watermark" not in client.runs[0]
+
+    def test_unloggable_failure_does_not_stop_loop(self, monkeypatch):
+        """Test that the loop survives when the failed run cannot be written either."""
+        calls = []
+
+        def failing_tick(*args, **kwargs):
+            calls.append(len(calls))
+            raise RuntimeError("BigQuery unavailable")
+
+        class UnavailableClient(FakeRunsClient):
+            def insert_rows_json(self, table_id, rows):
+                raise RuntimeError("503 Service Unavailable")
+
+        monkeypatch.setattr(pipeline_coordinator, "tick", failing_tick)
+        monkeypatch.setattr(pipeline_coordinator.time, "sleep", lambda seconds: None)
+        run_loop(UnavailableClient(), "proj", self.DATASETS, DEFAULT_SETTINGS, poll_seconds=60, cycles=2)
+        assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Query Result Cache
+====================================================
+
+Unit tests for scripts/query_cache.py
+Tests run locally without GCP access (fake BigQuery client).
+
+Usage:
+    pytest tests/unit/test_query_cache.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from query_cache import QueryCache, normalize_sql, referenced_tables
+
+
+TABLE = "proj.case_ficticio_gold.fact_sales"
+SQL = f"SELECT COUNT(*) AS orders FROM `{TABLE}` -- verification"
+
+
+class FakeClient:
+    """Counts query jobs; tables are SimpleNamespace metadata objects."""
+
+    def __init__(self):
+        self.queries = 0
+        self.tables = {}
+
+    def add_table(self, table_id, num_rows=10, streaming=False, table_type="TABLE", modified=None):
+        self.tables[table_id] = SimpleNamespace(
+            num_rows=num_rows,
+            streaming_buffer=object() if streaming else None,
+            table_type=table_type,
+            modified=modified or datetime(2026, 10, 1, tzinfo=timezone.utc),
+        )
+
+    def get_table(self, table_id):
+        return self.tables[table_id]
+
+    def query(self, sql):
+        self.queries += 1
+        return SimpleNamespace(result=lambda: [{"orders": 42, "row_count": 7}], total_bytes_processed=1024)
+
+
+@pytest.fixture
+def client():
+    fake = FakeClient()
+    fake.add_table(TABLE)
+    return fake
+
+
+class TestNormalization:
+    """Tests for SQL normalization and table extraction."""
+
+    def test_whitespace_and_comments_ignored(self):
+        """Test that formatting differences normalize to the same SQL."""
+        a = "SELECT a\n  FROM `p.d.t`  -- note\n;"
+        b = "SELECT a FROM `p.d.t`"
+        assert normalize_sql(a) == normalize_sql(b)
+
+    def test_referenced_tables(self):
+        """Test that backtick-quoted table ids are extracted once, sorted."""
+        sql = "SELECT * FROM `p-1.d.b` JOIN `p-1.d.a` USING (k) JOIN `p-1.d.b` USING (k)"
+        assert referenced_tables(sql) == ["p-1.d.a", "p-1.d.b"]
+
+
+class TestQueryCache:
+    """Tests for cached queries and metadata row counts."""
+
+    def test_repeat_query_served_from_disk(self, client, tmp_path):
+        """Test that a second run (new cache instance) issues no query job."""
+        path = tmp_path / "cache.pkl"
+        assert QueryCache(client, path=path).query(SQL)[0]["orders"] == 42
+
+        cache = QueryCache(client, path=path)
+        assert cache.query(SQL.replace(" -- verification", "")) == [{"orders": 42, "row_count": 7}]
+        assert client.queries == 1
+        assert cache.hits == 1 and cache.bytes_processed == 0
+
+    def test_empty_cache_is_truthy(self, client, tmp_path):
+        """Test that a cache with no entries is not mistaken for a missing one."""
+        cache = QueryCache(client, path=tmp_path / "cache.pkl")
+        assert len(cache) == 0
+        assert cache
+
+    def test_table_modification_invalidates(self, client, tmp_path):
+        """Test that a newer table modified time changes the cache key."""
+        path = tmp_path / "cache.pkl"
+        QueryCache(client, path=path).query(SQL)
+        client.add_table(TABLE, modified=datetime(2026, 10, 2, tzinfo=timezone.utc))
+        QueryCache(client, path=path).query(SQL)
+        assert client.queries == 2
+
+    def test_streaming_buffer_not_cached(self, client, tmp_path):
+        """Test that queries over tables with a streaming buffer always run."""
+        client.add_table(TABLE, streaming=True)
+        cache = QueryCache(client, path=tmp_path / "cache.pkl")
+        cache.query(SQL)
+        cache.query(SQL)
+        assert client.queries == 2 and len(cache) == 0
+
+    def test_ttl_expiry(self, client, tmp_path):
+        """Test that expired entries are re-queried."""
+        cache = QueryCache(client, path=tmp_path / "cache.pkl", ttl_seconds=0)
+        cache.query(SQL)
+        cache.query(SQL)
+        assert client.queries == 2
+
+    def test_lru_eviction(self, client, tmp_path):
+        """Test that the least recently used entry is evicted beyond max_entries."""
+        cache = QueryCache(client, path=tmp_path / "cache.pkl", max_entries=2)
+        first, second, third = (f"SELECT {i} FROM `{TABLE}`" for i in range(3))
+        cache.query(first)
+        cache.query(second)
+        cache.query(first)   # first becomes most recent
+        cache.query(third)   # evicts second
+        assert len(cache) == 2
+        cache.query(first)
+        cache.query(second)
+        assert client.queries == 4
+
+    def test_row_count_from_metadata(self, client, tmp_path):
+        """Test that native tables without streaming buffer are counted from metadata."""
+        cache = QueryCache(client, path=tmp_path / "cache.pkl")
+        assert cache.row_count(TABLE) == 10
+        assert client.queries == 0 and cache.metadata_counts == 1
+
+    def test_row_count_falls_back_for_views(self, client, tmp_path):
+        """Test that views are counted with a (cached) COUNT(*) query."""
+        view = "proj.case_ficticio_gold.dim_unit_view"
+        client.add_table(view, num_rows=None, table_type="VIEW")
+        cache = QueryCache(client, path=tmp_path / "cache.pkl")
+        assert cache.row_count(view) == 7
+        assert cache.row_count(view) == 7
+        assert client.queries == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
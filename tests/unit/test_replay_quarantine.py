@@ -0,0 +1,116 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Quarantine Replay
+===================================================
+
+Unit tests for scripts/replay_quarantine.py
+Tests run locally without GCP access (dry-run replays, no load jobs).
+
+Usage:
+    pytest tests/unit/test_replay_quarantine.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from replay_quarantine import replay, split_replayable, read_export
+
+SOURCE = "raw/csv_sales/2026/01/15/unit_001/item_pedido.csv"
+ORDER_SOURCE = "raw/csv_sales/2026/01/15/unit_001/pedido.csv"
+
+
+def item_row(item_id, rule, qtd="1", order_id="o1"):
+    return {"Id_Pedido": order_id, "Id_Item_Pedido": item_id, "Id_Produto": "3", "Qtd": qtd,
+            "Vlr_Item": "10.00", "Observacao": None, "_rule": rule,
+            "_source_file": SOURCE, "_line_number": 2}
+
+
+def order_row(order_id, rule, value="20.00", status="Finalizado"):
+    return {"Id_Unidade": "1", "Id_Pedido": order_id, "Tipo_Pedido": "Loja Fisica",
+            "Data_Pedido": "2026-01-15", "Vlr_Pedido": value, "Endereco_Entrega": None,
+            "Taxa_Entrega": "0.00", "Status": status, "_rule": rule,
+            "_source_file": ORDER_SOURCE, "_line_number": 2}
+
+
+class FakeBronze:
+    """Answers the Bronze order/item-total lookups from fixed rows."""
+
+    project = "p"
+
+    def __init__(self, orders=(), totals=None):
+        self.orders = [{"id_pedido": order_id} for order_id in orders]
+        self.totals = [{"id_pedido": k, "total": v} for k, v in (totals or {}).items()]
+
+    def query(self, sql, job_config=None):
+        rows = self.totals if "SUM(qtd * vlr_item)" in sql else self.orders
+        return SimpleNamespace(result=lambda: rows)
+
+
+class TestStickyRules:
+    """Tests that duplicates stay quarantined and cross-file rejections are re-checked."""
+
+    def test_split(self):
+        """Test that everything but cross-row duplicates is replayable."""
+        df = pd.DataFrame([item_row("a", "malformed_value"), item_row("b", "orphan_item"),
+                           item_row("c", "duplicate_id"), item_row("d", "non_positive_quantity")])
+        replayable, sticky = split_replayable(df)
+        assert list(replayable["Id_Item_Pedido"]) == ["a", "b", "d"]
+        assert list(sticky["_rule"]) == ["duplicate_id"]
+
+    def test_replay_keeps_context_rejections(self):
+        """Test that duplicates and items whose order is nowhere accepted stay quarantined."""
+        df = pd.DataFrame([item_row("a", "malformed_value"), item_row("b", "orphan_item", order_id="o2"),
+                           item_row("c", "duplicate_id"), item_row("d", "non_positive_quantity", qtd="0")])
+        stats = replay({"item_pedido": df}, bucket=None, bq_client=None, dataset="bronze", dry_run=True)
+        assert stats == {"loaded": 1, "still_rejected": 3, "sticky": 1}
+
+
+class TestCrossFileRecheck:
+    """Tests that orphan items and mismatched orders are released once their counterpart is accepted."""
+
+    def test_fixed_order_releases_its_items(self):
+        """Test that a corrected order and its orphaned items load in the same run."""
+        frames = {
+            "pedido": pd.DataFrame([order_row("o1", "order_total_mismatch"),
+                                    order_row("o2", "invalid_status", status="Unknown")]),
+            "item_pedido": pd.DataFrame([item_row("a", "orphan_item"), item_row("b", "orphan_item"),
+                                         item_row("c", "orphan_item", order_id="o2")]),
+        }
+        stats = replay(frames, bucket=None, bq_client=None, dataset="bronze", dry_run=True)
+        # o1 (20.00 = 2 x 10.00) and items a, b load; o2 is still invalid, so c stays orphaned
+        assert stats == {"loaded": 3, "still_rejected": 2, "sticky": 0}
+
+    def test_orders_and_items_already_in_bronze(self):
+        """Test that Bronze orders release orphans and Bronze items count toward order totals."""
+        frames = {
+            "pedido": pd.DataFrame([order_row("o3", "order_total_mismatch", value="30.00")]),
+            "item_pedido": pd.DataFrame([item_row("a", "orphan_item"), item_row("b", "orphan_item", order_id="o3")]),
+        }
+        bronze = FakeBronze(orders=["o1"], totals={"o3": 20.0})
+        stats = replay(frames, bucket=None, bq_client=bronze, dataset="bronze", dry_run=True)
+        assert stats == {"loaded": 3, "still_rejected": 0, "sticky": 0}
+
+    def test_mismatch_still_rejected(self):
+        """Test that an order whose total still does not match stays quarantined."""
+        frames = {"pedido": pd.DataFrame([order_row("o1", "order_total_mismatch", value="99.00")])}
+        stats = replay(frames, bucket=None, bq_client=None, dataset="bronze", dry_run=True)
+        assert stats == {"loaded": 0, "still_rejected": 1, "sticky": 0}
+
+    def test_export_requires_rule(self, tmp_path):
+        """Test that an export without _rule cannot be replayed."""
+        path = tmp_path / "fixes.csv"
+        pd.DataFrame([item_row("a", "malformed_value")]).drop(columns=["_rule"]).to_csv(path, sep=";", index=False)
+        with pytest.raises(ValueError, match="_rule"):
+            read_export(path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Case Fictício - Teste -- Unit Tests for the SQL Scan Regression Suite
+===========================================================
+
+Unit tests for scripts/sql_regression.py, plus the static plan-shape check
+of every SQL file against sql/plan_baseline.json.
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_sql_regression.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from sql_regression import (
+    BASELINE_PATH, collect, compare, merge_baseline, plan_stats, read_baseline,
+    reset_fixture, rewrite_for_fixture, sql_files, static_shape,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def entry(shape=None, bytes_processed=None, stages=None, shuffle_stages=None):
+    base_shape = {"joins": 1, "group_bys": 1, "windows": 0, "distincts": 0, "merges": 0, "pruning_filters": 2}
+    return {"shape": {**base_shape, **(shape or {})}, "bytes_processed": bytes_processed,
+            "stages": stages, "shuffle_stages": shuffle_stages}
+
+
+class TestStaticShape:
+    """Tests for the plan shape read from SQL text."""
+
+    def test_counts_operators_and_filters(self):
+        """Test that shuffle operators and partition predicates are counted, comments ignored."""
+        sql = """
+            -- a JOIN in a comment does not count
+            SELECT o.order_id, COUNT(DISTINCT i.product_id)
+            FROM `p.d.orders` o JOIN `p.d.items` i USING (order_id)
+            WHERE o._ingest_date >= DATE(watermark) AND o.order_date BETWEEN a AND b
+            GROUP BY o.order_id
+        """
+        shape = static_shape(sql)
+        assert shape["joins"] == 1
+        assert shape["group_bys"] == 1
+        assert shape["distincts"] == 1
+        assert shape["pruning_filters"] == 2
+
+    def test_dependency_order(self):
+        """Test that Silver runs before Gold and approx variants after the sketches."""
+        names = [p.relative_to(REPO_ROOT / "sql").as_posix() for p in sql_files(REPO_ROOT)]
+        assert names[0].startswith("silver/")
+        assert names.index("gold/09_agg_product_performance_approx.sql") > \
+            names.index("gold/10_agg_daily_product_sketches.sql")
+
+    def test_rewrite_for_fixture(self):
+        """Test that project and layer datasets are pointed at the fixture."""
+        sql = "SELECT * FROM `sixth-foundry-485810-e5.case_ficticio_silver.orders`"
+        assert rewrite_for_fixture(sql, "fx", "_fixture") == "SELECT * FROM `fx.case_ficticio_silver_fixture.orders`"
+
+
+class TestResetFixture:
+    """Tests for resetting the fixture Silver/Gold state before execute runs."""
+
+    def test_drops_silver_and_gold_only(self):
+        """Test that every Silver/Gold fixture table is dropped and Bronze is kept."""
+        tables = {"fx.case_ficticio_silver_fixture": ["orders", "orders_version_index"],
+                  "fx.case_ficticio_gold_fixture": ["fact_sales"]}
+        deleted = []
+        client = SimpleNamespace(list_tables=lambda dataset_id: tables.get(dataset_id, []),
+                                 delete_table=lambda table, not_found_ok=False: deleted.append(table))
+        assert reset_fixture(client, "fx", "_fixture") == 3
+        assert deleted == ["orders", "orders_version_index", "fact_sales"]
+
+    def test_refuses_without_suffix(self):
+        """Test that an empty suffix (the production datasets) is never reset."""
+        with pytest.raises(ValueError, match="dataset-suffix"):
+            reset_fixture(SimpleNamespace(), "fx", "")
+
+
+class TestCompare:
+    """Tests for regression detection against the baseline."""
+
+    def test_lost_partition_filter(self):
+        """Test that removing a partition predicate is a regression."""
+        regressions = compare({"a.sql": entry()}, {"a.sql": entry({"pruning_filters": 1})})
+        assert regressions == ["a.sql: pruning_filters 2 -> 1 (partition filter removed?)"]
+
+    def test_bytes_tolerance(self):
+        """Test that bytes growth beyond the tolerance fails and within it passes."""
+        base = {"a.sql": entry(bytes_processed=100_000_000)}
+        assert compare(base, {"a.sql": entry(bytes_processed=105_000_000)}) == []
+        assert "bytes_processed" in compare(base, {"a.sql": entry(bytes_processed=150_000_000)})[0]
+
+    def test_stages_and_new_files(self):
+        """Test that extra shuffle stages and files missing from the baseline fail."""
+        regressions = compare({"a.sql": entry(stages=4, shuffle_stages=2)},
+                              {"a.sql": entry(stages=4, shuffle_stages=3), "b.sql": entry()})
+        assert regressions == ["a.sql: shuffle_stages 2 -> 3", "b.sql: not in the baseline (run with --update)"]
+
+    def test_merge_keeps_measurements(self):
+        """Test that a static update keeps bytes measured by an earlier execute run."""
+        merged = merge_baseline({"a.sql": entry(bytes_processed=10, stages=3)}, {"a.sql": entry({"joins": 2})})
+        assert merged["a.sql"]["bytes_processed"] == 10
+        assert merged["a.sql"]["shape"]["joins"] == 2
+
+    def test_plan_stats(self):
+        """Test that stages writing shuffle output are counted."""
+        plan = [SimpleNamespace(shuffle_output_bytes=10), SimpleNamespace(shuffle_output_bytes=0)]
+        assert plan_stats(plan) == (2, 1)
+
+
+class TestRepositoryBaseline:
+    """Static plan shape of the repository SQL against sql/plan_baseline.json."""
+
+    def test_sql_within_baseline(self):
+        """Test that no SQL file gained shuffle operators or lost a partition filter."""
+        baseline = read_baseline(REPO_ROOT / BASELINE_PATH)
+        assert baseline, "sql/plan_baseline.json is missing"
+        assert compare(baseline, collect(REPO_ROOT)) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
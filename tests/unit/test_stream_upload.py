@@ -0,0 +1,113 @@
+"""
+Case Fictício - Teste -- Unit Tests for Streaming Generate-and-Upload
+===========================================================
+
+Unit tests for scripts/stream_upload.py and the --stream-to mode of
+scripts/generate_fake_sales.py. Uploads go to a filesystem-backed bucket.
+
+Usage:
+    pytest tests/unit/test_stream_upload.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from datetime import datetime
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from stream_upload import StreamUploader, FilesystemBucket, open_bucket
+from generate_fake_sales import generate_sales_data, generate_unit_list
+
+
+class SlowBucket:
+    """Bucket whose uploads take a fixed time; tracks the peak in-flight count."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def blob(self, name):
+        bucket = self
+
+        class Blob:
+            def upload_from_string(self, data, content_type=None):
+                with bucket.lock:
+                    bucket.in_flight += 1
+                    bucket.peak = max(bucket.peak, bucket.in_flight)
+                time.sleep(bucket.delay)
+                if name.endswith("bad.csv"):
+                    raise RuntimeError("503 backend error")
+                with bucket.lock:
+                    bucket.in_flight -= 1
+
+        return Blob()
+
+
+class TestStreamUploader:
+    """Tests for the bounded upload queue."""
+
+    def test_uploads_land_in_filesystem_bucket(self, tmp_path):
+        """Test that queued objects are written under the bucket root."""
+        with StreamUploader(FilesystemBucket(tmp_path), workers=2) as uploader:
+            uploader.put("raw/a/pedido.csv", b"x;y\n")
+        assert (tmp_path / "raw" / "a" / "pedido.csv").read_bytes() == b"x;y\n"
+        assert uploader.stats()["uploaded"] == 1
+
+    def test_full_queue_blocks_producer(self):
+        """Test that a slow uploader applies backpressure and uploads run concurrently."""
+        bucket = SlowBucket(0.05)
+        uploader = StreamUploader(bucket, workers=2, queue_size=1)
+        for i in range(8):
+            uploader.put(f"f{i}.csv", b"1")
+        stats = uploader.close()
+        assert stats["uploaded"] == 8
+        assert stats["producer_blocked_seconds"] > 0.05
+        assert bucket.peak == 2
+
+    def test_failures_are_collected(self):
+        """Test that a failed upload is reported and does not stop the others."""
+        uploader = StreamUploader(SlowBucket(0), workers=2)
+        uploader.put("bad.csv", b"1")
+        uploader.put("good.csv", b"1")
+        stats = uploader.close()
+        assert stats["uploaded"] == 1
+        assert stats["failed"] == [("bad.csv", "503 backend error")]
+
+    def test_local_target_is_filesystem_bucket(self, tmp_path):
+        """Test that a non-gs:// target opens the filesystem stand-in."""
+        assert isinstance(open_bucket(str(tmp_path)), FilesystemBucket)
+
+
+class TestStreamingGeneration:
+    """Tests for generate_sales_data in streaming mode."""
+
+    def test_streaming_matches_local_files(self, tmp_path):
+        """Test that streamed objects equal the files written locally and nothing is staged."""
+        units = generate_unit_list(2)
+        args = dict(units=units, start_date=datetime(2026, 1, 1), end_date=datetime(2026, 1, 2),
+                    min_orders=3, max_orders=5, seed=42)
+
+        generate_sales_data(output_dir=tmp_path / "local", **args)
+        with StreamUploader(FilesystemBucket(tmp_path / "bucket")) as uploader:
+            stats = generate_sales_data(output_dir=tmp_path / "staging", uploader=uploader, **args)
+
+        assert not (tmp_path / "staging").exists()
+        local = sorted(p.relative_to(tmp_path / "local") for p in (tmp_path / "local").rglob("*.csv"))
+        assert len(local) == stats["total_files"] == 8
+        for path in local:
+            streamed = tmp_path / "bucket" / "raw" / path
+            assert streamed.read_bytes() == (tmp_path / "local" / path).read_bytes()
+        assert uploader.stats()["bytes_uploaded"] == stats["total_bytes"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Case Fictício - Teste -- Unit Tests for Table Layout Tooling
+==================================================
+
+Unit tests for scripts/apply_table_layout.py and config/table_layout.yaml.
+Tests run locally without GCP access.
+
+Usage:
+    pytest tests/unit/test_table_layout.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+
+from google.cloud import bigquery
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from apply_table_layout import (
+    load_layout,
+    desired_layout,
+    current_layout,
+    plan_change,
+    migration_ddl,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def make_table(field=None, type_="DAY", expiration_days=None, cluster=None) -> bigquery.Table:
+    table = bigquery.Table("p.d.t")
+    if field:
+        table.time_partitioning = bigquery.TimePartitioning(
+            type_=type_, field=field,
+            expiration_ms=expiration_days * 24 * 60 * 60 * 1000 if expiration_days else None,
+        )
+    table.clustering_fields = cluster
+    return table
+
+
+class TestPlanChange:
+    """Tests for layout diffing."""
+
+    def test_matching_layout_is_ok(self):
+        """Test that an up-to-date table needs no change."""
+        desired = desired_layout({"partition": {"field": "order_date", "type": "DAY"}, "cluster": ["unit_id"]})
+        current = current_layout(make_table("order_date", cluster=["unit_id"]))
+        assert plan_change(current, desired) == "ok"
+
+    def test_clustering_and_expiration_update_in_place(self):
+        """Test that clustering/expiration changes do not require a rewrite."""
+        desired = desired_layout({"partition": {"field": "_ingest_date", "expiration_days": 730},
+                                  "cluster": ["id_pedido"]})
+        current = current_layout(make_table("_ingest_date"))
+        assert plan_change(current, desired) == "update"
+
+    def test_new_partitioning_requires_migration(self):
+        """Test that partitioning an unpartitioned table is a migration."""
+        desired = desired_layout({"partition": {"field": "order_date"}, "cluster": ["unit_id"]})
+        current = current_layout(make_table())
+        assert plan_change(current, desired) == "migrate"
+
+
+class TestMigrationDdl:
+    """Tests for migration DDL generation."""
+
+    def test_monthly_partition_ddl(self):
+        """Test that MONTH partitions use DATE_TRUNC and keep the description."""
+        desired = desired_layout({"partition": {"field": "order_date", "type": "MONTH"}, "cluster": ["order_date"]})
+        ddl = migration_ddl("p.gold.agg_daily_sales", desired, 'Daily "KPIs"')
+        assert "PARTITION BY DATE_TRUNC(order_date, MONTH)" in ddl
+        assert "CLUSTER BY order_date" in ddl
+        assert 'description="Daily \\"KPIs\\""' in ddl
+        assert "CREATE TABLE `p.gold.agg_daily_sales`" in ddl
+
+    def test_migration_copies_drops_and_recreates(self):
+        """Test that a partitioning change never uses CREATE OR REPLACE on the table itself."""
+        desired = desired_layout({"partition": {"field": "order_date"}, "cluster": ["unit_id"]})
+        statements = [line for line in migration_ddl("p.s.orders", desired).splitlines()
+                      if line.startswith(("CREATE", "DROP", "AS"))]
+        assert statements == [
+            "CREATE OR REPLACE TABLE `p.s.orders__layout_migration` AS SELECT * FROM `p.s.orders`;",
+            "DROP TABLE `p.s.orders`;",
+            "CREATE TABLE `p.s.orders`",
+            "AS SELECT * FROM `p.s.orders__layout_migration`;",
+            "DROP TABLE `p.s.orders__layout_migration`;",
+        ]
+
+
+class TestLayoutSpec:
+    """Tests for config/table_layout.yaml."""
+
+    def test_sql_ddl_declares_spec_clustering(self):
+        """Test that every CREATE statement in sql/ clusters like the spec says."""
+        layout = load_layout(REPO_ROOT / "config" / "table_layout.yaml")
+        sql = "\n".join(p.read_text(encoding="utf-8") for p in (REPO_ROOT / "sql").rglob("*.sql"))
+        for layer in ["bronze", "silver", "gold"]:
+            for table_name, spec in layout[layer]["tables"].items():
+                assert f"CLUSTER BY {', '.join(spec['cluster'])}" in sql, table_name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Case Fictício - Teste -- Unit Tests for Infrastructure Verification
+=========================================================
+
+Unit tests for scripts/verify_infrastructure.py
+Tests run locally without GCP access (fake GCS and BigQuery clients).
+
+Usage:
+    pytest tests/unit/test_verify_infrastructure.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import sys
+import os
+import json
+from types import SimpleNamespace
+
+from google.api_core import exceptions
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+import verify_infrastructure as vi
+
+
+class FakeStorage:
+    """Answers delimiter listings from a fixed set of object names."""
+
+    def __init__(self, names):
+        self.names = names
+        self.listings = []
+
+    def get_bucket(self, name):
+        return SimpleNamespace(location="US", storage_class="STANDARD", time_created="2026-01-01")
+
+    def list_blobs(self, bucket, prefix=None, delimiter=None, **kwargs):
+        self.listings.append((prefix, delimiter))
+        prefix = prefix or ""
+        children = {prefix + n[len(prefix):].split("/")[0] + "/"
+                    for n in self.names if n.startswith(prefix) and "/" in n[len(prefix):]}
+        return SimpleNamespace(pages=iter([[]]), prefixes=children)
+
+
+class FakeBigQuery:
+    """Lists datasets; get_dataset must not be called."""
+
+    def __init__(self, datasets, tables):
+        self.datasets = datasets
+        self.tables = tables
+
+    def list_datasets(self):
+        return [SimpleNamespace(dataset_id=d, labels={"env": "mvp"}) for d in self.datasets]
+
+    def get_dataset(self, dataset_id):
+        raise AssertionError("datasets are already listed")
+
+    def get_table(self, table_id):
+        ref = table_id.split(".", 1)[1]
+        if ref not in self.tables:
+            raise exceptions.NotFound(table_id)
+        return SimpleNamespace(num_rows=self.tables[ref])
+
+
+def run(storage_client, bq_client):
+    results = vi.run_checks(vi.build_checks(storage_client, bq_client, "proj", "bucket"))
+    return results, vi.summarize(results)
+
+
+class TestChecks:
+    """Tests for the concurrent infrastructure checks."""
+
+    def test_prefixes_use_delimiter_listings(self):
+        """Test that prefixes are found with one delimiter listing per parent."""
+        storage_client = FakeStorage(["raw/csv_sales/2026/01/01/unit_001/pedido.csv", "bronze/x.parquet"])
+        results, summary = run(storage_client, FakeBigQuery(vi.EXPECTED_DATASETS, {}))
+        assert sorted(storage_client.listings, key=str) == sorted([(None, "/"), ("raw/", "/")], key=str)
+        prefixes = {r["check"]: r for r in results if r["check"].startswith("prefixes")}
+        assert prefixes["prefixes:/"]["details"] == ["[OK] bronze/", "[WARN] quarantine/ (no objects yet)"]
+        assert "[OK] raw/csv_sales/" in prefixes["prefixes:raw/"]["details"]
+        assert summary["gcs"] == vi.WARN
+
+    def test_missing_dataset_fails(self):
+        """Test that a missing dataset fails the datasets group without get_dataset calls."""
+        _, summary = run(FakeStorage([]), FakeBigQuery(vi.EXPECTED_DATASETS[:2], {}))
+        assert summary["datasets"] == vi.FAIL
+
+    def test_tables_pending_and_timed(self):
+        """Test that missing tables are pending and every check carries a timing."""
+        tables = {ref: 10 for ref in vi.EXPECTED_TABLES[:-1]}
+        results, summary = run(FakeStorage([]), FakeBigQuery(vi.EXPECTED_DATASETS, tables))
+        assert summary["tables"] == vi.WARN
+        assert summary["service_accounts"] == vi.MANUAL
+        assert all(r["elapsed_ms"] >= 0 for r in results)
+
+    def test_check_errors_are_captured(self):
+        """Test that an exception inside a check becomes a FAIL result."""
+        result = vi.timed_check("gcs", "boom", lambda: 1 / 0)
+        assert result["status"] == vi.FAIL and "division by zero" in result["details"][0]
+
+    def test_json_output(self, monkeypatch, capsys):
+        """Test that --json prints one parseable document with per-check results."""
+        monkeypatch.setattr(vi, "load_config", lambda: {"project": {"id": "proj"}, "storage": {"bucket": "bucket"}})
+        monkeypatch.setattr(vi.storage, "Client", lambda project=None: FakeStorage(["quarantine/a.csv"]))
+        monkeypatch.setattr(vi.bigquery, "Client", lambda project=None: FakeBigQuery(vi.EXPECTED_DATASETS, {}))
+        monkeypatch.setattr(sys, "argv", ["verify_infrastructure.py", "--json"])
+        assert vi.main() == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["ok"] is True
+        assert len(report["checks"]) == len(vi.build_checks(None, None, "proj", "bucket"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Case Fictício - Teste -- Unit Tests for the Storage Write API Sink
+========================================================
+
+Unit tests for cloud_functions/csv_processor/write_api.py, run against the
+local stand-in in scripts/local_write_server.py.
+
+Usage:
+    pytest tests/unit/test_write_api.py -v
+
+Author: Arthur Graf -- Case Fictício - Teste Project
+Date: October 2026
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+
+from google.cloud.bigquery_storage_v1 import types
+
+# Add Cloud Function source and scripts directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'cloud_functions', 'csv_processor'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from bronze import to_bronze_arrow
+from local_write_server import LocalWriteServer
+from validation import validate_pedido
+from write_api import table_path, write_bronze_arrow, append_arrow
+
+
+PARENT = table_path("test-project", "case_ficticio_bronze", "orders")
+SOURCE_FILE = "raw/csv_sales/2026/01/15/unit_001/pedido.csv"
+
+
+def bronze_orders(count: int):
+    df = pd.DataFrame({
+        "Id_Unidade": ["1"] * count,
+        "Id_Pedido": [f"P{i}" for i in range(count)],
+        "Tipo_Pedido": ["Loja Fisica"] * count,
+        "Data_Pedido": ["2026-01-15"] * count,
+        "Vlr_Pedido": ["30.10"] * count,
+        "Endereco_Entrega": [None] * count,
+        "Taxa_Entrega": ["0.00"] * count,
+        "Status": ["Finalizado"] * count,
+    })
+    valid, _, _ = validate_pedido(df)
+    return to_bronze_arrow(valid, "orders", SOURCE_FILE, datetime(2026, 1, 16))
+
+
+class TestWriteApiSink:
+    """Tests for pending-stream writes."""
+
+    def test_rows_visible_after_commit(self):
+        """Test that every row is committed with its Bronze values."""
+        server = LocalWriteServer()
+        rows = write_bronze_arrow(server, bronze_orders(25), PARENT, batch_rows=10)
+        visible = server.visible_rows(PARENT)
+        assert rows == 25
+        assert visible.num_rows == 25
+        assert visible.column("vlr_pedido")[0].as_py() == Decimal("30.10")
+        assert visible.column("_source_file")[0].as_py() == SOURCE_FILE
+
+    def test_one_stream_and_commit_per_file(self):
+        """Test that each file is committed exactly once through its own stream."""
+        server = LocalWriteServer()
+        write_bronze_arrow(server, bronze_orders(3), PARENT)
+        write_bronze_arrow(server, bronze_orders(3), PARENT)
+        assert len(server.streams) == 2
+        assert len(server.commit_times) == 2
+
+    def test_failed_append_leaves_nothing_visible(self):
+        """Test that a failure before commit does not expose partial rows."""
+        server = LocalWriteServer(fail_appends=True)
+        with pytest.raises(RuntimeError):
+            write_bronze_arrow(server, bronze_orders(5), PARENT)
+        assert server.visible_rows(PARENT) is None
+
+    def test_replayed_append_rejected(self):
+        """Test that offsets prevent the same rows from being appended twice."""
+        server = LocalWriteServer()
+        stream = server.create_write_stream(
+            parent=PARENT,
+            write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING)
+        )
+        table = bronze_orders(5)
+        append_arrow(server, stream.name, table)
+        with pytest.raises(RuntimeError, match="offset"):
+            append_arrow(server, stream.name, table)
+        assert server.streams[stream.name]["rows"] == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])